@@ -10,12 +10,43 @@ SubPackages:
 
 Modules:
     | build_logging: TRACE log level and registration for the build pipeline.
+    | build_history: Keeps a history of build performance and finds regressions.
+    | build_planning: Estimates task durations from previous builds and plans which
+        ready task should be started first.
+    | build_tracing: Records a Chrome trace of the tasks and commands run in a build.
+    | cli_args: Types for parsing the command line arguments shared by the "main"
+        modules.
+    | coverage_map: Selects the unit tests to re-run from the lines each test ran, and
+        checks how much each test file covers on its own.
     | dag_engine: Contains the logic for resolving task dependencies and running
         tasks in a coherent order.
+    | docker_session: Runs a build's commands for each image in one long-lived
+        container.
+    | docstring_enforcement: Checks that docstrings document what they should from
+        the syntax tree of each module, without importing it.
     | dump_ci_cd_run_info: A "main" that records project level variables for the CI/CD
         pipeline to a file for use during CI/CD.
     | execute_build_steps: A "main" that runs tasks.
     | file_caching: Logic for checking if a file has been modified since last execution.
+    | filesystem_snapshot: Answers questions about a directory tree from a single
+        scan.
+    | import_graph: Finds which modules of a subproject a test depends on.
     | process_runner: Contains the logic for executing subprocesses.
+    | pytest_sizing: Picks the xdist worker count and test file order of each pytest
+        run from how long its test files took before.
+    | report_build_history: A "main" that reports trends and regressions from the
+        build history.
     | report_build_var: A "main" that reports variables.
+    | report_fragments: Assembles complete unit test reports from the saved results of
+        each test file, so unchanged tests don't run again.
+    | resource_accounting: Measures the CPU time, memory, and I/O used by the commands
+        a build runs.
+    | resource_budget: Shares the build machine's CPUs and memory between running
+        tasks.
+    | shared_test_results: Shares which tests have passed between the machines that
+        build the project.
+    | task_caching: Logic for skipping tasks whose inputs have not changed and
+        restoring their outputs from a local content-addressed store.
+    | task_queue: Hands the tasks of a distributed build to workers through a queue.
+    | task_worker: A "main" that runs tasks handed out by distributed builds.
 """
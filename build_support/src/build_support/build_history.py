@@ -0,0 +1,324 @@
+"""Logic for keeping a history of build performance and finding regressions.
+
+Every build appends the duration of each task and each command it ran to a SQLite
+database in the build directory, along with whether each task passed, how many tasks
+were restored from the task cache, and the git branch and commit that were built.
+Unlike the runtime report, which only describes the most recent build, the history is
+never overwritten.
+
+A task has regressed when its most recent duration is slower than its rolling baseline,
+the median of its durations in previous builds, by more than a threshold.  Runs where a
+task was restored from the task cache or failed are left out of both sides of the
+comparison.
+
+Attributes:
+    | ROLLING_BASELINE_BUILDS: The default number of previous runs of a task used as its
+        baseline.
+    | REGRESSION_THRESHOLD: The default fraction a task must be slower than its baseline
+        by to be flagged as a regression.
+    | MIN_REGRESSION_DURATION: The smallest slowdown that can be flagged, so that noise
+        in very short tasks is not reported as a regression.
+    | PASSED_STATUS: The status recorded for a task that ran without failing.
+"""
+
+from collections.abc import Mapping
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlite3 import Connection, connect
+from statistics import median
+from typing import cast
+
+from git import InvalidGitRepositoryError, NoSuchPathError
+
+from build_support.build_tracing import BuildTrace, TraceSpan
+from build_support.ci_cd_vars.build_paths import get_build_history_db_path
+from build_support.ci_cd_vars.git_status_vars import get_git_repo
+
+ROLLING_BASELINE_BUILDS = 10
+REGRESSION_THRESHOLD = 0.2
+MIN_REGRESSION_DURATION = timedelta(seconds=1)
+PASSED_STATUS = "passed"
+
+
+@dataclass(frozen=True)
+class BuildRecord:
+    """A dataclass summarizing a build in the history."""
+
+    build_id: int
+    started_at: datetime
+    branch: str | None
+    commit_sha: str | None
+    duration: timedelta
+    tasks_run: int
+    cache_hits: int
+
+
+@dataclass(frozen=True)
+class TaskTrend:
+    """A dataclass comparing the latest duration of a task to its baseline."""
+
+    task_name: str
+    latest_duration: timedelta
+    restored_from_cache: bool
+    baseline_duration: timedelta | None
+    regressed: bool
+
+    def get_percent_change(self) -> float | None:
+        """Gets how much slower the latest run was than the baseline, as a percent.
+
+        Returns:
+            float | None: The percent change from the baseline, or None if there is no
+                baseline to compare against.
+        """
+        if not self.baseline_duration:
+            return None
+        return 100 * (self.latest_duration / self.baseline_duration - 1)
+
+
+def connect_to_build_history(project_root: Path) -> Connection:
+    """Opens the build history database, creating it if it doesn't exist yet.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Connection: A connection to the build history database.
+    """
+    connection = connect(get_build_history_db_path(project_root=project_root))
+    connection.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS builds (
+            build_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            branch TEXT,
+            commit_sha TEXT,
+            duration_seconds REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS task_runs (
+            build_id INTEGER NOT NULL REFERENCES builds (build_id),
+            task_name TEXT NOT NULL,
+            duration_seconds REAL NOT NULL,
+            restored_from_cache INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'passed'
+        );
+        CREATE TABLE IF NOT EXISTS command_runs (
+            build_id INTEGER NOT NULL REFERENCES builds (build_id),
+            task_name TEXT,
+            command TEXT NOT NULL,
+            duration_seconds REAL NOT NULL,
+            exit_code INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS task_runs_by_task ON task_runs (task_name, build_id);
+        """
+    )
+    task_run_columns = {
+        row[1] for row in connection.execute("PRAGMA table_info(task_runs)")
+    }
+    if "status" not in task_run_columns:
+        # Histories recorded before statuses were kept can't tell which runs failed
+        connection.execute(
+            "ALTER TABLE task_runs ADD COLUMN status TEXT NOT NULL DEFAULT 'passed'"
+        )
+    return connection
+
+
+def get_git_revision(project_root: Path) -> tuple[str | None, str | None]:
+    """Gets the branch and commit that are checked out.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        tuple[str | None, str | None]: The branch name, or None if HEAD is detached,
+            and the commit sha, or None if the project isn't a git repo with commits.
+    """
+    try:
+        repo = get_git_repo(project_root=project_root)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        return None, None
+    if not repo.head.is_valid():
+        return None, None
+    branch = None if repo.head.is_detached else repo.active_branch.name
+    return branch, repo.head.commit.hexsha
+
+
+def _get_span_end(span: TraceSpan) -> datetime:
+    return span.start + span.duration
+
+
+def record_build(
+    project_root: Path,
+    build_trace: BuildTrace,
+    task_statuses: Mapping[str, str] | None = None,
+) -> int:
+    """Appends the tasks and commands of a build to the build history.
+
+    Args:
+        project_root (Path): Path to this project's root.
+        build_trace (BuildTrace): The trace recorded while the build ran.
+        task_statuses (Mapping[str, str] | None): The status of each task that ran,
+            by task name.  Tasks without a status are recorded as passed.
+
+    Returns:
+        int: The id of the build in the build history.
+    """
+    task_spans = [span for span in build_trace.spans if span.category == "task"]
+    command_spans = [span for span in build_trace.spans if span.category == "command"]
+    build_end = max(
+        (_get_span_end(span) for span in build_trace.spans), default=build_trace.start
+    )
+    task_statuses = task_statuses or {}
+    branch, commit_sha = get_git_revision(project_root=project_root)
+    with (
+        closing(connect_to_build_history(project_root=project_root)) as connection,
+        connection,
+    ):
+        cursor = connection.execute(
+            "INSERT INTO builds (started_at, branch, commit_sha, duration_seconds) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                build_trace.start.isoformat(),
+                branch,
+                commit_sha,
+                (build_end - build_trace.start).total_seconds(),
+            ),
+        )
+        build_id = cursor.lastrowid
+        connection.executemany(
+            "INSERT INTO task_runs "
+            "(build_id, task_name, duration_seconds, restored_from_cache, status) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    build_id,
+                    span.name,
+                    span.duration.total_seconds(),
+                    bool(span.args.get("restored_from_cache")),
+                    str(task_statuses.get(span.name, PASSED_STATUS)),
+                )
+                for span in task_spans
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO command_runs "
+            "(build_id, task_name, command, duration_seconds, exit_code) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    build_id,
+                    span.parent,
+                    span.name,
+                    span.duration.total_seconds(),
+                    span.args.get("exit_code"),
+                )
+                for span in command_spans
+            ],
+        )
+    return cast(int, build_id)
+
+
+def get_recent_builds(project_root: Path, limit: int) -> list[BuildRecord]:
+    """Gets the most recent builds in the build history.
+
+    Args:
+        project_root (Path): Path to this project's root.
+        limit (int): The maximum number of builds to get.
+
+    Returns:
+        list[BuildRecord]: The most recent builds, oldest first.
+    """
+    with closing(connect_to_build_history(project_root=project_root)) as connection:
+        rows = connection.execute(
+            "SELECT builds.build_id, started_at, branch, commit_sha, "
+            "builds.duration_seconds, COUNT(task_runs.task_name), "
+            "COALESCE(SUM(task_runs.restored_from_cache), 0) "
+            "FROM builds LEFT JOIN task_runs ON builds.build_id = task_runs.build_id "
+            "GROUP BY builds.build_id ORDER BY builds.build_id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return [
+        BuildRecord(
+            build_id=build_id,
+            started_at=datetime.fromisoformat(started_at),
+            branch=branch,
+            commit_sha=commit_sha,
+            duration=timedelta(seconds=duration_seconds),
+            tasks_run=tasks_run,
+            cache_hits=cache_hits,
+        )
+        for (
+            build_id,
+            started_at,
+            branch,
+            commit_sha,
+            duration_seconds,
+            tasks_run,
+            cache_hits,
+        ) in reversed(rows)
+    ]
+
+
+def get_task_trends(
+    project_root: Path,
+    baseline_builds: int = ROLLING_BASELINE_BUILDS,
+    regression_threshold: float = REGRESSION_THRESHOLD,
+) -> list[TaskTrend]:
+    """Compares each task in the most recent build against its rolling baseline.
+
+    Args:
+        project_root (Path): Path to this project's root.
+        baseline_builds (int): The number of previous passing runs of each task, not
+            restored from the cache, that make up its baseline.
+        regression_threshold (float): The fraction a task must be slower than its
+            baseline by to be flagged as a regression.
+
+    Returns:
+        list[TaskTrend]: A trend for every task in the most recent build, in the order
+            the tasks finished.
+    """
+    with closing(connect_to_build_history(project_root=project_root)) as connection:
+        latest_runs = connection.execute(
+            "SELECT build_id, task_name, duration_seconds, restored_from_cache, "
+            "status FROM task_runs WHERE build_id = (SELECT MAX(build_id) FROM builds) "
+            "ORDER BY rowid"
+        ).fetchall()
+        trends = []
+        for (
+            build_id,
+            task_name,
+            duration_seconds,
+            restored_from_cache,
+            status,
+        ) in latest_runs:
+            baseline_rows = connection.execute(
+                "SELECT duration_seconds FROM task_runs "
+                "WHERE task_name = ? AND build_id < ? AND restored_from_cache = 0 "
+                "AND status = ? ORDER BY build_id DESC LIMIT ?",
+                (task_name, build_id, PASSED_STATUS, baseline_builds),
+            ).fetchall()
+            latest_duration = timedelta(seconds=duration_seconds)
+            baseline_duration = (
+                timedelta(seconds=median(row[0] for row in baseline_rows))
+                if baseline_rows
+                else None
+            )
+            trends.append(
+                TaskTrend(
+                    task_name=task_name,
+                    latest_duration=latest_duration,
+                    restored_from_cache=bool(restored_from_cache),
+                    baseline_duration=baseline_duration,
+                    regressed=(
+                        not restored_from_cache
+                        and status == PASSED_STATUS
+                        and baseline_duration is not None
+                        and latest_duration
+                        > baseline_duration * (1 + regression_threshold)
+                        and latest_duration - baseline_duration
+                        >= MIN_REGRESSION_DURATION
+                    ),
+                )
+            )
+    return trends
@@ -0,0 +1,250 @@
+"""Logic for planning the order that ready tasks in the DAG are started in.
+
+Task durations from previous builds are persisted and used to estimate how long each
+task will take.  Each task is then ranked by the longest estimated path from the start
+of that task to the end of the build (HEFT-style upward rank).  When several tasks are
+ready at the same time the task with the highest rank is started first, so that the
+long pole of the build is never left waiting behind short tasks.
+
+Attributes:
+    | HISTORY_SMOOTHING_FACTOR: The weight given to the most recent duration of a task
+        when updating its estimated duration.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import timedelta
+
+from pydantic import BaseModel
+from yaml import safe_dump, safe_load
+
+from build_support.ci_cd_tasks.task_node import TaskNode
+
+HISTORY_SMOOTHING_FACTOR = 0.5
+
+
+class TaskDurationHistory(BaseModel):
+    """An object containing the estimated duration of each task from past builds."""
+
+    durations: dict[str, timedelta] = {}
+
+    @staticmethod
+    def from_yaml(yaml_str: str) -> "TaskDurationHistory":
+        """Builds an object from a yaml str.
+
+        Args:
+            yaml_str (str): String of the YAML representation of a TaskDurationHistory.
+
+        Returns:
+            TaskDurationHistory: A TaskDurationHistory object parsed from the YAML.
+        """
+        return TaskDurationHistory.model_validate(safe_load(yaml_str))
+
+    def to_yaml(self) -> str:
+        """Dumps object as a yaml str.
+
+        Returns:
+            str: A YAML representation of this TaskDurationHistory instance.
+        """
+        return safe_dump(self.model_dump(mode="json"))
+
+    def get_estimated_duration(self, task_label: str) -> timedelta:
+        """Gets the estimated duration of a task.
+
+        Tasks that have never been run are estimated to take the average duration of
+        the tasks that have been run before.
+
+        Args:
+            task_label (str): The label of the task to estimate.
+
+        Returns:
+            timedelta: The estimated duration of the task.
+        """
+        if task_label in self.durations:
+            return self.durations[task_label]
+        if not self.durations:
+            return timedelta()
+        return sum(self.durations.values(), timedelta()) / len(self.durations)
+
+    def record_durations(self, durations: dict[str, timedelta]) -> None:
+        """Updates the estimated durations with the durations from a build.
+
+        Estimates are an exponentially weighted moving average of observed durations.
+
+        Args:
+            durations (dict[str, timedelta]): The observed duration of each task in a
+                build, keyed by task label.
+
+        Returns:
+            None
+        """
+        for task_label, duration in durations.items():
+            previous_estimate = self.durations.get(task_label, duration)
+            self.durations[task_label] = (
+                duration * HISTORY_SMOOTHING_FACTOR
+                + previous_estimate * (1 - HISTORY_SMOOTHING_FACTOR)
+            )
+
+
+@dataclass(frozen=True)
+class BuildPlan:
+    """A dataclass describing the predicted shape of a build."""
+
+    estimated_durations: dict[TaskNode, timedelta]
+    task_ranks: dict[TaskNode, timedelta]
+    execution_positions: dict[TaskNode, int]
+    critical_path: list[TaskNode]
+    predicted_makespan: timedelta
+
+    def prioritize(self, tasks: list[TaskNode]) -> list[TaskNode]:
+        """Sorts tasks so that the task that should be started first is first.
+
+        Tasks with a longer remaining critical path come first.  Ties are broken by
+        execution order so that the result is deterministic.
+
+        Args:
+            tasks (list[TaskNode]): The tasks to sort.
+
+        Returns:
+            list[TaskNode]: The tasks sorted by priority.
+        """
+        return _prioritize(
+            tasks=tasks,
+            task_ranks=self.task_ranks,
+            execution_positions=self.execution_positions,
+        )
+
+    def describe(self) -> str:
+        """Describes the plan in a human-readable way.
+
+        Returns:
+            str: A description of the predicted makespan and the critical path.
+        """
+        critical_path = " -> ".join(
+            f"{task.task_label()} ({self.estimated_durations[task]})"
+            for task in self.critical_path
+        )
+        return (
+            f"Predicted makespan: {self.predicted_makespan}\n"
+            f"Critical path: {critical_path}"
+        )
+
+
+def _prioritize(
+    tasks: list[TaskNode],
+    task_ranks: dict[TaskNode, timedelta],
+    execution_positions: dict[TaskNode, int],
+) -> list[TaskNode]:
+    return sorted(
+        tasks, key=lambda task: (-task_ranks[task], execution_positions[task])
+    )
+
+
+def _get_task_dependents(
+    task_requirements: dict[TaskNode, set[TaskNode]],
+) -> dict[TaskNode, list[TaskNode]]:
+    task_dependents: dict[TaskNode, list[TaskNode]] = {
+        task: [] for task in task_requirements
+    }
+    for task, required_tasks in task_requirements.items():
+        for required_task in required_tasks:
+            task_dependents[required_task].append(task)
+    return task_dependents
+
+
+def _simulate_makespan(
+    task_requirements: dict[TaskNode, set[TaskNode]],
+    estimated_durations: dict[TaskNode, timedelta],
+    task_ranks: dict[TaskNode, timedelta],
+    execution_positions: dict[TaskNode, int],
+    jobs: int,
+) -> timedelta:
+    current_time = timedelta()
+    pending_tasks = list(execution_positions)
+    completed_tasks: set[TaskNode] = set()
+    running_tasks: list[tuple[timedelta, int, TaskNode]] = []
+    while pending_tasks or running_tasks:
+        ready_tasks = _prioritize(
+            tasks=[
+                task
+                for task in pending_tasks
+                if task_requirements[task].issubset(completed_tasks)
+            ],
+            task_ranks=task_ranks,
+            execution_positions=execution_positions,
+        )
+        for task in ready_tasks[: jobs - len(running_tasks)]:
+            pending_tasks.remove(task)
+            heapq.heappush(
+                running_tasks,
+                (
+                    current_time + estimated_durations[task],
+                    execution_positions[task],
+                    task,
+                ),
+            )
+        current_time, _, finished_task = heapq.heappop(running_tasks)
+        completed_tasks.add(finished_task)
+    return current_time
+
+
+def get_build_plan(
+    task_execution_order: list[TaskNode],
+    task_requirements: dict[TaskNode, set[TaskNode]],
+    duration_history: TaskDurationHistory,
+    jobs: int,
+) -> BuildPlan:
+    """Plans the order that tasks will be started in.
+
+    The predicted makespan is found by simulating the build with the estimated task
+    durations, starting ready tasks in priority order on ``jobs`` workers.
+
+    Args:
+        task_execution_order (list[TaskNode]): All tasks in the build, in an order
+            where every task comes after the tasks it requires.
+        task_requirements (dict[TaskNode, set[TaskNode]]): The tasks required by each
+            task in the build.
+        duration_history (TaskDurationHistory): Estimated task durations from previous
+            builds.
+        jobs (int): The maximum number of tasks that will run concurrently.
+
+    Returns:
+        BuildPlan: The plan for the build.
+    """
+    estimated_durations = {
+        task: duration_history.get_estimated_duration(task_label=task.task_label())
+        for task in task_execution_order
+    }
+    execution_positions = {
+        task: position for position, task in enumerate(task_execution_order)
+    }
+    task_dependents = _get_task_dependents(task_requirements=task_requirements)
+    task_ranks: dict[TaskNode, timedelta] = {}
+    for task in reversed(task_execution_order):
+        task_ranks[task] = estimated_durations[task] + max(
+            (task_ranks[dependent] for dependent in task_dependents[task]),
+            default=timedelta(),
+        )
+    critical_path: list[TaskNode] = []
+    next_candidates = task_execution_order
+    while next_candidates:
+        next_task = _prioritize(
+            tasks=next_candidates,
+            task_ranks=task_ranks,
+            execution_positions=execution_positions,
+        )[0]
+        critical_path.append(next_task)
+        next_candidates = task_dependents[next_task]
+    return BuildPlan(
+        estimated_durations=estimated_durations,
+        task_ranks=task_ranks,
+        execution_positions=execution_positions,
+        critical_path=critical_path,
+        predicted_makespan=_simulate_makespan(
+            task_requirements=task_requirements,
+            estimated_durations=estimated_durations,
+            task_ranks=task_ranks,
+            execution_positions=execution_positions,
+            jobs=jobs,
+        ),
+    )
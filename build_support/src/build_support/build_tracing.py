@@ -0,0 +1,160 @@
+"""Logic for recording a timeline of a build as Chrome trace events.
+
+While a build is being traced every task and every subprocess command records a span.
+Spans are recorded on the thread that ran them, so the commands run by a task nest
+inside that task's span when the trace is viewed in ``chrome://tracing`` or Perfetto.
+Each span also records the span it ran inside.  That is kept in a context variable, so
+work a task hands to its own threads with a copy of its context
+(``contextvars.copy_context``) is still recorded as part of the task.
+
+Spans are only recorded inside ``trace_build``.  Outside of it ``trace_span`` still
+times its block but the span is discarded.
+
+Attributes:
+    | TRACE_EVENT_PHASE_COMPLETE: The Chrome trace event phase for a span with a
+        duration.
+"""
+
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+TRACE_EVENT_PHASE_COMPLETE = "X"
+
+
+@dataclass(frozen=True)
+class TraceSpan:
+    """A dataclass holding a single timed span of work."""
+
+    name: str
+    category: str
+    start: datetime
+    duration: timedelta
+    thread_id: int
+    args: dict[str, Any]
+    parent: str | None = None
+
+
+class BuildTrace:
+    """A class collecting the spans recorded by every thread during a build."""
+
+    start: datetime
+    spans: list[TraceSpan]
+
+    def __init__(self) -> None:
+        """Init method for BuildTrace.
+
+        Returns:
+            None
+        """
+        self.start = datetime.now(tz=UTC)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add_span(self, span: TraceSpan) -> None:
+        """Adds a span to the trace.
+
+        Args:
+            span (TraceSpan): The span to add.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.spans.append(span)
+
+    def to_chrome_trace(self) -> str:
+        """Dumps the trace in the Chrome trace event JSON format.
+
+        Threads are numbered in the order they first started a span.
+
+        Returns:
+            str: A JSON representation of this trace.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        thread_numbers: dict[int, int] = {}
+        for span in spans:
+            thread_numbers.setdefault(span.thread_id, len(thread_numbers))
+        one_microsecond = timedelta(microseconds=1)
+        trace_events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": TRACE_EVENT_PHASE_COMPLETE,
+                "ts": (span.start - self.start) // one_microsecond,
+                "dur": span.duration // one_microsecond,
+                "pid": os.getpid(),
+                "tid": thread_numbers[span.thread_id],
+                "args": span.args,
+            }
+            for span in spans
+        ]
+        return json.dumps(
+            {"traceEvents": trace_events, "displayTimeUnit": "ms"}, indent=2
+        )
+
+
+_active_build_trace: BuildTrace | None = None
+_enclosing_span_name: ContextVar[str | None] = ContextVar(
+    "enclosing_span_name", default=None
+)
+
+
+@contextmanager
+def trace_build() -> Iterator[BuildTrace]:
+    """Records the spans of every task and command run inside this context.
+
+    Yields:
+        BuildTrace: The trace that spans are recorded to.
+    """
+    global _active_build_trace  # noqa: PLW0603
+    build_trace = BuildTrace()
+    _active_build_trace = build_trace
+    try:
+        yield build_trace
+    finally:
+        _active_build_trace = None
+
+
+@contextmanager
+def trace_span(name: str, category: str) -> Iterator[dict[str, Any]]:
+    """Records a span covering the work done inside this context.
+
+    The span is recorded even if the work raises.
+
+    Args:
+        name (str): The name of the span, e.g. a task label or a command.
+        category (str): The kind of work the span covers, e.g. "task" or "command".
+
+    Yields:
+        dict[str, Any]: Arguments that will be attached to the span.  The work inside
+            the context can add to these, e.g. the exit code of a command.
+    """
+    span_args: dict[str, Any] = {}
+    parent = _enclosing_span_name.get()
+    enclosing_span_token = _enclosing_span_name.set(name)
+    start = datetime.now(tz=UTC)
+    try:
+        yield span_args
+    finally:
+        _enclosing_span_name.reset(enclosing_span_token)
+        build_trace = _active_build_trace
+        if build_trace is not None:
+            build_trace.add_span(
+                span=TraceSpan(
+                    name=name,
+                    category=category,
+                    start=start,
+                    duration=datetime.now(tz=UTC) - start,
+                    thread_id=threading.get_ident(),
+                    args=span_args,
+                    parent=parent,
+                )
+            )
@@ -4,13 +4,14 @@ from shutil import copytree
 from typing import override
 
 from build_support.ci_cd_tasks.env_setup_tasks import SetupProdEnvironment
-from build_support.ci_cd_tasks.task_node import TaskNode
+from build_support.ci_cd_tasks.task_node import TaskCacheSpec, TaskNode
 from build_support.ci_cd_tasks.validation_tasks import (
     SubprojectUnitTests,
     ValidatePythonStyle,
 )
 from build_support.ci_cd_vars.build_paths import (
     get_build_docs_build_dir,
+    get_build_docs_dir,
     get_build_docs_source_dir,
     get_dist_dir,
 )
@@ -22,10 +23,19 @@ from build_support.ci_cd_vars.project_setting_vars import (
     get_project_name,
     get_project_version,
 )
-from build_support.ci_cd_vars.project_structure import get_docs_dir, get_sphinx_conf_dir
+from build_support.ci_cd_vars.project_structure import (
+    get_dockerfile,
+    get_docs_dir,
+    get_license_file,
+    get_pyproject_toml,
+    get_readme,
+    get_sphinx_conf_dir,
+    get_uv_lock_file,
+)
 from build_support.ci_cd_vars.subproject_structure import (
     SubprojectContext,
     get_all_python_subprojects_with_src,
+    get_python_subproject,
 )
 from build_support.process_runner import concatenate_args, run_process
 
@@ -75,6 +85,29 @@ class BuildPypi(TaskNode):
             SetupProdEnvironment(basic_task_info=self.get_basic_task_info()),
         ]
 
+    @override
+    def cache_spec(self) -> TaskCacheSpec:
+        """Declares the files that the PyPi package is built from.
+
+        Returns:
+            TaskCacheSpec: The inputs and outputs of building the PyPi package.
+        """
+        return TaskCacheSpec(
+            input_paths=[
+                get_python_subproject(
+                    subproject_context=SubprojectContext.PYPI,
+                    project_root=self.docker_project_root,
+                ).get_src_dir(),
+                get_pyproject_toml(project_root=self.docker_project_root),
+                get_uv_lock_file(project_root=self.docker_project_root),
+                get_readme(project_root=self.docker_project_root),
+                get_license_file(project_root=self.docker_project_root),
+                get_dockerfile(project_root=self.docker_project_root),
+            ],
+            output_paths=[get_dist_dir(project_root=self.docker_project_root)],
+            env_var_names=["TAG_SUFFIX"],
+        )
+
     @override
     def run(self) -> None:
         """Builds PyPi package.
@@ -125,6 +158,31 @@ class BuildDocs(TaskNode):
         """
         return [ValidatePythonStyle(basic_task_info=self.get_basic_task_info())]
 
+    @override
+    def cache_spec(self) -> TaskCacheSpec:
+        """Declares the files that the sphinx docs are built from.
+
+        Returns:
+            TaskCacheSpec: The inputs and outputs of building the sphinx docs.
+        """
+        return TaskCacheSpec(
+            input_paths=[
+                get_docs_dir(project_root=self.docker_project_root),
+                *(
+                    subproject.get_src_dir()
+                    for subproject in get_all_python_subprojects_with_src(
+                        project_root=self.docker_project_root
+                    )
+                ),
+                get_pyproject_toml(project_root=self.docker_project_root),
+                get_uv_lock_file(project_root=self.docker_project_root),
+                get_license_file(project_root=self.docker_project_root),
+                get_dockerfile(project_root=self.docker_project_root),
+            ],
+            output_paths=[get_build_docs_dir(project_root=self.docker_project_root)],
+            env_var_names=["TAG_SUFFIX"],
+        )
+
     @override
     def run(self) -> None:
         """Builds sphinx docs.
@@ -1,6 +1,7 @@
 """Abstract class for tasks that will be elements of the DAG."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import override
 
@@ -23,6 +24,7 @@ class BasicTaskInfo(BaseModel):
     local_gid: int = Field(gt=-1)
     local_user_env: dict[str, str] | None = None
     ci_cd_feature_test_mode: bool = False
+    fail_fast: bool = False
 
     @model_validator(mode="after")
     def check_valid_local_user_env(self) -> "BasicTaskInfo":
@@ -90,6 +92,32 @@ class BasicTaskInfo(BaseModel):
         return safe_dump(self.model_dump())
 
 
+@dataclass(frozen=True)
+class TaskCacheSpec:
+    """A dataclass declaring everything a task's result depends on and produces.
+
+    Input and output paths may be files or directories.  Directories include every
+    file beneath them.  Task info fields are the names of BasicTaskInfo fields.
+    """
+
+    input_paths: list[Path]
+    output_paths: list[Path]
+    env_var_names: list[str] = field(default_factory=list)
+    task_info_fields: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class TaskResources:
+    """A dataclass declaring the machine resources a task uses while it runs.
+
+    Cpus is the number of CPUs the task can make use of.  Memory weight is the
+    fraction of the build machine's memory the task needs at its peak.
+    """
+
+    cpus: int = 1
+    memory_weight: float = 0.0
+
+
 class TaskNode(ABC):
     """An abstract representation of a task that can be run in a DAG."""
 
@@ -99,6 +127,7 @@ class TaskNode(ABC):
     local_gid: int
     local_user_env: dict[str, str] | None
     ci_cd_feature_test_mode: bool
+    fail_fast: bool
 
     def __init__(self, basic_task_info: BasicTaskInfo) -> None:
         """Init method for TaskNode.
@@ -115,6 +144,7 @@ class TaskNode(ABC):
         self.local_gid = basic_task_info.local_gid
         self.local_user_env = basic_task_info.local_user_env
         self.ci_cd_feature_test_mode = basic_task_info.ci_cd_feature_test_mode
+        self.fail_fast = basic_task_info.fail_fast
 
     def get_basic_task_info(self) -> BasicTaskInfo:
         """Get the basic info used to run this task.
@@ -129,6 +159,7 @@ class TaskNode(ABC):
             local_gid=self.local_gid,
             local_user_env=self.local_user_env,
             ci_cd_feature_test_mode=self.ci_cd_feature_test_mode,
+            fail_fast=self.fail_fast,
         )
 
     def task_label(self) -> str:
@@ -160,6 +191,30 @@ class TaskNode(ABC):
         """
         return hash(self.task_label())
 
+    def cache_spec(self) -> TaskCacheSpec | None:
+        """Declares the inputs and outputs used to cache the result of this task.
+
+        Tasks that return a spec are skipped when their inputs match a previous
+        successful run, and their outputs are restored from the task cache instead.
+
+        Returns:
+            TaskCacheSpec | None: The inputs and outputs of this task, or None if the
+                result of this task should never be cached.
+        """
+        return None
+
+    def resources(self) -> TaskResources:
+        """Declares the machine resources this task uses while it runs.
+
+        The scheduler gives each running task a CPU budget from a pool shared by every
+        running task, and won't start tasks whose memory weights add up to more than
+        the whole machine.
+
+        Returns:
+            TaskResources: The resources this task uses.
+        """
+        return TaskResources()
+
     @abstractmethod
     def required_tasks(self) -> list["TaskNode"]:
         """Will return the tasks required to start the current task.
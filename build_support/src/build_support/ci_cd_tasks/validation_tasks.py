@@ -6,13 +6,15 @@ Attributes:
 
 import re
 from collections.abc import Iterator
-from copy import deepcopy
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import partial
 from pathlib import Path
-from typing import cast, override
+from typing import TYPE_CHECKING, override
 
 from junitparser import JUnitXml
-from tomlkit import TOMLDocument, document, dumps, table
 
 from build_support.ci_cd_tasks.env_setup_tasks import (
     GetGitInfo,
@@ -20,34 +22,69 @@ from build_support.ci_cd_tasks.env_setup_tasks import (
     SetupDevEnvironment,
     SetupProdEnvironment,
 )
-from build_support.ci_cd_tasks.task_node import PerSubprojectTask, TaskNode
+from build_support.ci_cd_tasks.task_node import (
+    PerSubprojectTask,
+    TaskCacheSpec,
+    TaskNode,
+    TaskResources,
+)
 from build_support.ci_cd_vars.build_paths import get_git_info_yaml
 from build_support.ci_cd_vars.docker_vars import (
     DockerTarget,
-    get_base_docker_command_for_image,
     get_docker_command_for_image,
-    get_docker_image_name,
     get_ty_extra_search_path_args,
 )
-from build_support.ci_cd_vars.file_and_dir_path_vars import (
-    get_all_non_test_folders,
-    get_all_test_folders,
+from build_support.ci_cd_vars.git_status_vars import (
+    get_head_commit_sha,
+    get_uncommitted_files,
 )
 from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
-from build_support.ci_cd_vars.project_setting_vars import get_pyproject_toml_data
 from build_support.ci_cd_vars.project_structure import (
+    get_dockerfile,
+    get_docs_dir,
     get_feature_test_scratch_folder,
-    get_resource_dir,
+    get_pyproject_toml,
+    get_readme,
+    get_sphinx_conf_dir,
+    get_static_check_config_files,
+    get_uv_lock_file,
 )
 from build_support.ci_cd_vars.subproject_structure import (
     PythonSubproject,
     SubprojectContext,
-    get_all_python_subprojects_dict,
-    get_python_subproject,
+    get_all_python_subprojects_with_src,
+    get_all_python_subprojects_with_test,
     get_sorted_subproject_contexts,
 )
-from build_support.file_caching import FileCacheEngine
-from build_support.process_runner import concatenate_args, run_process
+from build_support.coverage_map import (
+    CoverageTestSelector,
+    build_coverage_map,
+    check_test_file_coverage,
+    report_coverage,
+)
+from build_support.file_caching import TEST_FILE_PREFIX, FileCacheEngine
+from build_support.process_runner import (
+    ProcessFailedError,
+    concatenate_args,
+    run_process,
+)
+from build_support.pytest_sizing import (
+    get_failed_test_files,
+    get_pytest_distribution_args,
+    get_test_file_durations,
+    order_test_files,
+    was_modified_recently,
+)
+from build_support.report_fragments import ReportFragmentStore
+from build_support.resource_accounting import (
+    ResourceUsage,
+    record_resource_usage,
+    track_resource_usage,
+)
+from build_support.resource_budget import get_task_cpu_budget
+
+if TYPE_CHECKING:
+    from datetime import timedelta
 
 
 class ValidateAll(TaskNode):
@@ -79,6 +116,238 @@ class ValidateAll(TaskNode):
         """
 
 
+def get_fail_fast_args(*, fail_fast: bool) -> list[str]:
+    """Gets the args that stop a pytest run at its first failing test, if asked to.
+
+    Args:
+        fail_fast (bool): Whether the run should stop at its first failing test.
+
+    Returns:
+        list[str]: The args to add to the pytest run.
+    """
+    return ["--exitfirst"] if fail_fast else []
+
+
+def record_test_results(
+    file_cache: FileCacheEngine,
+    junit_report: Path,
+    test_files: list[Path],
+    project_root: Path,
+) -> None:
+    """Records how long the test files that just ran took, and which of them failed.
+
+    Args:
+        file_cache (FileCacheEngine): The file cache to save the results in.
+        junit_report (Path): The junit report written by the test run.
+        test_files (list[Path]): The test files that ran.
+        project_root (Path): The directory pytest ran in.
+
+    Returns:
+        None
+    """
+    if junit_report.exists():
+        file_cache.record_test_durations(
+            durations=get_test_file_durations(
+                junit_report=junit_report,
+                test_files=test_files,
+                project_root=project_root,
+            )
+        )
+    file_cache.record_test_failures(
+        ran_test_files=test_files,
+        failed_test_files=get_failed_test_files(
+            junit_report=junit_report, test_files=test_files, project_root=project_root
+        ),
+    )
+
+
+def _get_style_enforcement_input_paths(
+    project_root: Path, test_file: Path
+) -> list[Path]:
+    all_src_dirs = [
+        subproject.get_src_dir()
+        for subproject in get_all_python_subprojects_with_src(project_root=project_root)
+    ]
+    markdown_files = [
+        get_readme(project_root=project_root),
+        project_root.joinpath("AGENTS.md"),
+        project_root.joinpath("CLAUDE.md"),
+    ]
+    docs_inputs = [
+        get_docs_dir(project_root=project_root),
+        project_root.joinpath("Makefile"),
+        *all_src_dirs,
+    ]
+    match test_file.name:
+        case "test_docstrings.py":
+            return all_src_dirs
+        case "test_project_readme.py":
+            return markdown_files
+        case "test_sphinx_docs.py":
+            return docs_inputs
+        case _:
+            return [*docs_inputs, *markdown_files]
+
+
+def get_test_file_input_files(
+    file_cache: FileCacheEngine, test_suite: PythonSubproject.TestSuite, test_file: Path
+) -> list[Path]:
+    """Gets the files the results of a build_support test file depend on.
+
+    Every test file depends on itself, the other files of its suite that aren't test
+    files, its conftest files, the build_support source it imports, the files
+    configuring the dev environment and the git info.  In the style enforcement suite
+    the docstring tests also check the source of every subproject, the README tests
+    the top level markdown files, and the docs tests the docs, the Makefile and the
+    subprojects, while any other test file depends on all of those.  Every process
+    enforcement test also checks the source and tests of every subproject and the
+    docs, which hold the tickets.
+
+    Args:
+        file_cache (FileCacheEngine): The file cache of build_support.
+        test_suite (PythonSubproject.TestSuite): The test suite holding the test file.
+        test_file (Path): The test file to get the inputs of.
+
+    Returns:
+        list[Path]: The input files that exist, in sorted order.
+    """
+    project_root = file_cache.project_root
+    test_suite_dir = file_cache.subproject.get_test_suite_dir(test_suite=test_suite)
+    input_paths = [
+        test_file,
+        *(
+            file_path
+            for file_path in file_cache.get_files_in_dir(directory=test_suite_dir)
+            if not file_path.name.startswith(TEST_FILE_PREFIX)
+        ),
+        *file_cache.get_conftest_files(test_dir=test_suite_dir),
+        file_cache.subproject.get_src_dir(),
+        *get_static_check_config_files(project_root=project_root),
+        get_git_info_yaml(project_root=project_root),
+    ]
+    if test_suite == PythonSubproject.TestSuite.STYLE_ENFORCEMENT:
+        input_paths.extend(
+            _get_style_enforcement_input_paths(
+                project_root=project_root, test_file=test_file
+            )
+        )
+    if test_suite == PythonSubproject.TestSuite.PROCESS_ENFORCEMENT:
+        input_paths.extend(
+            subproject.get_src_dir()
+            for subproject in get_all_python_subprojects_with_src(
+                project_root=project_root
+            )
+        )
+        input_paths.extend(
+            subproject.get_test_dir()
+            for subproject in get_all_python_subprojects_with_test(
+                project_root=project_root
+            )
+        )
+        input_paths.append(get_docs_dir(project_root=project_root))
+    return file_cache.get_files_in_paths(input_paths=input_paths)
+
+
+def run_build_support_test_suite(
+    non_docker_project_root: Path,
+    docker_project_root: Path,
+    test_suite: PythonSubproject.TestSuite,
+    *,
+    fail_fast: bool,
+) -> None:
+    """Runs a test suite of build_support, sized and ordered from its last run.
+
+    Only the test files whose inputs changed since they last passed are run, and the
+    suite is skipped if there are none.
+
+    Args:
+        non_docker_project_root (Path): Path to this project's root on the local
+            machine.
+        docker_project_root (Path): Path to this project's root in docker containers.
+        test_suite (PythonSubproject.TestSuite): The test suite to run.
+        fail_fast (bool): Whether to stop at the first failing test.
+
+    Returns:
+        None
+    """
+    file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    )
+    build_support_subproject = file_cache.subproject
+    test_suite_dir = build_support_subproject.get_test_suite_dir(test_suite=test_suite)
+    input_digests_by_test_file = {
+        file_path: file_cache.get_input_digests(
+            input_files=get_test_file_input_files(
+                file_cache=file_cache, test_suite=test_suite, test_file=file_path
+            )
+        )
+        for file_path in file_cache.get_files_in_dir(directory=test_suite_dir)
+        if file_path.suffix == ".py" and file_path.name.startswith(TEST_FILE_PREFIX)
+    }
+    test_files = [
+        test_file
+        for test_file, input_digests in input_digests_by_test_file.items()
+        if file_cache.inputs_changed(file_path=test_file, input_digests=input_digests)
+    ]
+    if not test_files:
+        # Keep the digests of unchanged files so they aren't hashed again next time
+        file_cache.flush()
+        return
+    test_durations = file_cache.get_test_durations()
+    test_files = order_test_files(
+        test_files=test_files,
+        durations=test_durations,
+        failed_test_files=file_cache.get_failed_test_files(),
+        recently_modified_test_files={
+            test_file
+            for test_file in test_files
+            if was_modified_recently(
+                last_modified=file_cache.get_last_modified(input_files=[test_file])
+            )
+        },
+    )
+    junit_report = build_support_subproject.get_pytest_report_path(
+        test_suite=test_suite, test_scope=PythonSubproject.TestScope.COMPLETE
+    )
+    # A report left by an earlier run would hide that this run wrote none
+    junit_report.unlink(missing_ok=True)
+    try:
+        run_process(
+            args=concatenate_args(
+                args=[
+                    get_docker_command_for_image(
+                        non_docker_project_root=non_docker_project_root,
+                        docker_project_root=docker_project_root,
+                        target_image=DockerTarget.DEV,
+                    ),
+                    "pytest",
+                    get_pytest_distribution_args(
+                        test_files=test_files,
+                        durations=test_durations,
+                        cpu_budget=get_task_cpu_budget(),
+                    ),
+                    get_fail_fast_args(fail_fast=fail_fast),
+                    build_support_subproject.get_pytest_whole_test_suite_report_args(
+                        test_suite=test_suite
+                    ),
+                    test_files,
+                ]
+            )
+        )
+    finally:
+        record_test_results(
+            file_cache=file_cache,
+            junit_report=junit_report,
+            test_files=test_files,
+            project_root=docker_project_root,
+        )
+    for test_file in test_files:
+        file_cache.record_test_passed(
+            file_path=test_file, input_digests=input_digests_by_test_file[test_file]
+        )
+
+
 class EnforceProcess(TaskNode):
     """Task enforces the team's agreed build process for this project."""
 
@@ -94,6 +363,15 @@ class EnforceProcess(TaskNode):
             SetupDevEnvironment(basic_task_info=self.get_basic_task_info()),
         ]
 
+    @override
+    def resources(self) -> TaskResources:
+        """Declares that pytest can spread the process tests across every CPU.
+
+        Returns:
+            TaskResources: The resources used by the process enforcement tests.
+        """
+        return TaskResources(cpus=THREADS_AVAILABLE)
+
     @override
     def run(self) -> None:
         """Runs tests that enforce the build process.
@@ -101,32 +379,51 @@ class EnforceProcess(TaskNode):
         Returns:
             None
         """
-        build_support_subproject = get_python_subproject(
-            subproject_context=SubprojectContext.BUILD_SUPPORT,
-            project_root=self.docker_project_root,
-        )
-        run_process(
-            args=concatenate_args(
-                args=[
-                    get_docker_command_for_image(
-                        non_docker_project_root=self.non_docker_project_root,
-                        docker_project_root=self.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "pytest",
-                    "-n",
-                    THREADS_AVAILABLE,
-                    build_support_subproject.get_pytest_whole_test_suite_report_args(
-                        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT
-                    ),
-                    build_support_subproject.get_test_suite_dir(
-                        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT
-                    ),
-                ]
-            )
+        run_build_support_test_suite(
+            non_docker_project_root=self.non_docker_project_root,
+            docker_project_root=self.docker_project_root,
+            test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT,
+            fail_fast=self.fail_fast,
         )
 
 
+class StaticCheck(StrEnum):
+    """An Enum of the static checks that record the files that passed them."""
+
+    RUFF = "ruff"
+    RUFF_TESTS = "ruff_tests"
+    TY = "ty"
+
+
+def get_files_to_lint(
+    file_cache: FileCacheEngine, check_name: StaticCheck, lint_dir: Path
+) -> dict[Path, dict[str, str]]:
+    """Gets the Python files in a folder that changed since they last passed a check.
+
+    The results of a check that looks at one file at a time only depend on that file and
+    the files configuring the check.
+
+    Args:
+        file_cache (FileCacheEngine): The file cache of the subproject holding the
+            folder.
+        check_name (StaticCheck): The static check.
+        lint_dir (Path): The folder, either the subproject's src or test dir.
+
+    Returns:
+        dict[Path, dict[str, str]]: The current digests of the inputs of each file
+            that has to be checked, keyed by the file.
+    """
+    config_files = get_static_check_config_files(project_root=file_cache.project_root)
+    return file_cache.get_files_to_check(
+        check_name=check_name,
+        input_files_by_file={
+            file_path: [file_path, *config_files]
+            for file_path in file_cache.get_python_files()
+            if file_path.is_relative_to(lint_dir)
+        },
+    )
+
+
 class AllSubprojectStaticTypeChecking(TaskNode):
     """Task for running static type checking in all subprojects."""
 
@@ -171,32 +468,52 @@ class ValidateStaticTypeChecking(PerSubprojectTask):
 
     @override
     def run(self) -> None:
-        """Runs all static type checks on subproject.
+        """Runs static type checks on the subproject's files whose inputs changed.
+
+        A file's types depend on the modules it imports, so a file is checked again when
+        it, or any module it depends on, changed since it last passed.
 
         Returns:
             None
         """
-        run_process(
-            args=concatenate_args(
-                args=[
-                    get_base_docker_command_for_image(
-                        non_docker_project_root=self.non_docker_project_root,
-                        docker_project_root=self.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    get_docker_image_name(
-                        project_root=self.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "ty",
-                    "check",
-                    get_ty_extra_search_path_args(
-                        docker_project_root=self.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    self.subproject.get_root_dir(),
+        file_cache = FileCacheEngine(
+            subproject_context=self.subproject_context,
+            project_root=self.docker_project_root,
+        )
+        config_files = get_static_check_config_files(
+            project_root=self.docker_project_root
+        )
+        files_to_check = file_cache.get_files_to_check(
+            check_name=StaticCheck.TY,
+            input_files_by_file={
+                file_path: [
+                    *file_cache.get_type_check_input_files(file_path=file_path),
+                    *config_files,
                 ]
+                for file_path in file_cache.get_python_files()
+            },
+        )
+        if files_to_check:
+            run_process(
+                args=concatenate_args(
+                    args=[
+                        get_docker_command_for_image(
+                            non_docker_project_root=self.non_docker_project_root,
+                            docker_project_root=self.docker_project_root,
+                            target_image=DockerTarget.DEV,
+                        ),
+                        "ty",
+                        "check",
+                        get_ty_extra_search_path_args(
+                            docker_project_root=self.docker_project_root,
+                            target_image=DockerTarget.DEV,
+                        ),
+                        sorted(files_to_check),
+                    ]
+                )
             )
+        file_cache.record_check_passed(
+            check_name=StaticCheck.TY, input_digests_by_file=files_to_check
         )
 
 
@@ -242,9 +559,31 @@ class ValidateSecurityChecks(PerSubprojectTask):
             SetupDevEnvironment(basic_task_info=self.get_basic_task_info()),
         ]
 
+    @override
+    def cache_spec(self) -> TaskCacheSpec:
+        """Declares the files that the security checks are run against.
+
+        Returns:
+            TaskCacheSpec: The inputs and outputs of the security checks.
+        """
+        return TaskCacheSpec(
+            input_paths=[
+                self.subproject.get_src_dir(),
+                get_pyproject_toml(project_root=self.docker_project_root),
+                get_uv_lock_file(project_root=self.docker_project_root),
+                get_dockerfile(project_root=self.docker_project_root),
+            ],
+            output_paths=[self.subproject.get_bandit_report_path()],
+            env_var_names=["TAG_SUFFIX"],
+        )
+
     @override
     def run(self) -> None:
-        """Runs security checks on subproject.
+        """Runs security checks on the subproject's source.
+
+        Bandit always checks every source file, so the report covers the whole
+        subproject.  The task is skipped by its cache spec when none of its inputs
+        changed.
 
         Returns:
             None
@@ -282,30 +621,48 @@ class ValidatePythonStyle(TaskNode):
             SetupDevEnvironment(basic_task_info=self.get_basic_task_info()),
         ]
 
+    @override
+    def resources(self) -> TaskResources:
+        """Declares that pytest can spread the style enforcement tests across every CPU.
+
+        Returns:
+            TaskResources: The resources used by the style enforcement tests.
+        """
+        return TaskResources(cpus=THREADS_AVAILABLE)
+
     @override
     def run(self) -> None:
         """Runs all stylistic checks on code.
 
+        Ruff only checks the Python files of each subproject that changed since they
+        last passed, along with the sphinx config, which isn't in any subproject.
+
         Returns:
             None
         """
-        subproject = get_all_python_subprojects_dict(
-            project_root=self.docker_project_root
-        )
-        run_process(
-            args=concatenate_args(
-                args=[
-                    get_docker_command_for_image(
-                        non_docker_project_root=self.non_docker_project_root,
-                        docker_project_root=self.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "ruff",
-                    "check",
-                    get_all_non_test_folders(project_root=self.docker_project_root),
-                ]
+        file_caches = [
+            FileCacheEngine(
+                subproject_context=subproject_context,
+                project_root=self.docker_project_root,
             )
-        )
+            for subproject_context in get_sorted_subproject_contexts()
+        ]
+        src_files_to_check = [
+            get_files_to_lint(
+                file_cache=file_cache,
+                check_name=StaticCheck.RUFF,
+                lint_dir=file_cache.subproject.get_src_dir(),
+            )
+            for file_cache in file_caches
+        ]
+        test_files_to_check = [
+            get_files_to_lint(
+                file_cache=file_cache,
+                check_name=StaticCheck.RUFF_TESTS,
+                lint_dir=file_cache.subproject.get_test_dir(),
+            )
+            for file_cache in file_caches
+        ]
         run_process(
             args=concatenate_args(
                 args=[
@@ -316,33 +673,50 @@ class ValidatePythonStyle(TaskNode):
                     ),
                     "ruff",
                     "check",
-                    "--ignore",
-                    "D,FBT",  # These are too onerous to enforce on test code
-                    get_all_test_folders(project_root=self.docker_project_root),
+                    get_sphinx_conf_dir(project_root=self.docker_project_root),
+                    sorted(
+                        file_path
+                        for files_to_check in src_files_to_check
+                        for file_path in files_to_check
+                    ),
                 ]
             )
         )
-        run_process(
-            args=concatenate_args(
-                args=[
-                    get_docker_command_for_image(
-                        non_docker_project_root=self.non_docker_project_root,
-                        docker_project_root=self.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "pytest",
-                    "-n",
-                    THREADS_AVAILABLE,
-                    subproject[
-                        SubprojectContext.BUILD_SUPPORT
-                    ].get_pytest_whole_test_suite_report_args(
-                        test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT
-                    ),
-                    subproject[SubprojectContext.BUILD_SUPPORT].get_test_suite_dir(
-                        test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT
-                    ),
-                ]
+        if any(test_files_to_check):
+            run_process(
+                args=concatenate_args(
+                    args=[
+                        get_docker_command_for_image(
+                            non_docker_project_root=self.non_docker_project_root,
+                            docker_project_root=self.docker_project_root,
+                            target_image=DockerTarget.DEV,
+                        ),
+                        "ruff",
+                        "check",
+                        "--ignore",
+                        "D,FBT",  # These are too onerous to enforce on test code
+                        sorted(
+                            file_path
+                            for files_to_check in test_files_to_check
+                            for file_path in files_to_check
+                        ),
+                    ]
+                )
+            )
+        for file_cache, src_files, test_files in zip(
+            file_caches, src_files_to_check, test_files_to_check, strict=True
+        ):
+            file_cache.record_check_passed(
+                check_name=StaticCheck.RUFF, input_digests_by_file=src_files
+            )
+            file_cache.record_check_passed(
+                check_name=StaticCheck.RUFF_TESTS, input_digests_by_file=test_files
             )
+        run_build_support_test_suite(
+            non_docker_project_root=self.non_docker_project_root,
+            docker_project_root=self.docker_project_root,
+            test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT,
+            fail_fast=self.fail_fast,
         )
 
 
@@ -395,170 +769,324 @@ class AllSubprojectUnitTests(TaskNode):
 
 @dataclass
 class UnitTestInfo:
-    """A dataclass for organizing unit test information."""
+    """A dataclass for organizing unit test information.
+
+    The report digests are the inputs the test's saved reports were recorded with.
+    They only differ from its current inputs if the test doesn't need to run.
+    """
 
     src_file_path: Path
     test_file_path: Path
-    coverage_config_path: Path
+    input_digests: dict[str, str] = field(default_factory=dict)
+    report_digests: dict[str, str] = field(default_factory=dict)
+    must_run: bool = True
+    recently_modified: bool = False
 
 
 class SubprojectUnitTests(PerSubprojectTask):
     """Task for running unit tests in a single subproject."""
 
-    def get_coverage_settings(self) -> TOMLDocument:
-        """Gets the coverage settings from pyproject.toml.
+    def get_coverage_test_selector(
+        self, file_cache: FileCacheEngine
+    ) -> CoverageTestSelector | None:
+        """Gets a selector for the unit tests reached by changes, if there is a map.
+
+        Args:
+            file_cache (FileCacheEngine): The file cache holding the coverage map.
 
         Returns:
-            TOMLDocument: The coverage settings section from pyproject.toml as
-                TOMLDocument.
+            CoverageTestSelector | None: A selector using the coverage map recorded by
+                the last whole test suite run, or None if no map was recorded.
         """
-        pyproject_data = get_pyproject_toml_data(project_root=self.docker_project_root)
-        tool = cast(TOMLDocument, pyproject_data["tool"])
-        return cast(TOMLDocument, tool["coverage"])
+        coverage_map = file_cache.get_coverage_map()
+        if coverage_map is None:
+            return None
+        return CoverageTestSelector(
+            coverage_map=coverage_map,
+            project_root=self.docker_project_root,
+            paths=[self.subproject.get_src_dir()],
+        )
 
-    def build_omit_list(self, unit_test_info: UnitTestInfo) -> list[str]:
-        """Builds the list of omit patterns for a coverage config file.
+    @staticmethod
+    def unit_test_must_run(
+        file_cache: FileCacheEngine,
+        coverage_selector: CoverageTestSelector | None,
+        test_file: Path,
+        input_digests: dict[str, str],
+    ) -> bool:
+        """Decides if a unit test must run.
 
         Args:
-            unit_test_info (UnitTestInfo): Information about the unit test being run.
+            file_cache (FileCacheEngine): The file cache that holds up-to-date
+                information on which tests have passed and which haven't.
+            coverage_selector (CoverageTestSelector | None): Rules out tests whose
+                inputs only changed in lines they didn't run, if there is a coverage
+                map.
+            test_file (Path): The path to the test file.
+            input_digests (dict[str, str]): The current digests of the test's inputs.
 
         Returns:
-            list[str]: List of omit patterns to exclude all test files except the
-                target.
+            bool: True if the test's inputs changed and the coverage map can't rule
+                out the changes affecting the test.
         """
-        test_file_name = unit_test_info.test_file_path.name
-        test_file_parent = unit_test_info.test_file_path.parent
-        # Build omit patterns for all test files except the one we want
-        test_files_to_omit = [
-            test_file.name
-            for test_file in test_file_parent.glob("test_*.py")
-            if test_file.name != test_file_name
-        ]
-        test_file_parent_relative = test_file_parent.relative_to(
-            self.docker_project_root
+        if not file_cache.inputs_changed(
+            file_path=test_file, input_digests=input_digests
+        ):
+            return False
+        previous_digests = file_cache.get_test_info_for_file(
+            file_path=test_file
+        ).input_digests
+        return (
+            coverage_selector is None
+            or previous_digests is None
+            or coverage_selector.test_must_run(
+                test_file=test_file,
+                previous_digests=previous_digests,
+                input_digests=input_digests,
+            )
         )
-        test_files_to_omit_relative = [
-            str(test_file_parent_relative.joinpath(pattern))
-            for pattern in test_files_to_omit
-        ]
-        test_file_parent_relative_str = str(test_file_parent_relative)
-        return [
-            *test_files_to_omit_relative,
-            f"{test_file_parent_relative_str}/*/**/test_*.py",
-            f"{test_file_parent_relative_str}/**/__init__.py",
-            f"{test_file_parent_relative_str}/**/conftest.py",
-        ]
 
-    def write_coverage_config_file(
-        self, unit_test_info: UnitTestInfo, coverage_settings: TOMLDocument
-    ) -> Path:
-        """Writes a coverage config file in TOML format.
-
-        Preserves all existing coverage settings from pyproject.toml and only
-        updates the `tool.coverage.run.omit` field with test-specific omit patterns.
+    @staticmethod
+    def get_report_digests(
+        file_cache: FileCacheEngine, test_file: Path, input_digests: dict[str, str]
+    ) -> dict[str, str]:
+        """Gets the inputs the reports of a unit test that doesn't need to run are for.
 
         Args:
-            unit_test_info (UnitTestInfo): Information about the unit test being run.
-            coverage_settings (TOMLDocument): The coverage settings section from
-                pyproject.toml.
+            file_cache (FileCacheEngine): The file cache that holds up-to-date
+                information on which tests have passed and which haven't.
+            test_file (Path): The path to the test file.
+            input_digests (dict[str, str]): The current digests of the test's inputs.
 
         Returns:
-            Path: Path to the created config file.
+            dict[str, str]: The current inputs, unless only lines the test didn't run
+                have changed, in which case the inputs it last passed against.
         """
-        coverage_config_path = unit_test_info.coverage_config_path
-        coverage_config_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Build omit list for this specific test file
-        new_omit_list = self.build_omit_list(unit_test_info=unit_test_info)
-
-        # Combine the new omit list with existing configuration settings
-        coverage_config = deepcopy(coverage_settings)
-        if "run" not in coverage_config:
-            coverage_config["run"] = table()
-        run_table = cast(TOMLDocument, coverage_config["run"])
-        existing_omit = run_table.get("omit", [])
-        merged_omit = list(dict.fromkeys(list(existing_omit) + new_omit_list))
-        run_table["omit"] = merged_omit
-
-        # Write TOML file
-        config_doc = document()
-        config_doc["tool"] = {"coverage": coverage_config}
-        coverage_config_path.write_text(dumps(config_doc))
-        return coverage_config_path
-
-    @staticmethod
-    def get_module_from_path(src_file_path: Path, subproject: PythonSubproject) -> str:
-        """Gets the module name from a path.
+        previous_digests = file_cache.get_test_info_for_file(
+            file_path=test_file
+        ).input_digests
+        if previous_digests is not None and file_cache.inputs_changed(
+            file_path=test_file, input_digests=input_digests
+        ):
+            # Ruled out by the coverage map, so it last passed against other inputs
+            return previous_digests
+        return input_digests
 
-        Args:
-            src_file_path (Path): The path to the source file.
-            subproject (PythonSubproject): The subproject the source file is in.
+    def get_report_fragment_store(self) -> ReportFragmentStore:
+        """Gets the store of the saved reports of each unit test file.
 
         Returns:
-            str: The module name.
+            ReportFragmentStore: The store of this subproject's unit test reports.
         """
-        src_root = subproject.get_src_dir()
-        relative_path = src_file_path.relative_to(src_root)
-        relative_path_ext_stripped = relative_path.with_suffix("")
-        return ".".join(relative_path_ext_stripped.parts)
+        return ReportFragmentStore(
+            fragment_dir=self.subproject.get_unit_test_report_fragments_dir(),
+            project_root=self.docker_project_root,
+        )
 
-    def get_unit_tests_to_run(
-        self, file_cache: FileCacheEngine
+    def get_unit_tests(
+        self, file_cache: FileCacheEngine, report_fragments: ReportFragmentStore
     ) -> Iterator[UnitTestInfo]:
-        """Gets information required to run unit tests.
+        """Gets information required to run unit tests and report on them.
+
+        A test that doesn't need to run still runs if its reports weren't saved, since
+        they are needed to assemble the complete reports.
 
         Args:
             file_cache (FileCacheEngine): The file cache that holds up-to-date
                 information on which tests have passed and which haven't.
+            report_fragments (ReportFragmentStore): The saved reports of each test
+                file.
 
         Yields:
-            Iterator[UnitTestInfo]: Generator of unit test info for tests that need to
-                run.
+            Iterator[UnitTestInfo]: Generator of unit test info for every unit test.
         """
+        coverage_selector = self.get_coverage_test_selector(file_cache=file_cache)
         for src_file, test_file in self.subproject.get_src_unit_test_file_pairs():
-            if test_file.exists():
-                most_recent_conftest_update = file_cache.most_recent_conftest_update(
-                    test_dir=test_file.parent
-                )
-                src_file_updated = FileCacheEngine.get_last_modified_time(
-                    file_path=src_file
-                )
-                src_resource_dir = get_resource_dir(file_path=src_file)
-                most_recent_src_resource_update = (
-                    FileCacheEngine.get_most_recent_file_update_in_dir(
-                        directory=src_resource_dir
-                    )
-                )
-                test_file_updated = FileCacheEngine.get_last_modified_time(
-                    file_path=test_file
-                )
-                resource_dir = get_resource_dir(file_path=test_file)
-                most_recent_resource_update = (
-                    FileCacheEngine.get_most_recent_file_update_in_dir(
-                        directory=resource_dir
-                    )
-                )
-                test_file_info = file_cache.get_test_info_for_file(file_path=test_file)
-                if (
-                    test_file_info.tests_passed is None
-                    or test_file_info.tests_passed < src_file_updated
-                    or test_file_info.tests_passed < most_recent_src_resource_update
-                    or test_file_info.tests_passed < test_file_updated
-                    or test_file_info.tests_passed < most_recent_conftest_update
-                    or test_file_info.tests_passed < most_recent_resource_update
-                ):
-                    test_file_name = test_file.stem
-                    coverage_config_path = self.subproject.get_build_dir().joinpath(
-                        f"coverage_config_{test_file_name}.toml"
-                    )
-                    yield UnitTestInfo(
-                        src_file_path=src_file,
-                        test_file_path=test_file,
-                        coverage_config_path=coverage_config_path,
-                    )
-            else:
+            if not test_file.exists():
                 msg = f"Expected {test_file} to exist!"
                 raise ValueError(msg)
+            input_files = file_cache.get_unit_test_input_files(
+                src_file=src_file, test_file=test_file
+            )
+            input_digests = file_cache.get_input_digests(input_files=input_files)
+            unit_test_info = UnitTestInfo(
+                src_file_path=src_file,
+                test_file_path=test_file,
+                input_digests=input_digests,
+                report_digests=input_digests,
+                recently_modified=was_modified_recently(
+                    last_modified=file_cache.get_last_modified(input_files=input_files)
+                ),
+            )
+            if not self.unit_test_must_run(
+                file_cache=file_cache,
+                coverage_selector=coverage_selector,
+                test_file=test_file,
+                input_digests=input_digests,
+            ):
+                report_digests = self.get_report_digests(
+                    file_cache=file_cache,
+                    test_file=test_file,
+                    input_digests=input_digests,
+                )
+                if report_fragments.has_fragments(
+                    test_file=test_file, input_digests=report_digests
+                ):
+                    unit_test_info.report_digests = report_digests
+                    unit_test_info.must_run = False
+            yield unit_test_info
+
+    def check_unit_test_coverage(self, unit_tests: list[UnitTestInfo]) -> None:
+        """Checks that each unit test covers its source file on its own.
+
+        Coverage is read from the data of the whole test suite, using the contexts of
+        each test file's tests.
+
+        Args:
+            unit_tests (list[UnitTestInfo]): The unit tests to check.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If a test file doesn't cover its source file and itself.
+        """
+        coverage_failures = []
+        for unit_test_info in unit_tests:
+            fully_covered, report = check_test_file_coverage(
+                data_file=self.subproject.get_unit_test_coverage_data_file(),
+                config_file=get_pyproject_toml(project_root=self.docker_project_root),
+                project_root=self.docker_project_root,
+                test_file=unit_test_info.test_file_path,
+                covered_files=[
+                    unit_test_info.src_file_path,
+                    unit_test_info.test_file_path,
+                ],
+            )
+            if not fully_covered:
+                coverage_failures.append(
+                    f"{unit_test_info.test_file_path} does not fully cover "
+                    f"{unit_test_info.src_file_path}:\n{report}"
+                )
+        if coverage_failures:
+            msg = "\n".join(coverage_failures)
+            raise ValueError(msg)
+
+    def assemble_unit_test_reports(
+        self, report_fragments: ReportFragmentStore, unit_tests: list[UnitTestInfo]
+    ) -> None:
+        """Assembles the complete unit test reports after some unit tests ran.
+
+        The reports of the tests that ran are saved, then combined with the saved
+        reports of the rest.
+
+        Args:
+            report_fragments (ReportFragmentStore): The saved reports of each test
+                file.
+            unit_tests (list[UnitTestInfo]): Every unit test of the subproject.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the unit tests don't fully cover the subproject.
+        """
+        unit_test_suite = PythonSubproject.TestSuite.UNIT_TESTS
+        report_fragments.save_fragments(
+            data_file=self.subproject.get_unit_test_session_coverage_data_file(),
+            junit_report=self.subproject.get_pytest_report_path(
+                test_suite=unit_test_suite,
+                test_scope=PythonSubproject.TestScope.INCOMPLETE,
+            ),
+            test_inputs={
+                unit_test_info.test_file_path: unit_test_info.input_digests
+                for unit_test_info in unit_tests
+                if unit_test_info.must_run
+            },
+        )
+        data_file = self.subproject.get_unit_test_coverage_data_file()
+        config_file = get_pyproject_toml(project_root=self.docker_project_root)
+        report_fragments.assemble_reports(
+            test_inputs={
+                unit_test_info.test_file_path: unit_test_info.report_digests
+                for unit_test_info in unit_tests
+            },
+            data_file=data_file,
+            config_file=config_file,
+            junit_report=self.subproject.get_pytest_report_path(
+                test_suite=unit_test_suite,
+                test_scope=PythonSubproject.TestScope.COMPLETE,
+            ),
+        )
+        fully_covered, report = report_coverage(
+            data_file=data_file,
+            config_file=config_file,
+            xml_report=self.subproject.get_pytest_coverage_report_path(
+                test_suite=unit_test_suite
+            ),
+        )
+        if not fully_covered:
+            msg = (
+                "The unit tests do not fully cover "
+                f"{self.subproject.get_subproject_name()}:\n{report}"
+            )
+            raise ValueError(msg)
+
+    def record_unit_test_results(
+        self, file_cache: FileCacheEngine, test_files: list[Path]
+    ) -> None:
+        """Records how long the unit test files that just ran took, and which failed.
+
+        Args:
+            file_cache (FileCacheEngine): The file cache to save the results in.
+            test_files (list[Path]): The unit test files that ran.
+
+        Returns:
+            None
+        """
+        record_test_results(
+            file_cache=file_cache,
+            junit_report=self.subproject.get_pytest_report_path(
+                test_suite=PythonSubproject.TestSuite.UNIT_TESTS,
+                test_scope=PythonSubproject.TestScope.INCOMPLETE,
+            ),
+            test_files=test_files,
+            project_root=self.docker_project_root,
+        )
+
+    def record_coverage_map(self, file_cache: FileCacheEngine) -> None:
+        """Records the lines each unit test ran, from the whole test suite's data.
+
+        Only source files matching the checked out commit are mapped, so the lines
+        changed in them later can be found with ``git diff``.
+
+        Args:
+            file_cache (FileCacheEngine): The file cache to save the coverage map in.
+
+        Returns:
+            None
+        """
+        data_file = self.subproject.get_unit_test_coverage_data_file()
+        if not data_file.exists():
+            return
+        uncommitted_files = get_uncommitted_files(project_root=self.docker_project_root)
+        committed_src_files = [
+            src_file
+            for src_file in file_cache.get_files_in_dir(
+                directory=self.subproject.get_src_dir()
+            )
+            if src_file.suffix == ".py" and src_file not in uncommitted_files
+        ]
+        file_cache.save_coverage_map(
+            coverage_map=build_coverage_map(
+                data_file=data_file,
+                project_root=self.docker_project_root,
+                commit_sha=get_head_commit_sha(project_root=self.docker_project_root),
+                file_digests=file_cache.get_input_digests(
+                    input_files=committed_src_files
+                ),
+            )
+        )
 
     @override
     def required_tasks(self) -> list[TaskNode]:
@@ -573,6 +1101,15 @@ class SubprojectUnitTests(PerSubprojectTask):
         ]
         return required_tasks
 
+    @override
+    def resources(self) -> TaskResources:
+        """Declares that pytest can spread the unit tests across every CPU.
+
+        Returns:
+            TaskResources: The resources used by the unit tests.
+        """
+        return TaskResources(cpus=THREADS_AVAILABLE)
+
     @override
     def run(self) -> None:
         """Runs unit tests for the subproject.
@@ -584,67 +1121,85 @@ class SubprojectUnitTests(PerSubprojectTask):
             project_root=self.docker_project_root
         ):
             return
-        dev_docker_command = get_docker_command_for_image(
-            non_docker_project_root=self.non_docker_project_root,
-            docker_project_root=self.docker_project_root,
-            target_image=DockerTarget.DEV,
-        )
         file_cache = FileCacheEngine(
             subproject_context=self.subproject_context,
             project_root=self.docker_project_root,
         )
-        coverage_settings = self.get_coverage_settings()
-        src_files_tested = 0
-        for unit_test_info in self.get_unit_tests_to_run(file_cache=file_cache):
-            src_files_tested += 1
-            src_module = SubprojectUnitTests.get_module_from_path(
-                src_file_path=unit_test_info.src_file_path, subproject=self.subproject
-            )
-            test_file_parent = unit_test_info.test_file_path.parent
-            coverage_config_path = self.write_coverage_config_file(
-                unit_test_info=unit_test_info, coverage_settings=coverage_settings
+        report_fragments = self.get_report_fragment_store()
+        unit_tests = list(
+            self.get_unit_tests(
+                file_cache=file_cache, report_fragments=report_fragments
             )
-            run_process(
-                args=concatenate_args(
-                    args=[
-                        dev_docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        "--cov-report",
-                        "term-missing",
-                        f"--cov={src_module}",
-                        f"--cov={test_file_parent}",
-                        f"--cov-config={coverage_config_path}",
-                        unit_test_info.test_file_path,
-                    ]
-                )
+        )
+        unit_tests_to_run = [
+            unit_test_info for unit_test_info in unit_tests if unit_test_info.must_run
+        ]
+        if unit_tests_to_run:
+            test_durations = file_cache.get_test_durations()
+            # Likely failures are reported first, then the longest files start first
+            # so no worker is left running one at the end
+            test_files_to_run = order_test_files(
+                test_files=[
+                    unit_test_info.test_file_path
+                    for unit_test_info in unit_tests_to_run
+                ],
+                durations=test_durations,
+                failed_test_files=file_cache.get_failed_test_files(),
+                recently_modified_test_files={
+                    unit_test_info.test_file_path
+                    for unit_test_info in unit_tests_to_run
+                    if unit_test_info.recently_modified
+                },
             )
-            file_cache.update_test_pass_timestamp(
-                file_path=unit_test_info.test_file_path
+            # One session runs every stale test file, so containers, workers and
+            # collection start once.  Each test file's coverage is told apart by its
+            # context, and the rest of the reports come from earlier runs.
+            session_data_file = (
+                self.subproject.get_unit_test_session_coverage_data_file()
             )
-            file_cache.write_text()
-        if src_files_tested:
-            run_process(
-                args=concatenate_args(
-                    args=[
-                        dev_docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        self.subproject.get_pytest_whole_test_suite_report_args(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                        self.subproject.get_src_dir(),
-                        self.subproject.get_test_suite_dir(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                    ]
+            # A report left by an earlier run would hide that this run wrote none
+            self.subproject.get_pytest_report_path(
+                test_suite=PythonSubproject.TestSuite.UNIT_TESTS,
+                test_scope=PythonSubproject.TestScope.INCOMPLETE,
+            ).unlink(missing_ok=True)
+            try:
+                run_process(
+                    args=concatenate_args(
+                        args=[
+                            get_docker_command_for_image(
+                                non_docker_project_root=self.non_docker_project_root,
+                                docker_project_root=self.docker_project_root,
+                                target_image=DockerTarget.DEV,
+                                environment={"COVERAGE_FILE": str(session_data_file)},
+                            ),
+                            "pytest",
+                            get_pytest_distribution_args(
+                                test_files=test_files_to_run,
+                                durations=test_durations,
+                                cpu_budget=get_task_cpu_budget(),
+                            ),
+                            get_fail_fast_args(fail_fast=self.fail_fast),
+                            self.subproject.get_pytest_unit_test_session_args(),
+                            test_files_to_run,
+                        ]
+                    )
                 )
+            finally:
+                self.record_unit_test_results(
+                    file_cache=file_cache, test_files=test_files_to_run
+                )
+            self.assemble_unit_test_reports(
+                report_fragments=report_fragments, unit_tests=unit_tests
             )
-
-            # Conftest and file timestamps are already updated by get_unit_test_info()
-            file_cache.write_text()
+            self.check_unit_test_coverage(unit_tests=unit_tests_to_run)
+            for unit_test_info in unit_tests_to_run:
+                file_cache.record_test_passed(
+                    file_path=unit_test_info.test_file_path,
+                    input_digests=unit_test_info.input_digests,
+                )
+            self.record_coverage_map(file_cache=file_cache)
+        # Keep the digests of unchanged files so they aren't hashed again next time
+        file_cache.flush()
 
 
 class AllSubprojectFeatureTests(TaskNode):
@@ -677,6 +1232,15 @@ class AllSubprojectFeatureTests(TaskNode):
 FEATURE_TEST_FILE_NAME_REGEX = re.compile(r"test_.+_.+\.py")
 
 
+@dataclass
+class FeatureTestInfo:
+    """A dataclass for organizing feature test information."""
+
+    test_file_path: Path
+    input_digests: dict[str, str] = field(default_factory=dict)
+    recently_modified: bool = False
+
+
 class SubprojectFeatureTests(PerSubprojectTask):
     """Task for running feature tests in a single subproject."""
 
@@ -711,7 +1275,9 @@ class SubprojectFeatureTests(PerSubprojectTask):
             )
         return required_tasks
 
-    def get_feature_tests_to_run(self, file_cache: FileCacheEngine) -> Iterator[Path]:
+    def get_feature_tests_to_run(
+        self, file_cache: FileCacheEngine
+    ) -> Iterator[FeatureTestInfo]:
         """Gets information required to run feature tests.
 
         Args:
@@ -719,16 +1285,11 @@ class SubprojectFeatureTests(PerSubprojectTask):
                 information on which tests have passed and which haven't.
 
         Yields:
-            Iterator[Path]: Feature test file paths that need to run.
+            Iterator[FeatureTestInfo]: Feature test info for tests that need to run.
         """
         feature_test_dir = self.subproject.get_test_suite_dir(
             test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
         )
-        most_recent_conftest_update = file_cache.most_recent_conftest_update(
-            test_dir=feature_test_dir
-        )
-        most_recent_src_file_update = file_cache.most_recent_src_file_update()
-
         test_files = [
             file
             for file in feature_test_dir.glob("*")
@@ -736,27 +1297,112 @@ class SubprojectFeatureTests(PerSubprojectTask):
         ]
 
         for test_file in test_files:
-            resource_dir = get_resource_dir(file_path=test_file)
-            most_recent_resource_update = (
-                FileCacheEngine.get_most_recent_file_update_in_dir(
-                    directory=resource_dir
+            input_files = file_cache.get_feature_test_input_files(test_file=test_file)
+            input_digests = file_cache.get_input_digests(input_files=input_files)
+            if file_cache.inputs_changed(
+                file_path=test_file, input_digests=input_digests
+            ):
+                yield FeatureTestInfo(
+                    test_file_path=test_file,
+                    input_digests=input_digests,
+                    recently_modified=was_modified_recently(
+                        last_modified=file_cache.get_last_modified(
+                            input_files=input_files
+                        )
+                    ),
+                )
+
+    @override
+    def resources(self) -> TaskResources:
+        """Declares that feature test files can run on every CPU at the same time.
+
+        Returns:
+            TaskResources: The resources used by the feature tests.
+        """
+        return TaskResources(cpus=THREADS_AVAILABLE)
+
+    def run_feature_test(self, feature_test_info: FeatureTestInfo) -> ResourceUsage:
+        """Runs a single feature test file with its own scratch folder and report.
+
+        Args:
+            feature_test_info (FeatureTestInfo): The feature test file to run.
+
+        Returns:
+            ResourceUsage: The resources used by the feature test file's commands,
+                which run on a thread of their own.
+        """
+        test_file = feature_test_info.test_file_path
+        with track_resource_usage() as tracker:
+            run_process(
+                args=concatenate_args(
+                    args=[
+                        get_docker_command_for_image(
+                            non_docker_project_root=self.non_docker_project_root,
+                            docker_project_root=self.docker_project_root,
+                            target_image=DockerTarget.DEV,
+                        ),
+                        "pytest",
+                        "--basetemp",
+                        # Each feature test file gets its own basetemp so that feature
+                        # test files of every subproject can run at the same time.
+                        get_feature_test_scratch_folder(
+                            project_root=self.docker_project_root
+                        ).joinpath(
+                            self.subproject.get_subproject_name(), test_file.stem
+                        ),
+                        get_fail_fast_args(fail_fast=self.fail_fast),
+                        self.subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
+                        ),
+                        test_file,
+                    ]
                 )
             )
-            test_file_info = file_cache.get_test_info_for_file(file_path=test_file)
-            if (
-                test_file_info.tests_passed is None
-                or test_file_info.tests_passed < most_recent_conftest_update
-                or test_file_info.tests_passed < most_recent_src_file_update
-                or test_file_info.tests_passed < most_recent_resource_update
-            ):
-                yield test_file
+        return tracker.usage
+
+    def merge_feature_test_reports(self, feature_tests: list[FeatureTestInfo]) -> None:
+        """Adds the reports of feature test files to the incomplete feature test report.
+
+        Args:
+            feature_tests (list[FeatureTestInfo]): The feature test files that passed.
+
+        Returns:
+            None
+        """
+        if not feature_tests:
+            return
+        incomplete_xml_path = self.subproject.get_pytest_report_path(
+            test_suite=PythonSubproject.TestSuite.FEATURE_TESTS,
+            test_scope=PythonSubproject.TestScope.INCOMPLETE,
+        )
+        incomplete_xml_results = (
+            JUnitXml.fromfile(str(incomplete_xml_path))
+            if incomplete_xml_path.exists()
+            else JUnitXml()
+        )
+        for feature_test_info in feature_tests:
+            incomplete_xml_results += JUnitXml.fromfile(
+                str(
+                    self.subproject.get_feature_test_report_fragment(
+                        test_file=feature_test_info.test_file_path
+                    )
+                )
+            )
+        incomplete_xml_results.write(str(incomplete_xml_path))
 
     @override
     def run(self) -> None:
         """Runs feature tests for the subproject.
 
+        Stale feature test files run at the same time, and each one is recorded in the
+        file cache as soon as it passes.  If any fail, the first failure is raised once
+        every file has run, or once the running files finish when failing fast.
+
         Returns:
             None
+
+        Raises:
+            ProcessFailedError: If a feature test file fails.
         """
         if self.subproject_context not in get_subprojects_to_test(
             project_root=self.docker_project_root
@@ -768,11 +1414,6 @@ class SubprojectFeatureTests(PerSubprojectTask):
         ):
             # prevents recursive calls to feature testing
             return
-        dev_docker_command = get_docker_command_for_image(
-            non_docker_project_root=self.non_docker_project_root,
-            docker_project_root=self.docker_project_root,
-            target_image=DockerTarget.DEV,
-        )
 
         file_cache = FileCacheEngine(
             subproject_context=self.subproject_context,
@@ -788,35 +1429,85 @@ class SubprojectFeatureTests(PerSubprojectTask):
             test_scope=PythonSubproject.TestScope.INCOMPLETE,
         )
 
-        for feature_test_path in self.get_feature_tests_to_run(file_cache=file_cache):
-            run_process(
-                args=concatenate_args(
-                    args=[
-                        dev_docker_command,
-                        "pytest",
-                        "--basetemp",
-                        get_feature_test_scratch_folder(
-                            project_root=self.docker_project_root
+        feature_tests = list(self.get_feature_tests_to_run(file_cache=file_cache))
+        feature_tests_by_file = {
+            feature_test_info.test_file_path: feature_test_info
+            for feature_test_info in feature_tests
+        }
+        passed_test_files = set()
+        failed_test_files = set()
+        test_durations: dict[Path, timedelta] = {}
+        failures: list[ProcessFailedError] = []
+        with ThreadPoolExecutor(max_workers=get_task_cpu_budget()) as executor:
+            futures = {
+                # Each file runs in a copy of this task's context, so its commands
+                # keep the task's trace span and CPU budget
+                executor.submit(
+                    partial(
+                        copy_context().run,
+                        self.run_feature_test,
+                        feature_test_info=feature_tests_by_file[test_file],
+                    )
+                ): feature_tests_by_file[test_file]
+                # Likely failures start first, then the longest files
+                for test_file in order_test_files(
+                    test_files=feature_tests_by_file,
+                    durations=file_cache.get_test_durations(),
+                    failed_test_files=file_cache.get_failed_test_files(),
+                    recently_modified_test_files={
+                        feature_test_info.test_file_path
+                        for feature_test_info in feature_tests
+                        if feature_test_info.recently_modified
+                    },
+                )
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                feature_test_info = futures[future]
+                try:
+                    usage = future.result()
+                except ProcessFailedError as e:
+                    failures.append(e)
+                    failed_test_files.add(feature_test_info.test_file_path)
+                    if self.fail_fast:
+                        # Files that haven't started yet are skipped
+                        for pending_future in futures:
+                            pending_future.cancel()
+                    continue
+                record_resource_usage(usage=usage)
+                # Record that the feature test passed
+                file_cache.record_test_passed(
+                    file_path=feature_test_info.test_file_path,
+                    input_digests=feature_test_info.input_digests,
+                )
+                passed_test_files.add(feature_test_info.test_file_path)
+                test_durations.update(
+                    get_test_file_durations(
+                        junit_report=self.subproject.get_feature_test_report_fragment(
+                            test_file=feature_test_info.test_file_path
                         ),
-                        self.subproject.get_pytest_feature_test_report_args(),
-                        feature_test_path,
-                    ]
+                        test_files=[feature_test_info.test_file_path],
+                        project_root=self.docker_project_root,
+                    )
                 )
-            )
-            single_file_xml_path = self.subproject.get_pytest_report_path(
-                test_suite=PythonSubproject.TestSuite.FEATURE_TESTS,
-                test_scope=PythonSubproject.TestScope.SINGLE_FILE,
-            )
-            if incomplete_xml_path.exists():
-                incomplete_xml_results = JUnitXml.fromfile(str(incomplete_xml_path))
-                single_file_xml_results = JUnitXml.fromfile(str(single_file_xml_path))
-                incomplete_xml_results += single_file_xml_results
-                incomplete_xml_results.write()
-            else:
-                single_file_xml_path.rename(incomplete_xml_path)
-            # Record that the feature test passed
-            file_cache.update_test_pass_timestamp(file_path=feature_test_path)
-            file_cache.write_text()
+        file_cache.record_test_durations(durations=test_durations)
+        file_cache.record_test_failures(
+            ran_test_files=passed_test_files | failed_test_files,
+            failed_test_files=failed_test_files,
+        )
+        # Keep the digests of unchanged files so they aren't hashed again next time
+        file_cache.flush()
+        # One merge after every file has run, in a stable order
+        self.merge_feature_test_reports(
+            feature_tests=[
+                feature_test_info
+                for feature_test_info in feature_tests
+                if feature_test_info.test_file_path in passed_test_files
+            ]
+        )
+        if failures:
+            raise failures[0]
 
         if (
             incomplete_xml_path.exists() and not complete_xml_path.exists()
@@ -69,6 +69,50 @@ def get_build_docs_build_dir(project_root: Path) -> Path:
     )
 
 
+def get_task_cache_dir(project_root: Path) -> Path:
+    """Gets the directory that holds the cached outputs of tasks.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Path: Path to the task cache directory for this project.
+    """
+    return maybe_build_dir(
+        dir_to_build=get_build_dir(project_root=project_root).joinpath("task_cache")
+    )
+
+
+def get_task_queue_dir(project_root: Path) -> Path:
+    """Gets the directory that holds the queue of tasks handed out to workers.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Path: Path to the task queue directory for this project.
+    """
+    return maybe_build_dir(
+        dir_to_build=get_build_dir(project_root=project_root).joinpath("task_queue")
+    )
+
+
+def get_shared_test_results_dir(project_root: Path) -> Path:
+    """Gets the directory that holds the test results shared between machines.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Path: Path to the shared test results directory for this project.
+    """
+    return maybe_build_dir(
+        dir_to_build=get_build_dir(project_root=project_root).joinpath(
+            "shared_test_results"
+        )
+    )
+
+
 ########################################
 # Build files
 ########################################
@@ -108,3 +152,41 @@ def get_build_runtime_report_path(project_root: Path) -> Path:
         Path: Path to the file that will have the build runtime report.
     """
     return get_build_dir(project_root=project_root).joinpath("build_runtime.yaml")
+
+
+def get_build_trace_path(project_root: Path) -> Path:
+    """Gets the path to the Chrome trace of the most recent build.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Path: Path to the build trace, viewable in chrome://tracing or Perfetto.
+    """
+    return get_build_dir(project_root=project_root).joinpath("build_trace.json")
+
+
+def get_build_history_db_path(project_root: Path) -> Path:
+    """Gets the path to the database holding the performance history of all builds.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Path: Path to the SQLite build history database.
+    """
+    return get_build_dir(project_root=project_root).joinpath("build_history.sqlite")
+
+
+def get_task_duration_history_path(project_root: Path) -> Path:
+    """Gets the path to the file holding task durations from previous builds.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        Path: Path to the file that will have the task duration history.
+    """
+    return get_build_dir(project_root=project_root).joinpath(
+        "task_duration_history.yaml"
+    )
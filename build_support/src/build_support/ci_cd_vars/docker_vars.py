@@ -16,6 +16,7 @@ from build_support.ci_cd_vars.subproject_structure import (
     SubprojectContext,
     get_python_subproject,
 )
+from build_support.docker_session import get_session_container
 from build_support.process_runner import concatenate_args
 
 
@@ -247,10 +248,16 @@ def get_base_docker_command_for_image(
 
 
 def get_docker_command_for_image(
-    non_docker_project_root: Path, docker_project_root: Path, target_image: DockerTarget
+    non_docker_project_root: Path,
+    docker_project_root: Path,
+    target_image: DockerTarget,
+    environment: dict[str, str] | None = None,
 ) -> list[str]:
     """Builds a list of arguments for running commands in a docker container.
 
+    Inside a docker session the command is run with ``docker exec`` in the session's
+    container for the image, which was started with the same arguments.
+
     Args:
         non_docker_project_root (Path): Path to this project's root on the local
             machine.
@@ -259,23 +266,31 @@ def get_docker_command_for_image(
         target_image (DockerTarget): An enum specifying which type of docker image we
             are requesting a list of args that will allow us to run docker commands
             for.
+        environment (dict[str, str] | None): Extra environment variables to run the
+            command with.  Defaults to None.
 
     Returns:
         list[str]: A list of arguments that we can use to run a command in the specified
             docker container.
     """
-    return concatenate_args(
-        [
-            get_base_docker_command_for_image(
-                non_docker_project_root=non_docker_project_root,
-                docker_project_root=docker_project_root,
-                target_image=target_image,
-            ),
-            get_docker_image_name(
-                project_root=docker_project_root, target_image=target_image
-            ),
+    environment_args = concatenate_args(
+        args=[
+            ["-e", f"{variable}={value}"]
+            for variable, value in (environment or {}).items()
         ]
     )
+    run_args = get_base_docker_command_for_image(
+        non_docker_project_root=non_docker_project_root,
+        docker_project_root=docker_project_root,
+        target_image=target_image,
+    )
+    image_name = get_docker_image_name(
+        project_root=docker_project_root, target_image=target_image
+    )
+    container_name = get_session_container(image_name=image_name, run_args=run_args)
+    if container_name is None:
+        return concatenate_args(args=[run_args, environment_args, image_name])
+    return concatenate_args(args=["docker", "exec", environment_args, container_name])
 
 
 def get_interactive_docker_command_for_image(
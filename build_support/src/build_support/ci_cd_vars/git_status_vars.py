@@ -307,6 +307,55 @@ def get_modified_files(project_root: Path) -> set[Path]:
     return modified_files
 
 
+def get_head_commit_sha(project_root: Path) -> str:
+    """Gets the sha of the commit that is currently checked out.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        str: The hex sha of the HEAD commit.
+    """
+    return get_git_repo(project_root=project_root).head.commit.hexsha
+
+
+def get_uncommitted_files(project_root: Path) -> set[Path]:
+    """Gets the files whose content differs from the HEAD commit.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        set[Path]: The files with staged or unstaged changes, and untracked files.
+    """
+    repo = get_git_repo(project_root=project_root)
+    diff_index = repo.git.diff("HEAD", name_only=True)
+    return {
+        project_root.joinpath(file)
+        for file in [*diff_index.splitlines(), *repo.untracked_files]
+        if file
+    }
+
+
+def get_line_diff_since_commit(
+    project_root: Path, commit_sha: str, paths: Iterable[Path]
+) -> str:
+    """Gets the line level diff between a commit and the working tree.
+
+    Args:
+        project_root (Path): Path to this project's root.
+        commit_sha (str): The sha of the commit to diff against.
+        paths (Iterable[Path]): The files and directories to limit the diff to.
+
+    Returns:
+        str: The output of ``git diff --unified=0`` between the commit and the working
+            tree, so each hunk only holds the changed lines.
+    """
+    return get_git_repo(project_root=project_root).git.diff(
+        commit_sha, "--", *(str(path) for path in paths), unified=0
+    )
+
+
 def get_modified_subprojects(
     modified_files: Iterable[Path], project_root: Path
 ) -> list[SubprojectContext]:
@@ -1,9 +1,68 @@
 """Collection of all functions and variable that report machine properties.
 
 Attributes:
+    | CGROUP_V2_CPU_MAX_PATH: The cgroup v2 file holding this container's CPU quota.
+    | CGROUP_V1_CPU_QUOTA_PATH: The cgroup v1 file holding this container's CPU quota.
+    | CGROUP_V1_CPU_PERIOD_PATH: The cgroup v1 file holding the period of the quota.
     | THREADS_AVAILABLE: The number of threads available on this machine.
 """
 
-import multiprocessing
+import math
+import os
+from pathlib import Path
 
-THREADS_AVAILABLE = multiprocessing.cpu_count()
+CGROUP_V2_CPU_MAX_PATH = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_QUOTA_PATH = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_CPU_PERIOD_PATH = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _get_cpus_from_quota(quota: str, period: str) -> int | None:
+    if quota in ("max", "-1"):
+        return None
+    return max(1, math.ceil(int(quota) / int(period)))
+
+
+def get_cgroup_cpu_limit(
+    cpu_max_path: Path = CGROUP_V2_CPU_MAX_PATH,
+    cpu_quota_path: Path = CGROUP_V1_CPU_QUOTA_PATH,
+    cpu_period_path: Path = CGROUP_V1_CPU_PERIOD_PATH,
+) -> int | None:
+    """Gets the number of CPUs a container's cgroup quota allows it to use.
+
+    Args:
+        cpu_max_path (Path): Path to the cgroup v2 cpu.max file.
+        cpu_quota_path (Path): Path to the cgroup v1 cpu.cfs_quota_us file.
+        cpu_period_path (Path): Path to the cgroup v1 cpu.cfs_period_us file.
+
+    Returns:
+        int | None: The quota rounded up to a whole number of CPUs, or None if the
+            process isn't limited by a cgroup quota.
+    """
+    if cpu_max_path.exists():
+        quota, period = cpu_max_path.read_text().split()
+        return _get_cpus_from_quota(quota=quota, period=period)
+    if cpu_quota_path.exists() and cpu_period_path.exists():
+        return _get_cpus_from_quota(
+            quota=cpu_quota_path.read_text().strip(),
+            period=cpu_period_path.read_text().strip(),
+        )
+    return None
+
+
+def get_available_cpus() -> int:
+    """Gets the number of CPUs this process can actually use.
+
+    Unlike multiprocessing.cpu_count, this respects the CPUs the process is allowed
+    to be scheduled on and any CPU quota set on its container.
+
+    Returns:
+        int: The number of CPUs available to this process.
+    """
+    schedulable_cpus = os.process_cpu_count() or 1
+    cgroup_cpu_limit = get_cgroup_cpu_limit()
+    if cgroup_cpu_limit is None:
+        return schedulable_cpus
+    return min(schedulable_cpus, cgroup_cpu_limit)
+
+
+THREADS_AVAILABLE = get_available_cpus()
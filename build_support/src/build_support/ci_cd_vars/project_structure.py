@@ -144,6 +144,24 @@ def get_readme(project_root: Path) -> Path:
     return project_root.joinpath("README.md")
 
 
+def get_static_check_config_files(project_root: Path) -> list[Path]:
+    """Gets the files that set up the dev environment and pin the versions of its tools.
+
+    Every result of a static check or test depends on these files.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        list[Path]: The pyproject.toml, uv.lock and Dockerfile of the project.
+    """
+    return [
+        get_pyproject_toml(project_root=project_root),
+        get_uv_lock_file(project_root=project_root),
+        get_dockerfile(project_root=project_root),
+    ]
+
+
 def get_sphinx_conf_dir(project_root: Path) -> Path:
     """Gets the sphinx config file for this project.
 
@@ -60,7 +60,6 @@ class PythonSubproject:
 
         COMPLETE = "COMPLETE"
         INCOMPLETE = "INCOMPLETE"
-        SINGLE_FILE = "SINGLE_FILE"
 
     def get_subproject_name(self) -> str:
         """Gets the name of the subproject.
@@ -329,26 +328,44 @@ class PythonSubproject:
             f"--cov={self.get_test_suite_dir(test_suite=test_suite)}",
             f"--junitxml={report_path}",
         ]
-        if test_suite == self.TestSuite.UNIT_TESTS:
-            coverage_report = self.get_pytest_coverage_report_path(
-                test_suite=test_suite
-            )
-            report_args.extend(
-                (f"--cov={self.get_src_dir()}", f"--cov-report=xml:{coverage_report}")
-            )
         return concatenate_args(args=report_args)
 
-    def get_pytest_feature_test_report_args(self) -> list[str]:
-        """Get the args used by pytest when running features tests for this subproject.
+    def get_pytest_unit_test_session_args(self) -> list[str]:
+        """Get the args used by pytest when running unit test files of this subproject.
+
+        The complete unit test reports are assembled from the results of every test
+        file afterwards, so the session only records its own results and doesn't
+        check coverage.
 
         Returns:
             list[str]: A list of arguments that will be used with pytest when running
-                feature tests for this subproject.
+                unit tests for this subproject.
         """
+        unit_test_suite = PythonSubproject.TestSuite.UNIT_TESTS
         report_path = self.get_pytest_report_path(
-            test_suite=PythonSubproject.TestSuite.FEATURE_TESTS,
-            test_scope=PythonSubproject.TestScope.SINGLE_FILE,
+            test_suite=unit_test_suite, test_scope=PythonSubproject.TestScope.INCOMPLETE
         )
+        return [
+            f"--cov={self.get_src_dir()}",
+            f"--cov={self.get_test_suite_dir(test_suite=unit_test_suite)}",
+            # Record which test ran each line, to split the results by test file
+            "--cov-context=test",
+            "--cov-report=",
+            "--cov-fail-under=0",
+            f"--junitxml={report_path}",
+        ]
+
+    def get_pytest_feature_test_report_args(self, test_file: Path) -> list[str]:
+        """Get the args used by pytest when running a feature test file.
+
+        Args:
+            test_file (Path): The feature test file being run.
+
+        Returns:
+            list[str]: A list of arguments that will be used with pytest when running
+                the feature test file.
+        """
+        report_path = self.get_feature_test_report_fragment(test_file=test_file)
         return [f"--junitxml={report_path}"]
 
     def get_file_cache_yaml(self) -> Path:
@@ -359,6 +376,56 @@ class PythonSubproject:
         """
         return self.get_build_dir().joinpath("file_cache.yaml")
 
+    def get_file_cache_db(self) -> Path:
+        """Gets the database that holds this subproject's file cache information.
+
+        Returns:
+            Path: Path to this subproject's SQLite file cache database.
+        """
+        return self.get_build_dir().joinpath("file_cache.sqlite")
+
+    def get_unit_test_coverage_data_file(self) -> Path:
+        """Gets the coverage data file of the whole unit test suite.
+
+        Returns:
+            Path: Path to this subproject's unit test coverage data file.
+        """
+        return self.get_build_dir().joinpath("unit_test_coverage.sqlite")
+
+    def get_unit_test_session_coverage_data_file(self) -> Path:
+        """Gets the coverage data file written by a run of some unit test files.
+
+        Returns:
+            Path: Path to this subproject's unit test session coverage data file.
+        """
+        return self.get_build_dir().joinpath("unit_test_session_coverage.sqlite")
+
+    def get_unit_test_report_fragments_dir(self) -> Path:
+        """Gets the dir holding the saved reports of each unit test file.
+
+        Returns:
+            Path: Path to this subproject's unit test report fragments.
+        """
+        return self.get_build_dir().joinpath("unit_test_report_fragments")
+
+    def get_feature_test_report_fragment(self, test_file: Path) -> Path:
+        """Gets the junit report of a single feature test file.
+
+        Feature test files run at the same time, so each writes its own report and
+        the reports are merged once every file has run.
+
+        Args:
+            test_file (Path): The feature test file.
+
+        Returns:
+            Path: Path to the feature test file's junit report.
+        """
+        return (
+            self.get_build_dir()
+            .joinpath("feature_test_report_fragments")
+            .joinpath(f"{test_file.stem}.xml")
+        )
+
 
 def get_python_subproject(
     subproject_context: SubprojectContext, project_root: Path
@@ -0,0 +1,26 @@
+"""Types for parsing the command line arguments shared by the "main" modules."""
+
+from argparse import ArgumentTypeError
+
+
+def positive_int(value: str) -> int:
+    """Parses a CLI argument that must be a positive integer.
+
+    Args:
+        value (str): The raw value passed on the command line.
+
+    Returns:
+        int: The parsed integer.
+
+    Raises:
+        ArgumentTypeError: If the value is not an integer greater than zero.
+    """
+    try:
+        parsed_value = int(value)
+    except ValueError as e:
+        msg = f"{value!r} is not an integer."
+        raise ArgumentTypeError(msg) from e
+    if parsed_value < 1:
+        msg = f"{value!r} is not a positive integer."
+        raise ArgumentTypeError(msg)
+    return parsed_value
@@ -0,0 +1,347 @@
+"""Logic for selecting unit tests from the lines each test ran the last time.
+
+The whole unit test suite is run with coverage dynamic contexts, which record the test
+that was running when each line executed.  From that data a map is kept from each test
+file to the source lines its tests ran, along with the lines run while importing the
+source modules, outside any test, which every test importing a module depends on.
+
+The map is tied to the commit checked out when it was recorded.  Only source files
+that matched that commit at the time are mapped, so the lines changed in a mapped file
+since then are exactly the hunks of ``git diff`` between that commit and the working
+tree.  A test whose inputs changed only needs to run again if one of those hunks touches
+a line it ran.  Any other change, or a test missing from the map, falls back to the
+rules of the file cache and runs the test.
+
+The same data shows how much of a source file each test file covers on its own, so a
+single run of the unit tests replaces running each test file with its own coverage.
+
+Attributes:
+    | IMPORT_CONTEXT: The coverage context of lines run outside any test, e.g. while
+        importing modules.
+    | TEST_CONTEXT_SEPARATOR: Separates the test file from the test name in a context.
+    | DIFF_FILE_REGEX: A regex for the path of the committed file in a diff.
+    | HUNK_HEADER_REGEX: A regex for the committed lines a diff hunk replaces.
+"""
+
+import re
+from collections.abc import Iterable
+from io import StringIO
+from pathlib import Path
+from typing import cast
+
+from coverage import Coverage, CoverageData
+from coverage.results import should_fail_under
+from git import GitCommandError
+from pydantic import BaseModel
+
+from build_support.ci_cd_vars.git_status_vars import get_line_diff_since_commit
+
+IMPORT_CONTEXT = ""
+TEST_CONTEXT_SEPARATOR = "::"
+DIFF_FILE_REGEX = re.compile(r"^diff --git a/(.+) b/")
+HUNK_HEADER_REGEX = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+class CoverageMap(BaseModel):
+    """An object containing the lines each unit test ran when the map was recorded."""
+
+    commit_sha: str
+    file_digests: dict[str, str]
+    test_lines: dict[str, dict[str, set[int]]]
+    import_lines: dict[str, set[int]]
+
+    def get_lines_run(self, test_file: str, file_path: str) -> set[int]:
+        """Gets the lines of a file that a test depended on.
+
+        Args:
+            test_file (str): The test file.
+            file_path (str): The source file.
+
+        Returns:
+            set[int]: The lines of the source file run by the test or while importing
+                the source file.
+        """
+        return self.test_lines[test_file].get(file_path, set()) | self.import_lines.get(
+            file_path, set()
+        )
+
+
+def get_context_test_file(context: str, project_root: Path) -> str:
+    """Gets the test file a pytest-cov test context belongs to.
+
+    Args:
+        context (str): The context, e.g. ``tests/test_a.py::test_b|run``.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        str: The path to the test file.
+    """
+    test_id = context.partition(TEST_CONTEXT_SEPARATOR)[0]
+    return str(project_root.joinpath(test_id))
+
+
+def get_test_file_context(test_file: Path, project_root: Path) -> str:
+    """Gets the prefix of the coverage contexts of a test file's tests.
+
+    Args:
+        test_file (Path): The test file.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        str: The test file's path relative to the project root, followed by the test
+            context separator.
+    """
+    return f"{test_file.relative_to(project_root)}{TEST_CONTEXT_SEPARATOR}"
+
+
+def get_test_file_contexts_regex(test_file: Path, project_root: Path) -> str:
+    """Gets a regex for the coverage contexts that a test file's coverage is made of.
+
+    Those are the contexts of the test file's tests and the lines run outside any test,
+    e.g. while importing modules.
+
+    Args:
+        test_file (Path): The test file.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        str: A regex matching the coverage contexts of the test file.
+    """
+    test_file_context = get_test_file_context(
+        test_file=test_file, project_root=project_root
+    )
+    return f"^{re.escape(IMPORT_CONTEXT)}$|^{re.escape(test_file_context)}"
+
+
+def check_test_file_coverage(
+    data_file: Path,
+    config_file: Path,
+    project_root: Path,
+    test_file: Path,
+    covered_files: list[Path],
+) -> tuple[bool, str]:
+    """Checks that a test file covers files on its own, in a run with test contexts.
+
+    Args:
+        data_file (Path): The coverage data file written by the test run.
+        config_file (Path): The file holding the coverage settings.
+        project_root (Path): The directory pytest ran in.
+        test_file (Path): The test file.
+        covered_files (list[Path]): The files the test file must cover.
+
+    Returns:
+        tuple[bool, str]: If the test file's coverage meets the fail under setting, and
+            a coverage report with the lines it doesn't cover.
+    """
+    coverage = Coverage(data_file=str(data_file), config_file=str(config_file))
+    coverage.load()
+    report = StringIO()
+    percent_covered = coverage.report(
+        morfs=[str(covered_file) for covered_file in covered_files],
+        contexts=[
+            get_test_file_contexts_regex(test_file=test_file, project_root=project_root)
+        ],
+        show_missing=True,
+        file=report,
+    )
+    return _meets_fail_under(
+        coverage=coverage, percent_covered=percent_covered
+    ), report.getvalue()
+
+
+def report_coverage(
+    data_file: Path, config_file: Path, xml_report: Path
+) -> tuple[bool, str]:
+    """Writes the XML report of a test run's coverage and checks the total coverage.
+
+    Args:
+        data_file (Path): The coverage data file of the test run.
+        config_file (Path): The file holding the coverage settings.
+        xml_report (Path): The XML coverage report to write.
+
+    Returns:
+        tuple[bool, str]: If the total coverage meets the fail under setting, and a
+            coverage report with the lines that aren't covered.
+    """
+    coverage = Coverage(data_file=str(data_file), config_file=str(config_file))
+    coverage.load()
+    report = StringIO()
+    percent_covered = coverage.report(show_missing=True, file=report)
+    coverage.xml_report(outfile=str(xml_report))
+    return _meets_fail_under(
+        coverage=coverage, percent_covered=percent_covered
+    ), report.getvalue()
+
+
+def _meets_fail_under(coverage: Coverage, percent_covered: float) -> bool:
+    return not should_fail_under(
+        total=percent_covered,
+        fail_under=cast(float, coverage.get_option("report:fail_under")),
+        precision=cast(int, coverage.get_option("report:precision")),
+    )
+
+
+def build_coverage_map(
+    data_file: Path, project_root: Path, commit_sha: str, file_digests: dict[str, str]
+) -> CoverageMap:
+    """Builds a coverage map from the data of a test run with test contexts.
+
+    Args:
+        data_file (Path): The coverage data file written by the test run.
+        project_root (Path): The directory pytest ran in.
+        commit_sha (str): The commit checked out during the test run.
+        file_digests (dict[str, str]): The digests of the source files to map, which
+            must match their content at the commit.
+
+    Returns:
+        CoverageMap: The lines each test file ran in the mapped source files.
+    """
+    coverage_data = CoverageData(basename=str(data_file))
+    coverage_data.read()
+    context_test_files = {
+        context: get_context_test_file(context=context, project_root=project_root)
+        for context in coverage_data.measured_contexts()
+        if context != IMPORT_CONTEXT
+    }
+    test_lines: dict[str, dict[str, set[int]]] = {
+        test_file: {} for test_file in context_test_files.values()
+    }
+    import_lines: dict[str, set[int]] = {}
+    for file_path in coverage_data.measured_files():
+        if file_path not in file_digests:
+            continue
+        contexts_by_line = coverage_data.contexts_by_lineno(file_path)
+        for line_number, contexts in contexts_by_line.items():
+            for context in contexts:
+                if context == IMPORT_CONTEXT:
+                    lines = import_lines.setdefault(file_path, set())
+                else:
+                    lines = test_lines[context_test_files[context]].setdefault(
+                        file_path, set()
+                    )
+                lines.add(line_number)
+    return CoverageMap(
+        commit_sha=commit_sha,
+        file_digests=file_digests,
+        test_lines=test_lines,
+        import_lines=import_lines,
+    )
+
+
+def parse_changed_lines(diff: str, project_root: Path) -> dict[str, set[int]]:
+    """Finds the committed lines changed by a diff with no context lines.
+
+    A hunk that only adds lines is treated as changing the lines on either side of
+    the insertion, since code added there runs whenever its neighbours do.
+
+    Args:
+        diff (str): The output of ``git diff --unified=0``.
+        project_root (Path): The root of the git repo the diff was made in.
+
+    Returns:
+        dict[str, set[int]]: The changed line numbers, in the committed version of each
+            file, keyed by file path.
+    """
+    changed_lines: dict[str, set[int]] = {}
+    lines: set[int] = set()
+    for diff_line in diff.splitlines():
+        file_match = DIFF_FILE_REGEX.match(diff_line)
+        if file_match:
+            lines = changed_lines.setdefault(
+                str(project_root.joinpath(file_match[1])), set()
+            )
+            continue
+        hunk_match = HUNK_HEADER_REGEX.match(diff_line)
+        if hunk_match:
+            start = int(hunk_match[1])
+            count = 1 if hunk_match[2] is None else int(hunk_match[2])
+            if count:
+                lines.update(range(start, start + count))
+            else:
+                lines.update((start, start + 1))
+    return changed_lines
+
+
+class CoverageTestSelector:
+    """A class for deciding if changes to a test's inputs reach lines it ran."""
+
+    coverage_map: CoverageMap
+    project_root: Path
+    paths: list[Path]
+    changed_lines: dict[str, set[int]] | None
+
+    def __init__(
+        self, coverage_map: CoverageMap, project_root: Path, paths: Iterable[Path]
+    ) -> None:
+        """Init method for CoverageTestSelector.
+
+        Args:
+            coverage_map (CoverageMap): The lines each test ran when last recorded.
+            project_root (Path): Path to this project's root.
+            paths (Iterable[Path]): The directories holding the mapped source files.
+
+        Returns:
+            None
+        """
+        self.coverage_map = coverage_map
+        self.project_root = project_root
+        self.paths = list(paths)
+        self.changed_lines = None
+
+    def get_changed_lines(self) -> dict[str, set[int]] | None:
+        """Gets the lines changed since the map was recorded, running git only once.
+
+        Returns:
+            dict[str, set[int]] | None: The changed lines keyed by file path, or None if
+                git can't diff against the commit the map was recorded at.
+        """
+        if self.changed_lines is None:
+            try:
+                diff = get_line_diff_since_commit(
+                    project_root=self.project_root,
+                    commit_sha=self.coverage_map.commit_sha,
+                    paths=self.paths,
+                )
+            except GitCommandError:
+                return None
+            self.changed_lines = parse_changed_lines(
+                diff=diff, project_root=self.project_root
+            )
+        return self.changed_lines
+
+    def test_must_run(
+        self,
+        test_file: Path,
+        previous_digests: dict[str, str],
+        input_digests: dict[str, str],
+    ) -> bool:
+        """Decides if a test whose inputs changed must run again.
+
+        Args:
+            test_file (Path): The test file.
+            previous_digests (dict[str, str]): The digests of the test's inputs when it
+                last passed.
+            input_digests (dict[str, str]): The current digests of the test's inputs.
+
+        Returns:
+            bool: False only if every changed input is a mapped source file, unchanged
+                from the commit when the test last passed, whose changed lines the test
+                did not run.
+        """
+        test_key = str(test_file)
+        if test_key not in self.coverage_map.test_lines:
+            return True
+        for file_path in previous_digests.keys() | input_digests.keys():
+            previous_digest = previous_digests.get(file_path)
+            if previous_digest == input_digests.get(file_path):
+                continue
+            if self.coverage_map.file_digests.get(file_path) != previous_digest:
+                return True
+            changed_lines = self.get_changed_lines()
+            if changed_lines is None or not changed_lines.get(
+                file_path, set()
+            ).isdisjoint(
+                self.coverage_map.get_lines_run(test_file=test_key, file_path=file_path)
+            ):
+                return True
+        return False
@@ -1,18 +1,60 @@
 """Logic for building a DAG of tasks and running them in order.
 
+Tasks are run on a bounded pool of worker threads.  A task is started as soon as all
+of its required tasks have finished, so independent branches of the DAG run
+concurrently when more than one job is allowed.  When more tasks are ready than there
+are free workers, the tasks on the longest remaining critical path (estimated from the
+durations of previous builds) are started first.  Each running task is given a CPU
+budget from a pool shared by every running task, so concurrent tasks don't
+oversubscribe the CPUs available to the build.  Tasks that declare a cache spec are
+skipped, and their outputs restored, when their inputs have not changed since they last
+succeeded.
+
+A build can also be distributed by passing a task queue.  Ready tasks are then
+submitted to the queue and run by worker processes on the same host, and the scheduler
+only waits for their results.
+
+The runtime report records the CPU time, peak memory, and block I/O used by the
+commands each task ran, and by every subprocess the build reaped.
+
+When a task fails the build stops starting new tasks, unless it is run in keep-going
+mode.  In keep-going mode only the tasks that depend on a failed task are skipped, and
+every other branch of the DAG is run to completion.  Either way the runtime report
+records whether each task passed, failed, or was skipped, and a BuildFailedError is
+raised once the tasks that were already running have finished.
+
 Attributes:
     | logger: Module-level logger for task execution and report output.
 """
 
 import logging
+import resource
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import UTC, datetime, timedelta
+from enum import StrEnum
 from pathlib import Path
 
 from pydantic import BaseModel
 from yaml import safe_dump, safe_load
 
+from build_support.build_history import record_build
+from build_support.build_planning import TaskDurationHistory, get_build_plan
+from build_support.build_tracing import BuildTrace, trace_build, trace_span
 from build_support.ci_cd_tasks.task_node import TaskNode
-from build_support.ci_cd_vars.build_paths import get_build_runtime_report_path
+from build_support.ci_cd_vars.build_paths import (
+    get_build_runtime_report_path,
+    get_build_trace_path,
+    get_task_duration_history_path,
+)
+from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
+from build_support.resource_accounting import ResourceUsage, track_resource_usage
+from build_support.resource_budget import ResourcePool, task_cpu_budget
+from build_support.task_caching import (
+    get_task_fingerprint,
+    restore_task_outputs,
+    store_task_outputs,
+)
+from build_support.task_queue import RemoteTaskError, TaskQueue
 
 logger = logging.getLogger(__name__)
 
@@ -51,17 +93,29 @@ def get_task_execution_order(requested_tasks: list[TaskNode]) -> list[TaskNode]:
     return execution_order
 
 
+class TaskStatus(StrEnum):
+    """The outcome of a task in a build."""
+
+    PASSED = "passed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
 class TaskRunReport(BaseModel):
     """An object containing a report of how long a single task took to run."""
 
     task_name: str
     duration: timedelta
+    status: TaskStatus = TaskStatus.PASSED
+    resource_usage: ResourceUsage = ResourceUsage()
+    restored_from_cache: bool = False
 
 
 class BuildRunReport(BaseModel):
     """An object containing a report of how long the build took to run."""
 
     report: list[TaskRunReport] = []
+    resource_usage: ResourceUsage = ResourceUsage()
 
     @staticmethod
     def from_yaml(yaml_str: str) -> "BuildRunReport":
@@ -84,30 +138,307 @@ class BuildRunReport(BaseModel):
         return safe_dump(self.model_dump(mode="json"))
 
 
-def run_tasks(tasks: list[TaskNode], project_root: Path) -> None:
+class BuildFailedError(Exception):
+    """Raised after a build in which at least one task failed."""
+
+    def __init__(self, failed_tasks: list[str], skipped_tasks: list[str]) -> None:
+        """Initializes the error with the tasks that didn't pass.
+
+        Args:
+            failed_tasks (list[str]): The labels of the tasks that failed.
+            skipped_tasks (list[str]): The labels of the tasks that were not run
+                because of a failure.
+
+        Returns:
+            None
+        """
+        super().__init__(
+            f"Failed tasks: {', '.join(failed_tasks)}\n"
+            f"Skipped tasks: {', '.join(skipped_tasks) or 'none'}"
+        )
+        self.failed_tasks = failed_tasks
+        self.skipped_tasks = skipped_tasks
+
+
+def run_task(
+    task: TaskNode, project_root: Path, cpu_budget: int
+) -> tuple[timedelta, ResourceUsage, bool]:
+    """Runs a single task, restoring its outputs from the task cache if possible.
+
+    Args:
+        task (TaskNode): The task to run.
+        project_root (Path): Path to this project's root.
+        cpu_budget (int): The number of CPUs the task may use.
+
+    Returns:
+        tuple[timedelta, ResourceUsage, bool]: How long the task took, the resources
+            used by the commands it ran, and whether its outputs were restored from
+            the task cache instead of running it.
+    """
+    start = datetime.now(tz=UTC)
+    with (
+        trace_span(name=task.task_label(), category="task") as span_args,
+        task_cpu_budget(cpus=cpu_budget),
+        track_resource_usage() as usage_tracker,
+    ):
+        fingerprint = get_task_fingerprint(task=task, project_root=project_root)
+        restored_from_cache = fingerprint is not None and restore_task_outputs(
+            task=task, fingerprint=fingerprint, project_root=project_root
+        )
+        span_args["restored_from_cache"] = restored_from_cache
+        if restored_from_cache:
+            logger.info("Restored from cache: %s", task.task_label())
+        else:
+            logger.info("Starting: %s", task.task_label())
+            task.run()
+            if fingerprint is not None:
+                store_task_outputs(
+                    task=task, fingerprint=fingerprint, project_root=project_root
+                )
+    return datetime.now(tz=UTC) - start, usage_tracker.usage, restored_from_cache
+
+
+def _run_queued_task(
+    task_queue: TaskQueue, task: TaskNode
+) -> tuple[timedelta, ResourceUsage, bool]:
+    with trace_span(name=task.task_label(), category="task") as span_args:
+        task_result = task_queue.run_task(task=task)
+        span_args["worker"] = task_result.worker
+        span_args["restored_from_cache"] = task_result.restored_from_cache
+    if not task_result.succeeded:
+        raise RemoteTaskError(task_result=task_result)
+    return (
+        task_result.duration,
+        task_result.resource_usage,
+        task_result.restored_from_cache,
+    )
+
+
+def load_task_duration_history(project_root: Path) -> TaskDurationHistory:
+    """Loads the durations of tasks from previous builds.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        TaskDurationHistory: The task duration history, empty if no build has
+            recorded one yet.
+    """
+    history_path = get_task_duration_history_path(project_root=project_root)
+    if history_path.exists():
+        return TaskDurationHistory.from_yaml(history_path.read_text())
+    return TaskDurationHistory()
+
+
+def _skip_blocked_tasks(
+    pending_tasks: list[TaskNode],
+    task_requirements: dict[TaskNode, set[TaskNode]],
+    task_statuses: dict[TaskNode, TaskStatus],
+    *,
+    skip_all: bool,
+) -> None:
+    # Pending tasks are in execution order, so a task is always checked after any task
+    # it requires that was skipped in this pass.
+    for task in list(pending_tasks):
+        if skip_all or any(
+            task_statuses.get(required_task) in (TaskStatus.FAILED, TaskStatus.SKIPPED)
+            for required_task in task_requirements[task]
+        ):
+            pending_tasks.remove(task)
+            task_statuses[task] = TaskStatus.SKIPPED
+            logger.warning("Skipped: %s", task.task_label())
+
+
+def _write_build_reports(
+    project_root: Path,
+    run_report: BuildRunReport,
+    build_trace: BuildTrace,
+    duration_history: TaskDurationHistory,
+) -> None:
+    report_content = run_report.to_yaml()
+    logger.info("%s", report_content)
+    get_build_runtime_report_path(project_root=project_root).write_text(report_content)
+    get_build_trace_path(project_root=project_root).write_text(
+        build_trace.to_chrome_trace()
+    )
+    record_build(
+        project_root=project_root,
+        build_trace=build_trace,
+        task_statuses={
+            task_report.task_name: task_report.status
+            for task_report in run_report.report
+        },
+    )
+    duration_history.record_durations(
+        durations={
+            task_report.task_name: task_report.duration
+            for task_report in run_report.report
+            # A restored task's duration says nothing about how long running it takes
+            if task_report.status == TaskStatus.PASSED
+            and not task_report.restored_from_cache
+        }
+    )
+    get_task_duration_history_path(project_root=project_root).write_text(
+        duration_history.to_yaml()
+    )
+
+
+def run_tasks(
+    tasks: list[TaskNode],
+    project_root: Path,
+    jobs: int = 1,
+    *,
+    keep_going: bool = False,
+    task_queue: TaskQueue | None = None,
+) -> None:
     """Builds the DAG required for a task and runs the DAG.
 
+    Ready tasks are started in priority order, with at most ``jobs`` tasks running at
+    the same time.  A ready task waits while the CPUs or memory it declared are in use
+    by other tasks, letting lower priority tasks that fit start in the meantime.
+    Priority is the longest estimated path from a task to the end of the build, with
+    ties broken by the order returned by ``get_task_execution_order``.
+    The predicted makespan and critical path are logged before any task is started.
+    The runtime report always lists tasks in execution order, regardless of the order
+    they finished in, and the durations of tasks that ran, rather than being restored
+    from the task cache, are recorded for future builds.  A Chrome trace with a span
+    for every task and every command it ran is written next to the runtime report, and
+    the build is appended to the build history.
+
+    If a task fails no new tasks are started, unless ``keep_going`` is set, in which
+    case only the tasks that depend on a failed task are skipped.  Tasks that are
+    already running are allowed to finish, and the reports are still written.
+
+    If ``task_queue`` is set, tasks are run by the workers serving the queue instead
+    of by this process.  Each worker runs one task at a time with every CPU on its
+    host, so only ``jobs`` limits how many tasks run at once.
+
     Args:
         tasks (list[TaskNode]): Tasks that will be executed, along with prerequisite
             tasks.
         project_root (Path): Path to this project's root.
+        jobs (int): The maximum number of tasks to run concurrently.
+        keep_going (bool): If True, keep running every task that doesn't depend on a
+            failed task.
+        task_queue (TaskQueue | None): The queue to hand tasks to workers through, or
+            None to run every task in this process.
 
     Returns:
         None
+
+    Raises:
+        BuildFailedError: If any task failed, raised from the first task's exception.
     """
-    run_report = BuildRunReport()
     task_execution_order = get_task_execution_order(requested_tasks=tasks)
     logger.info("Will execute the following tasks:")
     for task in task_execution_order:
         logger.info("  - %s", task.task_label())
-    for task in task_execution_order:
-        logger.info("Starting: %s", task.task_label())
-        start = datetime.now(tz=UTC)
-        task.run()
-        duration = datetime.now(tz=UTC) - start
-        run_report.report.append(
-            TaskRunReport(task_name=task.task_label(), duration=duration)
-        )
-    report_content = run_report.to_yaml()
-    logger.info("%s", report_content)
-    get_build_runtime_report_path(project_root=project_root).write_text(report_content)
+    task_requirements = {
+        task: set(task.required_tasks()) for task in task_execution_order
+    }
+    duration_history = load_task_duration_history(project_root=project_root)
+    build_plan = get_build_plan(
+        task_execution_order=task_execution_order,
+        task_requirements=task_requirements,
+        duration_history=duration_history,
+        jobs=jobs,
+    )
+    logger.info("%s", build_plan.describe())
+    pending_tasks = list(task_execution_order)
+    passed_tasks: set[TaskNode] = set()
+    running_tasks: dict[Future[tuple[timedelta, ResourceUsage, bool]], TaskNode] = {}
+    cpu_budgets: dict[TaskNode, int] = {}
+    resource_pool = ResourcePool(
+        cpus=THREADS_AVAILABLE if task_queue is None else jobs * THREADS_AVAILABLE
+    )
+    task_durations: dict[TaskNode, timedelta] = {}
+    task_resource_usage: dict[TaskNode, ResourceUsage] = {}
+    restored_tasks: set[TaskNode] = set()
+    task_statuses: dict[TaskNode, TaskStatus] = {}
+    task_errors: list[BaseException] = []
+    rusage_before_build = resource.getrusage(resource.RUSAGE_CHILDREN)
+    with trace_build() as build_trace, ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending_tasks or running_tasks:
+            ready_tasks = build_plan.prioritize(
+                tasks=[
+                    task
+                    for task in pending_tasks
+                    if task_requirements[task].issubset(passed_tasks)
+                ]
+            )
+            for task in ready_tasks:
+                if len(running_tasks) >= jobs:
+                    break
+                cpu_budget = resource_pool.acquire(resources=task.resources())
+                if cpu_budget is None:
+                    continue
+                pending_tasks.remove(task)
+                cpu_budgets[task] = cpu_budget
+                running_tasks[
+                    executor.submit(run_task, task, project_root, cpu_budget)
+                    if task_queue is None
+                    else executor.submit(_run_queued_task, task_queue, task)
+                ] = task
+            finished_futures, _ = wait(running_tasks, return_when=FIRST_COMPLETED)
+            for future in finished_futures:
+                task = running_tasks.pop(future)
+                resource_pool.release(
+                    resources=task.resources(), cpu_budget=cpu_budgets[task]
+                )
+                task_error = future.exception()
+                if task_error is None:
+                    task_durations[task], task_resource_usage[task], restored = (
+                        future.result()
+                    )
+                    if restored:
+                        restored_tasks.add(task)
+                    task_statuses[task] = TaskStatus.PASSED
+                    passed_tasks.add(task)
+                else:
+                    logger.error("Failed: %s", task.task_label())
+                    task_statuses[task] = TaskStatus.FAILED
+                    task_errors.append(task_error)
+            _skip_blocked_tasks(
+                pending_tasks=pending_tasks,
+                task_requirements=task_requirements,
+                task_statuses=task_statuses,
+                skip_all=bool(task_errors) and not keep_going,
+            )
+    run_report = BuildRunReport(
+        report=[
+            TaskRunReport(
+                task_name=task.task_label(),
+                duration=task_durations.get(task, timedelta(0)),
+                status=task_statuses[task],
+                resource_usage=task_resource_usage.get(task, ResourceUsage()),
+                restored_from_cache=task in restored_tasks,
+            )
+            for task in task_execution_order
+        ],
+        resource_usage=ResourceUsage.from_rusage_delta(
+            before=rusage_before_build,
+            after=resource.getrusage(resource.RUSAGE_CHILDREN),
+            processes_spawned=sum(
+                usage.processes_spawned for usage in task_resource_usage.values()
+            ),
+        ),
+    )
+    _write_build_reports(
+        project_root=project_root,
+        run_report=run_report,
+        build_trace=build_trace,
+        duration_history=duration_history,
+    )
+    if task_errors:
+        raise BuildFailedError(
+            failed_tasks=[
+                task_report.task_name
+                for task_report in run_report.report
+                if task_report.status == TaskStatus.FAILED
+            ],
+            skipped_tasks=[
+                task_report.task_name
+                for task_report in run_report.report
+                if task_report.status == TaskStatus.SKIPPED
+            ],
+        ) from task_errors[0]
@@ -0,0 +1,223 @@
+"""Logic for running a build's commands in one long-lived container per image.
+
+Starting a container for every command adds the container's start up to every command,
+and a single build runs dozens of them.  Inside ``docker_session`` every command sent
+to an image runs with ``docker exec`` in one container for that image, which is started
+just before the first of those commands runs.  Building a command doesn't start
+anything, and an image built during the build is used by its commands.
+
+The container is started with the same ``docker run`` arguments the commands would have
+used, so they run with the same environment variables, working directory and mounts.
+Every container started in the session is removed when it ends, whether the build
+passed, failed, was interrupted or was terminated.  As a backstop for builds that are
+killed outright, containers run an init process that only lives for the longest a build
+may take, and are labelled with the project so the next build removes any left over.
+
+Attributes:
+    | MAX_BUILD_TIME: The longest a build may take, after which its containers stop.
+    | KEEP_ALIVE_COMMAND: The command a session's containers run until they are removed.
+    | SESSION_LABEL: The label of every container started by a session, set to the
+        project root on the local machine.
+"""
+
+import signal
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from types import FrameType
+from uuid import uuid4
+
+from build_support.process_runner import (
+    concatenate_args,
+    get_output_of_process,
+    preparing_commands,
+    run_process,
+)
+
+MAX_BUILD_TIME = timedelta(hours=6)
+KEEP_ALIVE_COMMAND = ["sleep", str(int(MAX_BUILD_TIME.total_seconds()))]
+SESSION_LABEL = "build_support.docker_session"
+
+
+class DockerSession:
+    """A class tracking the containers started for the images used during a build."""
+
+    project_root: Path
+    container_names: dict[str, str]
+    container_run_args: dict[str, list[str]]
+    started_containers: list[str]
+
+    def __init__(self, project_root: Path) -> None:
+        """Init method for DockerSession.
+
+        Args:
+            project_root (Path): Path to this project's root on the local machine, used
+                to label the containers of its builds.
+
+        Returns:
+            None
+        """
+        self.project_root = project_root
+        self.container_names = {}
+        self.container_run_args = {}
+        self.started_containers = []
+        # Reentrant, so that a signal handler can remove the containers while the
+        # thread it interrupted is starting one
+        self._lock = threading.RLock()
+
+    def get_container(self, image_name: str, run_args: list[str]) -> str:
+        """Gets the name of the container running an image, without starting it.
+
+        Args:
+            image_name (str): The image to run.
+            run_args (list[str]): The ``docker run`` arguments, without the image name,
+                that commands sent to the image would have been run with.
+
+        Returns:
+            str: The name of the container running the image.
+        """
+        with self._lock:
+            if image_name not in self.container_names:
+                container_name = f"{image_name.replace(':', '_')}_{uuid4().hex}"
+                self.container_names[image_name] = container_name
+                self.container_run_args[container_name] = concatenate_args(
+                    args=[
+                        run_args,
+                        "--init",
+                        "--label",
+                        f"{SESSION_LABEL}={self.project_root}",
+                        "--detach",
+                        "--name",
+                        container_name,
+                        image_name,
+                        KEEP_ALIVE_COMMAND,
+                    ]
+                )
+            return self.container_names[image_name]
+
+    def start_container_for_command(self, args: list[str]) -> None:
+        """Starts the session's container that a command is about to run in.
+
+        Args:
+            args (list[str]): The arguments of the command.
+
+        Returns:
+            None
+        """
+        if args[:2] != ["docker", "exec"]:
+            return
+        with self._lock:
+            for container_name, run_args in self.container_run_args.items():
+                if container_name in args and (
+                    container_name not in self.started_containers
+                ):
+                    run_process(args=run_args)
+                    self.started_containers.append(container_name)
+
+    def remove_containers(self) -> None:
+        """Removes every container started in this session.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            container_names = list(self.started_containers)
+            self.started_containers.clear()
+            self.container_names.clear()
+            self.container_run_args.clear()
+        if container_names:
+            # The containers were started with --rm, so the daemon removes them once
+            # they are killed.
+            run_process(args=concatenate_args(args=["docker", "kill", container_names]))
+
+    def remove_leftover_containers(self) -> None:
+        """Removes the containers left running by earlier builds of this project.
+
+        Returns:
+            None
+        """
+        leftover_containers = get_output_of_process(
+            args=[
+                "docker",
+                "ps",
+                "--quiet",
+                "--filter",
+                f"label={SESSION_LABEL}={self.project_root}",
+            ]
+        ).split()
+        if leftover_containers:
+            run_process(
+                args=concatenate_args(args=["docker", "kill", leftover_containers])
+            )
+
+
+_active_docker_session: DockerSession | None = None
+
+
+@contextmanager
+def _removing_containers_on_signal(session: DockerSession) -> Iterator[None]:
+    signals = (signal.SIGINT, signal.SIGTERM)
+    previous_handlers = {signum: signal.getsignal(signum) for signum in signals}
+
+    def remove_containers_and_resignal(signum: int, _: FrameType | None) -> None:
+        session.remove_containers()
+        # Let the signal do what it did before the session, such as ending the build
+        signal.signal(signum, previous_handlers[signum])
+        signal.raise_signal(signum)
+
+    for signum in signals:
+        signal.signal(signum, remove_containers_and_resignal)
+    try:
+        yield
+    finally:
+        for signum, previous_handler in previous_handlers.items():
+            signal.signal(signum, previous_handler)
+
+
+@contextmanager
+def docker_session(project_root: Path) -> Iterator[DockerSession]:
+    """Runs the commands sent to each image inside this context in one container.
+
+    Must be entered from the main thread, which handles signals.
+
+    Args:
+        project_root (Path): Path to this project's root on the local machine.
+
+    Yields:
+        DockerSession: The session tracking the containers started.
+    """
+    global _active_docker_session  # noqa: PLW0603
+    session = DockerSession(project_root=project_root)
+    session.remove_leftover_containers()
+    _active_docker_session = session
+    try:
+        with (
+            _removing_containers_on_signal(session=session),
+            preparing_commands(prepare=session.start_container_for_command),
+        ):
+            yield session
+    finally:
+        _active_docker_session = None
+        session.remove_containers()
+
+
+def get_session_container(image_name: str, run_args: list[str]) -> str | None:
+    """Gets the container running an image in the active session.
+
+    The container is started just before the first command sent to it runs.
+
+    Args:
+        image_name (str): The image to run.
+        run_args (list[str]): The ``docker run`` arguments, without the image name,
+            that commands sent to the image would have been run with.
+
+    Returns:
+        str | None: The name of the container running the image, or None if no session
+            is active.
+    """
+    session = _active_docker_session
+    if session is None:
+        return None
+    return session.get_container(image_name=image_name, run_args=run_args)
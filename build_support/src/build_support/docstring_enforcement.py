@@ -0,0 +1,732 @@
+"""Logic for checking that docstrings document what they should, without importing.
+
+Docstrings are read from each module's syntax tree with ``ast``, so checking them
+doesn't run the module or anything it imports, and every module can be checked on its
+own.  Modules are checked in a process pool, and the file cache keeps the issues found
+in each module under the digest of its content, so only changed modules are checked
+again.  See file_caching.
+
+Docstrings follow the Google style, with a few sections added by this project:
+
+- A package lists its public sub-packages under ``SubPackages`` and its public modules
+  under ``Modules``, each as ``| name: description``.
+- A module lists its public attributes under ``Attributes`` the same way.
+- A public function or method lists its arguments under ``Args``, each as
+  ``name (type): description``, and has a ``Returns`` or ``Yields`` section with a
+  single ``type: description``, or ``None``.
+
+Attributes:
+    | GOOGLE_SECTION_NAMES: The section names of Google style docstrings.
+    | ATTRIBUTES_SECTIONS: The sections that can list a module's attributes.
+    | ARGUMENTS_SECTIONS: The sections that can list a function's arguments.
+    | RESULTS_SECTIONS: The sections that can describe what a function gives back.
+    | SUB_PACKAGES_SECTIONS: The sections that can list a package's sub-packages.
+    | MODULES_SECTIONS: The sections that can list a package's modules.
+    | PROJECT_SPECIFIC_SECTIONS: The section names this project checks.
+    | LOOSE_ELEMENT_REGEX: Finds the name of any element listed in a section.
+    | LISTED_NAME_REGEX: The format of the sub-packages, modules and attributes
+        listed in a docstring.
+    | GOOGLE_ARGS_REGEX: The format of the arguments listed in a docstring.
+    | GOOGLE_RESULT_REGEX: The format of the result described in a docstring.
+    | RESULT_REGEX_TYPE_GROUP: The group of ``GOOGLE_RESULT_REGEX`` holding the type.
+    | NON_METHOD_DECORATORS: Decorators that turn a function defined in a class into
+        something other than a method, e.g. a property.
+    | UNBOUND_ARGS: The arguments that are never documented.
+"""
+
+import ast
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from re import Match, Pattern
+from re import compile as re_compile
+from textwrap import dedent
+
+from build_support.import_graph import INIT_MODULE_NAME
+
+GOOGLE_SECTION_NAMES = (
+    "Args",
+    "Arguments",
+    "Attention",
+    "Attributes",
+    "Caution",
+    "Danger",
+    "Error",
+    "Example",
+    "Examples",
+    "Hint",
+    "Important",
+    "Keyword Args",
+    "Keyword Arguments",
+    "Methods",
+    "Note",
+    "Notes",
+    "Return",
+    "Returns",
+    "Raises",
+    "References",
+    "See Also",
+    "Tip",
+    "Todo",
+    "Warning",
+    "Warnings",
+    "Warns",
+    "Yield",
+    "Yields",
+)
+ATTRIBUTES_SECTIONS = ("Attributes",)
+ARGUMENTS_SECTIONS = ("Args",)
+RESULTS_SECTIONS = ("Returns", "Yields")
+SUB_PACKAGES_SECTIONS = ("SubPackages",)
+MODULES_SECTIONS = ("Modules",)
+PROJECT_SPECIFIC_SECTIONS = tuple(
+    sorted(
+        {
+            *ATTRIBUTES_SECTIONS,
+            *ARGUMENTS_SECTIONS,
+            *RESULTS_SECTIONS,
+            *SUB_PACKAGES_SECTIONS,
+            *MODULES_SECTIONS,
+        }
+    )
+)
+LOOSE_ELEMENT_REGEX = re_compile(r"^\s*(\|\s)?([^\s:]+)\s*.*")
+LISTED_NAME_REGEX = re_compile(r"^\s*\|\s([^\s:]+)\s*:\n?\s*(.+)")
+GOOGLE_ARGS_REGEX = re_compile(r"^\s*(\w+)\s*(\(.*\))\s*:\n?\s*(.+)")
+GOOGLE_RESULT_REGEX = re_compile(r"^\s*(([\w\[\],\s|]+)\s*:\s*(.+)|None)")
+RESULT_REGEX_TYPE_GROUP = 2
+NON_METHOD_DECORATORS = frozenset(
+    {
+        "cached_property",
+        "computed_field",
+        "deleter",
+        "field_serializer",
+        "field_validator",
+        "getter",
+        "model_serializer",
+        "model_validator",
+        "property",
+        "setter",
+    }
+)
+UNBOUND_ARGS = frozenset({"self", "cls"})
+
+
+@dataclass(frozen=True)
+class DocumentedModule:
+    """A dataclass locating a module whose docstrings are checked.
+
+    The sub-packages and modules of a package are found beside its ``__init__`` module,
+    since they are part of what its docstring documents.
+    """
+
+    file_path: Path
+    module_path: str
+    sub_packages: tuple[str, ...] = ()
+    modules: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class DocstringIssue:
+    """A dataclass describing something a docstring doesn't document as it should.
+
+    The element path is empty for the docstrings of packages and modules.
+    """
+
+    module_path: str
+    element_path: str
+    issue: str
+
+
+@dataclass(frozen=True)
+class SectionContext:
+    """A dataclass holding a section of a docstring and the lines around it."""
+
+    section_name: str
+    previous_line: str
+    line: str
+    following_lines: list[str]
+    original_index: int
+    is_last_section: bool
+
+
+def get_leading_words(line: str) -> str:
+    """Gets the words a line starts with.
+
+    Args:
+        line (str): A line of a docstring, e.g. "  Hello world!!!".
+
+    Returns:
+        str: The leading words, e.g. "Hello world", or an empty string.
+    """
+    result = re_compile(r"[\w ]+").match(line.strip())
+    if result is not None:
+        return result.group()
+    return ""
+
+
+def is_docstring_section(context: SectionContext) -> bool:
+    """Checks if a line that starts with a section name really starts a section.
+
+    Args:
+        context (SectionContext): The suspected section.
+
+    Returns:
+        bool: True if the line holds only the section name, maybe with a colon, and
+            the line before it ends a paragraph.
+    """
+    section_name_suffix = (
+        context.line.strip().lstrip(context.section_name.strip()).strip()
+    )
+    this_line_looks_like_a_section_name = section_name_suffix in {"", ":"}
+    punctuation = (",", ";", ".", "-", "\\", "/", "]", "}", ")")
+    previous_line = context.previous_line.strip()
+    prev_line_looks_like_end_of_paragraph = not previous_line or previous_line.endswith(
+        punctuation
+    )
+    return this_line_looks_like_a_section_name and prev_line_looks_like_end_of_paragraph
+
+
+def get_section_contexts(
+    lines: list[str], valid_section_names: Iterable[str]
+) -> Iterator[SectionContext]:
+    """Finds the sections of a docstring.
+
+    Args:
+        lines (list[str]): The lines of the docstring.
+        valid_section_names (Iterable[str]): The names a section can have.
+
+    Yields:
+        Iterator[SectionContext]: Each section, with the lines up to the next section.
+    """
+    lower_section_names = {section_name.lower() for section_name in valid_section_names}
+    contexts = [
+        context
+        for context in (
+            SectionContext(
+                section_name=get_leading_words(line=line),
+                previous_line=lines[index - 1],
+                line=line,
+                following_lines=lines[index + 1 :],
+                original_index=index,
+                is_last_section=False,
+            )
+            for index, line in enumerate(lines)
+            if get_leading_words(line=line.lower()) in lower_section_names
+        )
+        if is_docstring_section(context=context)
+    ]
+    for index, context in enumerate(contexts):
+        is_last_section = index == len(contexts) - 1
+        end = None if is_last_section else contexts[index + 1].original_index
+        yield SectionContext(
+            section_name=context.section_name,
+            previous_line=context.previous_line,
+            line=context.line,
+            following_lines=lines[context.original_index + 1 : end],
+            original_index=context.original_index,
+            is_last_section=is_last_section,
+        )
+
+
+def normalize_context(context: SectionContext) -> SectionContext:
+    """Dedents the lines of a section and drops the lines that aren't part of it.
+
+    Args:
+        context (SectionContext): The section to normalize.
+
+    Returns:
+        SectionContext: The section with one line for each line of its content.
+    """
+    lines = context.following_lines
+    if lines:
+        first_line = lines[0]
+        leading_whitespace = first_line[: len(first_line) - len(first_line.lstrip())]
+        lines = [
+            line for line in lines if line.startswith(leading_whitespace) or not line
+        ]
+    return SectionContext(
+        section_name=context.section_name,
+        previous_line=context.previous_line,
+        line=context.line,
+        following_lines=dedent("\n".join(lines)).strip().splitlines(keepends=True),
+        original_index=context.original_index,
+        is_last_section=context.is_last_section,
+    )
+
+
+def get_docstring_contexts(docstring: str) -> dict[str, SectionContext]:
+    """Gets the sections of a docstring this project checks, by name.
+
+    Args:
+        docstring (str): The docstring.
+
+    Returns:
+        dict[str, SectionContext]: The normalized sections, keyed by section name.
+    """
+    lines = docstring.split("\n") if docstring else []
+    return {
+        context.section_name: normalize_context(context=context)
+        for context in get_section_contexts(
+            lines=lines,
+            valid_section_names=sorted(
+                {*GOOGLE_SECTION_NAMES, *PROJECT_SPECIFIC_SECTIONS}
+            ),
+        )
+    }
+
+
+def is_valid_result_type(match: Match[str]) -> bool:
+    """Checks the type of a result matching ``GOOGLE_RESULT_REGEX``.
+
+    The regex allows ``|`` in the type for union types, e.g. ``str | None``.
+
+    Args:
+        match (Match[str]): The match of the result.
+
+    Returns:
+        bool: False if the type is blank, starts or ends with ``|``, or has ``||``.
+    """
+    type_part = match.group(RESULT_REGEX_TYPE_GROUP)
+    if type_part is None:
+        return True
+    stripped = type_part.strip()
+    return (
+        bool(stripped)
+        and not stripped.startswith("|")
+        and not stripped.endswith("|")
+        and "||" not in stripped
+    )
+
+
+def _get_element_docs(context: SectionContext) -> list[str]:
+    element_docs: list[str] = []
+    for line in context.following_lines:
+        if element_docs and line[:1].isspace():
+            element_docs[-1] += line
+        else:
+            element_docs.append(line)
+    return element_docs
+
+
+def _find_section(
+    contexts: dict[str, SectionContext], section_names: tuple[str, ...]
+) -> SectionContext | str:
+    sections_found = [
+        section_name for section_name in section_names if section_name in contexts
+    ]
+    if not sections_found:
+        return f"missing section {'|'.join(section_names)}"
+    if len(sections_found) > 1:
+        return f"clashing sections {'|'.join(sections_found)}"
+    return contexts[sections_found[0]]
+
+
+def check_listed_elements(
+    contexts: dict[str, SectionContext],
+    section_names: tuple[str, ...],
+    required_elements: list[str],
+    element_regex: Pattern[str],
+) -> list[str]:
+    """Checks that a section lists some elements, and nothing else.
+
+    Args:
+        contexts (dict[str, SectionContext]): The sections of the docstring.
+        section_names (tuple[str, ...]): The names the section can have.
+        required_elements (list[str]): The elements the section must list.
+        element_regex (Pattern[str]): The format each listed element must have.
+
+    Returns:
+        list[str]: The issues found, empty if no elements are required.
+    """
+    if not required_elements:
+        return []
+    section = _find_section(contexts=contexts, section_names=section_names)
+    if isinstance(section, str):
+        return [section]
+    issues = []
+    missing_elements = set(required_elements)
+    for element_doc in _get_element_docs(context=section):
+        loose_match = LOOSE_ELEMENT_REGEX.match(element_doc)
+        if loose_match is None:
+            continue
+        element = loose_match.group(2)
+        if element not in missing_elements:
+            issues.append(f"extra {section.section_name} element {element}")
+            continue
+        missing_elements.remove(element)
+        if not element_regex.match(element_doc):
+            issues.append(f"malformed {section.section_name} element {element}")
+    issues.extend(
+        f"missing {section.section_name} element {element}"
+        for element in sorted(missing_elements)
+    )
+    return issues
+
+
+def check_result_section(contexts: dict[str, SectionContext]) -> list[str]:
+    """Checks that a function's docstring describes a single result.
+
+    Args:
+        contexts (dict[str, SectionContext]): The sections of the docstring.
+
+    Returns:
+        list[str]: The issues found.
+    """
+    section = _find_section(contexts=contexts, section_names=RESULTS_SECTIONS)
+    if isinstance(section, str):
+        return [section]
+    element_docs = _get_element_docs(context=section)
+    if len(element_docs) == 1:
+        match = GOOGLE_RESULT_REGEX.match(element_docs[0])
+        if match is not None and is_valid_result_type(match=match):
+            return []
+    return [f"malformed {section.section_name} section"]
+
+
+def _iter_statements(body: list[ast.stmt]) -> Iterator[ast.stmt]:
+    # Names bound in conditional blocks are still members of the module
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from _iter_statements(body=node.body)
+            yield from _iter_statements(body=node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from _iter_statements(body=node.body)
+            for handler in node.handlers:
+                yield from _iter_statements(body=handler.body)
+            yield from _iter_statements(body=node.orelse)
+            yield from _iter_statements(body=node.finalbody)
+
+
+def _get_bound_names(node: ast.stmt) -> list[str]:
+    targets: list[ast.expr] = []
+    if isinstance(node, ast.Assign):
+        targets = node.targets
+    elif isinstance(node, ast.AnnAssign) and node.value is not None:
+        targets = [node.target]
+    elif isinstance(node, ast.TypeAlias):
+        targets = [node.name]
+    names = []
+    while targets:
+        target = targets.pop(0)
+        if isinstance(target, ast.Name):
+            names.append(target.id)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            targets.extend(target.elts)
+    return names
+
+
+def _is_public(name: str) -> bool:
+    return not name.startswith("_")
+
+
+def _is_member(name: str) -> bool:
+    # Public names and dunders are checked in classes
+    return _is_public(name=name) or (name.startswith("__") and name.endswith("__"))
+
+
+def _get_decorator_name(decorator: ast.expr) -> str:
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr
+    if isinstance(decorator, ast.Name):
+        return decorator.id
+    return ""
+
+
+def _get_generated_methods(class_node: ast.ClassDef) -> set[str]:
+    # Methods a dataclass writes over, matching what the decorator generates
+    for decorator in class_node.decorator_list:
+        if _get_decorator_name(decorator=decorator) != "dataclass":
+            continue
+        options = {"eq": True, "init": True, "repr": True, "frozen": False}
+        keywords = decorator.keywords if isinstance(decorator, ast.Call) else []
+        for keyword in keywords:
+            if (
+                keyword.arg is not None
+                and keyword.arg in options
+                and isinstance(keyword.value, ast.Constant)
+            ):
+                options[keyword.arg] = bool(keyword.value.value)
+        generated_methods = {"__new__", "__replace__"}
+        if options["eq"]:
+            generated_methods.update({"__eq__", "__hash__"})
+        if options["init"]:
+            generated_methods.add("__init__")
+        if options["repr"]:
+            generated_methods.add("__repr__")
+        if options["frozen"]:
+            generated_methods.update({"__setattr__", "__delattr__"})
+        return generated_methods
+    return {"__new__"}
+
+
+def _check_function(
+    function_node: ast.FunctionDef | ast.AsyncFunctionDef,
+    module_path: str,
+    element_path: str,
+) -> list[DocstringIssue]:
+    arguments = function_node.args
+    arg_names = [arg.arg for arg in (*arguments.posonlyargs, *arguments.args)]
+    if arguments.vararg is not None:
+        arg_names.append(arguments.vararg.arg)
+    arg_names.extend(arg.arg for arg in arguments.kwonlyargs)
+    if arguments.kwarg is not None:
+        arg_names.append(arguments.kwarg.arg)
+    contexts = get_docstring_contexts(docstring=ast.get_docstring(function_node) or "")
+    issues = check_listed_elements(
+        contexts=contexts,
+        section_names=ARGUMENTS_SECTIONS,
+        required_elements=[
+            arg_name for arg_name in arg_names if arg_name not in UNBOUND_ARGS
+        ],
+        element_regex=GOOGLE_ARGS_REGEX,
+    )
+    issues.extend(check_result_section(contexts=contexts))
+    return [
+        DocstringIssue(module_path=module_path, element_path=element_path, issue=issue)
+        for issue in issues
+    ]
+
+
+def _check_class(
+    class_node: ast.ClassDef, module_path: str, element_path: str
+) -> list[DocstringIssue]:
+    generated_methods = _get_generated_methods(class_node=class_node)
+    issues: list[DocstringIssue] = []
+    for node in class_node.body:
+        if isinstance(node, ast.ClassDef) and _is_member(name=node.name):
+            issues.extend(
+                _check_class(
+                    class_node=node,
+                    module_path=module_path,
+                    element_path=f"{element_path}.{node.name}",
+                )
+            )
+        elif (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and _is_member(name=node.name)
+            and node.name not in generated_methods
+            and NON_METHOD_DECORATORS.isdisjoint(
+                _get_decorator_name(decorator=decorator)
+                for decorator in node.decorator_list
+            )
+        ):
+            issues.extend(
+                _check_function(
+                    function_node=node,
+                    module_path=module_path,
+                    element_path=f"{element_path}.{node.name}",
+                )
+            )
+    return issues
+
+
+def _check_module(tree: ast.Module, module_path: str) -> list[DocstringIssue]:
+    imported_names: set[str] = set()
+    attributes: dict[str, None] = {}
+    issues: list[DocstringIssue] = []
+    for node in _iter_statements(body=tree.body):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imported_names.update(
+                alias.asname or alias.name.split(".")[0] for alias in node.names
+            )
+        elif isinstance(node, ast.ClassDef) and _is_public(name=node.name):
+            issues.extend(
+                _check_class(
+                    class_node=node, module_path=module_path, element_path=node.name
+                )
+            )
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_public(
+            name=node.name
+        ):
+            issues.extend(
+                _check_function(
+                    function_node=node, module_path=module_path, element_path=node.name
+                )
+            )
+        else:
+            attributes.update(dict.fromkeys(_get_bound_names(node=node)))
+    issues.extend(
+        DocstringIssue(module_path=module_path, element_path="", issue=issue)
+        for issue in check_listed_elements(
+            contexts=get_docstring_contexts(docstring=ast.get_docstring(tree) or ""),
+            section_names=ATTRIBUTES_SECTIONS,
+            required_elements=[
+                name
+                for name in attributes
+                if _is_public(name=name) and name not in imported_names
+            ],
+            element_regex=LISTED_NAME_REGEX,
+        )
+    )
+    return issues
+
+
+def _check_package(
+    tree: ast.Module, documented_module: DocumentedModule
+) -> list[DocstringIssue]:
+    contexts = get_docstring_contexts(docstring=ast.get_docstring(tree) or "")
+    return [
+        DocstringIssue(
+            module_path=documented_module.module_path, element_path="", issue=issue
+        )
+        for section_names, required_elements in (
+            (SUB_PACKAGES_SECTIONS, documented_module.sub_packages),
+            (MODULES_SECTIONS, documented_module.modules),
+        )
+        for issue in check_listed_elements(
+            contexts=contexts,
+            section_names=section_names,
+            required_elements=list(required_elements),
+            element_regex=LISTED_NAME_REGEX,
+        )
+    ]
+
+
+def check_module_docstrings(
+    documented_module: DocumentedModule,
+) -> list[DocstringIssue]:
+    """Checks the docstrings of a module and everything it defines.
+
+    A package's ``__init__`` module is checked as the package.
+
+    Args:
+        documented_module (DocumentedModule): The module to check.
+
+    Returns:
+        list[DocstringIssue]: The issues found, in the order of the source.
+    """
+    file_path = documented_module.file_path
+    try:
+        tree = ast.parse(file_path.read_text(), filename=str(file_path))
+    except SyntaxError as e:
+        return [
+            DocstringIssue(
+                module_path=documented_module.module_path,
+                element_path="",
+                issue=f"can't be parsed: {e.msg}",
+            )
+        ]
+    if file_path.stem == INIT_MODULE_NAME:
+        return _check_package(tree=tree, documented_module=documented_module)
+    return _check_module(tree=tree, module_path=documented_module.module_path)
+
+
+def check_modules_docstrings(
+    documented_modules: list[DocumentedModule], max_workers: int
+) -> list[list[DocstringIssue]]:
+    """Checks the docstrings of modules, spread across a process pool.
+
+    Args:
+        documented_modules (list[DocumentedModule]): The modules to check.
+        max_workers (int): The most processes to check modules in at once.
+
+    Returns:
+        list[list[DocstringIssue]]: The issues found in each module, in the
+            order of the modules.
+    """
+    worker_count = min(max_workers, len(documented_modules))
+    if worker_count <= 1:
+        # Not worth starting a process for
+        return [
+            check_module_docstrings(documented_module=documented_module)
+            for documented_module in documented_modules
+        ]
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        return list(
+            executor.map(
+                check_module_docstrings,
+                documented_modules,
+                chunksize=max(1, len(documented_modules) // (worker_count * 4)),
+            )
+        )
+
+
+def _find_package_modules(
+    package_dir: Path, module_path: str
+) -> Iterator[DocumentedModule]:
+    children = sorted(
+        child for child in package_dir.iterdir() if _is_public(name=child.name)
+    )
+    sub_packages = [
+        child
+        for child in children
+        if child.is_dir() and child.joinpath(f"{INIT_MODULE_NAME}.py").is_file()
+    ]
+    modules = [child for child in children if child.is_file() and child.suffix == ".py"]
+    yield DocumentedModule(
+        file_path=package_dir.joinpath(f"{INIT_MODULE_NAME}.py"),
+        module_path=module_path,
+        sub_packages=tuple(sub_package.name for sub_package in sub_packages),
+        modules=tuple(module.stem for module in modules),
+    )
+    for module in modules:
+        yield DocumentedModule(
+            file_path=module, module_path=f"{module_path}.{module.stem}"
+        )
+    for sub_package in sub_packages:
+        yield from _find_package_modules(
+            package_dir=sub_package, module_path=f"{module_path}.{sub_package.name}"
+        )
+
+
+def find_documented_modules(src_dir: Path) -> list[DocumentedModule]:
+    """Finds the public packages and modules in a src dir.
+
+    Args:
+        src_dir (Path): The directory on the python path holding the packages.
+
+    Returns:
+        list[DocumentedModule]: Every public package and module, each package before
+            its modules and sub-packages.
+    """
+    if not src_dir.is_dir():
+        return []
+    return [
+        documented_module
+        for package_dir in sorted(src_dir.iterdir())
+        if _is_public(name=package_dir.name)
+        and package_dir.joinpath(f"{INIT_MODULE_NAME}.py").is_file()
+        for documented_module in _find_package_modules(
+            package_dir=package_dir, module_path=package_dir.name
+        )
+    ]
+
+
+@cache
+def _get_checks_digest() -> str:
+    return hashlib.blake2b(Path(__file__).read_bytes()).hexdigest()
+
+
+def get_docstring_cache_key(documented_module: DocumentedModule, digest: str) -> str:
+    """Gets the key the issues found in a module are cached under.
+
+    The issues only depend on the module's content, where it is imported from, what is
+    beside a package, and the checks themselves, so the key covers this module's
+    source as well.
+
+    Args:
+        documented_module (DocumentedModule): The module checked.
+        digest (str): The digest of the module's content.
+
+    Returns:
+        str: The hex digest of everything the module's issues depend on.
+    """
+    return hashlib.blake2b(
+        json.dumps(
+            [
+                _get_checks_digest(),
+                digest,
+                documented_module.module_path,
+                documented_module.sub_packages,
+                documented_module.modules,
+            ]
+        ).encode()
+    ).hexdigest()
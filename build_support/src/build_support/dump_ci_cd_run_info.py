@@ -55,6 +55,11 @@ def parse_args(args: list[str] | None = None) -> Namespace:
         action="store_true",
         help="Set to true when running CI/CD feature tests to avoid recursive testing.",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop each test task at its first failing test.",
+    )
     return parser.parse_args(args=args)
 
 
@@ -82,6 +87,7 @@ def run_main(args: Namespace) -> None:
         local_gid=local_gid,
         local_user_env=local_user_env,
         ci_cd_feature_test_mode=args.ci_cd_feature_test_mode,
+        fail_fast=args.fail_fast,
     )
     local_info_yaml = get_local_info_yaml(project_root=docker_project_root)
     local_info_yaml.write_text(basic_task_info.to_yaml())
@@ -35,11 +35,18 @@ from build_support.ci_cd_tasks.validation_tasks import (
     ValidatePythonStyle,
     ValidateStaticTypeChecking,
 )
-from build_support.ci_cd_vars.build_paths import get_local_info_yaml
+from build_support.ci_cd_vars.build_paths import get_local_info_yaml, get_task_queue_dir
 from build_support.ci_cd_vars.subproject_structure import SubprojectContext
+from build_support.cli_args import positive_int
 from build_support.dag_engine import run_tasks
+from build_support.docker_session import docker_session
 from build_support.new_project_setup.setup_new_project import MakeProjectFromTemplate
 from build_support.process_runner import concatenate_args, run_process
+from build_support.shared_test_results import (
+    SHARED_RESULT_MAX_AGE,
+    get_shared_result_store,
+)
+from build_support.task_queue import DirectoryTaskQueue
 
 logger = logging.getLogger(__name__)
 
@@ -190,6 +197,23 @@ def parse_args(args: list[str] | None = None) -> Namespace:
         help="Path to project root on docker machines, used to mount project "
         "when launching docker containers.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="Maximum number of independent tasks to run concurrently.",
+    )
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Keep running tasks that don't depend on a failed task.",
+    )
+    parser.add_argument(
+        "--distribute",
+        action="store_true",
+        help="Hand tasks to the workers serving the task queue instead of running "
+        "them in this process.",
+    )
     return parser.parse_args(args=args)
 
 
@@ -212,10 +236,30 @@ def run_main(args: Namespace) -> None:
         CLI_ARG_TO_TASK[arg].get_task_node(basic_task_info=basic_task_info)
         for arg in args.build_tasks
     ]
+    task_queue = None
+    if args.distribute:
+        task_queue = DirectoryTaskQueue(
+            queue_dir=get_task_queue_dir(
+                project_root=basic_task_info.docker_project_root
+            )
+        )
+        # Tasks left in the queue by an interrupted build would otherwise still run
+        task_queue.clear()
     try:
-        run_tasks(
-            tasks=requested_tasks, project_root=basic_task_info.docker_project_root
+        # Results that no build has used for a while would otherwise pile up
+        get_shared_result_store(project_root=basic_task_info.docker_project_root).prune(
+            max_age=SHARED_RESULT_MAX_AGE
         )
+        # Every command sent to an image runs in one container for the whole build,
+        # which is removed when the build ends, even if it fails or is stopped.
+        with docker_session(project_root=basic_task_info.non_docker_project_root):
+            run_tasks(
+                tasks=requested_tasks,
+                project_root=basic_task_info.docker_project_root,
+                jobs=args.jobs,
+                keep_going=args.keep_going,
+                task_queue=task_queue,
+            )
     except Exception:
         # logger.exception() logs at ERROR and automatically includes the exception
         # message and full traceback (equivalent to exc_info=True).
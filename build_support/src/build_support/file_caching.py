@@ -4,38 +4,128 @@ This module provides functionality to track file changes and determine which tes
 to be run.
 It implements the following requirements:
 1. Unit tests should be run if:
-   - The source file has been updated since the test last passed
-   - Any files in the source file's resource directory have been updated
-   - The test file has been updated since it last passed
-   - Any conftest files the test relies on have been updated
-   - Any files in the test's resource directory have been updated
+   - The source file has changed since the test last passed
+   - Any source file the source file, the test file or its conftest files import,
+     directly or not, has changed
+   - Any files in the resource directories of those source files have changed
+   - The test file has changed since it last passed
+   - Any conftest files the test relies on have changed
+   - Any files in the test's resource directory have changed
 
 2. Feature tests should be run if:
-   - Any source files in the subproject have been updated
-   - Any files in source resource directories in the subproject have been updated
-   - Any conftest files the feature test relies on have been updated
-   - Any files in the test's resource directory have been updated
+   - Any source file the feature test or its conftest files import, directly or not,
+     has changed
+   - Any source file imported, directly or not, by a module of the subproject that
+     can run as a "main" has changed, since feature tests run the subproject's mains
+   - Any files in the resource directories of those source files have changed
+   - Any conftest files the feature test relies on have changed
+   - Any files in the test's resource directory have changed
+
+3. Test suites that check the whole project, like the style and process enforcement
+   suites of build_support, are recorded under their test suite folder and should be
+   run if any file or folder they declare as an input has changed
+
+Changes are detected by content, not by modification time, so checking out a branch,
+cloning, or copying files into a container doesn't cause tests to re-run, and clock
+skew can't cause tests to be skipped.  When a test passes, the BLAKE2b digest of every
+input it ran against is recorded.  A test is re-run when the digests of its inputs no
+longer match.
+
+Like git's index, a stat cache records the size, mtime and inode of every file hashed,
+so a file whose stat is unchanged is never hashed again.  A file modified within
+RACY_MTIME_WINDOW_NS of being hashed could change again without its stat changing, so
+its digest is never reused.
+
+The imports of each module are only parsed when its digest changes, and the docstring
+issues found in each module are kept under a key covering its digest, so only modules
+that changed have their docstrings checked again.  See docstring_enforcement.
+
+Every passing test is also added to the shared result store, and a test whose inputs
+changed is still skipped if a build on another machine passed it against the same
+inputs.  The results shared also depend on the files setting up the dev environment,
+so a result is only used by machines with the same dependencies.  See
+shared_test_results.
+
+Static checks (ruff and ty) also record the files that passed them, with the
+digests of every input the file's results depend on, so a check only has to look at the
+files whose inputs changed since they last passed it.
+
+How long each test file took the last time it ran, and which test files failed, are kept
+as well, to size and order the pytest runs of the subproject.  See pytest_sizing.
+
+The database also holds the coverage map of the subproject's unit tests, which can rule
+out unit tests whose inputs changed in lines they don't run.  See coverage_map.
+
+Each subproject's file cache is kept in a SQLite database in its build directory.  A
+passing test is written as a single row, so recording results doesn't get slower as the
+test suite grows, and unit and feature tests of a subproject running at the same time
+don't overwrite each other's results.  A file cache left in the old YAML file is moved
+into the database the first time it is read.
 
 Attributes:
     | CONFTEST_NAME: The file name of conftest files.
+    | CACHE_DIR_NAMES: The names of folders holding caches written by tools, whose
+        files are never inputs.
+    | TEST_FILE_PREFIX: The prefix of the file names of test files.
+    | HASH_CHUNK_SIZE: The number of bytes read at a time when hashing a file.
+    | RACY_MTIME_WINDOW_NS: How recently a file can have been modified before it was
+        hashed for its digest to be reused.
+    | FILE_CACHE_LOCK_TIMEOUT: How long to wait for another task writing to the same
+        file cache database.
 """
 
-from datetime import UTC, datetime
-from itertools import chain
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable
+from contextlib import closing
+from dataclasses import asdict
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from sqlite3 import Connection, connect
 from typing import Any
 
 from pydantic import BaseModel, Field, field_serializer, field_validator
 from yaml import safe_dump, safe_load
 
-from build_support.ci_cd_vars.project_structure import get_resource_dir
+from build_support.ci_cd_vars.project_structure import (
+    get_resource_dir,
+    get_static_check_config_files,
+)
 from build_support.ci_cd_vars.subproject_structure import (
     PythonSubproject,
     SubprojectContext,
     get_python_subproject,
 )
+from build_support.coverage_map import CoverageMap
+from build_support.docstring_enforcement import (
+    DocstringIssue,
+    check_modules_docstrings,
+    find_documented_modules,
+    get_docstring_cache_key,
+)
+from build_support.filesystem_snapshot import FileSystemSnapshot
+from build_support.import_graph import (
+    ImportGraph,
+    ModuleImports,
+    get_module_name,
+    parse_module_imports,
+)
+from build_support.shared_test_results import (
+    PassedTest,
+    SharedResultStore,
+    get_shareable_test_inputs,
+    get_shared_result_key,
+    get_shared_result_store,
+)
 
 CONFTEST_NAME = "conftest.py"
+CACHE_DIR_NAMES = frozenset({"__pycache__", ".pytest_cache", ".ruff_cache"})
+TEST_FILE_PREFIX = "test_"
+HASH_CHUNK_SIZE = 1024 * 1024
+RACY_MTIME_WINDOW_NS = 1_000_000_000
+FILE_CACHE_LOCK_TIMEOUT = timedelta(seconds=30)
 
 
 class TestFileInfo(BaseModel):
@@ -43,6 +133,7 @@ class TestFileInfo(BaseModel):
 
     file_path: Path
     tests_passed: datetime | None
+    input_digests: dict[str, str] | None = None
 
     @field_serializer("file_path")
     def serialize_file_path(self, file_path: Path) -> str:
@@ -72,33 +163,42 @@ class TestFileInfo(BaseModel):
         return value
 
 
-class FileCacheInfo(BaseModel):
-    """An object containing the cache information for a file."""
+class FileStatCacheEntry(BaseModel):
+    """An object recording the stat and content digest of a file when it was hashed."""
 
-    subproject_context: SubprojectContext
-    test_cache_info: list[TestFileInfo] = Field(default=[])
+    size: int
+    mtime_ns: int
+    inode: int
+    hashed_at_ns: int
+    digest: str
 
-    @staticmethod
-    def get_file_cache_for(
-        subproject_context: SubprojectContext, project_root: Path
-    ) -> "FileCacheInfo":
-        """Gets the file cache for a subproject.
+    def matches(self, file_stat: os.stat_result) -> bool:
+        """Checks if the digest recorded can be reused for a file.
 
         Args:
-            subproject_context (SubprojectContext): The subproject to get a file cache
-                for.
-            project_root (Path): The path to the root of the project.
+            file_stat (os.stat_result): The current stat of the file.
 
         Returns:
-            FileCacheInfo: An object holding the information about when files were last
-                updated.
+            bool: True if the file's stat is unchanged and it wasn't modified so close
+                to being hashed that it could have changed without its stat changing.
         """
-        path_to_file_cache = get_python_subproject(
-            subproject_context=subproject_context, project_root=project_root
-        ).get_file_cache_yaml()
-        if path_to_file_cache.exists():
-            return FileCacheInfo.from_yaml(path_to_file_cache.read_text())
-        return FileCacheInfo(subproject_context=subproject_context)
+        return (
+            self.size == file_stat.st_size
+            and self.mtime_ns == file_stat.st_mtime_ns
+            and self.inode == file_stat.st_ino
+            and self.mtime_ns + RACY_MTIME_WINDOW_NS < self.hashed_at_ns
+        )
+
+
+class FileCacheInfo(BaseModel):
+    """An object containing the file cache information of a subproject.
+
+    This is the YAML format the file cache was stored in before it moved to SQLite.
+    """
+
+    subproject_context: SubprojectContext
+    test_cache_info: list[TestFileInfo] = Field(default=[])
+    stat_cache: dict[str, FileStatCacheEntry] = Field(default={})
 
     @classmethod
     def from_yaml(cls, yaml_str: str) -> "FileCacheInfo":
@@ -122,11 +222,175 @@ class FileCacheInfo(BaseModel):
         return safe_dump(self.model_dump(mode="json"))
 
 
+def connect_to_file_cache(subproject: PythonSubproject) -> Connection:
+    """Opens a subproject's file cache database, creating it if it doesn't exist yet.
+
+    Args:
+        subproject (PythonSubproject): The subproject to open the file cache of.
+
+    Returns:
+        Connection: A connection to the file cache database.
+    """
+    file_cache_db = subproject.get_file_cache_db()
+    file_cache_db.parent.mkdir(parents=True, exist_ok=True)
+    connection = connect(file_cache_db, timeout=FILE_CACHE_LOCK_TIMEOUT.total_seconds())
+    connection.executescript(
+        """
+        PRAGMA journal_mode = WAL;
+        CREATE TABLE IF NOT EXISTS test_cache (
+            file_path TEXT PRIMARY KEY,
+            tests_passed TEXT,
+            input_digests TEXT
+        );
+        CREATE TABLE IF NOT EXISTS stat_cache (
+            file_path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            hashed_at_ns INTEGER NOT NULL,
+            digest TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS import_cache (
+            digest TEXT PRIMARY KEY,
+            import_targets TEXT NOT NULL,
+            is_entry_point INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS coverage_map (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            coverage_map TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS failed_tests (
+            file_path TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS test_durations (
+            file_path TEXT PRIMARY KEY,
+            duration_seconds REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS check_cache (
+            check_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            input_digests TEXT NOT NULL,
+            PRIMARY KEY (check_name, file_path)
+        );
+        CREATE TABLE IF NOT EXISTS docstring_cache (
+            cache_key TEXT PRIMARY KEY,
+            issues TEXT NOT NULL
+        );
+        """
+    )
+    return connection
+
+
+def _to_test_cache_row(
+    test_file_info: TestFileInfo,
+) -> tuple[str, str | None, str | None]:
+    return (
+        str(test_file_info.file_path),
+        (
+            None
+            if test_file_info.tests_passed is None
+            else test_file_info.tests_passed.isoformat()
+        ),
+        (
+            None
+            if test_file_info.input_digests is None
+            else json.dumps(test_file_info.input_digests, sort_keys=True)
+        ),
+    )
+
+
+def _from_test_cache_row(
+    file_path: str, tests_passed: str | None, input_digests: str | None
+) -> TestFileInfo:
+    return TestFileInfo(
+        file_path=Path(file_path),
+        tests_passed=(
+            None if tests_passed is None else datetime.fromisoformat(tests_passed)
+        ),
+        input_digests=None if input_digests is None else json.loads(input_digests),
+    )
+
+
+def _to_stat_cache_row(
+    file_path: str, entry: FileStatCacheEntry
+) -> tuple[str, int, int, int, int, str]:
+    return (
+        file_path,
+        entry.size,
+        entry.mtime_ns,
+        entry.inode,
+        entry.hashed_at_ns,
+        entry.digest,
+    )
+
+
+def migrate_file_cache_yaml(subproject: PythonSubproject) -> None:
+    """Moves a subproject's file cache from its old YAML file into its database.
+
+    Entries already in the database are kept, so a migration interrupted before the
+    YAML file was removed can be safely run again.  Tasks for the same subproject can
+    start at the same time, so another task may migrate the file first.
+
+    Args:
+        subproject (PythonSubproject): The subproject to migrate the file cache of.
+
+    Returns:
+        None
+    """
+    file_cache_yaml = subproject.get_file_cache_yaml()
+    try:
+        file_cache_yaml_str = file_cache_yaml.read_text()
+    except FileNotFoundError:
+        return
+    file_cache_info = FileCacheInfo.from_yaml(file_cache_yaml_str)
+    with (
+        closing(connect_to_file_cache(subproject=subproject)) as connection,
+        connection,
+    ):
+        connection.executemany(
+            "INSERT OR IGNORE INTO test_cache "
+            "(file_path, tests_passed, input_digests) VALUES (?, ?, ?)",
+            [
+                _to_test_cache_row(test_file_info=test_file_info)
+                for test_file_info in file_cache_info.test_cache_info
+            ],
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO stat_cache "
+            "(file_path, size, mtime_ns, inode, hashed_at_ns, digest) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                _to_stat_cache_row(file_path=file_path, entry=entry)
+                for file_path, entry in file_cache_info.stat_cache.items()
+            ],
+        )
+    file_cache_yaml.unlink(missing_ok=True)
+
+
 class FileCacheEngine:
-    """A class for managing file cache information."""
+    """A class for managing file cache information.
+
+    The cache is read into dictionaries indexed by path when the engine is created.
+    Each test recorded as passing is written to the subproject's file cache database
+    in its own transaction, so a build that is interrupted keeps every result
+    recorded before it stopped.
+
+    The subproject is scanned once when the engine is created, and questions about the
+    files in it are answered from that snapshot.  The import graph of the subproject is
+    built the first time it is needed.
+    """
 
-    cache_data: FileCacheInfo
+    project_root: Path
     subproject: PythonSubproject
+    shared_results: SharedResultStore
+    snapshot: FileSystemSnapshot
+    test_cache_info: dict[Path, TestFileInfo]
+    stat_cache: dict[str, FileStatCacheEntry]
+    unsaved_stat_cache: dict[str, FileStatCacheEntry]
+    import_cache: dict[str, ModuleImports]
+    unsaved_import_cache: dict[str, ModuleImports]
+    check_cache: dict[tuple[str, Path], dict[str, str]]
+    import_graph: ImportGraph | None
 
     def __init__(
         self, subproject_context: SubprojectContext, project_root: Path
@@ -141,73 +405,516 @@ class FileCacheEngine:
         Returns:
             None
         """
-        self.cache_data = FileCacheInfo.get_file_cache_for(
-            subproject_context=subproject_context, project_root=project_root
-        )
+        self.project_root = project_root
         self.subproject = get_python_subproject(
             subproject_context=subproject_context, project_root=project_root
         )
+        self.shared_results = get_shared_result_store(project_root=project_root)
+        migrate_file_cache_yaml(subproject=self.subproject)
+        with closing(connect_to_file_cache(subproject=self.subproject)) as connection:
+            self.test_cache_info = {
+                Path(file_path): _from_test_cache_row(
+                    file_path=file_path,
+                    tests_passed=tests_passed,
+                    input_digests=input_digests,
+                )
+                for file_path, tests_passed, input_digests in connection.execute(
+                    "SELECT file_path, tests_passed, input_digests FROM test_cache"
+                )
+            }
+            self.stat_cache = {
+                file_path: FileStatCacheEntry(
+                    size=size,
+                    mtime_ns=mtime_ns,
+                    inode=inode,
+                    hashed_at_ns=hashed_at_ns,
+                    digest=digest,
+                )
+                for file_path, size, mtime_ns, inode, hashed_at_ns, digest in (
+                    connection.execute(
+                        "SELECT file_path, size, mtime_ns, inode, hashed_at_ns, digest "
+                        "FROM stat_cache"
+                    )
+                )
+            }
+            self.import_cache = {
+                digest: ModuleImports(
+                    import_targets=tuple(json.loads(import_targets)),
+                    is_entry_point=bool(is_entry_point),
+                )
+                for digest, import_targets, is_entry_point in connection.execute(
+                    "SELECT digest, import_targets, is_entry_point FROM import_cache"
+                )
+            }
+            self.check_cache = {
+                (check_name, Path(file_path)): json.loads(input_digests)
+                for check_name, file_path, input_digests in connection.execute(
+                    "SELECT check_name, file_path, input_digests FROM check_cache"
+                )
+            }
+        self.unsaved_stat_cache = {}
+        self.snapshot = FileSystemSnapshot(root=self.subproject.get_root_dir())
+        self.unsaved_import_cache = {}
+        self.import_graph = None
 
-    def write_text(self) -> None:
-        """Writes the cache data to the subproject's file cache yaml.
+    def flush(self) -> None:
+        """Writes the digests and imports found since the last write to the database.
 
         Returns:
             None
         """
-        self.subproject.get_file_cache_yaml().write_text(self.cache_data.to_yaml())
+        if not self.unsaved_stat_cache and not self.unsaved_import_cache:
+            return
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            self._write_unsaved_cache(connection=connection)
+
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """Gets the BLAKE2b digest of a file's content.
+
+        Args:
+            file_path (Path): The path to the file.
+
+        Returns:
+            str: The hex digest of the file's content.
+        """
+        file_hash = hashlib.blake2b()
+        with file_path.open("rb") as file:
+            while chunk := file.read(HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def _get_stat(self, file_path: Path) -> os.stat_result:
+        if self.snapshot.covers(path=file_path):
+            return self.snapshot.get_stat(file_path=file_path)
+        return file_path.stat()
+
+    def get_file_digest(self, file_path: Path) -> str:
+        """Gets the digest of a file, only hashing it if its stat has changed.
+
+        Args:
+            file_path (Path): The path to the file.
+
+        Returns:
+            str: The hex digest of the file's content.
+        """
+        file_stat = self._get_stat(file_path=file_path)
+        cache_key = str(file_path)
+        cache_entry = self.stat_cache.get(cache_key)
+        if cache_entry is not None and cache_entry.matches(file_stat=file_stat):
+            return cache_entry.digest
+        hashed_at_ns = time.time_ns()
+        digest = FileCacheEngine.hash_file(file_path=file_path)
+        cache_entry = FileStatCacheEntry(
+            size=file_stat.st_size,
+            mtime_ns=file_stat.st_mtime_ns,
+            inode=file_stat.st_ino,
+            hashed_at_ns=hashed_at_ns,
+            digest=digest,
+        )
+        self.stat_cache[cache_key] = cache_entry
+        self.unsaved_stat_cache[cache_key] = cache_entry
+        return digest
+
+    def get_input_digests(self, input_files: list[Path]) -> dict[str, str]:
+        """Gets the digest of every input file.
+
+        Args:
+            input_files (list[Path]): The paths to the input files.
+
+        Returns:
+            dict[str, str]: The digest of each input file, keyed by its path.
+        """
+        return {
+            str(input_file): self.get_file_digest(file_path=input_file)
+            for input_file in input_files
+        }
+
+    def get_last_modified(self, input_files: list[Path]) -> datetime:
+        """Gets when the most recently modified of some input files was modified.
+
+        Args:
+            input_files (list[Path]): The paths to the input files.
+
+        Returns:
+            datetime: The latest modification time of the input files, or the earliest
+                representable time if there are none.
+        """
+        return max(
+            (
+                datetime.fromtimestamp(
+                    self._get_stat(file_path=input_file).st_mtime, tz=UTC
+                )
+                for input_file in input_files
+            ),
+            default=datetime.min.replace(tzinfo=UTC),
+        )
+
+    def get_files_in_dir(self, directory: Path) -> list[Path]:
+        """Gets every file in a directory tree.
+
+        Args:
+            directory (Path): The directory to scan recursively.
+
+        Returns:
+            list[Path]: The files found in sorted order, empty if the directory does
+                not exist.
+        """
+        if self.snapshot.covers(path=directory):
+            return self.snapshot.get_files_in_dir(directory=directory)
+        return sorted(path for path in directory.rglob("*") if path.is_file())
 
-    def most_recent_conftest_update(self, test_dir: Path) -> datetime:
-        """Gets the last time a conftest file for a test directory was updated.
+    def get_files_in_paths(self, input_paths: list[Path]) -> list[Path]:
+        """Gets every file in some files and directory trees.
 
-        For a given test directory we care about it's conftest file and any conftest
+        Files in folders of tool caches, like ``__pycache__``, are left out.
+
+        Args:
+            input_paths (list[Path]): Files and directories.  Directories include every
+                file beneath them.
+
+        Returns:
+            list[Path]: The files that exist in sorted order, without duplicates.
+        """
+        input_files = set()
+        for input_path in input_paths:
+            if input_path.is_dir():
+                input_files.update(
+                    file_path
+                    for file_path in self.get_files_in_dir(directory=input_path)
+                    if CACHE_DIR_NAMES.isdisjoint(file_path.parts)
+                )
+            elif input_path.is_file():
+                input_files.add(input_path)
+        return sorted(input_files)
+
+    def get_conftest_files(self, test_dir: Path) -> list[Path]:
+        """Gets the conftest files that apply to a test directory.
+
+        For a given test directory we care about its conftest file and any conftest
         file of a parent directory.
 
         Args:
             test_dir (Path): The path to the test directory.
 
         Returns:
-            datetime: The last time a conftest file for a test directory or any conftest
-                files for parent directories were updated.
+            list[Path]: The conftest files of the test directory and every parent test
+                directory.
         """
         top_level_test_dir = self.subproject.get_test_dir()
-        top_conftest = top_level_test_dir.joinpath(CONFTEST_NAME)
-        most_recent_update = (
-            self.get_last_modified_time(file_path=top_conftest)
-            if top_conftest.exists()
-            else datetime.min.replace(tzinfo=UTC)
-        )
-
+        test_dirs = [top_level_test_dir]
         current_test = test_dir
         while current_test != top_level_test_dir:
-            current_conftest = current_test.joinpath(CONFTEST_NAME)
-            if current_conftest.exists():
-                most_recent_update = max(
-                    self.get_last_modified_time(file_path=current_conftest),
-                    most_recent_update,
-                )
+            test_dirs.append(current_test)
             current_test = current_test.parent
-        return most_recent_update
+        return [
+            conftest
+            for conftest in (test_dir.joinpath(CONFTEST_NAME) for test_dir in test_dirs)
+            if self.snapshot.is_file(file_path=conftest)
+        ]
 
-    def most_recent_src_file_update(self) -> datetime:
-        """Gets the last time any src file or src resource was updated.
+    def get_module_imports(self, file_path: Path) -> ModuleImports:
+        """Gets the imports of a module, only parsing it if its digest has changed.
+
+        Args:
+            file_path (Path): The path to the module.
 
         Returns:
-            datetime: The last time any src file or src resource was updated.
+            ModuleImports: The imports found in the module.
         """
-        return max(
-            (
-                most_recent_update
-                for src_file, _ in self.subproject.get_src_unit_test_file_pairs()
-                for most_recent_update in (
-                    self.get_last_modified_time(file_path=src_file),
-                    self.get_most_recent_file_update_in_dir(
+        digest = self.get_file_digest(file_path=file_path)
+        module_imports = self.import_cache.get(digest)
+        if module_imports is None:
+            module_imports = parse_module_imports(source=file_path.read_text())
+            self.import_cache[digest] = module_imports
+            self.unsaved_import_cache[digest] = module_imports
+        return module_imports
+
+    def get_import_graph(self) -> ImportGraph:
+        """Gets the import graph of the subproject's source files.
+
+        Returns:
+            ImportGraph: The imports between the modules in the subproject's src dir.
+        """
+        if self.import_graph is None:
+            self.import_graph = ImportGraph(
+                src_dir=self.subproject.get_src_dir(),
+                module_imports_by_path={
+                    src_file: self.get_module_imports(file_path=src_file)
+                    for src_file in self.get_files_in_dir(
+                        directory=self.subproject.get_src_dir()
+                    )
+                    if src_file.suffix == ".py"
+                },
+            )
+        return self.import_graph
+
+    def get_src_dependencies(
+        self,
+        test_file: Path,
+        src_files: list[Path],
+        *,
+        include_entry_points: bool = False,
+    ) -> list[Path]:
+        """Gets the source files a test depends on.
+
+        Args:
+            test_file (Path): The path to the test file.
+            src_files (list[Path]): Source files the test depends on regardless of
+                what it imports.
+            include_entry_points (bool): Whether the test depends on every module
+                that can run as a "main", because it runs the subproject's mains.
+
+        Returns:
+            list[Path]: The source files imported, directly or not, by the test file,
+                its conftest files and the given source files, in sorted order.
+        """
+        import_graph = self.get_import_graph()
+        src_dir = self.subproject.get_src_dir()
+        module_names = {
+            get_module_name(src_dir=src_dir, file_path=src_file)
+            for src_file in src_files
+        }
+        for test_module in [
+            test_file,
+            *self.get_conftest_files(test_dir=test_file.parent),
+        ]:
+            module_names |= import_graph.resolve(
+                import_targets=self.get_module_imports(
+                    file_path=test_module
+                ).import_targets,
+                package="",
+            )
+        if include_entry_points:
+            module_names |= set(import_graph.get_entry_points())
+        return import_graph.get_dependencies(module_names=module_names)
+
+    def _get_test_input_files(
+        self, test_file: Path, src_dependencies: list[Path]
+    ) -> list[Path]:
+        return [
+            *(
+                input_file
+                for src_file in src_dependencies
+                for input_file in (
+                    src_file,
+                    *self.get_files_in_dir(
                         directory=get_resource_dir(file_path=src_file)
                     ),
                 )
             ),
-            default=datetime.min.replace(tzinfo=UTC),
+            test_file,
+            *self.get_files_in_dir(directory=get_resource_dir(file_path=test_file)),
+            *self.get_conftest_files(test_dir=test_file.parent),
+        ]
+
+    def get_unit_test_input_files(self, src_file: Path, test_file: Path) -> list[Path]:
+        """Gets the files a unit test depends on.
+
+        Args:
+            src_file (Path): The path to the source file tested.
+            test_file (Path): The path to the test file.
+
+        Returns:
+            list[Path]: The source files the test depends on and their resources, the
+                test file, its resources, and the conftest files it relies on.
+        """
+        return self._get_test_input_files(
+            test_file=test_file,
+            src_dependencies=self.get_src_dependencies(
+                test_file=test_file, src_files=[src_file]
+            ),
+        )
+
+    def get_feature_test_input_files(self, test_file: Path) -> list[Path]:
+        """Gets the files a feature test depends on.
+
+        Args:
+            test_file (Path): The path to the feature test file.
+
+        Returns:
+            list[Path]: The source files the test depends on and their resources, the
+                test file, its resources, and the conftest files it relies on.
+        """
+        return self._get_test_input_files(
+            test_file=test_file,
+            src_dependencies=self.get_src_dependencies(
+                test_file=test_file, src_files=[], include_entry_points=True
+            ),
         )
 
+    def get_python_files(self) -> list[Path]:
+        """Gets the Python files in the subproject's src and test dirs.
+
+        Returns:
+            list[Path]: The Python files in sorted order.
+        """
+        return [
+            file_path
+            for directory in (
+                self.subproject.get_src_dir(),
+                self.subproject.get_test_dir(),
+            )
+            for file_path in self.get_files_in_dir(directory=directory)
+            if file_path.suffix == ".py"
+        ]
+
+    def get_type_check_input_files(self, file_path: Path) -> list[Path]:
+        """Gets the files a module's type check results depend on.
+
+        The types in a module depend on every source module it imports, directly or
+        not.  A module in the test dir can also import the modules in the test dir that
+        aren't tests, e.g. conftest files and test utilities.
+
+        Args:
+            file_path (Path): The path to a Python file in the src or test dir.
+
+        Returns:
+            list[Path]: The module, the source modules it depends on and, for modules in
+                the test dir, the test dir's modules that aren't tests, in sorted order.
+        """
+        src_dir = self.subproject.get_src_dir()
+        if file_path.is_relative_to(src_dir):
+            return self.get_import_graph().get_dependencies(
+                module_names=[get_module_name(src_dir=src_dir, file_path=file_path)]
+            )
+        test_helper_files = [
+            test_helper_file
+            for test_helper_file in self.get_files_in_dir(
+                directory=self.subproject.get_test_dir()
+            )
+            if test_helper_file.suffix == ".py"
+            and not test_helper_file.name.startswith(TEST_FILE_PREFIX)
+        ]
+        return sorted(
+            {
+                file_path,
+                *self.get_src_dependencies(test_file=file_path, src_files=[]),
+                *test_helper_files,
+            }
+        )
+
+    def get_files_to_check(
+        self, check_name: str, input_files_by_file: dict[Path, list[Path]]
+    ) -> dict[Path, dict[str, str]]:
+        """Gets the files whose inputs changed since they last passed a static check.
+
+        Args:
+            check_name (str): The name of the static check.
+            input_files_by_file (dict[Path, list[Path]]): The files the check results
+                of each file depend on, keyed by the file checked.
+
+        Returns:
+            dict[Path, dict[str, str]]: The current digests of the inputs of each file
+                that has to be checked, keyed by the file.
+        """
+        files_to_check = {}
+        for file_path, input_files in input_files_by_file.items():
+            input_digests = self.get_input_digests(input_files=input_files)
+            if self.check_cache.get((check_name, file_path)) != input_digests:
+                files_to_check[file_path] = input_digests
+        return files_to_check
+
+    def record_check_passed(
+        self, check_name: str, input_digests_by_file: dict[Path, dict[str, str]]
+    ) -> None:
+        """Records that files passed a static check with inputs of the given digests.
+
+        Args:
+            check_name (str): The name of the static check.
+            input_digests_by_file (dict[Path, dict[str, str]]): The digests of the
+                inputs of each file as they were when it was checked, keyed by the file.
+
+        Returns:
+            None
+        """
+        for file_path, input_digests in input_digests_by_file.items():
+            self.check_cache[(check_name, file_path)] = input_digests
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            connection.executemany(
+                "INSERT OR REPLACE INTO check_cache "
+                "(check_name, file_path, input_digests) VALUES (?, ?, ?)",
+                [
+                    (
+                        check_name,
+                        str(file_path),
+                        json.dumps(input_digests, sort_keys=True),
+                    )
+                    for file_path, input_digests in input_digests_by_file.items()
+                ],
+            )
+            self._write_unsaved_cache(connection=connection)
+
+    def get_docstring_issues(self, max_workers: int) -> list[DocstringIssue]:
+        """Checks the docstrings of the subproject's source, skipping unchanged modules.
+
+        Args:
+            max_workers (int): The most processes to check changed modules in at once.
+
+        Returns:
+            list[DocstringIssue]: The issues found in every public package and module
+                of the subproject's src dir.
+        """
+        documented_modules = find_documented_modules(
+            src_dir=self.subproject.get_src_dir()
+        )
+        cache_keys = [
+            get_docstring_cache_key(
+                documented_module=documented_module,
+                digest=self.get_file_digest(file_path=documented_module.file_path),
+            )
+            for documented_module in documented_modules
+        ]
+        issues_by_key: dict[str, list[DocstringIssue]] = {}
+        with closing(connect_to_file_cache(subproject=self.subproject)) as connection:
+            for cache_key in cache_keys:
+                row = connection.execute(
+                    "SELECT issues FROM docstring_cache WHERE cache_key = ?",
+                    (cache_key,),
+                ).fetchone()
+                if row is not None:
+                    issues_by_key[cache_key] = [
+                        DocstringIssue(**issue) for issue in json.loads(row[0])
+                    ]
+        modules_to_check = {
+            cache_key: documented_module
+            for cache_key, documented_module in zip(
+                cache_keys, documented_modules, strict=True
+            )
+            if cache_key not in issues_by_key
+        }
+        checked_issues = dict(
+            zip(
+                modules_to_check,
+                check_modules_docstrings(
+                    documented_modules=list(modules_to_check.values()),
+                    max_workers=max_workers,
+                ),
+                strict=True,
+            )
+        )
+        issues_by_key.update(checked_issues)
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            connection.executemany(
+                "INSERT OR REPLACE INTO docstring_cache (cache_key, issues) "
+                "VALUES (?, ?)",
+                [
+                    (cache_key, json.dumps([asdict(issue) for issue in issues]))
+                    for cache_key, issues in checked_issues.items()
+                ],
+            )
+            self._write_unsaved_cache(connection=connection)
+        return [issue for cache_key in cache_keys for issue in issues_by_key[cache_key]]
+
     def get_test_info_for_file(self, file_path: Path) -> TestFileInfo:
         """Gets information about the tests that have been run for a file.
 
@@ -218,64 +925,215 @@ class FileCacheEngine:
             TestFileInfo: An object containing information about the tests that have
                 been run for a file.
         """
-        file_info = next(
-            (
-                info
-                for info in self.cache_data.test_cache_info
-                if info.file_path == file_path
-            ),
-            None,
+        return self.test_cache_info.get(
+            file_path, TestFileInfo(file_path=file_path, tests_passed=None)
         )
-        if file_info is None:
-            file_info = TestFileInfo(file_path=file_path, tests_passed=None)
-            self.cache_data.test_cache_info.append(file_info)
-        return file_info
 
-    @staticmethod
-    def get_most_recent_file_update_in_dir(directory: Path) -> datetime:
-        """Return the most recent mtime of any file or directory in a tree.
+    def _get_shared_input_digests(
+        self, input_digests: dict[str, str]
+    ) -> dict[str, str]:
+        # Other machines can have other dependencies installed
+        environment_files = self.get_files_in_paths(
+            input_paths=get_static_check_config_files(project_root=self.project_root)
+        )
+        return {
+            **self.get_input_digests(input_files=environment_files),
+            **input_digests,
+        }
 
-        Returns ``datetime.min`` (UTC) if the directory does not exist or
-        has no entries.
+    def inputs_changed(self, file_path: Path, input_digests: dict[str, str]) -> bool:
+        """Checks if a test's inputs have changed since it last passed.
 
         Args:
-            directory (Path): The directory to scan recursively.
+            file_path (Path): The path to the test file.
+            input_digests (dict[str, str]): The current digests of the test's inputs.
 
         Returns:
-            datetime: The most recent modification time found.
+            bool: True if the test never passed or any input was added, removed or
+                changed since it last passed, and no build sharing the shared result
+                store passed it against the current inputs.
         """
-        if not directory.exists():
-            return datetime.min.replace(tzinfo=UTC)
-        return max(
-            (
-                FileCacheEngine.get_last_modified_time(file_path=path)
-                for path in chain((directory,), directory.rglob("*"))
-                if path.is_file() or path.is_dir()
-            ),
-            default=datetime.min.replace(tzinfo=UTC),
+        if self.get_test_info_for_file(file_path=file_path).input_digests == (
+            input_digests
+        ):
+            return False
+        test_file, shareable_digests = get_shareable_test_inputs(
+            test_file=file_path,
+            input_digests=self._get_shared_input_digests(input_digests=input_digests),
+            project_root=self.project_root,
+        )
+        return not self.shared_results.has_passed(
+            result_key=get_shared_result_key(
+                test_file=test_file, input_digests=shareable_digests
+            )
         )
 
-    @staticmethod
-    def get_last_modified_time(file_path: Path) -> datetime:
-        """Gets the timestamp that the file or directory was last modified.
+    def record_test_passed(
+        self, file_path: Path, input_digests: dict[str, str]
+    ) -> None:
+        """Records that a test passed against inputs with the given digests.
+
+        Args:
+            file_path (Path): The path to the test file.
+            input_digests (dict[str, str]): The digests of the inputs as they were
+                when the test was run.
+
+        Returns:
+            None
+        """
+        tests_passed = datetime.now(tz=UTC)
+        test_file_info = TestFileInfo(
+            file_path=file_path, tests_passed=tests_passed, input_digests=input_digests
+        )
+        self.test_cache_info[file_path] = test_file_info
+        self.shared_results.add(
+            passed_test=PassedTest.from_test_run(
+                test_file=file_path,
+                input_digests=self._get_shared_input_digests(
+                    input_digests=input_digests
+                ),
+                tests_passed=tests_passed,
+                project_root=self.project_root,
+            )
+        )
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            connection.execute(
+                "INSERT OR REPLACE INTO test_cache "
+                "(file_path, tests_passed, input_digests) VALUES (?, ?, ?)",
+                _to_test_cache_row(test_file_info=test_file_info),
+            )
+            self._write_unsaved_cache(connection=connection)
+
+    def get_coverage_map(self) -> CoverageMap | None:
+        """Gets the coverage map of the subproject's unit tests.
+
+        Returns:
+            CoverageMap | None: The most recently saved coverage map, or None if no map
+                has been saved.
+        """
+        with closing(connect_to_file_cache(subproject=self.subproject)) as connection:
+            row = connection.execute("SELECT coverage_map FROM coverage_map").fetchone()
+        return None if row is None else CoverageMap.model_validate_json(row[0])
+
+    def get_test_durations(self) -> dict[Path, timedelta]:
+        """Gets how long each test file of the subproject took the last time it ran.
+
+        Returns:
+            dict[Path, timedelta]: The duration of each test file's tests, keyed by
+                test file.
+        """
+        with closing(connect_to_file_cache(subproject=self.subproject)) as connection:
+            return {
+                Path(file_path): timedelta(seconds=duration_seconds)
+                for file_path, duration_seconds in connection.execute(
+                    "SELECT file_path, duration_seconds FROM test_durations"
+                )
+            }
+
+    def get_failed_test_files(self) -> set[Path]:
+        """Gets the test files of the subproject that failed the last time they ran.
+
+        Returns:
+            set[Path]: The test files with a test that failed the last time they ran.
+        """
+        with closing(connect_to_file_cache(subproject=self.subproject)) as connection:
+            return {
+                Path(file_path)
+                for (file_path,) in connection.execute(
+                    "SELECT file_path FROM failed_tests"
+                )
+            }
+
+    def record_test_failures(
+        self, ran_test_files: Iterable[Path], failed_test_files: set[Path]
+    ) -> None:
+        """Records which of the test files that just ran failed.
 
         Args:
-            file_path (Path): The path to the file or directory.
+            ran_test_files (Iterable[Path]): The test files that ran.
+            failed_test_files (set[Path]): The test files that ran and failed.
 
         Returns:
-            datetime: The last modification time (UTC).
+            None
         """
-        return datetime.fromtimestamp(timestamp=file_path.stat().st_mtime, tz=UTC)
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            connection.executemany(
+                "DELETE FROM failed_tests WHERE file_path = ?",
+                [(str(test_file),) for test_file in ran_test_files],
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO failed_tests (file_path) VALUES (?)",
+                [(str(test_file),) for test_file in sorted(failed_test_files)],
+            )
 
-    def update_test_pass_timestamp(self, file_path: Path) -> None:
-        """Records when a test passed using the current timestamp.
+    def record_test_durations(self, durations: dict[Path, timedelta]) -> None:
+        """Records how long the tests of some test files took.
 
         Args:
-            file_path (Path): The path to the test file.
+            durations (dict[Path, timedelta]): The duration of each test file's tests,
+                keyed by test file.
+
+        Returns:
+            None
+        """
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            connection.executemany(
+                "INSERT OR REPLACE INTO test_durations "
+                "(file_path, duration_seconds) VALUES (?, ?)",
+                [
+                    (str(file_path), duration.total_seconds())
+                    for file_path, duration in durations.items()
+                ],
+            )
+
+    def save_coverage_map(self, coverage_map: CoverageMap) -> None:
+        """Replaces the coverage map of the subproject's unit tests.
+
+        Args:
+            coverage_map (CoverageMap): The coverage map to save.
 
         Returns:
             None
         """
-        test_file_cache_info = self.get_test_info_for_file(file_path=file_path)
-        current_time = datetime.now(tz=UTC)
-        test_file_cache_info.tests_passed = current_time
+        with (
+            closing(connect_to_file_cache(subproject=self.subproject)) as connection,
+            connection,
+        ):
+            connection.execute(
+                "INSERT OR REPLACE INTO coverage_map (id, coverage_map) VALUES (0, ?)",
+                (coverage_map.model_dump_json(),),
+            )
+
+    def _write_unsaved_cache(self, connection: Connection) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO stat_cache "
+            "(file_path, size, mtime_ns, inode, hashed_at_ns, digest) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                _to_stat_cache_row(file_path=file_path, entry=entry)
+                for file_path, entry in self.unsaved_stat_cache.items()
+            ],
+        )
+        self.unsaved_stat_cache = {}
+        connection.executemany(
+            "INSERT OR REPLACE INTO import_cache "
+            "(digest, import_targets, is_entry_point) VALUES (?, ?, ?)",
+            [
+                (
+                    digest,
+                    json.dumps(module_imports.import_targets),
+                    module_imports.is_entry_point,
+                )
+                for digest, module_imports in self.unsaved_import_cache.items()
+            ],
+        )
+        self.unsaved_import_cache = {}
@@ -0,0 +1,104 @@
+"""Logic for answering questions about a directory tree from a single scan.
+
+Selecting which tests to run asks, for every test file, which resource files and
+conftest files it depends on and what the stat of each of those files is.  Answering
+each question from the filesystem costs a directory walk or a system call, which adds up
+to thousands of system calls for a large subproject.  A snapshot walks the directory
+tree once with ``os.scandir``, keeping the stat of every file and the files under every
+directory, so each question is answered with a dictionary lookup.
+
+A snapshot doesn't see changes made after it was taken, so it should only be used for
+questions asked while the files in the tree aren't being modified.
+"""
+
+from os import scandir, stat_result
+from pathlib import Path
+
+
+class FileSystemSnapshot:
+    """A record of every file in a directory tree, taken in a single scan."""
+
+    root: Path
+    file_stats: dict[Path, stat_result]
+    files_in_dir: dict[Path, list[Path]]
+
+    def __init__(self, root: Path) -> None:
+        """Init method for FileSystemSnapshot.
+
+        Args:
+            root (Path): The directory to scan.  Symlinked directories are not followed,
+                matching ``Path.rglob``.
+
+        Returns:
+            None
+        """
+        self.root = root
+        self.file_stats = {}
+        self.files_in_dir = {}
+        dirs_to_scan = [root] if root.is_dir() else []
+        while dirs_to_scan:
+            directory = dirs_to_scan.pop()
+            self.files_in_dir[directory] = []
+            with scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs_to_scan.append(Path(entry.path))
+                    elif entry.is_file():
+                        self.file_stats[Path(entry.path)] = entry.stat()
+        for file_path in sorted(self.file_stats):
+            directory = file_path.parent
+            while directory != root:
+                self.files_in_dir[directory].append(file_path)
+                directory = directory.parent
+            self.files_in_dir[root].append(file_path)
+
+    def covers(self, path: Path) -> bool:
+        """Checks if a path is in the tree this snapshot was taken of.
+
+        Args:
+            path (Path): The path to check.
+
+        Returns:
+            bool: True if the path is the root of the snapshot or inside it.
+        """
+        return path.is_relative_to(self.root)
+
+    def is_file(self, file_path: Path) -> bool:
+        """Checks if a file existed when the snapshot was taken.
+
+        Args:
+            file_path (Path): The path to the file.
+
+        Returns:
+            bool: True if the path was a file when the snapshot was taken.
+        """
+        return file_path in self.file_stats
+
+    def get_stat(self, file_path: Path) -> stat_result:
+        """Gets the stat of a file when the snapshot was taken.
+
+        Args:
+            file_path (Path): The path to the file.
+
+        Returns:
+            stat_result: The stat of the file.
+
+        Raises:
+            FileNotFoundError: If the path wasn't a file when the snapshot was taken.
+        """
+        if file_path not in self.file_stats:
+            msg = f"{file_path} was not a file when the snapshot was taken."
+            raise FileNotFoundError(msg)
+        return self.file_stats[file_path]
+
+    def get_files_in_dir(self, directory: Path) -> list[Path]:
+        """Gets every file in a directory tree when the snapshot was taken.
+
+        Args:
+            directory (Path): The directory to get the files in.
+
+        Returns:
+            list[Path]: The files in the directory and its subdirectories in sorted
+                order, empty if the directory didn't exist.
+        """
+        return list(self.files_in_dir.get(directory, []))
@@ -0,0 +1,220 @@
+"""Logic for finding which modules of a subproject a test depends on.
+
+A test depends on the modules it imports, the modules those modules import, and so on.
+Each module's imports are read from its syntax tree with ``ast``, without running it, so
+the dependencies found are the import statements written in the module, including
+imports inside functions and ``if TYPE_CHECKING`` blocks.  Imports of modules outside
+the subproject are ignored.
+
+Importing a module also runs the ``__init__`` module of every package containing it, so
+those are dependencies as well.
+
+Attributes:
+    | INIT_MODULE_NAME: The name of the module that initializes a package.
+"""
+
+import ast
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+INIT_MODULE_NAME = "__init__"
+
+
+@dataclass(frozen=True)
+class ModuleImports:
+    """A dataclass describing the imports found in a module's source.
+
+    Relative imports are kept relative, with one leading dot per level, because what
+    they refer to depends on where the module is rather than on its content.
+    """
+
+    import_targets: tuple[str, ...]
+    is_entry_point: bool
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+        and any(
+            isinstance(comparator, ast.Constant) and comparator.value == "__main__"
+            for comparator in node.test.comparators
+        )
+    )
+
+
+def parse_module_imports(source: str) -> ModuleImports:
+    """Finds the modules imported by a module's source.
+
+    Every name imported from a module is also kept as a possible submodule, e.g.
+    ``from a import b`` gives the targets ``a`` and ``a.b``.  A module that can't be
+    parsed is treated as importing nothing, since any test importing it will fail
+    regardless.
+
+    Args:
+        source (str): The source of the module.
+
+    Returns:
+        ModuleImports: The import targets in the order found, and whether the module
+            runs as a "main" when executed as a script.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return ModuleImports(import_targets=(), is_entry_point=False)
+    import_targets: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            import_targets.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            if node.module:
+                import_targets.append(module)
+            import_targets.extend(
+                f"{module}.{alias.name}" if node.module else f"{module}{alias.name}"
+                for alias in node.names
+            )
+    return ModuleImports(
+        import_targets=tuple(dict.fromkeys(import_targets)),
+        is_entry_point=any(_is_main_guard(node=node) for node in tree.body),
+    )
+
+
+def resolve_import_target(import_target: str, package: str) -> str | None:
+    """Turns an import target into an absolute module name.
+
+    Args:
+        import_target (str): The import target, relative if it starts with a dot.
+        package (str): The package of the module the target was imported in.
+
+    Returns:
+        str | None: The absolute module name, or None if a relative import goes above
+            the top level package.
+    """
+    relative_name = import_target.lstrip(".")
+    level = len(import_target) - len(relative_name)
+    if not level:
+        return import_target
+    package_parts = package.split(".") if package else []
+    if level - 1 >= len(package_parts):
+        return None
+    base_parts = package_parts[: len(package_parts) - (level - 1)]
+    return ".".join([*base_parts, relative_name] if relative_name else base_parts)
+
+
+def get_module_name(src_dir: Path, file_path: Path) -> str:
+    """Gets the name a source file is imported by.
+
+    Args:
+        src_dir (Path): The directory on the python path holding the file.
+        file_path (Path): The path to the source file.
+
+    Returns:
+        str: The dotted module name, the package name for ``__init__`` files.
+    """
+    module_parts = file_path.relative_to(src_dir).with_suffix("").parts
+    if module_parts[-1] == INIT_MODULE_NAME:
+        module_parts = module_parts[:-1]
+    return ".".join(module_parts)
+
+
+class ImportGraph:
+    """A class holding the imports between the modules of a subproject."""
+
+    module_paths: dict[str, Path]
+    module_imports: dict[str, ModuleImports]
+
+    def __init__(
+        self, src_dir: Path, module_imports_by_path: dict[Path, ModuleImports]
+    ) -> None:
+        """Init method for ImportGraph.
+
+        Args:
+            src_dir (Path): The directory on the python path holding the modules.
+            module_imports_by_path (dict[Path, ModuleImports]): The imports of every
+                module in the subproject, keyed by the module's path.
+
+        Returns:
+            None
+        """
+        self.module_paths = {}
+        self.module_imports = {}
+        for file_path, module_imports in module_imports_by_path.items():
+            module_name = get_module_name(src_dir=src_dir, file_path=file_path)
+            self.module_paths[module_name] = file_path
+            self.module_imports[module_name] = module_imports
+
+    def get_package(self, module_name: str) -> str:
+        """Gets the package relative imports in a module are resolved against.
+
+        Args:
+            module_name (str): The name of the module.
+
+        Returns:
+            str: The module itself if it is a package, otherwise its parent package.
+        """
+        if self.module_paths[module_name].stem == INIT_MODULE_NAME:
+            return module_name
+        return module_name.rpartition(".")[0]
+
+    def resolve(self, import_targets: Iterable[str], package: str) -> set[str]:
+        """Finds the modules of the subproject that import targets load.
+
+        Args:
+            import_targets (Iterable[str]): The import targets to resolve.
+            package (str): The package the targets were imported in.
+
+        Returns:
+            set[str]: The names of the modules in the subproject loaded by importing
+                the targets, including the packages containing them.
+        """
+        modules = set()
+        for import_target in import_targets:
+            module_name = resolve_import_target(
+                import_target=import_target, package=package
+            )
+            while module_name:
+                if module_name in self.module_paths:
+                    modules.add(module_name)
+                module_name = module_name.rpartition(".")[0]
+        return modules
+
+    def get_dependencies(self, module_names: Iterable[str]) -> list[Path]:
+        """Gets the modules that a group of modules depend on, directly or not.
+
+        Args:
+            module_names (Iterable[str]): The names of the modules to start from.
+
+        Returns:
+            list[Path]: The paths of the starting modules and every module they depend
+                on, in sorted order.
+        """
+        modules_to_visit = list(module_names)
+        dependencies: set[str] = set()
+        while modules_to_visit:
+            module_name = modules_to_visit.pop()
+            if module_name in dependencies:
+                continue
+            dependencies.add(module_name)
+            modules_to_visit.extend(
+                self.resolve(
+                    import_targets=self.module_imports[module_name].import_targets,
+                    package=self.get_package(module_name=module_name),
+                )
+            )
+        return sorted(self.module_paths[module_name] for module_name in dependencies)
+
+    def get_entry_points(self) -> list[str]:
+        """Gets the modules of the subproject that can be run as a "main".
+
+        Returns:
+            list[str]: The names of the modules with a ``__main__`` guard, sorted.
+        """
+        return sorted(
+            module_name
+            for module_name, module_imports in self.module_imports.items()
+            if module_imports.is_entry_point
+        )
@@ -4,22 +4,86 @@ Three verbosity levels: INFO = steps only; DEBUG = + command line;
 TRACE = + stdout/stderr. On failure, command + return code + stdout + stderr
 are always logged at ERROR.
 
+A command that fails raises a ProcessFailedError rather than exiting, so that the
+caller decides whether the failure ends the build.
+
+Inside ``preparing_commands`` a function is called with the arguments of every
+command before it runs, such as to start the container the command runs in.
+
+Every command records a span with its exit code, so that commands appear in the
+build trace nested inside the task that ran them.  Commands are reaped with
+``os.wait4`` so that the resources they used are recorded on the span and added to the
+resource usage of the task that ran them.
+
 Attributes:
     | logger: Module-level logger for subprocess command and output.
 """
 
 import itertools
 import logging
-import sys
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 # The purpose of this module is to make subprocess calls
 from subprocess import PIPE, Popen  # nosec: B404
-from typing import IO, Any
+from typing import IO, Any, cast
 
 from build_support.build_logging import TRACE
+from build_support.build_tracing import trace_span
+from build_support.resource_accounting import ResourceUsage, record_resource_usage
 
 logger = logging.getLogger(__name__)
 
+_command_preparer: Callable[[list[str]], None] | None = None
+
+
+class ProcessFailedError(Exception):
+    """Raised when a command exits with a non-zero return code."""
+
+    def __init__(self, command_as_str: str, return_code: int) -> None:
+        """Initializes the error with the command that failed.
+
+        Args:
+            command_as_str (str): The command run as it would appear on the command
+                line.
+            return_code (int): The return code from the subprocess that was run.
+
+        Returns:
+            None
+        """
+        super().__init__(f"{command_as_str}\nFailed with code: {return_code}")
+        self.command_as_str = command_as_str
+        self.return_code = return_code
+
+
+@contextmanager
+def preparing_commands(prepare: Callable[[list[str]], None]) -> Iterator[None]:
+    """Calls a function with the arguments of each command run inside this context.
+
+    The function is called before the command runs, from the thread running it.
+
+    Args:
+        prepare (Callable[[list[str]], None]): The function to call.
+
+    Yields:
+        None
+    """
+    global _command_preparer  # noqa: PLW0603
+    previous_preparer = _command_preparer
+    _command_preparer = prepare
+    try:
+        yield
+    finally:
+        _command_preparer = previous_preparer
+
+
+def _prepare_command(str_args: list[str]) -> None:
+    command_preparer = _command_preparer
+    if command_preparer is not None:
+        command_preparer(str_args)
+
 
 def run_piped_processes(processes: list[list[Any]]) -> None:
     """Runs piped processes as they would be on the command line.
@@ -35,17 +99,26 @@ def run_piped_processes(processes: list[list[Any]]) -> None:
         None
     """
     args_list = [get_str_args(args=args) for args in processes]
+    for str_args in args_list:
+        _prepare_command(str_args=str_args)
     process_strs = [" ".join(args) for args in args_list]
     command_as_str = " | ".join(process_strs)
     logger.debug("%s", command_as_str)
-    p1 = build_popen(args=args_list[0])
-    popen_processes = [p1]
-    for args in args_list[1:]:
-        last_process = popen_processes[-1]
-        next_process = build_popen(args=args, stdin=last_process.stdout)
-        popen_processes.append(next_process)
-    output, error = popen_processes[-1].communicate()
-    return_code = popen_processes[-1].returncode
+    with trace_span(name=command_as_str, category="command") as span_args:
+        p1 = build_popen(args=args_list[0])
+        popen_processes = [p1]
+        for args in args_list[1:]:
+            last_process = popen_processes[-1]
+            next_process = build_popen(args=args, stdin=last_process.stdout)
+            # Only the next process reads this output, so that the previous process
+            # gets SIGPIPE instead of blocking if the next process exits early
+            cast(IO[bytes], last_process.stdout).close()
+            popen_processes.append(next_process)
+        output, error, usage = wait_for_processes(processes=popen_processes)
+        return_code = popen_processes[-1].returncode
+        span_args["exit_code"] = return_code
+        span_args["resource_usage"] = usage.model_dump(mode="json")
+    record_resource_usage(usage=usage)
     resolve_process_results(
         command_as_str=command_as_str,
         output=output,
@@ -80,11 +153,16 @@ def run_process(args: list[Any]) -> bytes:
         bytes: The stdout from the subprocess that was run.
     """
     str_args = get_str_args(args=args)
+    _prepare_command(str_args=str_args)
     command_as_str = " ".join(str_args)
     logger.debug("%s", command_as_str)
-    p = build_popen(args=str_args)
-    output, error = p.communicate()
-    return_code = p.returncode
+    with trace_span(name=command_as_str, category="command") as span_args:
+        p = build_popen(args=str_args)
+        output, error, usage = wait_for_processes(processes=[p])
+        return_code = p.returncode
+        span_args["exit_code"] = return_code
+        span_args["resource_usage"] = usage.model_dump(mode="json")
+    record_resource_usage(usage=usage)
     resolve_process_results(
         command_as_str=command_as_str,
         output=output,
@@ -94,6 +172,45 @@ def run_process(args: list[Any]) -> bytes:
     return output
 
 
+def _read_stream(stream: IO[bytes] | None) -> bytes:
+    if stream is None:
+        return b""
+    with stream:
+        return stream.read()
+
+
+def wait_for_processes(
+    processes: list[Popen[bytes]],
+) -> tuple[bytes, bytes, ResourceUsage]:
+    """Reads the output of a pipeline of processes and waits for all of them to exit.
+
+    Stderr of every process is drained so that none of them block on a full pipe.  The
+    processes are reaped with os.wait4, which sets their return codes and reports the
+    resources each of them used.
+
+    Args:
+        processes (list[Popen[bytes]]): The processes in the pipeline, in order.
+
+    Returns:
+        tuple[bytes, bytes, ResourceUsage]: The stdout and stderr of the last process,
+            and the resources used by all of the processes.
+    """
+    with ThreadPoolExecutor(max_workers=len(processes)) as executor:
+        error_futures = [
+            executor.submit(_read_stream, process.stderr) for process in processes
+        ]
+        output = _read_stream(stream=processes[-1].stdout)
+        error = error_futures[-1].result()
+    usage = ResourceUsage()
+    for process in processes:
+        _, wait_status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(wait_status)
+        usage = usage.combine(
+            other=ResourceUsage.from_rusage(rusage=rusage, processes_spawned=1)
+        )
+    return output, error, usage
+
+
 def build_popen(args: list[str], stdin: IO[bytes] | int | None = None) -> Popen[bytes]:
     """Creates a Popen instance based on the arguments.
 
@@ -113,7 +230,7 @@ def build_popen(args: list[str], stdin: IO[bytes] | int | None = None) -> Popen[
 def resolve_process_results(
     command_as_str: str, output: bytes, error: bytes, return_code: int
 ) -> None:
-    """Logs outputs and errors and exits as appropriate when a command exits.
+    """Logs outputs and errors and raises as appropriate when a command exits.
 
     On success: stdout/stderr at TRACE (level 3). On failure: command, return code,
     stdout and stderr are all logged at ERROR so they are visible at any LOG_LEVEL.
@@ -126,6 +243,9 @@ def resolve_process_results(
 
     Returns:
         None
+
+    Raises:
+        ProcessFailedError: If the command exited with a non-zero return code.
     """
     if return_code != 0:
         logger.error("%s\nFailed with code: %s", command_as_str, return_code)
@@ -133,7 +253,7 @@ def resolve_process_results(
             logger.error("stdout:\n%s", output.decode("utf-8"))
         if error:
             logger.error("stderr:\n%s", error.decode("utf-8"))
-        sys.exit(return_code)
+        raise ProcessFailedError(command_as_str=command_as_str, return_code=return_code)
     if output:
         logger.log(TRACE, "stdout:\n%s", output.decode("utf-8"), stack_info=False)
     if error:
@@ -0,0 +1,214 @@
+"""Logic for sizing and ordering each pytest run from how its test files did before.
+
+Starting xdist workers costs more than running a few fast test files, so each pytest run
+picks its worker count from the durations of its test files in earlier junit reports.
+A run with too little work to share runs in the pytest process, and other runs get one
+worker for every ``MIN_WORK_PER_WORKER`` of estimated work, up to the task's CPU budget.
+
+Test files that failed last time run first, then the ones whose inputs were modified
+recently, so a developer hears about the most likely failures soonest.  Otherwise test
+files are passed longest first and handed out with xdist's work stealing, so the
+longest files start first and idle workers take over the tests of busy ones.
+
+Attributes:
+    | MIN_WORK_PER_WORKER: The least estimated work worth starting an xdist worker for.
+    | IN_PROCESS: The xdist worker count that runs the tests in the pytest process.
+    | RECENTLY_MODIFIED_WINDOW: How long ago a test's inputs can have been modified for
+        the test to run before the others.
+"""
+
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from junitparser import JUnitXml
+
+from build_support.report_fragments import get_test_file_cases
+
+MIN_WORK_PER_WORKER = timedelta(seconds=2)
+IN_PROCESS = 0
+RECENTLY_MODIFIED_WINDOW = timedelta(hours=1)
+
+
+def get_test_file_durations(
+    junit_report: Path, test_files: Iterable[Path], project_root: Path
+) -> dict[Path, timedelta]:
+    """Gets how long the tests of each test file took from a junit report.
+
+    Args:
+        junit_report (Path): The junit report written by a test run.
+        test_files (Iterable[Path]): The test files to get the durations of.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        dict[Path, timedelta]: The total duration of each test file's tests, keyed by
+            test file.  Test files without tests in the report are left out.
+    """
+    test_cases = [
+        test_case
+        for test_suite in JUnitXml.fromfile(str(junit_report))
+        for test_case in test_suite
+    ]
+    durations: dict[Path, timedelta] = {}
+    for test_file in test_files:
+        test_file_cases = get_test_file_cases(
+            test_cases=test_cases, test_file=test_file, project_root=project_root
+        )
+        if test_file_cases:
+            durations[test_file] = timedelta(
+                seconds=sum(test_case.time for test_case in test_file_cases)
+            )
+    return durations
+
+
+def get_failed_test_files(
+    junit_report: Path, test_files: Iterable[Path], project_root: Path
+) -> set[Path]:
+    """Gets the test files with failing tests from a junit report.
+
+    Args:
+        junit_report (Path): The junit report written by a test run.
+        test_files (Iterable[Path]): The test files that ran.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        set[Path]: The test files with a test that failed or errored.  Every test file
+            if the run didn't write a report, e.g. because pytest couldn't start.
+    """
+    if not junit_report.exists():
+        return set(test_files)
+    test_cases = [
+        test_case
+        for test_suite in JUnitXml.fromfile(str(junit_report))
+        for test_case in test_suite
+    ]
+    return {
+        test_file
+        for test_file in test_files
+        if any(
+            not (test_case.is_passed or test_case.is_skipped)
+            for test_case in get_test_file_cases(
+                test_cases=test_cases, test_file=test_file, project_root=project_root
+            )
+        )
+    }
+
+
+def was_modified_recently(last_modified: datetime) -> bool:
+    """Checks if a test's inputs were modified recently enough for it to run early.
+
+    Args:
+        last_modified (datetime): When the test's inputs were last modified.
+
+    Returns:
+        bool: True if they were modified within ``RECENTLY_MODIFIED_WINDOW``.
+    """
+    return datetime.now(tz=UTC) - last_modified <= RECENTLY_MODIFIED_WINDOW
+
+
+def estimate_test_file_durations(
+    test_files: Iterable[Path], durations: dict[Path, timedelta]
+) -> dict[Path, timedelta] | None:
+    """Estimates how long the tests of each test file will take.
+
+    Test files that haven't run before are estimated to take the average duration of
+    the test files that have.
+
+    Args:
+        test_files (Iterable[Path]): The test files to estimate.
+        durations (dict[Path, timedelta]): The durations of test files in earlier runs.
+
+    Returns:
+        dict[Path, timedelta] | None: The estimated duration of each test file, or None
+            if no test file has run before.
+    """
+    if not durations:
+        return None
+    average_duration = sum(durations.values(), timedelta()) / len(durations)
+    return {
+        test_file: durations.get(test_file, average_duration)
+        for test_file in test_files
+    }
+
+
+def get_pytest_worker_count(
+    test_files: Iterable[Path], durations: dict[Path, timedelta], cpu_budget: int
+) -> int:
+    """Gets the number of xdist workers worth starting to run some test files.
+
+    Args:
+        test_files (Iterable[Path]): The test files to run.
+        durations (dict[Path, timedelta]): The durations of test files in earlier runs.
+        cpu_budget (int): The number of CPUs the test run may use.
+
+    Returns:
+        int: One worker for every ``MIN_WORK_PER_WORKER`` of estimated work, up to the
+            CPU budget, or ``IN_PROCESS`` if the work isn't worth sharing between
+            workers.  The whole CPU budget if no test file has run before.
+    """
+    estimated_durations = estimate_test_file_durations(
+        test_files=test_files, durations=durations
+    )
+    if estimated_durations is None:
+        return cpu_budget
+    total_duration = sum(estimated_durations.values(), timedelta())
+    worker_count = min(cpu_budget, int(total_duration / MIN_WORK_PER_WORKER))
+    return worker_count if worker_count > 1 else IN_PROCESS
+
+
+def get_pytest_distribution_args(
+    test_files: Iterable[Path], durations: dict[Path, timedelta], cpu_budget: int
+) -> list[Any]:
+    """Gets the args that size a pytest run and choose how tests are handed out.
+
+    Args:
+        test_files (Iterable[Path]): The test files to run.
+        durations (dict[Path, timedelta]): The durations of test files in earlier runs.
+        cpu_budget (int): The number of CPUs the test run may use.
+
+    Returns:
+        list[Any]: The xdist args for the test run.
+    """
+    worker_count = get_pytest_worker_count(
+        test_files=test_files, durations=durations, cpu_budget=cpu_budget
+    )
+    if worker_count == IN_PROCESS:
+        return ["-n", IN_PROCESS]
+    return ["-n", worker_count, "--dist", "worksteal"]
+
+
+def order_test_files(
+    test_files: Iterable[Path],
+    durations: dict[Path, timedelta],
+    failed_test_files: set[Path],
+    recently_modified_test_files: set[Path],
+) -> list[Path]:
+    """Orders test files so the ones most likely to fail, then the longest, come first.
+
+    Args:
+        test_files (Iterable[Path]): The test files to order.
+        durations (dict[Path, timedelta]): The durations of test files in earlier runs.
+        failed_test_files (set[Path]): The test files that failed the last time they
+            ran.
+        recently_modified_test_files (set[Path]): The test files whose inputs were
+            modified recently.
+
+    Returns:
+        list[Path]: The test files that failed last time, then the ones with recently
+            modified inputs, then the rest.  Longest first within each group, and by
+            path among equal estimates.
+    """
+    test_files = list(test_files)
+    estimated_durations = (
+        estimate_test_file_durations(test_files=test_files, durations=durations) or {}
+    )
+    return sorted(
+        test_files,
+        key=lambda test_file: (
+            test_file not in failed_test_files,
+            test_file not in recently_modified_test_files,
+            -estimated_durations.get(test_file, timedelta()),
+            test_file,
+        ),
+    )
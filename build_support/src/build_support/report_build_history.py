@@ -0,0 +1,150 @@
+"""A "main" that reports trends and regressions from the build history."""
+
+import sys
+from argparse import ArgumentParser, Namespace
+from datetime import timedelta
+from pathlib import Path
+
+from build_support.build_history import (
+    REGRESSION_THRESHOLD,
+    ROLLING_BASELINE_BUILDS,
+    BuildRecord,
+    TaskTrend,
+    get_recent_builds,
+    get_task_trends,
+)
+from build_support.cli_args import positive_int
+
+
+def _format_duration(duration: timedelta) -> str:
+    return f"{duration.total_seconds():.1f}s"
+
+
+def _format_build(build: BuildRecord) -> str:
+    revision = "@".join(
+        part
+        for part in (build.branch, build.commit_sha[:8] if build.commit_sha else None)
+        if part
+    )
+    return (
+        f"  #{build.build_id} {build.started_at:%Y-%m-%d %H:%M:%S} "
+        f"{revision or 'unknown revision'} {_format_duration(build.duration)} "
+        f"tasks: {build.tasks_run} cache hits: {build.cache_hits}"
+    )
+
+
+def _format_trend(trend: TaskTrend) -> str:
+    latest = f"  {trend.task_name} {_format_duration(trend.latest_duration)}"
+    if trend.restored_from_cache:
+        return f"{latest} (restored from cache)"
+    percent_change = trend.get_percent_change()
+    if trend.baseline_duration is None or percent_change is None:
+        return f"{latest} (no baseline)"
+    return (
+        f"{latest} baseline: {_format_duration(trend.baseline_duration)} "
+        f"({percent_change:+.1f}%){' REGRESSED' if trend.regressed else ''}"
+    )
+
+
+def format_build_history_report(
+    builds: list[BuildRecord], trends: list[TaskTrend], regression_threshold: float
+) -> str:
+    """Formats the build history as a human-readable report.
+
+    Args:
+        builds (list[BuildRecord]): The builds to list, oldest first.
+        trends (list[TaskTrend]): The trends of the tasks in the most recent build.
+        regression_threshold (float): The fraction a task had to be slower than its
+            baseline by to be flagged as a regression.
+
+    Returns:
+        str: The report.
+    """
+    if not builds:
+        return "No builds have been recorded yet."
+    regressed_tasks = [trend for trend in trends if trend.regressed]
+    return "\n".join(
+        [
+            "Recent builds:",
+            *(_format_build(build=build) for build in builds),
+            "Tasks in the latest build:",
+            *(_format_trend(trend=trend) for trend in trends),
+            f"{len(regressed_tasks)} task(s) regressed by more than "
+            f"{regression_threshold:.0%} against their baseline.",
+        ]
+    )
+
+
+def parse_args(args: list[str] | None = None) -> Namespace:
+    """Parses arguments from list given or the command line.
+
+    Args:
+        args (list[str] | None): Args to parse.  Defaults to None, causing
+            sys.argv[1:] to be used.
+
+    Returns:
+        Namespace: A namespace made from the parsed args.
+    """
+    parser = ArgumentParser(
+        prog="ReportBuildHistory",
+        description="This tool exists to find build performance regressions.",
+    )
+    parser.add_argument(
+        "--docker-project-root",
+        type=Path,
+        required=True,
+        help="Path to project root on docker machines.",
+    )
+    parser.add_argument(
+        "--builds",
+        type=positive_int,
+        default=ROLLING_BASELINE_BUILDS,
+        help="Number of recent builds to list.",
+    )
+    parser.add_argument(
+        "--baseline-builds",
+        type=positive_int,
+        default=ROLLING_BASELINE_BUILDS,
+        help="Number of previous runs of each task used as its baseline.",
+    )
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="Fraction a task must be slower than its baseline by to be flagged.",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with a non-zero code if any task regressed.",
+    )
+    return parser.parse_args(args=args)
+
+
+def run_main(args: Namespace) -> None:
+    """Runs the logic for the report_build_history main.
+
+    Args:
+        args (Namespace): A namespace generated by an ArgumentParser.
+
+    Returns:
+        None
+    """
+    builds = get_recent_builds(project_root=args.docker_project_root, limit=args.builds)
+    trends = get_task_trends(
+        project_root=args.docker_project_root,
+        baseline_builds=args.baseline_builds,
+        regression_threshold=args.regression_threshold,
+    )
+    # Stdout is the report; intentionally print for data output.
+    print(  # noqa: T201
+        format_build_history_report(
+            builds=builds, trends=trends, regression_threshold=args.regression_threshold
+        )
+    )
+    if args.fail_on_regression and any(trend.regressed for trend in trends):
+        sys.exit(1)
+
+
+if __name__ == "__main__":  # pragma: no cov - main
+    run_main(args=parse_args())
@@ -0,0 +1,278 @@
+"""Logic for building complete unit test reports without re-running unchanged tests.
+
+After unit tests run, the coverage data and junit results of each test file that ran
+are saved as fragments, under a key made from the test file and the digests of the
+inputs it ran against.  The complete reports are assembled from the fragments of every
+test file with ``coverage combine`` and a junit merge, so a test file only has to run
+again when there is no fragment for its inputs.
+
+A coverage fragment keeps the lines run by its test file's tests under a single context
+for the test file, and the lines run outside any test under the import context, so the
+assembled data still shows which test file ran each line.
+
+Attributes:
+    | COVERAGE_FRAGMENT_SUFFIX: The suffix of the files holding coverage fragments.
+    | JUNIT_FRAGMENT_SUFFIX: The suffix of the files holding junit fragments.
+"""
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from coverage import Coverage, CoverageData
+from junitparser import JUnitXml, TestCase, TestSuite
+
+from build_support.coverage_map import IMPORT_CONTEXT, get_test_file_context
+from build_support.shared_test_results import (
+    get_shareable_test_inputs,
+    get_shared_result_key,
+)
+
+COVERAGE_FRAGMENT_SUFFIX = ".coverage.sqlite"
+JUNIT_FRAGMENT_SUFFIX = ".junit.xml"
+
+
+def get_junit_classname(test_file: Path, project_root: Path) -> str:
+    """Gets the junit classname pytest gives the tests in a test file.
+
+    Args:
+        test_file (Path): The test file.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        str: The classname of the module's tests, which is followed by the test class
+            name for tests in a class.
+    """
+    return ".".join(test_file.relative_to(project_root).with_suffix("").parts)
+
+
+def get_test_file_cases(
+    test_cases: Iterable[TestCase], test_file: Path, project_root: Path
+) -> list[TestCase]:
+    """Gets the junit test cases of the tests in a test file.
+
+    Args:
+        test_cases (Iterable[TestCase]): The test cases of a junit report.
+        test_file (Path): The test file.
+        project_root (Path): The directory pytest ran in, test ids are relative to it.
+
+    Returns:
+        list[TestCase]: The test cases of the test file's tests, in report order.
+    """
+    classname = get_junit_classname(test_file=test_file, project_root=project_root)
+    return [
+        test_case
+        for test_case in test_cases
+        # Cases without a classname don't belong to any test file
+        if test_case.classname is not None
+        and (
+            test_case.classname == classname
+            or test_case.classname.startswith(f"{classname}.")
+        )
+    ]
+
+
+def _copy_coverage(
+    source: CoverageData, fragment: CoverageData, contexts_regex: str
+) -> None:
+    source.set_query_contexts([contexts_regex])
+    if source.has_arcs():
+        fragment.add_arcs(
+            {
+                file_path: source.arcs(file_path) or []
+                for file_path in source.measured_files()
+            }
+        )
+    else:
+        fragment.add_lines(
+            {
+                file_path: source.lines(file_path) or []
+                for file_path in source.measured_files()
+            }
+        )
+
+
+class ReportFragmentStore:
+    """A directory of coverage and junit fragments, one of each per test file run."""
+
+    fragment_dir: Path
+    project_root: Path
+
+    def __init__(self, fragment_dir: Path, project_root: Path) -> None:
+        """Init method for ReportFragmentStore.
+
+        Args:
+            fragment_dir (Path): The directory holding the fragments.
+            project_root (Path): Path to this project's root, which pytest ran in.
+
+        Returns:
+            None
+        """
+        self.fragment_dir = fragment_dir
+        self.project_root = project_root
+        self.fragment_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_fragment_key(self, test_file: Path, input_digests: dict[str, str]) -> str:
+        """Gets the key of a test file's fragments when run against the given inputs.
+
+        Args:
+            test_file (Path): The test file.
+            input_digests (dict[str, str]): The digests of the test's inputs.
+
+        Returns:
+            str: The key the test file's fragments are stored under.
+        """
+        relative_test_file, relative_digests = get_shareable_test_inputs(
+            test_file=test_file,
+            input_digests=input_digests,
+            project_root=self.project_root,
+        )
+        return get_shared_result_key(
+            test_file=relative_test_file, input_digests=relative_digests
+        )
+
+    def _get_coverage_fragment(self, fragment_key: str) -> Path:
+        return self.fragment_dir.joinpath(f"{fragment_key}{COVERAGE_FRAGMENT_SUFFIX}")
+
+    def _get_junit_fragment(self, fragment_key: str) -> Path:
+        return self.fragment_dir.joinpath(f"{fragment_key}{JUNIT_FRAGMENT_SUFFIX}")
+
+    def has_fragments(self, test_file: Path, input_digests: dict[str, str]) -> bool:
+        """Checks if a test file's results against the given inputs are stored.
+
+        Args:
+            test_file (Path): The test file.
+            input_digests (dict[str, str]): The digests of the test's inputs.
+
+        Returns:
+            bool: True if both the coverage and junit fragments are stored.
+        """
+        fragment_key = self.get_fragment_key(
+            test_file=test_file, input_digests=input_digests
+        )
+        return (
+            self._get_coverage_fragment(fragment_key=fragment_key).exists()
+            and self._get_junit_fragment(fragment_key=fragment_key).exists()
+        )
+
+    def save_fragments(
+        self,
+        data_file: Path,
+        junit_report: Path,
+        test_inputs: dict[Path, dict[str, str]],
+    ) -> None:
+        """Splits the reports of a test run into fragments for each test file.
+
+        Args:
+            data_file (Path): The coverage data file written by the test run, with
+                test contexts.
+            junit_report (Path): The junit report written by the test run.
+            test_inputs (dict[Path, dict[str, str]]): The digests of the inputs each
+                test file ran against, keyed by test file.
+
+        Returns:
+            None
+        """
+        coverage_data = CoverageData(basename=str(data_file))
+        coverage_data.read()
+        test_cases = [
+            test_case
+            for test_suite in JUnitXml.fromfile(str(junit_report))
+            for test_case in test_suite
+        ]
+        for test_file, input_digests in test_inputs.items():
+            fragment_key = self.get_fragment_key(
+                test_file=test_file, input_digests=input_digests
+            )
+            coverage_fragment = self._get_coverage_fragment(fragment_key=fragment_key)
+            coverage_fragment.unlink(missing_ok=True)
+            fragment_data = CoverageData(basename=str(coverage_fragment))
+            fragment_data.set_context(IMPORT_CONTEXT)
+            _copy_coverage(
+                source=coverage_data,
+                fragment=fragment_data,
+                contexts_regex=f"^{re.escape(IMPORT_CONTEXT)}$",
+            )
+            test_file_context = get_test_file_context(
+                test_file=test_file, project_root=self.project_root
+            )
+            fragment_data.set_context(test_file_context)
+            _copy_coverage(
+                source=coverage_data,
+                fragment=fragment_data,
+                contexts_regex=f"^{re.escape(test_file_context)}",
+            )
+            # Keep the files no test ran, so they're reported as not covered
+            fragment_data.touch_files(coverage_data.measured_files())
+            fragment_data.write()
+            junit_fragment = TestSuite(
+                name=str(test_file.relative_to(self.project_root))
+            )
+            junit_fragment.add_testcases(
+                get_test_file_cases(
+                    test_cases=test_cases,
+                    test_file=test_file,
+                    project_root=self.project_root,
+                )
+            )
+            junit_fragment.update_statistics()
+            fragment_xml = JUnitXml()
+            fragment_xml.add_testsuite(junit_fragment)
+            fragment_xml.write(str(self._get_junit_fragment(fragment_key=fragment_key)))
+
+    def assemble_reports(
+        self,
+        test_inputs: dict[Path, dict[str, str]],
+        data_file: Path,
+        config_file: Path,
+        junit_report: Path,
+    ) -> None:
+        """Assembles the complete reports of every test file from their fragments.
+
+        Fragments of other test files or inputs are removed.
+
+        Args:
+            test_inputs (dict[Path, dict[str, str]]): The digests of the inputs each
+                test file's fragments were saved with, keyed by test file.
+            data_file (Path): The coverage data file to write.
+            config_file (Path): The file holding the coverage settings.
+            junit_report (Path): The junit report to write.
+
+        Returns:
+            None
+        """
+        fragment_keys = [
+            self.get_fragment_key(test_file=test_file, input_digests=input_digests)
+            for test_file, input_digests in test_inputs.items()
+        ]
+        data_file.unlink(missing_ok=True)
+        coverage = Coverage(data_file=str(data_file), config_file=str(config_file))
+        coverage.combine(
+            data_paths=[
+                str(self._get_coverage_fragment(fragment_key=fragment_key))
+                for fragment_key in fragment_keys
+            ],
+            strict=True,
+            keep=True,
+        )
+        coverage.save()
+        complete_xml = JUnitXml()
+        for fragment_key in fragment_keys:
+            complete_xml += JUnitXml.fromfile(
+                str(self._get_junit_fragment(fragment_key=fragment_key))
+            )
+        complete_xml.write(str(junit_report))
+        self._remove_other_fragments(fragment_keys=fragment_keys)
+
+    def _remove_other_fragments(self, fragment_keys: Iterable[str]) -> None:
+        kept_files = {
+            fragment_file
+            for fragment_key in fragment_keys
+            for fragment_file in (
+                self._get_coverage_fragment(fragment_key=fragment_key),
+                self._get_junit_fragment(fragment_key=fragment_key),
+            )
+        }
+        for fragment_file in self.fragment_dir.iterdir():
+            if fragment_file not in kept_files:
+                fragment_file.unlink()
@@ -0,0 +1,167 @@
+"""Logic for measuring the CPU time, memory, and I/O used by the commands a build runs.
+
+The resource usage of every command is measured with ``os.wait4`` when it exits, and is
+added to the usage of the task running on the same thread.  Comparing a task's CPU time
+to its duration shows whether it is CPU bound or spends its time waiting, e.g. on I/O
+or on docker containers starting.  Commands run in docker containers are measured
+through the docker client, so the work done inside the container isn't included.
+
+Attributes:
+    | RUSAGE_MAX_RSS_UNIT_BYTES: The size of the unit ru_maxrss is reported in.
+"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from resource import struct_rusage
+
+from pydantic import BaseModel
+
+RUSAGE_MAX_RSS_UNIT_BYTES = 1024
+
+
+class ResourceUsage(BaseModel):
+    """An object containing the resources used by one or more processes."""
+
+    user_cpu_time: timedelta = timedelta(0)
+    system_cpu_time: timedelta = timedelta(0)
+    max_rss_bytes: int = 0
+    block_input_operations: int = 0
+    block_output_operations: int = 0
+    processes_spawned: int = 0
+
+    @staticmethod
+    def from_rusage(rusage: struct_rusage, processes_spawned: int) -> "ResourceUsage":
+        """Builds an object from the resource usage reported by the OS.
+
+        Args:
+            rusage (struct_rusage): Resource usage from os.wait4 or resource.getrusage.
+            processes_spawned (int): The number of processes the usage covers.
+
+        Returns:
+            ResourceUsage: The resources used.
+        """
+        return ResourceUsage(
+            user_cpu_time=timedelta(seconds=rusage.ru_utime),
+            system_cpu_time=timedelta(seconds=rusage.ru_stime),
+            max_rss_bytes=rusage.ru_maxrss * RUSAGE_MAX_RSS_UNIT_BYTES,
+            block_input_operations=rusage.ru_inblock,
+            block_output_operations=rusage.ru_oublock,
+            processes_spawned=processes_spawned,
+        )
+
+    @staticmethod
+    def from_rusage_delta(
+        before: struct_rusage, after: struct_rusage, processes_spawned: int
+    ) -> "ResourceUsage":
+        """Builds an object from two readings of resource.getrusage(RUSAGE_CHILDREN).
+
+        The OS only reports the peak memory of the largest child, so the peak memory is
+        taken from the later reading.
+
+        Args:
+            before (struct_rusage): The reading from before the processes ran.
+            after (struct_rusage): The reading from after the processes were reaped.
+            processes_spawned (int): The number of processes started in between.
+
+        Returns:
+            ResourceUsage: The resources used by the processes reaped in between.
+        """
+        return ResourceUsage(
+            user_cpu_time=timedelta(seconds=after.ru_utime - before.ru_utime),
+            system_cpu_time=timedelta(seconds=after.ru_stime - before.ru_stime),
+            max_rss_bytes=after.ru_maxrss * RUSAGE_MAX_RSS_UNIT_BYTES,
+            block_input_operations=after.ru_inblock - before.ru_inblock,
+            block_output_operations=after.ru_oublock - before.ru_oublock,
+            processes_spawned=processes_spawned,
+        )
+
+    def combine(self, other: "ResourceUsage") -> "ResourceUsage":
+        """Adds up the resources used by two sets of processes.
+
+        Args:
+            other (ResourceUsage): The resources used by the other processes.
+
+        Returns:
+            ResourceUsage: The resources used by both.  Peak memory is the larger peak.
+        """
+        return ResourceUsage(
+            user_cpu_time=self.user_cpu_time + other.user_cpu_time,
+            system_cpu_time=self.system_cpu_time + other.system_cpu_time,
+            max_rss_bytes=max(self.max_rss_bytes, other.max_rss_bytes),
+            block_input_operations=(
+                self.block_input_operations + other.block_input_operations
+            ),
+            block_output_operations=(
+                self.block_output_operations + other.block_output_operations
+            ),
+            processes_spawned=self.processes_spawned + other.processes_spawned,
+        )
+
+    def get_cpu_time(self) -> timedelta:
+        """Gets the total CPU time used.
+
+        Returns:
+            timedelta: The user and system CPU time used.
+        """
+        return self.user_cpu_time + self.system_cpu_time
+
+
+class ResourceUsageTracker:
+    """A class adding up the resources used by the commands a task runs."""
+
+    usage: ResourceUsage
+
+    def __init__(self) -> None:
+        """Init method for ResourceUsageTracker.
+
+        Returns:
+            None
+        """
+        self.usage = ResourceUsage()
+
+    def add(self, usage: ResourceUsage) -> None:
+        """Adds the resources used by a command.
+
+        Args:
+            usage (ResourceUsage): The resources used by the command.
+
+        Returns:
+            None
+        """
+        self.usage = self.usage.combine(other=usage)
+
+
+_active_trackers = threading.local()
+
+
+@contextmanager
+def track_resource_usage() -> Iterator[ResourceUsageTracker]:
+    """Adds up the resources used by commands run on this thread inside this context.
+
+    Yields:
+        ResourceUsageTracker: The tracker that the resources used are added to.
+    """
+    tracker = ResourceUsageTracker()
+    _active_trackers.tracker = tracker
+    try:
+        yield tracker
+    finally:
+        del _active_trackers.tracker
+
+
+def record_resource_usage(usage: ResourceUsage) -> None:
+    """Adds the resources used by a command to the tracker active on this thread.
+
+    Usage recorded outside of ``track_resource_usage`` is discarded.
+
+    Args:
+        usage (ResourceUsage): The resources used by the command.
+
+    Returns:
+        None
+    """
+    tracker: ResourceUsageTracker | None = getattr(_active_trackers, "tracker", None)
+    if tracker is not None:
+        tracker.add(usage=usage)
@@ -0,0 +1,111 @@
+"""Logic for sharing the build machine's CPUs and memory between running tasks.
+
+The scheduler takes a CPU budget for every task it starts from a pool holding every CPU
+available to the build, and returns the budget when the task finishes.  Tasks read their
+budget with ``get_task_cpu_budget``, e.g. to decide how many pytest workers to start, so
+that tasks running at the same time don't oversubscribe the machine.  The budget is held
+in a context variable, so work a task hands to its own threads with a copy of its
+context (``contextvars.copy_context``) keeps the task's budget.
+
+Attributes:
+    | FULL_MEMORY_WEIGHT: The memory weight of the whole build machine.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from build_support.ci_cd_tasks.task_node import TaskResources
+from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
+
+FULL_MEMORY_WEIGHT = 1.0
+
+
+class ResourcePool:
+    """A class tracking the CPUs and memory not yet given to running tasks."""
+
+    cpus_free: int
+    memory_weight_free: float
+    tasks_running: int
+
+    def __init__(self, cpus: int) -> None:
+        """Init method for ResourcePool.
+
+        Args:
+            cpus (int): The number of CPUs shared by all running tasks.
+
+        Returns:
+            None
+        """
+        self.cpus_free = cpus
+        self.memory_weight_free = FULL_MEMORY_WEIGHT
+        self.tasks_running = 0
+
+    def acquire(self, resources: TaskResources) -> int | None:
+        """Takes a CPU budget and memory for a task from the pool.
+
+        A task is given as many of the CPUs it can use as are free, and at least one.
+        A task that needs more memory than is free, or that would get no CPUs, only
+        starts once no other task is running, so that it never waits forever.
+
+        Args:
+            resources (TaskResources): The resources the task declared.
+
+        Returns:
+            int | None: The number of CPUs the task may use, or None if the task has
+                to wait for running tasks to release their resources.
+        """
+        if self.tasks_running and (
+            self.cpus_free < 1 or resources.memory_weight > self.memory_weight_free
+        ):
+            return None
+        cpu_budget = max(1, min(resources.cpus, self.cpus_free))
+        self.cpus_free -= cpu_budget
+        self.memory_weight_free -= resources.memory_weight
+        self.tasks_running += 1
+        return cpu_budget
+
+    def release(self, resources: TaskResources, cpu_budget: int) -> None:
+        """Returns the resources of a finished task to the pool.
+
+        Args:
+            resources (TaskResources): The resources the task declared.
+            cpu_budget (int): The number of CPUs the task was given.
+
+        Returns:
+            None
+        """
+        self.cpus_free += cpu_budget
+        self.memory_weight_free += resources.memory_weight
+        self.tasks_running -= 1
+
+
+_task_cpu_budget: ContextVar[int | None] = ContextVar("task_cpu_budget", default=None)
+
+
+@contextmanager
+def task_cpu_budget(cpus: int) -> Iterator[None]:
+    """Sets the CPU budget of the task running in this context.
+
+    Args:
+        cpus (int): The number of CPUs the task may use.
+
+    Yields:
+        None
+    """
+    budget_token = _task_cpu_budget.set(cpus)
+    try:
+        yield
+    finally:
+        _task_cpu_budget.reset(budget_token)
+
+
+def get_task_cpu_budget() -> int:
+    """Gets the number of CPUs the task running in this context may use.
+
+    Returns:
+        int: The task's CPU budget, or every CPU available to the build when called
+            outside of ``task_cpu_budget``.
+    """
+    cpus = _task_cpu_budget.get()
+    return THREADS_AVAILABLE if cpus is None else cpus
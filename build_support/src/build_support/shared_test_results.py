@@ -0,0 +1,289 @@
+"""Logic for sharing which tests have passed between the machines that build a project.
+
+The file cache only knows about the tests run on one machine, so a fresh CI runner would
+run every test again.  Every passing test is also added to a shared result store, under
+a key made from the test file and the digest of every input it ran against, with paths
+relative to the project root.  A test is skipped if the store holds a result for the
+same inputs, wherever that result came from.  The inputs include the files that set up
+the dev environment, so results from a machine with other dependencies aren't used.
+
+Stores implement SharedResultStore.  The default, DirectorySharedResultStore, keeps
+each result in its own file in ``build/shared_test_results``, which CI can save and
+restore as a cache artifact.  Passing ``SHARED_TEST_RESULTS_DIR`` to make mounts a
+directory into the build container instead, e.g. a volume shared by every runner, and
+sets SHARED_TEST_RESULTS_PATH_ENV_VAR to where it is mounted.  Each build prunes the
+results that haven't been added or used for SHARED_RESULT_MAX_AGE, so the store doesn't
+grow without bound.
+
+Attributes:
+    | SHARED_TEST_RESULTS_PATH_ENV_VAR: The environment variable holding the directory
+        of the shared result store, if it isn't in the build directory.
+    | SHARED_RESULT_MAX_AGE: How long a result is kept without being added or used.
+"""
+
+import hashlib
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from pydantic import BaseModel
+from yaml import safe_dump, safe_load
+
+from build_support.ci_cd_vars.build_paths import get_shared_test_results_dir
+
+SHARED_TEST_RESULTS_PATH_ENV_VAR = "SHARED_TEST_RESULTS_PATH"
+SHARED_RESULT_MAX_AGE = timedelta(days=30)
+
+
+def get_shared_result_key(test_file: str, input_digests: dict[str, str]) -> str:
+    """Gets the key a test's result against some inputs is stored under.
+
+    Args:
+        test_file (str): The test file, relative to the project root.
+        input_digests (dict[str, str]): The digests of the test's inputs, keyed by
+            paths relative to the project root.
+
+    Returns:
+        str: The BLAKE2b digest of the test file and its input digests.
+    """
+    return hashlib.blake2b(
+        json.dumps([test_file, input_digests], sort_keys=True).encode()
+    ).hexdigest()
+
+
+def get_shareable_test_inputs(
+    test_file: Path, input_digests: dict[str, str], project_root: Path
+) -> tuple[str, dict[str, str]]:
+    """Makes the paths of a test file and its inputs relative to the project root.
+
+    Args:
+        test_file (Path): The path to the test file.
+        input_digests (dict[str, str]): The digests of the test's inputs, keyed by
+            absolute path.
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        tuple[str, dict[str, str]]: The test file and the digests of its inputs,
+            with paths relative to the project root.
+    """
+    return str(test_file.relative_to(project_root)), {
+        str(Path(input_file).relative_to(project_root)): digest
+        for input_file, digest in input_digests.items()
+    }
+
+
+class PassedTest(BaseModel):
+    """An object recording that a test passed against inputs with the given digests.
+
+    Paths are relative to the project root, so that results can be shared between
+    machines that have the project in different places.
+    """
+
+    test_file: str
+    input_digests: dict[str, str]
+    tests_passed: datetime
+
+    @classmethod
+    def from_test_run(
+        cls,
+        test_file: Path,
+        input_digests: dict[str, str],
+        tests_passed: datetime,
+        project_root: Path,
+    ) -> "PassedTest":
+        """Builds an object from the absolute paths used by the file cache.
+
+        Args:
+            test_file (Path): The path to the test file.
+            input_digests (dict[str, str]): The digests of the test's inputs, keyed by
+                absolute path.
+            tests_passed (datetime): When the test passed.
+            project_root (Path): Path to this project's root.
+
+        Returns:
+            PassedTest: A record of the test passing, with paths relative to the
+                project root.
+        """
+        shareable_test_file, shareable_digests = get_shareable_test_inputs(
+            test_file=test_file, input_digests=input_digests, project_root=project_root
+        )
+        return PassedTest(
+            test_file=shareable_test_file,
+            input_digests=shareable_digests,
+            tests_passed=tests_passed,
+        )
+
+    def get_key(self) -> str:
+        """Gets the key this result is stored under.
+
+        Returns:
+            str: The key of the test file and its input digests.
+        """
+        return get_shared_result_key(
+            test_file=self.test_file, input_digests=self.input_digests
+        )
+
+    @classmethod
+    def from_yaml(cls, yaml_str: str) -> "PassedTest":
+        """Builds an object from a YAML str.
+
+        Args:
+            yaml_str (str): String of the YAML representation of a PassedTest instance.
+
+        Returns:
+            PassedTest: A PassedTest object parsed from the YAML.
+        """
+        return PassedTest.model_validate(safe_load(yaml_str))
+
+    def to_yaml(self) -> str:
+        """Dumps object as a yaml str.
+
+        Returns:
+            str: A YAML representation of this PassedTest instance.
+        """
+        return safe_dump(self.model_dump(mode="json"))
+
+
+class SharedResultStore(ABC):
+    """An abstract store of passing test results, shared by the machines using it."""
+
+    @abstractmethod
+    def has_passed(self, result_key: str) -> bool:
+        """Checks if a test passed against the inputs with the given key.
+
+        Args:
+            result_key (str): The key of the test file and its input digests.
+
+        Returns:
+            bool: True if a passing result is stored under the key.
+        """
+
+    @abstractmethod
+    def add(self, passed_test: PassedTest) -> None:
+        """Adds a passing test result to the store.
+
+        Args:
+            passed_test (PassedTest): The passing test result.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def prune(self, max_age: timedelta) -> None:
+        """Removes the results that weren't added or used within some time.
+
+        Args:
+            max_age (timedelta): How long a result is kept without being added or used.
+
+        Returns:
+            None
+        """
+
+
+def _write_atomically(path: Path, content: str) -> None:
+    # Machines sharing the store can write the same result at the same time
+    temp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    temp_path.write_text(content)
+    temp_path.replace(path)
+
+
+class DirectorySharedResultStore(SharedResultStore):
+    """A shared result store kept in a directory, with one file per passing result.
+
+    Results are written to a temporary file and renamed into place, so a half written
+    result is never read by another machine sharing the directory.
+    """
+
+    store_dir: Path
+
+    def __init__(self, store_dir: Path) -> None:
+        """Init method for DirectorySharedResultStore.
+
+        Args:
+            store_dir (Path): The directory holding the test results.
+
+        Returns:
+            None
+        """
+        self.store_dir = store_dir
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_result_path(self, result_key: str) -> Path:
+        return self.store_dir.joinpath(f"{result_key}.yaml")
+
+    def has_passed(self, result_key: str) -> bool:
+        """Checks if a test passed against the inputs with the given key.
+
+        A result that is found is marked as used, so that it isn't pruned.
+
+        Args:
+            result_key (str): The key of the test file and its input digests.
+
+        Returns:
+            bool: True if a passing result is stored under the key.
+        """
+        try:
+            os.utime(self._get_result_path(result_key=result_key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def add(self, passed_test: PassedTest) -> None:
+        """Adds a passing test result to the store.
+
+        Args:
+            passed_test (PassedTest): The passing test result.
+
+        Returns:
+            None
+        """
+        _write_atomically(
+            path=self._get_result_path(result_key=passed_test.get_key()),
+            content=passed_test.to_yaml(),
+        )
+
+    def prune(self, max_age: timedelta) -> None:
+        """Removes the results that weren't added or used within some time.
+
+        Temporary files left by writes that were interrupted are removed as well.
+
+        Args:
+            max_age (timedelta): How long a result is kept without being added or used.
+
+        Returns:
+            None
+        """
+        oldest_kept = time.time() - max_age.total_seconds()
+        for result_path in self.store_dir.iterdir():
+            try:
+                if result_path.stat().st_mtime < oldest_kept:
+                    result_path.unlink()
+            except FileNotFoundError:
+                # Another machine sharing the store removed it first
+                continue
+
+
+def get_shared_result_store(project_root: Path) -> SharedResultStore:
+    """Gets the shared result store used by this build.
+
+    Args:
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        SharedResultStore: A store in the directory named by
+            SHARED_TEST_RESULTS_PATH_ENV_VAR, or in the build directory if it isn't
+            set.
+    """
+    store_dir = os.environ.get(SHARED_TEST_RESULTS_PATH_ENV_VAR)
+    return DirectorySharedResultStore(
+        store_dir=(
+            Path(store_dir)
+            if store_dir
+            else get_shared_test_results_dir(project_root=project_root)
+        )
+    )
@@ -0,0 +1,214 @@
+"""Logic for skipping tasks whose inputs have not changed since they last succeeded.
+
+A task opts in to caching by returning a TaskCacheSpec from ``TaskNode.cache_spec``.
+Before the task is run a fingerprint of its declared inputs and of the build_support
+code that runs it is calculated.  If the fingerprint matches the one recorded after the
+task last succeeded, the task's outputs are restored from a local content-addressed
+store instead of running the task.  Files in the caches tools write, like
+``__pycache__``, are never part of a task's inputs or outputs.
+
+The store lives in the build directory.  Every output file is saved once under the
+SHA-256 digest of its content, and each task has an entry recording its fingerprint
+and the digest of every output file it produced.
+
+Attributes:
+    | HASH_CHUNK_SIZE: The number of bytes read at a time when hashing a file.
+    | MISSING_PATH_DIGEST: The digest recorded for an input path that does not exist.
+    | UNSET_ENV_VAR_VALUE: The value recorded for an input env var that is not set.
+"""
+
+import hashlib
+import os
+import shutil
+from collections.abc import Iterator
+from functools import cache
+from pathlib import Path
+
+from pydantic import BaseModel
+from yaml import safe_dump, safe_load
+
+from build_support.ci_cd_tasks.task_node import TaskNode
+from build_support.ci_cd_vars.build_paths import get_task_cache_dir
+from build_support.ci_cd_vars.project_structure import maybe_build_dir
+from build_support.file_caching import CACHE_DIR_NAMES
+
+HASH_CHUNK_SIZE = 1024 * 1024
+MISSING_PATH_DIGEST = "MISSING"
+UNSET_ENV_VAR_VALUE = "UNSET"
+
+
+class TaskCacheEntry(BaseModel):
+    """An object recording the outputs of the last successful run of a task."""
+
+    fingerprint: str
+    outputs: dict[str, str] = {}
+
+    @staticmethod
+    def from_yaml(yaml_str: str) -> "TaskCacheEntry":
+        """Builds an object from a yaml str.
+
+        Args:
+            yaml_str (str): String of the YAML representation of a TaskCacheEntry.
+
+        Returns:
+            TaskCacheEntry: A TaskCacheEntry object parsed from the YAML.
+        """
+        return TaskCacheEntry.model_validate(safe_load(yaml_str))
+
+    def to_yaml(self) -> str:
+        """Dumps object as a yaml str.
+
+        Returns:
+            str: A YAML representation of this TaskCacheEntry instance.
+        """
+        return safe_dump(self.model_dump(mode="json"))
+
+
+def get_file_digest(file_path: Path) -> str:
+    """Gets the SHA-256 digest of a file's content.
+
+    Args:
+        file_path (Path): The path to the file.
+
+    Returns:
+        str: The hex digest of the file's content.
+    """
+    file_hash = hashlib.sha256()
+    with file_path.open("rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _get_all_files(paths: list[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(
+                file
+                for file in path.rglob("*")
+                if file.is_file() and CACHE_DIR_NAMES.isdisjoint(file.parts)
+            )
+        elif path.is_file():
+            yield path
+
+
+@cache
+def _get_build_code_digests() -> tuple[tuple[str, str], ...]:
+    # Changing how a task runs, in its own module or any it uses, must rerun it
+    package_dir = Path(__file__).parent
+    return tuple(
+        (str(file.relative_to(package_dir)), get_file_digest(file_path=file))
+        for file in _get_all_files(paths=[package_dir])
+    )
+
+
+def _get_task_cache_objects_dir(project_root: Path) -> Path:
+    return maybe_build_dir(
+        dir_to_build=get_task_cache_dir(project_root=project_root).joinpath("objects")
+    )
+
+
+def _get_task_cache_entry_path(task: TaskNode, project_root: Path) -> Path:
+    return maybe_build_dir(
+        dir_to_build=get_task_cache_dir(project_root=project_root).joinpath("entries")
+    ).joinpath(f"{task.task_label()}.yaml")
+
+
+def get_task_fingerprint(task: TaskNode, project_root: Path) -> str | None:
+    """Calculates a fingerprint of everything a task's result depends on.
+
+    Args:
+        task (TaskNode): The task to fingerprint.
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        str | None: The fingerprint of the task's inputs, or None if the task does not
+            declare a cache spec.
+    """
+    cache_spec = task.cache_spec()
+    if cache_spec is None:
+        return None
+    fingerprint = hashlib.sha256()
+    fingerprint.update(f"task:{task.task_label()}\n".encode())
+    for code_file, code_digest in _get_build_code_digests():
+        fingerprint.update(f"code:{code_file}:{code_digest}\n".encode())
+    for input_path in sorted(cache_spec.input_paths):
+        relative_path = input_path.relative_to(project_root)
+        if not input_path.exists():
+            fingerprint.update(f"path:{relative_path}:{MISSING_PATH_DIGEST}\n".encode())
+        for file in _get_all_files(paths=[input_path]):
+            file_digest = get_file_digest(file_path=file)
+            relative_file = file.relative_to(project_root)
+            fingerprint.update(f"file:{relative_file}:{file_digest}\n".encode())
+    for env_var_name in sorted(cache_spec.env_var_names):
+        env_var_value = os.environ.get(env_var_name, UNSET_ENV_VAR_VALUE)
+        fingerprint.update(f"env:{env_var_name}={env_var_value}\n".encode())
+    task_info = task.get_basic_task_info().model_dump(mode="json")
+    for field_name in sorted(cache_spec.task_info_fields):
+        fingerprint.update(f"info:{field_name}={task_info[field_name]}\n".encode())
+    return fingerprint.hexdigest()
+
+
+def restore_task_outputs(task: TaskNode, fingerprint: str, project_root: Path) -> bool:
+    """Restores a task's outputs if the task last succeeded with the same inputs.
+
+    Args:
+        task (TaskNode): The task to restore the outputs of.
+        fingerprint (str): The fingerprint of the task's current inputs.
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        bool: True if the outputs were restored and the task can be skipped,
+            otherwise False.
+    """
+    cache_spec = task.cache_spec()
+    entry_path = _get_task_cache_entry_path(task=task, project_root=project_root)
+    if cache_spec is None or not entry_path.exists():
+        return False
+    entry = TaskCacheEntry.from_yaml(entry_path.read_text())
+    objects_dir = _get_task_cache_objects_dir(project_root=project_root)
+    if entry.fingerprint != fingerprint or not all(
+        objects_dir.joinpath(digest).exists() for digest in entry.outputs.values()
+    ):
+        return False
+    for output_path in cache_spec.output_paths:
+        if output_path.is_dir():
+            shutil.rmtree(output_path)
+        elif output_path.exists():
+            output_path.unlink()
+    for relative_file, digest in entry.outputs.items():
+        output_file = project_root.joinpath(relative_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        # Restores the output as the task produced it, modification time included
+        shutil.copy2(src=objects_dir.joinpath(digest), dst=output_file)
+    return True
+
+
+def store_task_outputs(task: TaskNode, fingerprint: str, project_root: Path) -> None:
+    """Saves a task's outputs to the store after the task succeeds.
+
+    Args:
+        task (TaskNode): The task that succeeded.
+        fingerprint (str): The fingerprint of the task's inputs before it was run.
+        project_root (Path): Path to this project's root.
+
+    Returns:
+        None
+    """
+    cache_spec = task.cache_spec()
+    if cache_spec is None:
+        return
+    objects_dir = _get_task_cache_objects_dir(project_root=project_root)
+    entry = TaskCacheEntry(fingerprint=fingerprint)
+    for output_file in _get_all_files(paths=cache_spec.output_paths):
+        digest = get_file_digest(file_path=output_file)
+        object_path = objects_dir.joinpath(digest)
+        if not object_path.exists():
+            # Copy then rename so a concurrent task never sees a partial object
+            partial_object_path = objects_dir.joinpath(f"{digest}.{task.task_label()}")
+            shutil.copy2(src=output_file, dst=partial_object_path)
+            partial_object_path.replace(object_path)
+        entry.outputs[str(output_file.relative_to(project_root))] = digest
+    _get_task_cache_entry_path(task=task, project_root=project_root).write_text(
+        entry.to_yaml()
+    )
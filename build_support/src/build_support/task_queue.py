@@ -0,0 +1,605 @@
+"""Logic for handing the tasks of a build to worker processes through a queue.
+
+When a build is distributed the scheduler doesn't run tasks itself.  Each ready task is
+submitted to a queue as a TaskSpec, holding the task's class, its BasicTaskInfo and its
+subproject context, and is claimed by one of any number of workers started with
+``task_worker.py``.  The worker rebuilds the task, runs it, streams its log back through
+the queue, and reports whether it passed along with its duration and resource usage.
+
+Queue backends implement TaskQueue.  DirectoryTaskQueue is the reference backend and
+keeps the queue in a directory.  Workers must run on the same host as the build: tasks
+such as SetupDevEnvironment build Docker images only on the host that runs them, and
+the file cache's SQLite database isn't safe to share over a network filesystem.
+
+A worker holds a lease on each task it claims and renews it while the task runs.  A
+task whose lease runs out is handed to another worker, and a task that isn't finished
+by its deadline fails.
+
+Attributes:
+    | QUEUE_POLL_INTERVAL: The time between checks of the queue for tasks or results.
+    | QUEUE_CLAIM_LEASE: How long a claimed task is kept by a worker that stopped
+        renewing its claim.
+    | QUEUE_TASK_DEADLINE: How long a queued task may take to finish before it fails.
+    | logger: Module-level logger for the output of tasks run by workers.
+"""
+
+import importlib
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from pydantic import BaseModel
+from yaml import safe_dump, safe_load
+
+from build_support.ci_cd_tasks.task_node import (
+    BasicTaskInfo,
+    PerSubprojectTask,
+    TaskNode,
+)
+from build_support.ci_cd_vars.subproject_structure import SubprojectContext
+from build_support.resource_accounting import ResourceUsage
+
+QUEUE_POLL_INTERVAL = timedelta(seconds=0.1)
+QUEUE_CLAIM_LEASE = timedelta(seconds=30)
+QUEUE_TASK_DEADLINE = timedelta(hours=2)
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSpec(BaseModel):
+    """An object containing everything a worker needs to rebuild and run a task."""
+
+    task_label: str
+    task_module: str
+    task_class: str
+    basic_task_info: BasicTaskInfo
+    subproject_context: SubprojectContext | None = None
+
+    @staticmethod
+    def from_task(task: TaskNode) -> "TaskSpec":
+        """Builds an object describing a task.
+
+        Args:
+            task (TaskNode): The task to describe.
+
+        Returns:
+            TaskSpec: A TaskSpec that rebuilds the task.
+        """
+        return TaskSpec(
+            task_label=task.task_label(),
+            task_module=type(task).__module__,
+            task_class=type(task).__qualname__,
+            basic_task_info=task.get_basic_task_info(),
+            subproject_context=(
+                task.subproject_context if isinstance(task, PerSubprojectTask) else None
+            ),
+        )
+
+    def build_task(self) -> TaskNode:
+        """Rebuilds the task this object describes.
+
+        Returns:
+            TaskNode: The task described.
+
+        Raises:
+            TypeError: If the class described isn't a task.
+            ValueError: If the class described doesn't match the subproject context.
+        """
+        task_class = getattr(importlib.import_module(self.task_module), self.task_class)
+        if not (isinstance(task_class, type) and issubclass(task_class, TaskNode)):
+            msg = f"{self.task_module}.{self.task_class} is not a TaskNode."
+            raise TypeError(msg)
+        is_per_subproject_task = issubclass(task_class, PerSubprojectTask)
+        if is_per_subproject_task and self.subproject_context:
+            return task_class(
+                basic_task_info=self.basic_task_info,
+                subproject_context=self.subproject_context,
+            )
+        if not is_per_subproject_task and self.subproject_context is None:
+            return task_class(basic_task_info=self.basic_task_info)
+        msg = (
+            "Incoherent task spec.\n"
+            f"\ttask_class: {self.task_class}\n"
+            f"\tsubproject_context: {self.subproject_context}"
+        )
+        raise ValueError(msg)
+
+    @staticmethod
+    def from_yaml(yaml_str: str) -> "TaskSpec":
+        """Builds an object from a yaml str.
+
+        Args:
+            yaml_str (str): String of the YAML representation of a TaskSpec.
+
+        Returns:
+            TaskSpec: A TaskSpec object parsed from the YAML.
+        """
+        return TaskSpec.model_validate(safe_load(yaml_str))
+
+    def to_yaml(self) -> str:
+        """Dumps object as a yaml str.
+
+        Returns:
+            str: A YAML representation of this TaskSpec instance.
+        """
+        return safe_dump(self.model_dump(mode="json"))
+
+
+class TaskResult(BaseModel):
+    """An object containing the outcome of a task run by a worker."""
+
+    task_label: str
+    worker: str
+    succeeded: bool
+    duration: timedelta
+    resource_usage: ResourceUsage = ResourceUsage()
+    restored_from_cache: bool = False
+    error: str = ""
+
+    @staticmethod
+    def from_yaml(yaml_str: str) -> "TaskResult":
+        """Builds an object from a yaml str.
+
+        Args:
+            yaml_str (str): String of the YAML representation of a TaskResult.
+
+        Returns:
+            TaskResult: A TaskResult object parsed from the YAML.
+        """
+        return TaskResult.model_validate(safe_load(yaml_str))
+
+    def to_yaml(self) -> str:
+        """Dumps object as a yaml str.
+
+        Returns:
+            str: A YAML representation of this TaskResult instance.
+        """
+        return safe_dump(self.model_dump(mode="json"))
+
+
+class RemoteTaskError(Exception):
+    """Raised when a task run by a worker fails."""
+
+    def __init__(self, task_result: TaskResult) -> None:
+        """Initializes the error with the result reported by the worker.
+
+        Args:
+            task_result (TaskResult): The result of the failed task.
+
+        Returns:
+            None
+        """
+        super().__init__(
+            f"{task_result.task_label} failed on worker {task_result.worker}:\n"
+            f"{task_result.error}"
+        )
+        self.task_result = task_result
+
+
+class TaskQueue(ABC):
+    """An abstract queue connecting the scheduler of a build to its workers."""
+
+    @abstractmethod
+    def submit(self, task_spec: TaskSpec) -> None:
+        """Adds a task to the queue, discarding the log and result of any earlier run.
+
+        Args:
+            task_spec (TaskSpec): The task to add.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def claim(self, worker: str) -> TaskSpec | None:
+        """Takes the oldest task from the queue, so that no other worker runs it.
+
+        Args:
+            worker (str): The name of the worker claiming the task.
+
+        Returns:
+            TaskSpec | None: The task claimed, or None if the queue is empty.
+        """
+
+    @abstractmethod
+    def renew_claim(self, task_label: str, worker: str) -> None:
+        """Renews the lease of a worker on a task it claimed.
+
+        Args:
+            task_label (str): The label of the task claimed.
+            worker (str): The name of the worker that claimed the task.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def requeue_expired_claim(self, task_label: str, claim_lease: timedelta) -> bool:
+        """Hands a task back to the queue if its worker stopped renewing its claim.
+
+        Args:
+            task_label (str): The label of the task.
+            claim_lease (timedelta): How long a claim lasts without being renewed.
+
+        Returns:
+            bool: Whether the task was handed back to the queue.
+        """
+
+    @abstractmethod
+    def withdraw(self, task_label: str) -> None:
+        """Removes a task from the queue, whether it's pending or claimed.
+
+        A worker still running the task can no longer report its outcome.
+
+        Args:
+            task_label (str): The label of the task.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every pending and claimed task, such as those of interrupted builds.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def append_log(self, task_label: str, level: int, message: str) -> None:
+        """Adds a message to the log of a task.
+
+        Args:
+            task_label (str): The label of the task that logged the message.
+            level (int): The level the message was logged at.
+            message (str): The message logged.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def read_log(self, task_label: str, messages_read: int) -> list[tuple[int, str]]:
+        """Reads the messages added to the log of a task since it was last read.
+
+        Args:
+            task_label (str): The label of the task.
+            messages_read (int): The number of messages already read.
+
+        Returns:
+            list[tuple[int, str]]: The level and text of each new message.
+        """
+
+    @abstractmethod
+    def finish(self, task_result: TaskResult) -> None:
+        """Reports the outcome of a claimed task.
+
+        The outcome is dropped if the worker's claim on the task was withdrawn or
+        handed to another worker.
+
+        Args:
+            task_result (TaskResult): The outcome of the task.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def get_result(self, task_label: str) -> TaskResult | None:
+        """Gets the outcome of a task.
+
+        Args:
+            task_label (str): The label of the task.
+
+        Returns:
+            TaskResult | None: The outcome of the task, or None if it hasn't finished.
+        """
+
+    def run_task(
+        self,
+        task: TaskNode,
+        poll_interval: timedelta = QUEUE_POLL_INTERVAL,
+        claim_lease: timedelta = QUEUE_CLAIM_LEASE,
+        deadline: timedelta = QUEUE_TASK_DEADLINE,
+    ) -> TaskResult:
+        """Submits a task and waits for a worker to finish it.
+
+        The task's log is re-logged by this process as it arrives.  The result is
+        checked before the log is read, so every message is logged before returning.
+        A task whose worker stopped renewing its claim is handed to another worker, and
+        a task that isn't finished by the deadline is withdrawn and fails.
+
+        Args:
+            task (TaskNode): The task to run.
+            poll_interval (timedelta): The time between checks for the result.
+            claim_lease (timedelta): How long a claim lasts without being renewed.
+            deadline (timedelta): How long the task may take to finish.
+
+        Returns:
+            TaskResult: The outcome of the task.
+        """
+        task_label = task.task_label()
+        self.submit(task_spec=TaskSpec.from_task(task=task))
+        start = datetime.now(tz=UTC)
+        messages_read = 0
+        while True:
+            task_result = self.get_result(task_label=task_label)
+            for level, message in self.read_log(
+                task_label=task_label, messages_read=messages_read
+            ):
+                logger.log(level, "%s", message)
+                messages_read += 1
+            if task_result is not None:
+                return task_result
+            elapsed = datetime.now(tz=UTC) - start
+            if elapsed > deadline:
+                self.withdraw(task_label=task_label)
+                return TaskResult(
+                    task_label=task_label,
+                    worker="none",
+                    succeeded=False,
+                    duration=elapsed,
+                    error=f"Not finished within {deadline}.",
+                )
+            if self.requeue_expired_claim(
+                task_label=task_label, claim_lease=claim_lease
+            ):
+                logger.warning(
+                    "Requeued %s, its worker stopped responding.", task_label
+                )
+            time.sleep(poll_interval.total_seconds())
+
+
+def _write_atomically(path: Path, content: str) -> None:
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_text(content)
+    temp_path.replace(path)
+
+
+class DirectoryTaskQueue(TaskQueue):
+    """A task queue kept in a directory, shared by the build and workers of one host.
+
+    Tasks are claimed by renaming them from the pending directory into the claimed
+    directory, under the name of the worker claiming them.  Renaming is atomic, so only
+    one worker can claim each task.  A worker renews its claim by touching the claimed
+    file.
+    """
+
+    pending_dir: Path
+    claimed_dir: Path
+    log_dir: Path
+    result_dir: Path
+
+    def __init__(self, queue_dir: Path) -> None:
+        """Init method for DirectoryTaskQueue.
+
+        Args:
+            queue_dir (Path): The directory holding the queue.
+
+        Returns:
+            None
+        """
+        self.pending_dir = queue_dir.joinpath("pending")
+        self.claimed_dir = queue_dir.joinpath("claimed")
+        self.log_dir = queue_dir.joinpath("logs")
+        self.result_dir = queue_dir.joinpath("results")
+        for queue_subdir in (
+            self.pending_dir,
+            self.claimed_dir,
+            self.log_dir,
+            self.result_dir,
+        ):
+            queue_subdir.mkdir(parents=True, exist_ok=True)
+
+    def _get_log_path(self, task_label: str) -> Path:
+        return self.log_dir.joinpath(f"{task_label}.log")
+
+    def _get_result_path(self, task_label: str) -> Path:
+        return self.result_dir.joinpath(f"{task_label}.yaml")
+
+    def _get_pending_path(self, task_label: str) -> Path:
+        return self.pending_dir.joinpath(f"{task_label}.yaml")
+
+    def _get_claimed_path(self, task_label: str, worker: str) -> Path:
+        return self.claimed_dir.joinpath(task_label, f"{worker}.yaml")
+
+    def submit(self, task_spec: TaskSpec) -> None:
+        """Adds a task to the queue, discarding the log and result of any earlier run.
+
+        Args:
+            task_spec (TaskSpec): The task to add.
+
+        Returns:
+            None
+        """
+        self._get_log_path(task_label=task_spec.task_label).unlink(missing_ok=True)
+        self._get_result_path(task_label=task_spec.task_label).unlink(missing_ok=True)
+        _write_atomically(
+            path=self._get_pending_path(task_label=task_spec.task_label),
+            content=task_spec.to_yaml(),
+        )
+
+    def claim(self, worker: str) -> TaskSpec | None:
+        """Takes the oldest task from the queue, so that no other worker runs it.
+
+        Args:
+            worker (str): The name of the worker claiming the task.
+
+        Returns:
+            TaskSpec | None: The task claimed, or None if the queue is empty.
+        """
+        submitted_tasks = []
+        for pending_path in self.pending_dir.glob("*.yaml"):
+            try:
+                submitted_tasks.append((pending_path.stat().st_mtime_ns, pending_path))
+            except FileNotFoundError:
+                # Another worker claimed this task first
+                continue
+        for _, pending_path in sorted(submitted_tasks):
+            claimed_path = self._get_claimed_path(
+                task_label=pending_path.stem, worker=worker
+            )
+            claimed_path.parent.mkdir(exist_ok=True)
+            try:
+                pending_path.rename(claimed_path)
+                # Renaming keeps the time the task was submitted, so start the lease
+                os.utime(claimed_path)
+                return TaskSpec.from_yaml(claimed_path.read_text())
+            except FileNotFoundError:
+                # Another worker claimed this task first, or it was withdrawn
+                continue
+        return None
+
+    def renew_claim(self, task_label: str, worker: str) -> None:
+        """Renews the lease of a worker on a task it claimed.
+
+        Args:
+            task_label (str): The label of the task claimed.
+            worker (str): The name of the worker that claimed the task.
+
+        Returns:
+            None
+        """
+        try:
+            os.utime(self._get_claimed_path(task_label=task_label, worker=worker))
+        except FileNotFoundError:
+            # The claim was withdrawn or handed to another worker
+            return
+
+    def requeue_expired_claim(self, task_label: str, claim_lease: timedelta) -> bool:
+        """Hands a task back to the queue if its worker stopped renewing its claim.
+
+        Args:
+            task_label (str): The label of the task.
+            claim_lease (timedelta): How long a claim lasts without being renewed.
+
+        Returns:
+            bool: Whether the task was handed back to the queue.
+        """
+        expired_before = datetime.now(tz=UTC) - claim_lease
+        for claimed_path in self.claimed_dir.joinpath(task_label).glob("*.yaml"):
+            try:
+                renewed_at = datetime.fromtimestamp(
+                    claimed_path.stat().st_mtime, tz=UTC
+                )
+                if renewed_at >= expired_before:
+                    continue
+                claimed_path.rename(self._get_pending_path(task_label=task_label))
+            except FileNotFoundError:
+                # The worker finished the task in the meantime
+                continue
+            return True
+        return False
+
+    def withdraw(self, task_label: str) -> None:
+        """Removes a task from the queue, whether it's pending or claimed.
+
+        A worker still running the task can no longer report its outcome.
+
+        Args:
+            task_label (str): The label of the task.
+
+        Returns:
+            None
+        """
+        self._get_pending_path(task_label=task_label).unlink(missing_ok=True)
+        for claimed_path in self.claimed_dir.joinpath(task_label).glob("*.yaml"):
+            claimed_path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Removes every pending and claimed task, such as those of interrupted builds.
+
+        Returns:
+            None
+        """
+        for queued_path in (
+            *self.pending_dir.glob("*.yaml"),
+            *self.claimed_dir.glob("*/*.yaml"),
+        ):
+            queued_path.unlink(missing_ok=True)
+
+    def append_log(self, task_label: str, level: int, message: str) -> None:
+        """Adds a message to the log of a task.
+
+        Args:
+            task_label (str): The label of the task that logged the message.
+            level (int): The level the message was logged at.
+            message (str): The message logged.
+
+        Returns:
+            None
+        """
+        with self._get_log_path(task_label=task_label).open("a") as log_file:
+            log_file.write(json.dumps([level, message]) + "\n")
+
+    def read_log(self, task_label: str, messages_read: int) -> list[tuple[int, str]]:
+        """Reads the messages added to the log of a task since it was last read.
+
+        A message that is still being written is left to be read next time.
+
+        Args:
+            task_label (str): The label of the task.
+            messages_read (int): The number of messages already read.
+
+        Returns:
+            list[tuple[int, str]]: The level and text of each new message.
+        """
+        log_path = self._get_log_path(task_label=task_label)
+        if not log_path.exists():
+            return []
+        complete_lines = log_path.read_text().splitlines(keepends=True)
+        return [
+            (level, message)
+            for level, message in (
+                json.loads(line)
+                for line in complete_lines[messages_read:]
+                if line.endswith("\n")
+            )
+        ]
+
+    def finish(self, task_result: TaskResult) -> None:
+        """Reports the outcome of a claimed task.
+
+        The outcome is dropped if the worker's claim on the task was withdrawn or
+        handed to another worker.
+
+        Args:
+            task_result (TaskResult): The outcome of the task.
+
+        Returns:
+            None
+        """
+        claimed_path = self._get_claimed_path(
+            task_label=task_result.task_label, worker=task_result.worker
+        )
+        if not claimed_path.exists():
+            logger.warning(
+                "Dropped the outcome of %s, %s no longer holds its claim.",
+                task_result.task_label,
+                task_result.worker,
+            )
+            return
+        _write_atomically(
+            path=self._get_result_path(task_label=task_result.task_label),
+            content=task_result.to_yaml(),
+        )
+        claimed_path.unlink(missing_ok=True)
+
+    def get_result(self, task_label: str) -> TaskResult | None:
+        """Gets the outcome of a task.
+
+        Args:
+            task_label (str): The label of the task.
+
+        Returns:
+            TaskResult | None: The outcome of the task, or None if it hasn't finished.
+        """
+        result_path = self._get_result_path(task_label=task_label)
+        if not result_path.exists():
+            return None
+        return TaskResult.from_yaml(result_path.read_text())
@@ -0,0 +1,247 @@
+"""A "main" that runs tasks handed out by distributed builds.
+
+Start any number of workers on the host running the build, and run the build with
+``--distribute``.  Each worker claims one task at a time from the build's task queue,
+runs it with every CPU available to the worker, and reports the result back to the
+build along with everything the task logged.  While a task runs its claim is renewed
+in the background, so the build can tell a busy worker from one that stopped.
+
+Attributes:
+    | logger: Module-level logger for the tasks claimed by this worker.
+"""
+
+import logging
+import os
+import threading
+import time
+import traceback
+from argparse import ArgumentParser, Namespace
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import override
+
+from build_support.build_logging import _configure_build_logging
+from build_support.ci_cd_vars.build_paths import get_task_queue_dir
+from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
+from build_support.dag_engine import run_task
+from build_support.task_queue import (
+    QUEUE_CLAIM_LEASE,
+    QUEUE_POLL_INTERVAL,
+    DirectoryTaskQueue,
+    TaskQueue,
+    TaskResult,
+    TaskSpec,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TaskLogHandler(logging.Handler):
+    """A logging handler sending every record to the log of a task in a queue."""
+
+    task_queue: TaskQueue
+    task_label: str
+
+    def __init__(self, task_queue: TaskQueue, task_label: str) -> None:
+        """Init method for TaskLogHandler.
+
+        Args:
+            task_queue (TaskQueue): The queue the task was claimed from.
+            task_label (str): The label of the task being run.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.task_queue = task_queue
+        self.task_label = task_label
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        """Adds a record to the log of the task.
+
+        Args:
+            record (logging.LogRecord): The record logged.
+
+        Returns:
+            None
+        """
+        self.task_queue.append_log(
+            task_label=self.task_label,
+            level=record.levelno,
+            message=self.format(record),
+        )
+
+
+def get_worker_name() -> str:
+    """Gets a name identifying this worker.
+
+    Returns:
+        str: The host name and process ID of this worker.
+    """
+    return f"{os.uname().nodename}-{os.getpid()}"
+
+
+@contextmanager
+def renewing_claim(
+    task_queue: TaskQueue,
+    task_label: str,
+    worker: str,
+    renew_interval: timedelta = QUEUE_CLAIM_LEASE / 3,
+) -> Iterator[None]:
+    """Renews a worker's claim on a task in the background while inside this context.
+
+    Args:
+        task_queue (TaskQueue): The queue the task was claimed from.
+        task_label (str): The label of the task claimed.
+        worker (str): The name of the worker that claimed the task.
+        renew_interval (timedelta): The time between renewals of the claim.
+
+    Yields:
+        None
+    """
+    stopped = threading.Event()
+
+    def renew_until_stopped() -> None:
+        while not stopped.wait(timeout=renew_interval.total_seconds()):
+            task_queue.renew_claim(task_label=task_label, worker=worker)
+
+    renewer = threading.Thread(target=renew_until_stopped, daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        renewer.join()
+
+
+def run_claimed_task(task_queue: TaskQueue, task_spec: TaskSpec, worker: str) -> None:
+    """Runs a task claimed from a queue and reports its result to the queue.
+
+    Args:
+        task_queue (TaskQueue): The queue the task was claimed from.
+        task_spec (TaskSpec): The task claimed.
+        worker (str): The name of this worker.
+
+    Returns:
+        None
+    """
+    log_handler = TaskLogHandler(task_queue=task_queue, task_label=task_spec.task_label)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(log_handler)
+    start = datetime.now(tz=UTC)
+    try:
+        with renewing_claim(
+            task_queue=task_queue, task_label=task_spec.task_label, worker=worker
+        ):
+            duration, resource_usage, restored_from_cache = run_task(
+                task=task_spec.build_task(),
+                project_root=task_spec.basic_task_info.docker_project_root,
+                cpu_budget=THREADS_AVAILABLE,
+            )
+        task_result = TaskResult(
+            task_label=task_spec.task_label,
+            worker=worker,
+            succeeded=True,
+            duration=duration,
+            resource_usage=resource_usage,
+            restored_from_cache=restored_from_cache,
+        )
+    except Exception:  # noqa: BLE001 - every failure is reported to the build
+        task_result = TaskResult(
+            task_label=task_spec.task_label,
+            worker=worker,
+            succeeded=False,
+            duration=datetime.now(tz=UTC) - start,
+            error=traceback.format_exc(),
+        )
+    finally:
+        root_logger.removeHandler(log_handler)
+    task_queue.finish(task_result=task_result)
+
+
+def serve_tasks(
+    task_queue: TaskQueue,
+    worker: str,
+    max_idle_time: timedelta | None = None,
+    poll_interval: timedelta = QUEUE_POLL_INTERVAL,
+) -> None:
+    """Runs tasks from a queue one at a time.
+
+    Args:
+        task_queue (TaskQueue): The queue to claim tasks from.
+        worker (str): The name of this worker.
+        max_idle_time (timedelta | None): How long to wait for a task before
+            stopping, or None to serve tasks until the worker is killed.
+        poll_interval (timedelta): The time between checks of the queue.
+
+    Returns:
+        None
+    """
+    idle_since = datetime.now(tz=UTC)
+    while max_idle_time is None or datetime.now(tz=UTC) - idle_since < max_idle_time:
+        task_spec = task_queue.claim(worker=worker)
+        if task_spec is None:
+            time.sleep(poll_interval.total_seconds())
+            continue
+        logger.info("%s claimed: %s", worker, task_spec.task_label)
+        run_claimed_task(task_queue=task_queue, task_spec=task_spec, worker=worker)
+        idle_since = datetime.now(tz=UTC)
+
+
+def parse_args(args: list[str] | None = None) -> Namespace:
+    """Parses arguments from list given or the command line.
+
+    Args:
+        args (list[str] | None): Args to parse.  Defaults to None, causing
+            sys.argv[1:] to be used.
+
+    Returns:
+        Namespace: A namespace made from the parsed args.
+    """
+    parser = ArgumentParser(
+        prog="TaskWorker",
+        description="This tool exists to run the tasks of distributed builds.",
+    )
+    parser.add_argument(
+        "--docker-project-root",
+        type=Path,
+        required=True,
+        help="Path to project root on docker machines.",
+    )
+    parser.add_argument(
+        "--max-idle-seconds",
+        type=float,
+        default=None,
+        help="Stop after waiting this long for a task.  Defaults to never stopping.",
+    )
+    return parser.parse_args(args=args)
+
+
+def run_main(args: Namespace) -> None:
+    """Runs the logic for the task_worker main.
+
+    Args:
+        args (Namespace): A namespace generated by an ArgumentParser.
+
+    Returns:
+        None
+    """
+    _configure_build_logging()
+    serve_tasks(
+        task_queue=DirectoryTaskQueue(
+            queue_dir=get_task_queue_dir(project_root=args.docker_project_root)
+        ),
+        worker=get_worker_name(),
+        max_idle_time=(
+            None
+            if args.max_idle_seconds is None
+            else timedelta(seconds=args.max_idle_seconds)
+        ),
+    )
+
+
+if __name__ == "__main__":  # pragma: no cov - main
+    run_main(args=parse_args())
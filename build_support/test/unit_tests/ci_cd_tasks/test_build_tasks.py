@@ -3,13 +3,14 @@ from unittest.mock import call, patch
 import pytest
 from build_support.ci_cd_tasks.build_tasks import BuildAll, BuildDocs, BuildPypi
 from build_support.ci_cd_tasks.env_setup_tasks import SetupProdEnvironment
-from build_support.ci_cd_tasks.task_node import BasicTaskInfo
+from build_support.ci_cd_tasks.task_node import BasicTaskInfo, TaskCacheSpec
 from build_support.ci_cd_tasks.validation_tasks import (
     SubprojectUnitTests,
     ValidatePythonStyle,
 )
 from build_support.ci_cd_vars.build_paths import (
     get_build_docs_build_dir,
+    get_build_docs_dir,
     get_build_docs_source_dir,
     get_dist_dir,
 )
@@ -21,9 +22,18 @@ from build_support.ci_cd_vars.project_setting_vars import (
     get_project_name,
     get_project_version,
 )
-from build_support.ci_cd_vars.project_structure import get_docs_dir, get_sphinx_conf_dir
+from build_support.ci_cd_vars.project_structure import (
+    get_dockerfile,
+    get_docs_dir,
+    get_license_file,
+    get_pyproject_toml,
+    get_readme,
+    get_sphinx_conf_dir,
+    get_uv_lock_file,
+)
 from build_support.ci_cd_vars.subproject_structure import (
     SubprojectContext,
+    get_all_python_subprojects_with_src,
     get_python_subproject,
 )
 from build_support.process_runner import concatenate_args
@@ -51,6 +61,25 @@ def test_build_pypi_requires(basic_task_info: BasicTaskInfo) -> None:
     ]
 
 
+def test_build_pypi_cache_spec(basic_task_info: BasicTaskInfo) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    assert BuildPypi(basic_task_info=basic_task_info).cache_spec() == TaskCacheSpec(
+        input_paths=[
+            get_python_subproject(
+                subproject_context=SubprojectContext.PYPI,
+                project_root=docker_project_root,
+            ).get_src_dir(),
+            get_pyproject_toml(project_root=docker_project_root),
+            get_uv_lock_file(project_root=docker_project_root),
+            get_readme(project_root=docker_project_root),
+            get_license_file(project_root=docker_project_root),
+            get_dockerfile(project_root=docker_project_root),
+        ],
+        output_paths=[get_dist_dir(project_root=docker_project_root)],
+        env_var_names=["TAG_SUFFIX"],
+    )
+
+
 @pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
 def test_run_build_pypi(basic_task_info: BasicTaskInfo) -> None:
     with patch("build_support.ci_cd_tasks.build_tasks.run_process") as run_process_mock:
@@ -94,6 +123,27 @@ def test_build_docs_requires(basic_task_info: BasicTaskInfo) -> None:
     ]
 
 
+def test_build_docs_cache_spec(basic_task_info: BasicTaskInfo) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    assert BuildDocs(basic_task_info=basic_task_info).cache_spec() == TaskCacheSpec(
+        input_paths=[
+            get_docs_dir(project_root=docker_project_root),
+            *(
+                subproject.get_src_dir()
+                for subproject in get_all_python_subprojects_with_src(
+                    project_root=docker_project_root
+                )
+            ),
+            get_pyproject_toml(project_root=docker_project_root),
+            get_uv_lock_file(project_root=docker_project_root),
+            get_license_file(project_root=docker_project_root),
+            get_dockerfile(project_root=docker_project_root),
+        ],
+        output_paths=[get_build_docs_dir(project_root=docker_project_root)],
+        env_var_names=["TAG_SUFFIX"],
+    )
+
+
 @pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
 def test_run_build_docs(basic_task_info: BasicTaskInfo) -> None:
     with (
@@ -9,7 +9,9 @@ from _pytest.fixtures import SubRequest
 from build_support.ci_cd_tasks.task_node import (
     BasicTaskInfo,
     PerSubprojectTask,
+    TaskCacheSpec,
     TaskNode,
+    TaskResources,
 )
 from build_support.ci_cd_vars.subproject_structure import (
     SubprojectContext,
@@ -31,6 +33,7 @@ from pydantic import ValidationError
         {
             "ci_cd_feature_test_mode": False,
             "docker_project_root": "/usr/dev",
+            "fail_fast": True,
             "local_gid": 0,
             "local_uid": 0,
             "local_user_env": None,
@@ -61,6 +64,8 @@ def basic_task_info_yaml_str(basic_task_info_data_dict: dict[str, Any]) -> str:
     data_copy = deepcopy(basic_task_info_data_dict)
     if "ci_cd_feature_test_mode" not in data_copy:
         data_copy["ci_cd_feature_test_mode"] = False
+    if "fail_fast" not in data_copy:
+        data_copy["fail_fast"] = False
     if "local_user_env" not in data_copy:
         data_copy["local_user_env"] = None
     return yaml.dump(data_copy)
@@ -143,6 +148,14 @@ def test_load_bad_ci_cd_feature_test_mode(
         BasicTaskInfo.from_yaml(yaml_str=basic_task_info_yaml_str)
 
 
+def test_load_bad_fail_fast(basic_task_info_data_dict: dict[str, Any]) -> None:
+    data_copy = deepcopy(basic_task_info_data_dict)
+    data_copy["fail_fast"] = "Probably"
+    basic_task_info_yaml_str = yaml.dump(data_copy)
+    with pytest.raises(ValidationError):
+        BasicTaskInfo.from_yaml(yaml_str=basic_task_info_yaml_str)
+
+
 def test_load_bad_uid_gid_pair_uid_0() -> None:
     basic_task_info_data_dict = {
         "ci_cd_feature_test_mode": False,
@@ -258,6 +271,26 @@ def test_task_run_callable() -> None:
     assert True
 
 
+def test_task_cache_spec_defaults_to_none() -> None:
+    task_name = "test_task_cache_spec"
+    mock_task = build_mock_basic_task(task_name=task_name, required_mock_tasks=[])
+    assert mock_task.cache_spec() is None
+
+
+def test_task_cache_spec_defaults() -> None:
+    cache_spec = TaskCacheSpec(
+        input_paths=[Path("/input")], output_paths=[Path("/output")]
+    )
+    assert cache_spec.env_var_names == []
+    assert cache_spec.task_info_fields == []
+
+
+def test_task_resources_default_to_one_cpu() -> None:
+    task_name = "test_task_resources"
+    mock_task = build_mock_basic_task(task_name=task_name, required_mock_tasks=[])
+    assert mock_task.resources() == TaskResources(cpus=1, memory_weight=0.0)
+
+
 def test_task_hash() -> None:
     task_name = "test_task_hash"
     mock_task = build_mock_basic_task(task_name=task_name, required_mock_tasks=[])
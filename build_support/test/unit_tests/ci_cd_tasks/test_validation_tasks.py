@@ -1,22 +1,28 @@
+import os
 import re
 import shutil
-from copy import deepcopy
-from dataclasses import dataclass
+from collections.abc import Iterator
+from datetime import timedelta
 from itertools import islice
 from pathlib import Path
 from time import sleep
-from typing import Any, cast
-from unittest.mock import call, patch
+from typing import Any
+from unittest.mock import ANY, MagicMock, _Call, call, patch
 
 import pytest
-from _pytest.fixtures import SubRequest
+from build_support.build_tracing import trace_build, trace_span
 from build_support.ci_cd_tasks.env_setup_tasks import (
     GetGitInfo,
     GitInfo,
     SetupDevEnvironment,
     SetupProdEnvironment,
 )
-from build_support.ci_cd_tasks.task_node import BasicTaskInfo, TaskNode
+from build_support.ci_cd_tasks.task_node import (
+    BasicTaskInfo,
+    TaskCacheSpec,
+    TaskNode,
+    TaskResources,
+)
 from build_support.ci_cd_tasks.validation_tasks import (
     FEATURE_TEST_FILE_NAME_REGEX,
     AllSubprojectFeatureTests,
@@ -24,6 +30,8 @@ from build_support.ci_cd_tasks.validation_tasks import (
     AllSubprojectStaticTypeChecking,
     AllSubprojectUnitTests,
     EnforceProcess,
+    FeatureTestInfo,
+    StaticCheck,
     SubprojectFeatureTests,
     SubprojectUnitTests,
     UnitTestInfo,
@@ -31,7 +39,10 @@ from build_support.ci_cd_tasks.validation_tasks import (
     ValidatePythonStyle,
     ValidateSecurityChecks,
     ValidateStaticTypeChecking,
+    get_files_to_lint,
     get_subprojects_to_test,
+    get_test_file_input_files,
+    run_build_support_test_suite,
 )
 from build_support.ci_cd_vars.build_paths import get_git_info_yaml
 from build_support.ci_cd_vars.docker_vars import (
@@ -41,14 +52,17 @@ from build_support.ci_cd_vars.docker_vars import (
     get_docker_image_name,
     get_ty_extra_search_path_args,
 )
-from build_support.ci_cd_vars.file_and_dir_path_vars import (
-    get_all_non_test_folders,
-    get_all_test_folders,
-)
 from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
 from build_support.ci_cd_vars.project_structure import (
+    get_dockerfile,
+    get_docs_dir,
     get_feature_test_scratch_folder,
+    get_pyproject_toml,
+    get_readme,
     get_resource_dir,
+    get_sphinx_conf_dir,
+    get_static_check_config_files,
+    get_uv_lock_file,
 )
 from build_support.ci_cd_vars.subproject_structure import (
     PythonSubproject,
@@ -57,11 +71,16 @@ from build_support.ci_cd_vars.subproject_structure import (
     get_python_subproject,
     get_sorted_subproject_contexts,
 )
+from build_support.coverage_map import CoverageMap, CoverageTestSelector
 from build_support.file_caching import CONFTEST_NAME, FileCacheEngine
-from build_support.process_runner import concatenate_args
-from junitparser import JUnitXml, TestCase, TestSuite
+from build_support.process_runner import ProcessFailedError, concatenate_args
+from build_support.pytest_sizing import order_test_files
+from build_support.report_fragments import ReportFragmentStore, get_junit_classname
+from build_support.resource_accounting import ResourceUsage, record_resource_usage
+from build_support.resource_budget import get_task_cpu_budget, task_cpu_budget
+from coverage import CoverageData
+from junitparser import Failure, JUnitXml, TestCase, TestSuite
 from test_utils.empty_function_check import is_an_empty_function
-from tomlkit import TOMLDocument, parse
 
 
 def test_validate_all_requires(basic_task_info: BasicTaskInfo) -> None:
@@ -86,38 +105,431 @@ def test_enforce_process_requires(basic_task_info: BasicTaskInfo) -> None:
     ]
 
 
-@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
-def test_run_enforce_process(basic_task_info: BasicTaskInfo) -> None:
+def _write_junit_report(
+    report_path: Path,
+    durations: dict[Path, float],
+    project_root: Path,
+    failed_test_files: set[Path] | None = None,
+) -> None:
+    """Write a junit report with one test case for each test file."""
+    suite = TestSuite(name="pytest")
+    for test_file, duration in durations.items():
+        case = TestCase(
+            name="test_case",
+            classname=get_junit_classname(
+                test_file=test_file, project_root=project_root
+            ),
+            time=duration,
+        )
+        if failed_test_files and test_file in failed_test_files:
+            case.result = [Failure("assert False")]
+        suite.add_testcase(case)
+    xml = JUnitXml()
+    xml.add_testsuite(suite)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    xml.write(str(report_path))
+
+
+def _get_build_support_test_suite_args(
+    basic_task_info: BasicTaskInfo,
+    test_suite: PythonSubproject.TestSuite,
+    distribution_args: list[Any],
+    test_files: list[Path],
+    *,
+    fail_fast: bool = False,
+) -> list[str]:
     build_support_subproject = get_python_subproject(
         subproject_context=SubprojectContext.BUILD_SUPPORT,
         project_root=basic_task_info.docker_project_root,
     )
+    return concatenate_args(
+        args=[
+            get_docker_command_for_image(
+                non_docker_project_root=basic_task_info.non_docker_project_root,
+                docker_project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+            "pytest",
+            distribution_args,
+            ["--exitfirst"] if fail_fast else [],
+            build_support_subproject.get_pytest_whole_test_suite_report_args(
+                test_suite=test_suite
+            ),
+            test_files,
+        ]
+    )
+
+
+def _make_build_support_test_suite(
+    docker_project_root: Path, test_suite: PythonSubproject.TestSuite
+) -> list[Path]:
+    build_support_subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    )
+    test_suite_dir = build_support_subproject.get_test_suite_dir(test_suite=test_suite)
+    test_suite_dir.mkdir(parents=True, exist_ok=True)
+    test_files = [test_suite_dir.joinpath(f"test_{name}.py") for name in ("a", "b")]
+    for test_file in test_files:
+        test_file.write_text("")
+    test_suite_dir.joinpath("helpers.py").write_text("")
+    return test_files
+
+
+@pytest.mark.usefixtures("mock_static_check_config_files")
+def test_get_test_file_input_files(docker_project_root: Path) -> None:
+    python_files = [
+        _write_python_files(subproject=subproject)
+        for subproject in get_all_python_subprojects_dict(
+            project_root=docker_project_root
+        ).values()
+    ]
+    src_files = [
+        file_path
+        for src_file, _ in python_files
+        for file_path in (src_file.parent.joinpath("__init__.py"), src_file)
+    ]
+    build_support_src_files = [
+        file_path
+        for file_path in src_files
+        if file_path.is_relative_to(
+            get_python_subproject(
+                subproject_context=SubprojectContext.BUILD_SUPPORT,
+                project_root=docker_project_root,
+            ).get_src_dir()
+        )
+    ]
+    unit_test_files = [test_file for _, test_file in python_files]
+    style_test_files = _make_build_support_test_suite(
+        docker_project_root=docker_project_root,
+        test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT,
+    )
+    style_helpers = style_test_files[0].parent.joinpath("helpers.py")
+    process_test_files = _make_build_support_test_suite(
+        docker_project_root=docker_project_root,
+        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT,
+    )
+    process_helpers = process_test_files[0].parent.joinpath("helpers.py")
+    top_conftest = (
+        get_python_subproject(
+            subproject_context=SubprojectContext.BUILD_SUPPORT,
+            project_root=docker_project_root,
+        )
+        .get_test_dir()
+        .joinpath("conftest.py")
+    )
+    top_conftest.write_text("")
+    readme = get_readme(project_root=docker_project_root)
+    readme.write_text("# Readme\n")
+    agent_notes = [
+        docker_project_root.joinpath(name) for name in ("AGENTS.md", "CLAUDE.md")
+    ]
+    for agent_note in agent_notes:
+        agent_note.write_text("# Notes\n")
+    makefile = docker_project_root.joinpath("Makefile")
+    makefile.write_text(".PHONY: test\n")
+    ticket = get_docs_dir(project_root=docker_project_root).joinpath(
+        "tickets", "ticket.rst"
+    )
+    ticket.parent.mkdir(parents=True)
+    ticket.write_text("Ticket\n")
+    git_info_yaml = get_git_info_yaml(project_root=docker_project_root)
+    git_info_yaml.parent.mkdir(parents=True, exist_ok=True)
+    git_info_yaml.write_text("branch: main\n")
+    file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    )
+    common_inputs = [
+        *get_static_check_config_files(project_root=docker_project_root),
+        git_info_yaml,
+        top_conftest,
+        *build_support_src_files,
+    ]
+    style_test_dir = style_test_files[0].parent
+
+    for test_file_name in (
+        "test_docstrings.py",
+        "test_project_readme.py",
+        "test_sphinx_docs.py",
+    ):
+        style_test_dir.joinpath(test_file_name).write_text("")
+
+    def get_style_inputs(test_file_name: str) -> list[Path]:
+        test_file = style_test_dir.joinpath(test_file_name)
+        return get_test_file_input_files(
+            file_cache=file_cache,
+            test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT,
+            test_file=test_file,
+        )
+
+    def expected_style_inputs(test_file_name: str, *inputs: Path) -> list[Path]:
+        test_file = style_test_dir.joinpath(test_file_name)
+        return sorted({*common_inputs, test_file, style_helpers, *inputs})
+
+    # Editing the agent notes only reruns the tests that read them
+    assert get_style_inputs(test_file_name="test_docstrings.py") == (
+        expected_style_inputs("test_docstrings.py", *src_files)
+    )
+    assert get_style_inputs(test_file_name="test_project_readme.py") == (
+        expected_style_inputs("test_project_readme.py", readme, *agent_notes)
+    )
+    assert get_style_inputs(test_file_name="test_sphinx_docs.py") == (
+        expected_style_inputs("test_sphinx_docs.py", ticket, makefile, *src_files)
+    )
+    assert get_style_inputs(test_file_name=style_test_files[0].name) == (
+        expected_style_inputs(
+            style_test_files[0].name, ticket, makefile, readme, *agent_notes, *src_files
+        )
+    )
+    assert get_test_file_input_files(
+        file_cache=file_cache,
+        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT,
+        test_file=process_test_files[0],
+    ) == sorted(
+        {
+            *common_inputs,
+            *src_files,
+            ticket,
+            process_test_files[0],
+            process_helpers,
+            *style_test_files,
+            style_helpers,
+            *process_test_files,
+            *unit_test_files,
+        }
+    )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_run_build_support_test_suite(basic_task_info: BasicTaskInfo) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    test_suite = PythonSubproject.TestSuite.PROCESS_ENFORCEMENT
+    test_files = _make_build_support_test_suite(
+        docker_project_root=docker_project_root, test_suite=test_suite
+    )
+    report_path = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    ).get_pytest_report_path(
+        test_suite=test_suite, test_scope=PythonSubproject.TestScope.COMPLETE
+    )
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text("left by an earlier run")
+    file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    )
+
+    def write_report(args: list[str]) -> None:  # noqa: ARG001
+        _write_junit_report(
+            report_path=report_path,
+            durations={test_files[0]: 0.25, test_files[1]: 0.5},
+            project_root=docker_project_root,
+        )
+
+    # Nothing is known about the suite before its first run, so it uses every CPU
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process",
+        side_effect=write_report,
+    ) as run_process_mock:
+        run_build_support_test_suite(
+            non_docker_project_root=basic_task_info.non_docker_project_root,
+            docker_project_root=docker_project_root,
+            test_suite=test_suite,
+            fail_fast=False,
+        )
+        run_process_mock.assert_called_once_with(
+            args=_get_build_support_test_suite_args(
+                basic_task_info=basic_task_info,
+                test_suite=test_suite,
+                distribution_args=["-n", THREADS_AVAILABLE, "--dist", "worksteal"],
+                test_files=test_files,
+            )
+        )
+    assert file_cache.get_test_durations() == {
+        test_files[0]: timedelta(seconds=0.25),
+        test_files[1]: timedelta(seconds=0.5),
+    }
+    assert file_cache.get_failed_test_files() == set()
+    # The suite is skipped while none of its inputs change
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ) as run_process_mock:
+        run_build_support_test_suite(
+            non_docker_project_root=basic_task_info.non_docker_project_root,
+            docker_project_root=docker_project_root,
+            test_suite=test_suite,
+            fail_fast=False,
+        )
+        run_process_mock.assert_not_called()
+    test_files[0].write_text("a = 1\n")
+    # Every process enforcement test reads the other test files, so they all rerun,
+    # and they are too quick to be worth starting workers for
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process",
+        side_effect=write_report,
+    ) as run_process_mock:
+        run_build_support_test_suite(
+            non_docker_project_root=basic_task_info.non_docker_project_root,
+            docker_project_root=docker_project_root,
+            test_suite=test_suite,
+            fail_fast=True,
+        )
+        run_process_mock.assert_called_once_with(
+            args=_get_build_support_test_suite_args(
+                basic_task_info=basic_task_info,
+                test_suite=test_suite,
+                distribution_args=["-n", 0],
+                test_files=[test_files[1], test_files[0]],
+                fail_fast=True,
+            )
+        )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_run_build_support_test_suite_only_changed_test_files(
+    basic_task_info: BasicTaskInfo,
+) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    test_suite = PythonSubproject.TestSuite.STYLE_ENFORCEMENT
+    test_files = _make_build_support_test_suite(
+        docker_project_root=docker_project_root, test_suite=test_suite
+    )
+    with patch("build_support.ci_cd_tasks.validation_tasks.run_process"):
+        run_build_support_test_suite(
+            non_docker_project_root=basic_task_info.non_docker_project_root,
+            docker_project_root=docker_project_root,
+            test_suite=test_suite,
+            fail_fast=False,
+        )
+    test_files[0].write_text("a = 1\n")
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ) as run_process_mock:
+        run_build_support_test_suite(
+            non_docker_project_root=basic_task_info.non_docker_project_root,
+            docker_project_root=docker_project_root,
+            test_suite=test_suite,
+            fail_fast=False,
+        )
+        args = run_process_mock.call_args.kwargs["args"]
+        assert args[-1] == str(test_files[0])
+        assert str(test_files[1]) not in args
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_run_build_support_test_suite_failed_first(
+    basic_task_info: BasicTaskInfo,
+) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    test_suite = PythonSubproject.TestSuite.STYLE_ENFORCEMENT
+    test_files = _make_build_support_test_suite(
+        docker_project_root=docker_project_root, test_suite=test_suite
+    )
+    report_path = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    ).get_pytest_report_path(
+        test_suite=test_suite, test_scope=PythonSubproject.TestScope.COMPLETE
+    )
+    file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=docker_project_root,
+    )
+    file_cache.record_test_durations(
+        durations={
+            test_files[0]: timedelta(seconds=1),
+            test_files[1]: timedelta(seconds=5),
+        }
+    )
+    failure = ProcessFailedError(command_as_str="pytest", return_code=1)
+
+    def fail_test_a(args: list[str]) -> None:  # noqa: ARG001
+        _write_junit_report(
+            report_path=report_path,
+            durations={test_files[0]: 1, test_files[1]: 5},
+            project_root=docker_project_root,
+            failed_test_files={test_files[0]},
+        )
+        raise failure
+
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process",
+            side_effect=fail_test_a,
+        ),
+        pytest.raises(ProcessFailedError),
+    ):
+        run_build_support_test_suite(
+            non_docker_project_root=basic_task_info.non_docker_project_root,
+            docker_project_root=docker_project_root,
+            test_suite=test_suite,
+            fail_fast=False,
+        )
+    assert file_cache.get_failed_test_files() == {test_files[0]}
+    # The failed test file runs before the longer one
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process", side_effect=failure
+    ) as run_process_mock:
+        with pytest.raises(ProcessFailedError):
+            run_build_support_test_suite(
+                non_docker_project_root=basic_task_info.non_docker_project_root,
+                docker_project_root=docker_project_root,
+                test_suite=test_suite,
+                fail_fast=False,
+            )
+        assert run_process_mock.call_args.kwargs["args"][-2:] == [
+            str(test_files[0]),
+            str(test_files[1]),
+        ]
+    # Without a report, every test file that was meant to run is taken as failed
+    assert file_cache.get_failed_test_files() == set(test_files)
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_run_enforce_process(basic_task_info: BasicTaskInfo) -> None:
+    test_files = _make_build_support_test_suite(
+        docker_project_root=basic_task_info.docker_project_root,
+        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT,
+    )
     with patch(
         "build_support.ci_cd_tasks.validation_tasks.run_process"
     ) as run_process_mock:
         EnforceProcess(basic_task_info=basic_task_info).run()
         run_process_mock.assert_called_once_with(
-            args=concatenate_args(
-                args=[
-                    get_docker_command_for_image(
-                        non_docker_project_root=basic_task_info.non_docker_project_root,
-                        docker_project_root=basic_task_info.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "pytest",
-                    "-n",
-                    THREADS_AVAILABLE,
-                    build_support_subproject.get_pytest_whole_test_suite_report_args(
-                        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT
-                    ),
-                    build_support_subproject.get_test_suite_dir(
-                        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT
-                    ),
-                ]
+            args=_get_build_support_test_suite_args(
+                basic_task_info=basic_task_info,
+                test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT,
+                distribution_args=["-n", THREADS_AVAILABLE, "--dist", "worksteal"],
+                test_files=test_files,
             )
         )
 
 
+def test_enforce_process_resources(basic_task_info: BasicTaskInfo) -> None:
+    assert EnforceProcess(basic_task_info=basic_task_info).resources() == (
+        TaskResources(cpus=THREADS_AVAILABLE)
+    )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_run_enforce_process_uses_cpu_budget(basic_task_info: BasicTaskInfo) -> None:
+    _make_build_support_test_suite(
+        docker_project_root=basic_task_info.docker_project_root,
+        test_suite=PythonSubproject.TestSuite.PROCESS_ENFORCEMENT,
+    )
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        task_cpu_budget(cpus=3),
+    ):
+        EnforceProcess(basic_task_info=basic_task_info).run()
+    pytest_args = run_process_mock.call_args.kwargs["args"]
+    assert pytest_args[pytest_args.index("-n") + 1] == "3"
+
+
 def test_all_subproject_static_type_checking_requires(
     basic_task_info: BasicTaskInfo,
 ) -> None:
@@ -150,42 +562,171 @@ def test_validate_static_type_checking_requires(
     ]
 
 
-@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_static_check_values() -> None:
+    assert [static_check.value for static_check in StaticCheck] == [
+        "ruff",
+        "ruff_tests",
+        "ty",
+    ]
+
+
+@pytest.fixture
+def mock_static_check_config_files(
+    mock_docker_pyproject_toml_file: Path, docker_project_root: Path
+) -> list[Path]:
+    get_uv_lock_file(project_root=docker_project_root).write_text("version = 1\n")
+    get_dockerfile(project_root=docker_project_root).write_text("FROM python\n")
+    return [
+        mock_docker_pyproject_toml_file,
+        get_uv_lock_file(project_root=docker_project_root),
+        get_dockerfile(project_root=docker_project_root),
+    ]
+
+
+def _write_python_files(subproject: PythonSubproject) -> tuple[Path, Path]:
+    package_dir = subproject.get_python_package_dir()
+    package_dir.mkdir(parents=True, exist_ok=True)
+    package_dir.joinpath("__init__.py").write_text("")
+    src_file = package_dir.joinpath("file_1.py")
+    src_file.write_text("a = 1\n")
+    test_dir = subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    )
+    test_dir.mkdir(parents=True, exist_ok=True)
+    test_file = test_dir.joinpath("test_file_1.py")
+    test_file.write_text(f"from {package_dir.name}.file_1 import a\n")
+    return src_file, test_file
+
+
+def test_get_files_to_lint(
+    mock_static_check_config_files: list[Path],
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+    docker_project_root: Path,
+) -> None:
+    src_file, test_file = _write_python_files(subproject=mock_docker_subproject)
+    file_cache = FileCacheEngine(
+        subproject_context=subproject_context, project_root=docker_project_root
+    )
+    files_to_check = get_files_to_lint(
+        file_cache=file_cache,
+        check_name=StaticCheck.RUFF,
+        lint_dir=mock_docker_subproject.get_test_dir(),
+    )
+    assert files_to_check == {
+        test_file: file_cache.get_input_digests(
+            input_files=[test_file, *mock_static_check_config_files]
+        )
+    }
+    file_cache.record_check_passed(
+        check_name=StaticCheck.RUFF, input_digests_by_file=files_to_check
+    )
+    assert not get_files_to_lint(
+        file_cache=file_cache,
+        check_name=StaticCheck.RUFF,
+        lint_dir=mock_docker_subproject.get_test_dir(),
+    )
+    assert list(
+        get_files_to_lint(
+            file_cache=file_cache,
+            check_name=StaticCheck.RUFF,
+            lint_dir=mock_docker_subproject.get_src_dir(),
+        )
+    ) == [src_file.parent.joinpath("__init__.py"), src_file]
+    mock_static_check_config_files[0].write_text("[tool.ruff]\n")
+    assert list(
+        get_files_to_lint(
+            file_cache=file_cache,
+            check_name=StaticCheck.RUFF,
+            lint_dir=mock_docker_subproject.get_test_dir(),
+        )
+    ) == [test_file]
+
+
+def _get_ty_check_args(basic_task_info: BasicTaskInfo, files: list[Path]) -> list[str]:
+    return concatenate_args(
+        args=[
+            get_base_docker_command_for_image(
+                non_docker_project_root=basic_task_info.non_docker_project_root,
+                docker_project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+            get_docker_image_name(
+                project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+            "ty",
+            "check",
+            get_ty_extra_search_path_args(
+                docker_project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+            files,
+        ]
+    )
+
+
+@pytest.mark.usefixtures("mock_static_check_config_files")
 def test_run_validate_static_type_checking(
     basic_task_info: BasicTaskInfo,
     subproject_context: SubprojectContext,
     mock_docker_subproject: PythonSubproject,
 ) -> None:
+    src_file, test_file = _write_python_files(subproject=mock_docker_subproject)
+    package_init = src_file.parent.joinpath("__init__.py")
+    other_src_file = src_file.parent.joinpath("file_2.py")
+    other_src_file.write_text("b = 2\n")
+    task = ValidateStaticTypeChecking(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    )
     with patch(
         "build_support.ci_cd_tasks.validation_tasks.run_process"
     ) as run_process_mock:
-        ValidateStaticTypeChecking(
-            basic_task_info=basic_task_info, subproject_context=subproject_context
-        ).run()
+        task.run()
         run_process_mock.assert_called_once_with(
-            args=concatenate_args(
-                args=[
-                    get_base_docker_command_for_image(
-                        non_docker_project_root=basic_task_info.non_docker_project_root,
-                        docker_project_root=basic_task_info.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    get_docker_image_name(
-                        project_root=basic_task_info.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "ty",
-                    "check",
-                    get_ty_extra_search_path_args(
-                        docker_project_root=basic_task_info.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    mock_docker_subproject.get_root_dir(),
-                ]
+            args=_get_ty_check_args(
+                basic_task_info=basic_task_info,
+                files=[package_init, src_file, other_src_file, test_file],
+            )
+        )
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ) as run_process_mock:
+        task.run()
+        run_process_mock.assert_not_called()
+    # The test file imports the changed module, so its types are checked again
+    src_file.write_text("a = 3\n")
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ) as run_process_mock:
+        task.run()
+        run_process_mock.assert_called_once_with(
+            args=_get_ty_check_args(
+                basic_task_info=basic_task_info, files=[src_file, test_file]
             )
         )
 
 
+@pytest.mark.usefixtures("mock_static_check_config_files")
+def test_run_validate_static_type_checking_fails(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    _write_python_files(subproject=mock_docker_subproject)
+    task = ValidateStaticTypeChecking(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    )
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process",
+        side_effect=ProcessFailedError(command_as_str="ty", return_code=1),
+    ):
+        with pytest.raises(ProcessFailedError):
+            task.run()
+        with pytest.raises(ProcessFailedError):
+            task.run()
+
+
 def test_all_subproject_security_checks_requires(
     basic_task_info: BasicTaskInfo,
 ) -> None:
@@ -222,28 +763,51 @@ def test_run_validate_security_checks(
     subproject_context: SubprojectContext,
     mock_docker_subproject: PythonSubproject,
 ) -> None:
-    with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
-    ) as run_process_mock:
-        ValidateSecurityChecks(
-            basic_task_info=basic_task_info, subproject_context=subproject_context
-        ).run()
-        run_process_mock.assert_called_once_with(
-            args=concatenate_args(
-                args=[
-                    get_docker_command_for_image(
-                        non_docker_project_root=basic_task_info.non_docker_project_root,
-                        docker_project_root=basic_task_info.docker_project_root,
-                        target_image=DockerTarget.DEV,
-                    ),
-                    "bandit",
-                    "-o",
-                    mock_docker_subproject.get_bandit_report_path(),
-                    "-r",
-                    mock_docker_subproject.get_src_dir(),
-                ]
-            )
-        )
+    task = ValidateSecurityChecks(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    )
+    expected_bandit_args = concatenate_args(
+        args=[
+            get_docker_command_for_image(
+                non_docker_project_root=basic_task_info.non_docker_project_root,
+                docker_project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+            "bandit",
+            "-o",
+            mock_docker_subproject.get_bandit_report_path(),
+            "-r",
+            mock_docker_subproject.get_src_dir(),
+        ]
+    )
+    # Skipping bandit is left to the task's cache spec, so every run checks every file
+    for _ in range(2):
+        with patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock:
+            task.run()
+            run_process_mock.assert_called_once_with(args=expected_bandit_args)
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_validate_security_checks_cache_spec(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    assert ValidateSecurityChecks(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    ).cache_spec() == TaskCacheSpec(
+        input_paths=[
+            mock_docker_subproject.get_src_dir(),
+            get_pyproject_toml(project_root=docker_project_root),
+            get_uv_lock_file(project_root=docker_project_root),
+            get_dockerfile(project_root=docker_project_root),
+        ],
+        output_paths=[mock_docker_subproject.get_bandit_report_path()],
+        env_var_names=["TAG_SUFFIX"],
+    )
 
 
 def test_validate_python_style_requires(basic_task_info: BasicTaskInfo) -> None:
@@ -253,72 +817,115 @@ def test_validate_python_style_requires(basic_task_info: BasicTaskInfo) -> None:
     ]
 
 
-@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
-def test_run_validate_python_style(basic_task_info: BasicTaskInfo) -> None:
-    subprojects = get_all_python_subprojects_dict(
-        project_root=basic_task_info.docker_project_root
+def _get_python_style_args(
+    basic_task_info: BasicTaskInfo,
+    src_files: list[Path],
+    test_files: list[Path],
+    style_test_files: list[Path],
+) -> list[list[str]]:
+    docker_command = get_docker_command_for_image(
+        non_docker_project_root=basic_task_info.non_docker_project_root,
+        docker_project_root=basic_task_info.docker_project_root,
+        target_image=DockerTarget.DEV,
     )
-    with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ruff_check_src_args = concatenate_args(
+        args=[
+            docker_command,
+            "ruff",
+            "check",
+            get_sphinx_conf_dir(project_root=basic_task_info.docker_project_root),
+            src_files,
+        ]
+    )
+    ruff_check_test_args = concatenate_args(
+        args=[docker_command, "ruff", "check", "--ignore", "D,FBT", test_files]
+    )
+    test_style_enforcement_args = _get_build_support_test_suite_args(
+        basic_task_info=basic_task_info,
+        test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT,
+        distribution_args=["-n", THREADS_AVAILABLE, "--dist", "worksteal"],
+        test_files=style_test_files,
+    )
+    return [
+        ruff_check_src_args,
+        *([ruff_check_test_args] if test_files else []),
+        *([test_style_enforcement_args] if style_test_files else []),
+    ]
+
+
+@pytest.mark.usefixtures("mock_static_check_config_files")
+def test_run_validate_python_style(basic_task_info: BasicTaskInfo) -> None:
+    python_files = [
+        _write_python_files(subproject=subproject)
+        for subproject in get_all_python_subprojects_dict(
+            project_root=basic_task_info.docker_project_root
+        ).values()
+    ]
+    src_files = sorted(
+        file_path
+        for src_file, _ in python_files
+        for file_path in (src_file.parent.joinpath("__init__.py"), src_file)
+    )
+    style_test_files = _make_build_support_test_suite(
+        docker_project_root=basic_task_info.docker_project_root,
+        test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT,
+    )
+    test_files = sorted(
+        [
+            *(test_file for _, test_file in python_files),
+            *style_test_files,
+            style_test_files[0].parent.joinpath("helpers.py"),
+        ]
+    )
+    task = ValidatePythonStyle(basic_task_info=basic_task_info)
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
     ) as run_process_mock:
-        ValidatePythonStyle(basic_task_info=basic_task_info).run()
-        ruff_check_src_args = concatenate_args(
-            args=[
-                get_docker_command_for_image(
-                    non_docker_project_root=basic_task_info.non_docker_project_root,
-                    docker_project_root=basic_task_info.docker_project_root,
-                    target_image=DockerTarget.DEV,
-                ),
-                "ruff",
-                "check",
-                get_all_non_test_folders(
-                    project_root=basic_task_info.docker_project_root
-                ),
-            ]
-        )
-        ruff_check_test_args = concatenate_args(
-            args=[
-                get_docker_command_for_image(
-                    non_docker_project_root=basic_task_info.non_docker_project_root,
-                    docker_project_root=basic_task_info.docker_project_root,
-                    target_image=DockerTarget.DEV,
-                ),
-                "ruff",
-                "check",
-                "--ignore",
-                "D,FBT",
-                get_all_test_folders(project_root=basic_task_info.docker_project_root),
-            ]
-        )
-        test_style_enforcement_args = concatenate_args(
-            args=[
-                get_docker_command_for_image(
-                    non_docker_project_root=basic_task_info.non_docker_project_root,
-                    docker_project_root=basic_task_info.docker_project_root,
-                    target_image=DockerTarget.DEV,
-                ),
-                "pytest",
-                "-n",
-                THREADS_AVAILABLE,
-                subprojects[
-                    SubprojectContext.BUILD_SUPPORT
-                ].get_pytest_whole_test_suite_report_args(
-                    test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT
-                ),
-                subprojects[SubprojectContext.BUILD_SUPPORT].get_test_suite_dir(
-                    test_suite=PythonSubproject.TestSuite.STYLE_ENFORCEMENT
-                ),
-            ]
-        )
-        all_call_args = [
-            ruff_check_src_args,
-            ruff_check_test_args,
-            test_style_enforcement_args,
+        task.run()
+        assert run_process_mock.call_args_list == [
+            call(args=args)
+            for args in _get_python_style_args(
+                basic_task_info=basic_task_info,
+                src_files=src_files,
+                test_files=test_files,
+                style_test_files=style_test_files,
+            )
+        ]
+    changed_test_file = python_files[0][1]
+    changed_test_file.write_text("b = 2\n")
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ) as run_process_mock:
+        task.run()
+        assert run_process_mock.call_args_list == [
+            call(args=args)
+            for args in _get_python_style_args(
+                basic_task_info=basic_task_info,
+                src_files=[],
+                test_files=[changed_test_file],
+                # Unit tests aren't inputs of the style enforcement suite
+                style_test_files=[],
+            )
+        ]
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process"
+    ) as run_process_mock:
+        task.run()
+        assert run_process_mock.call_args_list == [
+            call(args=args)
+            for args in _get_python_style_args(
+                basic_task_info=basic_task_info,
+                src_files=[],
+                test_files=[],
+                style_test_files=[],
+            )
         ]
-        run_process_mock.assert_has_calls(
-            calls=[call(args=args) for args in all_call_args]
-        )
-        assert run_process_mock.call_count == len(all_call_args)
+
+
+def test_validate_python_style_resources(basic_task_info: BasicTaskInfo) -> None:
+    assert ValidatePythonStyle(basic_task_info=basic_task_info).resources() == (
+        TaskResources(cpus=THREADS_AVAILABLE)
+    )
 
 
 def test_all_subproject_unit_tests_requires(basic_task_info: BasicTaskInfo) -> None:
@@ -347,6 +954,14 @@ def test_subproject_unit_tests_requires(
     ]
 
 
+def test_subproject_unit_tests_resources(
+    basic_task_info: BasicTaskInfo, subproject_context: SubprojectContext
+) -> None:
+    assert SubprojectUnitTests(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    ).resources() == TaskResources(cpus=THREADS_AVAILABLE)
+
+
 @pytest.fixture
 def mock_entire_subproject(
     real_project_root_dir: Path,
@@ -363,6 +978,11 @@ def mock_entire_subproject(
     read_package_name = real_subproject.get_python_package_dir().name
     copied_dir = mock_docker_subproject.get_src_dir().joinpath(read_package_name)
     shutil.move(src=copied_dir, dst=mock_docker_subproject.get_python_package_dir())
+    # The copies keep the real files' mtimes, and recently modified test files run
+    # first, so age them to keep the test order independent of the clock
+    for copied_file in test_root_dir.rglob("*"):
+        if copied_file.is_file():
+            os.utime(copied_file, (0, 0))
 
 
 @pytest.fixture
@@ -386,85 +1006,180 @@ def mock_git_info_yaml(
     return git_info_yaml_path
 
 
+def _get_unit_test_session_docker_command(
+    basic_task_info: BasicTaskInfo, subproject: PythonSubproject
+) -> list[str]:
+    """Get the docker command that runs unit test files of a subproject."""
+    return concatenate_args(
+        args=[
+            get_base_docker_command_for_image(
+                non_docker_project_root=basic_task_info.non_docker_project_root,
+                docker_project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+            "-e",
+            f"COVERAGE_FILE={subproject.get_unit_test_session_coverage_data_file()}",
+            get_docker_image_name(
+                project_root=basic_task_info.docker_project_root,
+                target_image=DockerTarget.DEV,
+            ),
+        ]
+    )
+
+
+def _get_unit_test_session_call(
+    basic_task_info: BasicTaskInfo,
+    subproject: PythonSubproject,
+    test_files: set[Path],
+    recently_modified_test_files: set[Path] | None = None,
+) -> _Call:
+    """Get the run_process call that runs some unit test files of a subproject."""
+    return call(
+        args=concatenate_args(
+            args=[
+                _get_unit_test_session_docker_command(
+                    basic_task_info=basic_task_info, subproject=subproject
+                ),
+                "pytest",
+                "-n",
+                THREADS_AVAILABLE,
+                "--dist",
+                "worksteal",
+                subproject.get_pytest_unit_test_session_args(),
+                # Without recorded durations or failures, test files with recently
+                # modified inputs run first, then the rest in path order
+                order_test_files(
+                    test_files=test_files,
+                    durations={},
+                    failed_test_files=set(),
+                    recently_modified_test_files=recently_modified_test_files or set(),
+                ),
+            ]
+        )
+    )
+
+
+@pytest.fixture
+def mock_saved_report_fragments() -> Iterator[None]:
+    with patch.object(ReportFragmentStore, "has_fragments", return_value=True):
+        yield
+
+
+def _get_coverage_checked_test_files(check_coverage_mock: MagicMock) -> set[Path]:
+    """Get the test files whose coverage a mocked coverage check was asked to check."""
+    return {
+        unit_test.test_file_path
+        for unit_test in check_coverage_mock.call_args.kwargs["unit_tests"]
+    }
+
+
+def _record_unit_test_passed(
+    file_cache: FileCacheEngine, src_file: Path, test_file: Path
+) -> None:
+    """Record that a unit test passed against the current content of its inputs."""
+    file_cache.record_test_passed(
+        file_path=test_file,
+        input_digests=file_cache.get_input_digests(
+            input_files=file_cache.get_unit_test_input_files(
+                src_file=src_file, test_file=test_file
+            )
+        ),
+    )
+
+
+def _record_feature_test_passed(file_cache: FileCacheEngine, test_file: Path) -> None:
+    """Record that a feature test passed against the current content of its inputs."""
+    file_cache.record_test_passed(
+        file_path=test_file,
+        input_digests=file_cache.get_input_digests(
+            input_files=file_cache.get_feature_test_input_files(test_file=test_file)
+        ),
+    )
+
+
+def _get_unit_tests_using(
+    subproject: PythonSubproject, updated_files: list[Path]
+) -> set[Path]:
+    """Get the unit tests with any of the updated files among their inputs."""
+    file_cache = FileCacheEngine(
+        subproject_context=subproject.subproject_context,
+        project_root=subproject.project_root,
+    )
+    return {
+        test_file
+        for src_file, test_file in subproject.get_src_unit_test_file_pairs()
+        if set(updated_files).intersection(
+            file_cache.get_unit_test_input_files(src_file=src_file, test_file=test_file)
+        )
+    }
+
+
+def _get_feature_tests_using(
+    subproject: PythonSubproject, test_files: list[Path], updated_files: list[Path]
+) -> list[Path]:
+    """Get the feature tests with any of the updated files among their inputs."""
+    file_cache = FileCacheEngine(
+        subproject_context=subproject.subproject_context,
+        project_root=subproject.project_root,
+    )
+    return [
+        test_file
+        for test_file in test_files
+        if set(updated_files).intersection(
+            file_cache.get_feature_test_input_files(test_file=test_file)
+        )
+    ]
+
+
 @pytest.mark.usefixtures(
-    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
 )
 def test_run_subproject_unit_tests_test_all(
     basic_task_info: BasicTaskInfo,
     subproject_context: SubprojectContext,
     mock_docker_subproject: PythonSubproject,
 ) -> None:
-    with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
-    ) as run_process_mock:
-        top_level_conftest = mock_docker_subproject.get_test_dir().joinpath(
-            CONFTEST_NAME
-        )
-        top_level_conftest.parent.mkdir(parents=True, exist_ok=True)
-        top_level_conftest.touch()
+    tests_to_run = {
+        test_file
+        for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs()
+    }
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(
+            SubprojectUnitTests, "assemble_unit_test_reports"
+        ) as assemble_reports_mock,
+        patch.object(
+            SubprojectUnitTests, "check_unit_test_coverage"
+        ) as check_coverage_mock,
+    ):
         SubprojectUnitTests(
             basic_task_info=basic_task_info, subproject_context=subproject_context
         ).run()
-        docker_command = get_docker_command_for_image(
-            non_docker_project_root=basic_task_info.non_docker_project_root,
-            docker_project_root=basic_task_info.docker_project_root,
-            target_image=DockerTarget.DEV,
-        )
-        expected_run_process_calls = []
-        for (
-            src_file,
-            test_file,
-        ) in mock_docker_subproject.get_src_unit_test_file_pairs():
-            src_module = SubprojectUnitTests.get_module_from_path(
-                src_file_path=src_file, subproject=mock_docker_subproject
-            )
-            test_file_parent = test_file.parent
-            test_file_name = test_file.stem
-            coverage_config_path = mock_docker_subproject.get_build_dir().joinpath(
-                f"coverage_config_{test_file_name}.toml"
-            )
-            expected_run_process_calls.append(
-                call(
-                    args=concatenate_args(
-                        args=[
-                            docker_command,
-                            "pytest",
-                            "-n",
-                            THREADS_AVAILABLE,
-                            "--cov-report",
-                            "term-missing",
-                            f"--cov={src_module}",
-                            f"--cov={test_file_parent}",
-                            f"--cov-config={coverage_config_path}",
-                            test_file,
-                        ]
-                    )
-                )
-            )
-        expected_run_process_calls.append(
-            call(
-                args=concatenate_args(
-                    args=[
-                        docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        mock_docker_subproject.get_pytest_whole_test_suite_report_args(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                        mock_docker_subproject.get_src_dir(),
-                        mock_docker_subproject.get_test_suite_dir(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                    ]
-                )
-            )
+    assert run_process_mock.mock_calls == [
+        _get_unit_test_session_call(
+            basic_task_info=basic_task_info,
+            subproject=mock_docker_subproject,
+            test_files=tests_to_run,
         )
-        assert run_process_mock.mock_calls == expected_run_process_calls
+    ]
+    assert (
+        _get_coverage_checked_test_files(check_coverage_mock=check_coverage_mock)
+        == tests_to_run
+    )
+    assemble_reports_mock.assert_called_once()
 
 
 @pytest.mark.usefixtures(
-    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
 )
 def test_run_subproject_unit_tests_all_cached(
     basic_task_info: BasicTaskInfo, subproject_context: SubprojectContext
@@ -473,12 +1188,14 @@ def test_run_subproject_unit_tests_all_cached(
         subproject_context=subproject_context,
         project_root=basic_task_info.docker_project_root,
     )
-    for _, test_file in get_python_subproject(
+    for src_file, test_file in get_python_subproject(
         subproject_context=subproject_context,
         project_root=basic_task_info.docker_project_root,
     ).get_src_unit_test_file_pairs():
-        cache_engine.update_test_pass_timestamp(file_path=test_file)
-    cache_engine.write_text()
+        _record_unit_test_passed(
+            file_cache=cache_engine, src_file=src_file, test_file=test_file
+        )
+    cache_engine.flush()
     # Everything above this line makes it so that there is unit test cache file
     # that has all files in it up to date.  This should make it so that no tests are
     # run
@@ -494,6 +1211,49 @@ def test_run_subproject_unit_tests_all_cached(
 @pytest.mark.usefixtures(
     "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
 )
+def test_run_subproject_unit_tests_all_cached_without_saved_reports(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    cache_engine = FileCacheEngine(
+        subproject_context=subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    tests_to_run = set()
+    for src_file, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
+        _record_unit_test_passed(
+            file_cache=cache_engine, src_file=src_file, test_file=test_file
+        )
+        tests_to_run.add(test_file)
+    cache_engine.flush()
+    # Every test passed, but its reports are needed for the complete reports
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(SubprojectUnitTests, "assemble_unit_test_reports"),
+        patch.object(SubprojectUnitTests, "check_unit_test_coverage"),
+    ):
+        SubprojectUnitTests(
+            basic_task_info=basic_task_info, subproject_context=subproject_context
+        ).run()
+    assert run_process_mock.mock_calls == [
+        _get_unit_test_session_call(
+            basic_task_info=basic_task_info,
+            subproject=mock_docker_subproject,
+            test_files=tests_to_run,
+        )
+    ]
+
+
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
+)
 def test_run_subproject_unit_tests_all_cached_but_top_test_conftest_updated(
     basic_task_info: BasicTaskInfo,
     subproject_context: SubprojectContext,
@@ -503,9 +1263,11 @@ def test_run_subproject_unit_tests_all_cached_but_top_test_conftest_updated(
         subproject_context=subproject_context,
         project_root=basic_task_info.docker_project_root,
     )
-    for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
-        cache_engine.update_test_pass_timestamp(file_path=test_file)
-    cache_engine.write_text()
+    for src_file, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
+        _record_unit_test_passed(
+            file_cache=cache_engine, src_file=src_file, test_file=test_file
+        )
+    cache_engine.flush()
     sleep(1 / 1000)  # sleep just long enough for a new timestamp when writing file
     mock_docker_subproject.get_test_dir().joinpath(CONFTEST_NAME).write_text(
         "Updated Top Level Conftest"
@@ -513,73 +1275,44 @@ def test_run_subproject_unit_tests_all_cached_but_top_test_conftest_updated(
     # Everything above this line makes it so that there is unit test cache file
     # that has all files in it up to date, but then update the top level conftest in the
     # test folder.  This should make it so that all tests are run
-    with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
-    ) as run_process_mock:
+    tests_to_run = {
+        test_file
+        for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs()
+    }
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(
+            SubprojectUnitTests, "assemble_unit_test_reports"
+        ) as assemble_reports_mock,
+        patch.object(
+            SubprojectUnitTests, "check_unit_test_coverage"
+        ) as check_coverage_mock,
+    ):
         SubprojectUnitTests(
             basic_task_info=basic_task_info, subproject_context=subproject_context
         ).run()
-        docker_command = get_docker_command_for_image(
-            non_docker_project_root=basic_task_info.non_docker_project_root,
-            docker_project_root=basic_task_info.docker_project_root,
-            target_image=DockerTarget.DEV,
-        )
-        expected_run_process_calls = []
-
-        for (
-            src_file,
-            test_file,
-        ) in mock_docker_subproject.get_src_unit_test_file_pairs():
-            src_module = SubprojectUnitTests.get_module_from_path(
-                src_file_path=src_file, subproject=mock_docker_subproject
-            )
-            test_file_parent = test_file.parent
-            test_file_name = test_file.stem
-            coverage_config_path = mock_docker_subproject.get_build_dir().joinpath(
-                f"coverage_config_{test_file_name}.toml"
-            )
-            expected_run_process_calls.append(
-                call(
-                    args=concatenate_args(
-                        args=[
-                            docker_command,
-                            "pytest",
-                            "-n",
-                            THREADS_AVAILABLE,
-                            "--cov-report",
-                            "term-missing",
-                            f"--cov={src_module}",
-                            f"--cov={test_file_parent}",
-                            f"--cov-config={coverage_config_path}",
-                            test_file,
-                        ]
-                    )
-                )
-            )
-        expected_run_process_calls.append(
-            call(
-                args=concatenate_args(
-                    args=[
-                        docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        mock_docker_subproject.get_pytest_whole_test_suite_report_args(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                        mock_docker_subproject.get_src_dir(),
-                        mock_docker_subproject.get_test_suite_dir(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                    ]
-                )
-            )
+    assert run_process_mock.mock_calls == [
+        _get_unit_test_session_call(
+            basic_task_info=basic_task_info,
+            subproject=mock_docker_subproject,
+            test_files=tests_to_run,
         )
-        assert run_process_mock.mock_calls == expected_run_process_calls
+    ]
+    assert (
+        _get_coverage_checked_test_files(check_coverage_mock=check_coverage_mock)
+        == tests_to_run
+    )
+    assemble_reports_mock.assert_called_once()
 
 
 @pytest.mark.usefixtures(
-    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
 )
 def test_run_subproject_unit_tests_all_cached_but_resource_updated(
     basic_task_info: BasicTaskInfo,
@@ -590,83 +1323,56 @@ def test_run_subproject_unit_tests_all_cached_but_resource_updated(
         subproject_context=subproject_context,
         project_root=basic_task_info.docker_project_root,
     )
-    for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
-        cache_engine.update_test_pass_timestamp(file_path=test_file)
-    cache_engine.write_text()
+    for src_file, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
+        _record_unit_test_passed(
+            file_cache=cache_engine, src_file=src_file, test_file=test_file
+        )
+    cache_engine.flush()
     sleep(1 / 1000)
     # Create a resource file for some test files
     resource_dirs_updated = 10
+    tests_to_run = set()
     for _, test_file in islice(
         mock_docker_subproject.get_src_unit_test_file_pairs(), resource_dirs_updated
     ):
+        tests_to_run.add(test_file)
         resource_dir = get_resource_dir(file_path=test_file)
         resource_dir.mkdir(parents=True, exist_ok=True)
         resource_dir.joinpath("data.txt").write_text("resource data")
-    with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
-    ) as run_process_mock:
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(
+            SubprojectUnitTests, "assemble_unit_test_reports"
+        ) as assemble_reports_mock,
+        patch.object(
+            SubprojectUnitTests, "check_unit_test_coverage"
+        ) as check_coverage_mock,
+    ):
         SubprojectUnitTests(
             basic_task_info=basic_task_info, subproject_context=subproject_context
         ).run()
-        docker_command = get_docker_command_for_image(
-            non_docker_project_root=basic_task_info.non_docker_project_root,
-            docker_project_root=basic_task_info.docker_project_root,
-            target_image=DockerTarget.DEV,
-        )
-        expected_run_process_calls = []
-        for src_file, test_file in islice(
-            mock_docker_subproject.get_src_unit_test_file_pairs(), resource_dirs_updated
-        ):
-            src_module = SubprojectUnitTests.get_module_from_path(
-                src_file_path=src_file, subproject=mock_docker_subproject
-            )
-            test_file_parent = test_file.parent
-            test_file_name = test_file.stem
-            coverage_config_path = mock_docker_subproject.get_build_dir().joinpath(
-                f"coverage_config_{test_file_name}.toml"
-            )
-            expected_run_process_calls.append(
-                call(
-                    args=concatenate_args(
-                        args=[
-                            docker_command,
-                            "pytest",
-                            "-n",
-                            THREADS_AVAILABLE,
-                            "--cov-report",
-                            "term-missing",
-                            f"--cov={src_module}",
-                            f"--cov={test_file_parent}",
-                            f"--cov-config={coverage_config_path}",
-                            test_file,
-                        ]
-                    )
-                )
-            )
-        expected_run_process_calls.append(
-            call(
-                args=concatenate_args(
-                    args=[
-                        docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        mock_docker_subproject.get_pytest_whole_test_suite_report_args(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                        mock_docker_subproject.get_src_dir(),
-                        mock_docker_subproject.get_test_suite_dir(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                    ]
-                )
-            )
+    assert run_process_mock.mock_calls == [
+        _get_unit_test_session_call(
+            basic_task_info=basic_task_info,
+            subproject=mock_docker_subproject,
+            test_files=tests_to_run,
         )
-        assert run_process_mock.mock_calls == expected_run_process_calls
+    ]
+    assert (
+        _get_coverage_checked_test_files(check_coverage_mock=check_coverage_mock)
+        == tests_to_run
+    )
+    assemble_reports_mock.assert_called_once()
 
 
 @pytest.mark.usefixtures(
-    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
 )
 def test_run_subproject_unit_tests_all_cached_but_src_resource_updated(
     basic_task_info: BasicTaskInfo,
@@ -677,79 +1383,53 @@ def test_run_subproject_unit_tests_all_cached_but_src_resource_updated(
         subproject_context=subproject_context,
         project_root=basic_task_info.docker_project_root,
     )
-    for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
-        cache_engine.update_test_pass_timestamp(file_path=test_file)
-    cache_engine.write_text()
+    for src_file, test_file in mock_docker_subproject.get_src_unit_test_file_pairs():
+        _record_unit_test_passed(
+            file_cache=cache_engine, src_file=src_file, test_file=test_file
+        )
+    cache_engine.flush()
     sleep(1 / 1000)
     src_resource_dirs_updated = 10
+    updated_files = []
     for src_file, _ in islice(
         mock_docker_subproject.get_src_unit_test_file_pairs(), src_resource_dirs_updated
     ):
         src_resource_dir = get_resource_dir(file_path=src_file)
         src_resource_dir.mkdir(parents=True, exist_ok=True)
-        src_resource_dir.joinpath("data.txt").write_text("resource data")
-    with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
-    ) as run_process_mock:
+        src_resource_file = src_resource_dir.joinpath("data.txt")
+        src_resource_file.write_text("resource data")
+        updated_files.append(src_resource_file)
+    # Tests importing a src file, directly or not, also depend on its resources
+    tests_to_run = _get_unit_tests_using(
+        subproject=mock_docker_subproject, updated_files=updated_files
+    )
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(
+            SubprojectUnitTests, "assemble_unit_test_reports"
+        ) as assemble_reports_mock,
+        patch.object(
+            SubprojectUnitTests, "check_unit_test_coverage"
+        ) as check_coverage_mock,
+    ):
         SubprojectUnitTests(
             basic_task_info=basic_task_info, subproject_context=subproject_context
         ).run()
-        docker_command = get_docker_command_for_image(
-            non_docker_project_root=basic_task_info.non_docker_project_root,
-            docker_project_root=basic_task_info.docker_project_root,
-            target_image=DockerTarget.DEV,
-        )
-        expected_run_process_calls = []
-        for src_file, test_file in islice(
-            mock_docker_subproject.get_src_unit_test_file_pairs(),
-            src_resource_dirs_updated,
-        ):
-            src_module = SubprojectUnitTests.get_module_from_path(
-                src_file_path=src_file, subproject=mock_docker_subproject
-            )
-            test_file_parent = test_file.parent
-            test_file_name = test_file.stem
-            coverage_config_path = mock_docker_subproject.get_build_dir().joinpath(
-                f"coverage_config_{test_file_name}.toml"
-            )
-            expected_run_process_calls.append(
-                call(
-                    args=concatenate_args(
-                        args=[
-                            docker_command,
-                            "pytest",
-                            "-n",
-                            THREADS_AVAILABLE,
-                            "--cov-report",
-                            "term-missing",
-                            f"--cov={src_module}",
-                            f"--cov={test_file_parent}",
-                            f"--cov-config={coverage_config_path}",
-                            test_file,
-                        ]
-                    )
-                )
-            )
-        expected_run_process_calls.append(
-            call(
-                args=concatenate_args(
-                    args=[
-                        docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        mock_docker_subproject.get_pytest_whole_test_suite_report_args(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                        mock_docker_subproject.get_src_dir(),
-                        mock_docker_subproject.get_test_suite_dir(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                    ]
-                )
-            )
+    assert run_process_mock.mock_calls == [
+        _get_unit_test_session_call(
+            basic_task_info=basic_task_info,
+            subproject=mock_docker_subproject,
+            test_files=tests_to_run,
         )
-        assert run_process_mock.mock_calls == expected_run_process_calls
+    ]
+    assert (
+        _get_coverage_checked_test_files(check_coverage_mock=check_coverage_mock)
+        == tests_to_run
+    )
+    assemble_reports_mock.assert_called_once()
 
 
 @pytest.mark.usefixtures("mock_docker_pyproject_toml_file", "mock_git_info_yaml")
@@ -792,7 +1472,10 @@ def test_missing_test_file_for_src(
 
 
 @pytest.mark.usefixtures(
-    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
 )
 def test_run_subproject_unit_tests_some_cached(
     basic_task_info: BasicTaskInfo,
@@ -803,107 +1486,561 @@ def test_run_subproject_unit_tests_some_cached(
         subproject_context=subproject_context,
         project_root=basic_task_info.docker_project_root,
     )
-    expected_run_process_calls = []
-    docker_command = get_docker_command_for_image(
-        non_docker_project_root=basic_task_info.non_docker_project_root,
-        docker_project_root=basic_task_info.docker_project_root,
-        target_image=DockerTarget.DEV,
-    )
     cache_both_src_and_test = 0
     cache_src = 1
     cache_test = 2
     cache_resource = 3
     files_to_update: list[Path] = []
     resource_dirs_to_create: list[Path] = []
+    uncached_test_files = set()
     for file_index, (src_file, test_file) in enumerate(
         mock_docker_subproject.get_src_unit_test_file_pairs()
     ):
-        src_module = SubprojectUnitTests.get_module_from_path(
-            src_file_path=src_file, subproject=mock_docker_subproject
-        )
-        test_file_parent = test_file.parent
-        test_file_name = test_file.stem
-        coverage_config_path = mock_docker_subproject.get_build_dir().joinpath(
-            f"coverage_config_{test_file_name}.toml"
-        )
-        run_process_call = call(
-            args=concatenate_args(
-                args=[
-                    docker_command,
-                    "pytest",
-                    "-n",
-                    THREADS_AVAILABLE,
-                    "--cov-report",
-                    "term-missing",
-                    f"--cov={src_module}",
-                    f"--cov={test_file_parent}",
-                    f"--cov-config={coverage_config_path}",
-                    test_file,
-                ]
-            )
-        )
         mod_ten = file_index % 10
         if mod_ten == cache_both_src_and_test:
             # Tests ran and neither src nor test are updated
-            file_cache.update_test_pass_timestamp(file_path=test_file)
+            _record_unit_test_passed(
+                file_cache=file_cache, src_file=src_file, test_file=test_file
+            )
         elif mod_ten == cache_src:
             # Tests ran, but src was updated
-            file_cache.update_test_pass_timestamp(file_path=test_file)
+            _record_unit_test_passed(
+                file_cache=file_cache, src_file=src_file, test_file=test_file
+            )
             files_to_update.append(src_file)
-            expected_run_process_calls.append(run_process_call)
         elif mod_ten == cache_test:
             # Tests ran, but test was updated
-            file_cache.update_test_pass_timestamp(file_path=test_file)
+            _record_unit_test_passed(
+                file_cache=file_cache, src_file=src_file, test_file=test_file
+            )
             files_to_update.append(test_file)
-            expected_run_process_calls.append(run_process_call)
         elif mod_ten == cache_resource:
             # Tests ran, but a resource file was updated
-            file_cache.update_test_pass_timestamp(file_path=test_file)
+            _record_unit_test_passed(
+                file_cache=file_cache, src_file=src_file, test_file=test_file
+            )
             resource_dir = get_resource_dir(file_path=test_file)
             resource_dirs_to_create.append(resource_dir)
-            expected_run_process_calls.append(run_process_call)
         else:
-            expected_run_process_calls.append(run_process_call)
-    file_cache.write_text()
+            uncached_test_files.add(test_file)
+    file_cache.flush()
     sleep(1 / 1000)  # sleep just long enough for a new timestamp when writing file
     for file_to_update in files_to_update:
         file_to_update.write_text("Updated File")
     for resource_dir in resource_dirs_to_create:
         resource_dir.mkdir(parents=True, exist_ok=True)
-        resource_dir.joinpath("data.txt").write_text("resource")
-    # This is needed for now because INFRA only has one file and therefore
-    # skipping it skips the report generating test as well
-    if expected_run_process_calls:
-        expected_run_process_calls.append(
-            call(
-                args=concatenate_args(
-                    args=[
-                        docker_command,
-                        "pytest",
-                        "-n",
-                        THREADS_AVAILABLE,
-                        mock_docker_subproject.get_pytest_whole_test_suite_report_args(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                        mock_docker_subproject.get_src_dir(),
-                        mock_docker_subproject.get_test_suite_dir(
-                            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-                        ),
-                    ]
-                )
-            )
-        )
+        resource_file = resource_dir.joinpath("data.txt")
+        resource_file.write_text("resource")
+        files_to_update.append(resource_file)
+    # Updating a src file also re-runs the tests of every src file importing it
+    tests_using_updated_files = _get_unit_tests_using(
+        subproject=mock_docker_subproject, updated_files=files_to_update
+    )
+    tests_to_run = uncached_test_files | tests_using_updated_files
     # Everything above this line makes it so that there is unit test cache file
     # that has some, not all, files in it up to date.  This includes some src files
     # without their corresponding test file and vice versa, as well as some src and test
     # file pairs.  This will run tests on most files, but skip some.
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(
+            SubprojectUnitTests, "assemble_unit_test_reports"
+        ) as assemble_reports_mock,
+        patch.object(
+            SubprojectUnitTests, "check_unit_test_coverage"
+        ) as check_coverage_mock,
+    ):
+        SubprojectUnitTests(
+            basic_task_info=basic_task_info, subproject_context=subproject_context
+        ).run()
+    # INFRA only has one file, so every one of its tests might be cached
+    if tests_to_run:
+        assert run_process_mock.mock_calls == [
+            _get_unit_test_session_call(
+                basic_task_info=basic_task_info,
+                subproject=mock_docker_subproject,
+                test_files=tests_to_run,
+                recently_modified_test_files=tests_using_updated_files,
+            )
+        ]
+        assert (
+            _get_coverage_checked_test_files(check_coverage_mock=check_coverage_mock)
+            == tests_to_run
+        )
+        assemble_reports_mock.assert_called_once()
+    else:
+        run_process_mock.assert_not_called()
+        check_coverage_mock.assert_not_called()
+        assemble_reports_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    argnames=("fully_covered", "expected_error"),
+    argvalues=[(True, None), (False, "does not fully cover")],
+)
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_check_unit_test_coverage(
+    basic_task_info: BasicTaskInfo,
+    mock_docker_subproject: PythonSubproject,
+    fully_covered: bool,
+    expected_error: str | None,
+) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    unit_test_info = UnitTestInfo(
+        src_file_path=mock_docker_subproject.get_python_package_dir().joinpath("a.py"),
+        test_file_path=mock_docker_subproject.get_test_suite_dir(
+            test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+        ).joinpath("test_a.py"),
+    )
+    unit_tests = SubprojectUnitTests(
+        basic_task_info=basic_task_info,
+        subproject_context=mock_docker_subproject.subproject_context,
+    )
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.check_test_file_coverage",
+        return_value=(fully_covered, "coverage report"),
+    ) as mock_check_test_file_coverage:
+        if expected_error is None:
+            unit_tests.check_unit_test_coverage(unit_tests=[unit_test_info])
+        else:
+            with pytest.raises(ValueError, match=expected_error):
+                unit_tests.check_unit_test_coverage(unit_tests=[unit_test_info])
+    mock_check_test_file_coverage.assert_called_once_with(
+        data_file=mock_docker_subproject.get_unit_test_coverage_data_file(),
+        config_file=get_pyproject_toml(project_root=docker_project_root),
+        project_root=docker_project_root,
+        test_file=unit_test_info.test_file_path,
+        covered_files=[unit_test_info.src_file_path, unit_test_info.test_file_path],
+    )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_record_coverage_map(
+    basic_task_info: BasicTaskInfo, mock_docker_subproject: PythonSubproject
+) -> None:
+    unit_tests = SubprojectUnitTests(
+        basic_task_info=basic_task_info,
+        subproject_context=mock_docker_subproject.subproject_context,
+    )
+    package_dir = mock_docker_subproject.get_python_package_dir()
+    package_dir.mkdir(parents=True, exist_ok=True)
+    committed_file = package_dir.joinpath("committed.py")
+    committed_file.write_text("x = 1\n")
+    uncommitted_file = package_dir.joinpath("uncommitted.py")
+    uncommitted_file.write_text("y = 2\n")
+    package_dir.joinpath("data.txt").write_text("not python")
+    test_file = mock_docker_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    ).joinpath("test_committed.py")
+    coverage_data = CoverageData(
+        basename=str(mock_docker_subproject.get_unit_test_coverage_data_file())
+    )
+    coverage_data.set_context(
+        f"{test_file.relative_to(basic_task_info.docker_project_root)}::test_x|run"
+    )
+    coverage_data.add_lines({str(committed_file): [1], str(uncommitted_file): [1]})
+    coverage_data.write()
+    file_cache = FileCacheEngine(
+        subproject_context=mock_docker_subproject.subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.get_uncommitted_files",
+            return_value={uncommitted_file},
+        ),
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.get_head_commit_sha",
+            return_value="abc123",
+        ),
+    ):
+        unit_tests.record_coverage_map(file_cache=file_cache)
+    assert file_cache.get_coverage_map() == CoverageMap(
+        commit_sha="abc123",
+        file_digests=file_cache.get_input_digests(input_files=[committed_file]),
+        test_lines={str(test_file): {str(committed_file): {1}}},
+        import_lines={},
+    )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_record_unit_test_results(
+    basic_task_info: BasicTaskInfo, mock_docker_subproject: PythonSubproject
+) -> None:
+    test_dir = mock_docker_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    )
+    ran_test_file = test_dir.joinpath("test_a.py")
+    failed_test_file = test_dir.joinpath("test_b.py")
+    not_ran_test_file = test_dir.joinpath("test_c.py")
+    report_path = mock_docker_subproject.get_pytest_report_path(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS,
+        test_scope=PythonSubproject.TestScope.INCOMPLETE,
+    )
+    _write_junit_report(
+        report_path=report_path,
+        durations={ran_test_file: 1.5, failed_test_file: 0.5, not_ran_test_file: 2.0},
+        project_root=basic_task_info.docker_project_root,
+        failed_test_files={failed_test_file},
+    )
+    file_cache = FileCacheEngine(
+        subproject_context=mock_docker_subproject.subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    file_cache.record_test_failures(
+        ran_test_files=[ran_test_file], failed_test_files={ran_test_file}
+    )
+    unit_tests_task = SubprojectUnitTests(
+        basic_task_info=basic_task_info,
+        subproject_context=mock_docker_subproject.subproject_context,
+    )
+    unit_tests_task.record_unit_test_results(
+        file_cache=file_cache, test_files=[ran_test_file, failed_test_file]
+    )
+    assert file_cache.get_test_durations() == {
+        ran_test_file: timedelta(seconds=1.5),
+        failed_test_file: timedelta(seconds=0.5),
+    }
+    assert file_cache.get_failed_test_files() == {failed_test_file}
+    # Without a report, every test file that was meant to run is taken as failed
+    report_path.unlink()
+    unit_tests_task.record_unit_test_results(
+        file_cache=file_cache, test_files=[ran_test_file]
+    )
+    assert file_cache.get_failed_test_files() == {ran_test_file, failed_test_file}
+
+
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
+)
+def test_run_subproject_unit_tests_longest_first(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    test_files = sorted(
+        test_file
+        for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs()
+    )
+    file_cache = FileCacheEngine(
+        subproject_context=subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    # Later test files took longer, but all of them are too quick to share out
+    durations = {
+        test_file: timedelta(microseconds=index)
+        for index, test_file in enumerate(test_files)
+    }
+    file_cache.record_test_durations(durations=durations)
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process"
+        ) as run_process_mock,
+        patch.object(SubprojectUnitTests, "record_unit_test_results"),
+        patch.object(SubprojectUnitTests, "assemble_unit_test_reports"),
+        patch.object(SubprojectUnitTests, "check_unit_test_coverage"),
+    ):
+        SubprojectUnitTests(
+            basic_task_info=basic_task_info, subproject_context=subproject_context
+        ).run()
+    assert run_process_mock.mock_calls == [
+        call(
+            args=concatenate_args(
+                args=[
+                    _get_unit_test_session_docker_command(
+                        basic_task_info=basic_task_info,
+                        subproject=mock_docker_subproject,
+                    ),
+                    "pytest",
+                    "-n",
+                    0,
+                    mock_docker_subproject.get_pytest_unit_test_session_args(),
+                    test_files[::-1],
+                ]
+            )
+        )
+    ]
+
+
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file",
+    "mock_entire_subproject",
+    "mock_git_info_yaml",
+    "mock_saved_report_fragments",
+)
+def test_run_subproject_unit_tests_failed_first_fail_fast(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    test_files = sorted(
+        test_file
+        for _, test_file in mock_docker_subproject.get_src_unit_test_file_pairs()
+    )
+    file_cache = FileCacheEngine(
+        subproject_context=subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    file_cache.record_test_durations(
+        durations={
+            test_file: timedelta(microseconds=index)
+            for index, test_file in enumerate(test_files)
+        }
+    )
+    # The quickest test file failed last time, so it runs before the longer ones
+    file_cache.record_test_failures(
+        ran_test_files=test_files, failed_test_files={test_files[0]}
+    )
+    failure = ProcessFailedError(command_as_str="pytest", return_code=1)
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process",
+            side_effect=failure,
+        ) as run_process_mock,
+        patch.object(
+            SubprojectUnitTests, "record_unit_test_results"
+        ) as record_results_mock,
+        patch.object(
+            SubprojectUnitTests, "assemble_unit_test_reports"
+        ) as assemble_reports_mock,
+        pytest.raises(ProcessFailedError),
+    ):
+        SubprojectUnitTests(
+            basic_task_info=basic_task_info.model_copy(update={"fail_fast": True}),
+            subproject_context=subproject_context,
+        ).run()
+    expected_test_files = [test_files[0], *test_files[:0:-1]]
+    assert run_process_mock.mock_calls == [
+        call(
+            args=concatenate_args(
+                args=[
+                    _get_unit_test_session_docker_command(
+                        basic_task_info=basic_task_info,
+                        subproject=mock_docker_subproject,
+                    ),
+                    "pytest",
+                    "-n",
+                    0,
+                    "--exitfirst",
+                    mock_docker_subproject.get_pytest_unit_test_session_args(),
+                    expected_test_files,
+                ]
+            )
+        )
+    ]
+    # The results of a failed run are recorded, but no reports are assembled
+    record_results_mock.assert_called_once_with(
+        file_cache=ANY, test_files=expected_test_files
+    )
+    assemble_reports_mock.assert_not_called()
+
+
+def test_record_coverage_map_without_data_file(
+    basic_task_info: BasicTaskInfo, mock_docker_subproject: PythonSubproject
+) -> None:
+    file_cache = FileCacheEngine(
+        subproject_context=mock_docker_subproject.subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.get_head_commit_sha"
+    ) as mock_get_head_commit_sha:
+        SubprojectUnitTests(
+            basic_task_info=basic_task_info,
+            subproject_context=mock_docker_subproject.subproject_context,
+        ).record_coverage_map(file_cache=file_cache)
+    mock_get_head_commit_sha.assert_not_called()
+    assert file_cache.get_coverage_map() is None
+
+
+def test_get_coverage_test_selector(
+    basic_task_info: BasicTaskInfo, mock_docker_subproject: PythonSubproject
+) -> None:
+    unit_tests = SubprojectUnitTests(
+        basic_task_info=basic_task_info,
+        subproject_context=mock_docker_subproject.subproject_context,
+    )
+    file_cache = FileCacheEngine(
+        subproject_context=mock_docker_subproject.subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    assert unit_tests.get_coverage_test_selector(file_cache=file_cache) is None
+    coverage_map = CoverageMap(
+        commit_sha="abc123", file_digests={}, test_lines={}, import_lines={}
+    )
+    file_cache.save_coverage_map(coverage_map=coverage_map)
+    coverage_selector = unit_tests.get_coverage_test_selector(file_cache=file_cache)
+    assert coverage_selector is not None
+    assert coverage_selector.coverage_map == coverage_map
+    assert coverage_selector.project_root == basic_task_info.docker_project_root
+    assert coverage_selector.paths == [mock_docker_subproject.get_src_dir()]
+
+
+@pytest.mark.parametrize(
+    argnames=("previous_digest", "has_selector", "selector_says_run", "must_run"),
+    argvalues=[
+        ("new", True, True, False),
+        (None, True, False, True),
+        ("old", False, False, True),
+        ("old", True, True, True),
+        ("old", True, False, False),
+    ],
+)
+def test_unit_test_must_run(
+    mock_project_root: Path,
+    previous_digest: str | None,
+    has_selector: bool,
+    selector_says_run: bool,
+    must_run: bool,
+) -> None:
+    file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    test_file = mock_project_root.joinpath("test_a.py")
+    src_file = str(mock_project_root.joinpath("a.py"))
+    if previous_digest is not None:
+        file_cache.record_test_passed(
+            file_path=test_file, input_digests={src_file: previous_digest}
+        )
+    coverage_selector = CoverageTestSelector(
+        coverage_map=CoverageMap(
+            commit_sha="abc123", file_digests={}, test_lines={}, import_lines={}
+        ),
+        project_root=mock_project_root,
+        paths=[],
+    )
+    with patch.object(
+        CoverageTestSelector, "test_must_run", return_value=selector_says_run
+    ):
+        assert (
+            SubprojectUnitTests.unit_test_must_run(
+                file_cache=file_cache,
+                coverage_selector=coverage_selector if has_selector else None,
+                test_file=test_file,
+                input_digests={src_file: "new"},
+            )
+            == must_run
+        )
+
+
+@pytest.mark.parametrize(
+    argnames=("previous_digest", "report_digest"),
+    argvalues=[(None, "new"), ("new", "new"), ("old", "old")],
+)
+def test_get_report_digests(
+    mock_project_root: Path, previous_digest: str | None, report_digest: str
+) -> None:
+    file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    test_file = mock_project_root.joinpath("test_a.py")
+    src_file = str(mock_project_root.joinpath("a.py"))
+    if previous_digest is not None:
+        file_cache.record_test_passed(
+            file_path=test_file, input_digests={src_file: previous_digest}
+        )
+    assert SubprojectUnitTests.get_report_digests(
+        file_cache=file_cache, test_file=test_file, input_digests={src_file: "new"}
+    ) == {src_file: report_digest}
+
+
+def test_get_report_fragment_store(
+    basic_task_info: BasicTaskInfo, mock_docker_subproject: PythonSubproject
+) -> None:
+    report_fragments = SubprojectUnitTests(
+        basic_task_info=basic_task_info,
+        subproject_context=mock_docker_subproject.subproject_context,
+    ).get_report_fragment_store()
+    assert (
+        report_fragments.fragment_dir
+        == mock_docker_subproject.get_unit_test_report_fragments_dir()
+    )
+    assert report_fragments.project_root == basic_task_info.docker_project_root
+
+
+@pytest.mark.parametrize(
+    argnames=("fully_covered", "expected_error"),
+    argvalues=[(True, None), (False, "do not fully cover")],
+)
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_assemble_unit_test_reports(
+    basic_task_info: BasicTaskInfo,
+    mock_docker_subproject: PythonSubproject,
+    fully_covered: bool,
+    expected_error: str | None,
+) -> None:
+    docker_project_root = basic_task_info.docker_project_root
+    test_dir = mock_docker_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    )
+    ran_test = UnitTestInfo(
+        src_file_path=mock_docker_subproject.get_python_package_dir().joinpath("a.py"),
+        test_file_path=test_dir.joinpath("test_a.py"),
+        input_digests={"a.py": "new"},
+        report_digests={"a.py": "new"},
+    )
+    skipped_test = UnitTestInfo(
+        src_file_path=mock_docker_subproject.get_python_package_dir().joinpath("b.py"),
+        test_file_path=test_dir.joinpath("test_b.py"),
+        input_digests={"b.py": "new"},
+        report_digests={"b.py": "old"},
+        must_run=False,
+    )
+    report_fragments = MagicMock(spec=ReportFragmentStore)
+    unit_tests = SubprojectUnitTests(
+        basic_task_info=basic_task_info,
+        subproject_context=mock_docker_subproject.subproject_context,
+    )
     with patch(
-        "build_support.ci_cd_tasks.validation_tasks.run_process"
-    ) as run_process_mock:
-        SubprojectUnitTests(
-            basic_task_info=basic_task_info, subproject_context=subproject_context
-        ).run()
-        assert run_process_mock.mock_calls == expected_run_process_calls
+        "build_support.ci_cd_tasks.validation_tasks.report_coverage",
+        return_value=(fully_covered, "coverage report"),
+    ) as mock_report_coverage:
+        if expected_error is None:
+            unit_tests.assemble_unit_test_reports(
+                report_fragments=report_fragments, unit_tests=[ran_test, skipped_test]
+            )
+        else:
+            with pytest.raises(ValueError, match=expected_error):
+                unit_tests.assemble_unit_test_reports(
+                    report_fragments=report_fragments,
+                    unit_tests=[ran_test, skipped_test],
+                )
+    unit_test_suite = PythonSubproject.TestSuite.UNIT_TESTS
+    report_fragments.save_fragments.assert_called_once_with(
+        data_file=mock_docker_subproject.get_unit_test_session_coverage_data_file(),
+        junit_report=mock_docker_subproject.get_pytest_report_path(
+            test_suite=unit_test_suite, test_scope=PythonSubproject.TestScope.INCOMPLETE
+        ),
+        test_inputs={ran_test.test_file_path: ran_test.input_digests},
+    )
+    data_file = mock_docker_subproject.get_unit_test_coverage_data_file()
+    config_file = get_pyproject_toml(project_root=docker_project_root)
+    report_fragments.assemble_reports.assert_called_once_with(
+        test_inputs={
+            ran_test.test_file_path: ran_test.report_digests,
+            skipped_test.test_file_path: skipped_test.report_digests,
+        },
+        data_file=data_file,
+        config_file=config_file,
+        junit_report=mock_docker_subproject.get_pytest_report_path(
+            test_suite=unit_test_suite, test_scope=PythonSubproject.TestScope.COMPLETE
+        ),
+    )
+    mock_report_coverage.assert_called_once_with(
+        data_file=data_file,
+        config_file=config_file,
+        xml_report=mock_docker_subproject.get_pytest_coverage_report_path(
+            test_suite=unit_test_suite
+        ),
+    )
 
 
 def test_all_subproject_feature_tests_requires(basic_task_info: BasicTaskInfo) -> None:
@@ -960,6 +2097,7 @@ def run_feature_test_side_effect(args: list[Any]) -> None:
         regex_match = REPORT_XML_REGEX.match(arg)
         if regex_match:
             path = Path(regex_match[1])
+            path.parent.mkdir(parents=True, exist_ok=True)
             case = TestCase(name=test_file_name)
             suite_name = f"suite_{test_file_name}"
             # allow for untyped calls to library
@@ -1008,8 +2146,12 @@ def test_run_subproject_feature_tests_test_all(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(), test_file.stem
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file,
                     ]
                 )
@@ -1017,11 +2159,84 @@ def test_run_subproject_feature_tests_test_all(
             for test_file in test_files
         ]
         if len(expected_calls) > 0:
-            assert run_process_mock.mock_calls == expected_calls
+            run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+            assert run_process_mock.call_count == len(expected_calls)
         else:  # pragma: no cov - might only have cases that require calls
             run_process_mock.assert_not_called()
 
 
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+)
+def test_run_subproject_feature_tests_longest_first(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    test_files = sorted(
+        file
+        for file in mock_docker_subproject.get_test_suite_dir(
+            test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+        ).glob("*")
+        if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
+    )
+    file_cache = FileCacheEngine(
+        subproject_context=subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    file_cache.record_test_durations(
+        durations={
+            test_file: timedelta(seconds=index)
+            for index, test_file in enumerate(test_files)
+        }
+    )
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process",
+            side_effect=run_feature_test_side_effect,
+        ) as run_process_mock,
+        # A single CPU runs the files one at a time, in the order they're started
+        task_cpu_budget(cpus=1),
+    ):
+        SubprojectFeatureTests(
+            basic_task_info=basic_task_info, subproject_context=subproject_context
+        ).run()
+    assert [
+        mock_call.kwargs["args"][-1] for mock_call in run_process_mock.mock_calls
+    ] == [str(test_file) for test_file in test_files[::-1]]
+
+
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+)
+def test_run_subproject_feature_tests_keeps_task_context(
+    basic_task_info: BasicTaskInfo, subproject_context: SubprojectContext
+) -> None:
+    cpu_budgets = []
+
+    def run_traced_feature_test(args: list[Any]) -> None:
+        cpu_budgets.append(get_task_cpu_budget())
+        with trace_span(name=args[-1], category="command"):
+            run_feature_test_side_effect(args=args)
+
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process",
+            side_effect=run_traced_feature_test,
+        ),
+        trace_build() as build_trace,
+        trace_span(name="FEATURE_TESTS", category="task"),
+        task_cpu_budget(cpus=2),
+    ):
+        SubprojectFeatureTests(
+            basic_task_info=basic_task_info, subproject_context=subproject_context
+        ).run()
+    command_spans = [span for span in build_trace.spans if span.category == "command"]
+    # Files run on worker threads, but still in the task that started them
+    assert {span.parent for span in command_spans} <= {"FEATURE_TESTS"}
+    assert cpu_budgets == [2] * len(command_spans)
+
+
 @pytest.mark.usefixtures(
     "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
 )
@@ -1060,8 +2275,12 @@ def test_run_subproject_feature_tests_in_ci_cd_int_test_mode(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(), test_file.stem
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file,
                     ]
                 )
@@ -1071,7 +2290,8 @@ def test_run_subproject_feature_tests_in_ci_cd_int_test_mode(
         if subproject_context == SubprojectContext.BUILD_SUPPORT:
             run_process_mock.assert_not_called()
         else:
-            assert run_process_mock.mock_calls == expected_calls
+            run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+            assert run_process_mock.call_count == len(expected_calls)
 
 
 @pytest.mark.usefixtures(
@@ -1094,8 +2314,8 @@ def test_run_subproject_feature_tests_all_cached(
         if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
     ]
     for test_file in test_files:
-        file_cache.update_test_pass_timestamp(file_path=test_file)
-    file_cache.write_text()
+        _record_feature_test_passed(file_cache=file_cache, test_file=test_file)
+    file_cache.flush()
     with patch(
         "build_support.ci_cd_tasks.validation_tasks.run_process"
     ) as run_process_mock:
@@ -1125,8 +2345,8 @@ def test_run_subproject_feature_tests_all_cached_but_top_test_conftest_updated(
         if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
     ]
     for test_file in test_files:
-        file_cache.update_test_pass_timestamp(file_path=test_file)
-    file_cache.write_text()
+        _record_feature_test_passed(file_cache=file_cache, test_file=test_file)
+    file_cache.flush()
     sleep(1 / 1000)  # sleep just long enough for a new timestamp when writing file
     mock_docker_subproject.get_test_dir().joinpath(CONFTEST_NAME).write_text(
         "Updated Top Level Conftest"
@@ -1153,8 +2373,12 @@ def test_run_subproject_feature_tests_all_cached_but_top_test_conftest_updated(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(), test_file.stem
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file,
                     ]
                 )
@@ -1162,7 +2386,8 @@ def test_run_subproject_feature_tests_all_cached_but_top_test_conftest_updated(
             for test_file in test_files
         ]
         if len(expected_calls) > 0:
-            assert run_process_mock.mock_calls == expected_calls
+            run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+            assert run_process_mock.call_count == len(expected_calls)
         else:  # pragma: no cov - might only have cases that require calls
             run_process_mock.assert_not_called()
 
@@ -1187,8 +2412,8 @@ def test_run_subproject_feature_tests_all_cached_but_resource_updated(
         if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
     ]
     for test_file in test_files:
-        file_cache.update_test_pass_timestamp(file_path=test_file)
-    file_cache.write_text()
+        _record_feature_test_passed(file_cache=file_cache, test_file=test_file)
+    file_cache.flush()
     sleep(1 / 1000)
     # Create a resource file for each feature test
     for test_file in test_files:
@@ -1217,8 +2442,12 @@ def test_run_subproject_feature_tests_all_cached_but_resource_updated(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(), test_file.stem
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file,
                     ]
                 )
@@ -1226,7 +2455,8 @@ def test_run_subproject_feature_tests_all_cached_but_resource_updated(
             for test_file in test_files
         ]
         if len(expected_calls) > 0:
-            assert run_process_mock.mock_calls == expected_calls
+            run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+            assert run_process_mock.call_count == len(expected_calls)
         else:  # pragma: no cov - might only have cases that require calls
             run_process_mock.assert_not_called()
 
@@ -1255,10 +2485,10 @@ def test_run_subproject_feature_tests_some_cached(
     test_files_to_run = []
     for index, test_file in enumerate(test_files):
         if index % 2 == 0:
-            file_cache.update_test_pass_timestamp(file_path=test_file)
+            _record_feature_test_passed(file_cache=file_cache, test_file=test_file)
         else:
             test_files_to_run.append(test_file)
-    file_cache.write_text()
+    file_cache.flush()
 
     with patch(
         "build_support.ci_cd_tasks.validation_tasks.run_process",
@@ -1282,15 +2512,21 @@ def test_run_subproject_feature_tests_some_cached(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(),
+                            test_file_to_run.stem,
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file_to_run
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file_to_run,
                     ]
                 )
             )
             for test_file_to_run in test_files_to_run
         ]
-        run_process_mock.assert_has_calls(calls=expected_calls)
+        run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+        assert run_process_mock.call_count == len(expected_calls)
 
 
 @pytest.mark.usefixtures(
@@ -1313,12 +2549,17 @@ def test_run_subproject_feature_tests_one_src_updated(
         if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
     ]
     for test_file in test_files:
-        file_cache.update_test_pass_timestamp(file_path=test_file)
-    file_cache.write_text()
+        _record_feature_test_passed(file_cache=file_cache, test_file=test_file)
+    file_cache.flush()
     sleep(1 / 1000)  # sleep just long enough for a new timestamp when writing file
     src_file = next(mock_docker_subproject.get_all_testable_src_files())
     src_content = src_file.read_text()
     src_file.write_text(src_content + "\n")
+    test_files_to_run = _get_feature_tests_using(
+        subproject=mock_docker_subproject,
+        test_files=test_files,
+        updated_files=[src_file],
+    )
 
     with patch(
         "build_support.ci_cd_tasks.validation_tasks.run_process",
@@ -1342,16 +2583,21 @@ def test_run_subproject_feature_tests_one_src_updated(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(), test_file.stem
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file,
                     ]
                 )
             )
-            for test_file in test_files
+            for test_file in test_files_to_run
         ]
         if len(expected_calls) > 0:
-            run_process_mock.assert_has_calls(calls=expected_calls)
+            run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+            assert run_process_mock.call_count == len(expected_calls)
         else:  # pragma: no cov - might only have cases that require calls
             run_process_mock.assert_not_called()
 
@@ -1376,13 +2622,19 @@ def test_run_subproject_feature_tests_one_src_resource_updated(
         if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
     ]
     for test_file in test_files:
-        file_cache.update_test_pass_timestamp(file_path=test_file)
-    file_cache.write_text()
+        _record_feature_test_passed(file_cache=file_cache, test_file=test_file)
+    file_cache.flush()
     sleep(1 / 1000)
     src_file = next(mock_docker_subproject.get_all_testable_src_files())
     src_resource_dir = get_resource_dir(file_path=src_file)
     src_resource_dir.mkdir(parents=True, exist_ok=True)
-    src_resource_dir.joinpath("data.txt").write_text("resource data")
+    src_resource_file = src_resource_dir.joinpath("data.txt")
+    src_resource_file.write_text("resource data")
+    test_files_to_run = _get_feature_tests_using(
+        subproject=mock_docker_subproject,
+        test_files=test_files,
+        updated_files=[src_resource_file],
+    )
 
     with patch(
         "build_support.ci_cd_tasks.validation_tasks.run_process",
@@ -1406,20 +2658,225 @@ def test_run_subproject_feature_tests_one_src_resource_updated(
                         "--basetemp",
                         get_feature_test_scratch_folder(
                             project_root=docker_project_root
+                        ).joinpath(
+                            mock_docker_subproject.get_subproject_name(), test_file.stem
+                        ),
+                        mock_docker_subproject.get_pytest_feature_test_report_args(
+                            test_file=test_file
                         ),
-                        mock_docker_subproject.get_pytest_feature_test_report_args(),
                         test_file,
                     ]
                 )
             )
-            for test_file in test_files
+            for test_file in test_files_to_run
         ]
         if len(expected_calls) > 0:
-            run_process_mock.assert_has_calls(calls=expected_calls)
+            run_process_mock.assert_has_calls(calls=expected_calls, any_order=True)
+            assert run_process_mock.call_count == len(expected_calls)
         else:  # pragma: no cov - might only have cases that require calls
             run_process_mock.assert_not_called()
 
 
+def test_subproject_feature_tests_resources(
+    basic_task_info: BasicTaskInfo, subproject_context: SubprojectContext
+) -> None:
+    assert SubprojectFeatureTests(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    ).resources() == TaskResources(cpus=THREADS_AVAILABLE)
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_run_feature_test_returns_resource_usage(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    test_file = mock_docker_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+    ).joinpath("test_a.py")
+    usage = ResourceUsage(processes_spawned=1)
+    with patch(
+        "build_support.ci_cd_tasks.validation_tasks.run_process",
+        side_effect=lambda args: record_resource_usage(usage=usage),  # noqa: ARG005
+    ):
+        assert (
+            SubprojectFeatureTests(
+                basic_task_info=basic_task_info, subproject_context=subproject_context
+            ).run_feature_test(
+                feature_test_info=FeatureTestInfo(test_file_path=test_file)
+            )
+            == usage
+        )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_merge_feature_test_reports(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    task = SubprojectFeatureTests(
+        basic_task_info=basic_task_info, subproject_context=subproject_context
+    )
+    incomplete_xml_path = mock_docker_subproject.get_pytest_report_path(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS,
+        test_scope=PythonSubproject.TestScope.INCOMPLETE,
+    )
+    task.merge_feature_test_reports(feature_tests=[])
+    assert not incomplete_xml_path.exists()
+    feature_test_dir = mock_docker_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+    )
+    feature_tests = [
+        FeatureTestInfo(test_file_path=feature_test_dir.joinpath(test_file_name))
+        for test_file_name in ["test_a.py", "test_b.py", "test_c.py"]
+    ]
+    for feature_test_info in feature_tests:
+        run_feature_test_side_effect(
+            args=mock_docker_subproject.get_pytest_feature_test_report_args(
+                test_file=feature_test_info.test_file_path
+            )
+        )
+    task.merge_feature_test_reports(feature_tests=feature_tests[:1])
+    task.merge_feature_test_reports(feature_tests=feature_tests[1:])
+    fragment_suites = [
+        test_suite.name
+        for feature_test_info in feature_tests
+        for test_suite in JUnitXml.fromfile(
+            str(
+                mock_docker_subproject.get_feature_test_report_fragment(
+                    test_file=feature_test_info.test_file_path
+                )
+            )
+        )
+    ]
+    assert [
+        test_suite.name for test_suite in JUnitXml.fromfile(str(incomplete_xml_path))
+    ] == fragment_suites
+
+
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+)
+def test_run_subproject_feature_tests_one_fails(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    test_files = [
+        file
+        for file in mock_docker_subproject.get_test_suite_dir(
+            test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+        ).glob("*")
+        if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
+    ]
+    if len(test_files) <= 1:  # pragma: no cov - might not be true
+        return
+    failing_test_file = test_files[0]
+    failure = ProcessFailedError(command_as_str="pytest", return_code=1)
+
+    def fail_one_feature_test(args: list[Any]) -> None:
+        if args[-1] == str(failing_test_file):
+            raise failure
+        run_feature_test_side_effect(args=args)
+
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process",
+            side_effect=fail_one_feature_test,
+        ) as run_process_mock,
+        pytest.raises(ProcessFailedError) as exc_info,
+    ):
+        SubprojectFeatureTests(
+            basic_task_info=basic_task_info, subproject_context=subproject_context
+        ).run()
+    assert exc_info.value is failure
+    # Every other feature test still ran, and is recorded as passing
+    assert run_process_mock.call_count == len(test_files)
+    file_cache = FileCacheEngine(
+        subproject_context=subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    assert [
+        file_cache.inputs_changed(
+            file_path=test_file,
+            input_digests=file_cache.get_input_digests(
+                input_files=file_cache.get_feature_test_input_files(test_file=test_file)
+            ),
+        )
+        for test_file in test_files
+    ] == [True] + [False] * (len(test_files) - 1)
+    assert file_cache.get_failed_test_files() == {failing_test_file}
+    incomplete_xml_path = mock_docker_subproject.get_pytest_report_path(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS,
+        test_scope=PythonSubproject.TestScope.INCOMPLETE,
+    )
+    # Only the reports of the feature tests that passed are merged
+    assert (
+        len(
+            [
+                test_case
+                for test_suite in JUnitXml.fromfile(str(incomplete_xml_path))
+                for test_case in test_suite
+            ]
+        )
+        == len(test_files) - 1
+    )
+
+
+@pytest.mark.usefixtures(
+    "mock_docker_pyproject_toml_file", "mock_entire_subproject", "mock_git_info_yaml"
+)
+def test_run_subproject_feature_tests_failed_first_fail_fast(
+    basic_task_info: BasicTaskInfo,
+    subproject_context: SubprojectContext,
+    mock_docker_subproject: PythonSubproject,
+) -> None:
+    test_files = sorted(
+        file
+        for file in mock_docker_subproject.get_test_suite_dir(
+            test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+        ).glob("*")
+        if FEATURE_TEST_FILE_NAME_REGEX.match(file.name)
+    )
+    if len(test_files) <= 1:  # pragma: no cov - might not be true
+        return
+    failing_test_file = test_files[-1]
+    file_cache = FileCacheEngine(
+        subproject_context=subproject_context,
+        project_root=basic_task_info.docker_project_root,
+    )
+    file_cache.record_test_failures(
+        ran_test_files=test_files, failed_test_files={failing_test_file}
+    )
+    failure = ProcessFailedError(command_as_str="pytest", return_code=1)
+
+    def fail_one_feature_test(args: list[Any]) -> None:
+        if args[-1] == str(failing_test_file):
+            raise failure
+        run_feature_test_side_effect(args=args)
+
+    with (
+        patch(
+            "build_support.ci_cd_tasks.validation_tasks.run_process",
+            side_effect=fail_one_feature_test,
+        ) as run_process_mock,
+        # A single CPU runs the files one at a time, in the order they're started
+        task_cpu_budget(cpus=1),
+        pytest.raises(ProcessFailedError) as exc_info,
+    ):
+        SubprojectFeatureTests(
+            basic_task_info=basic_task_info.model_copy(update={"fail_fast": True}),
+            subproject_context=subproject_context,
+        ).run()
+    assert exc_info.value is failure
+    # The file that failed last time runs first, and stops at its first failure
+    first_args = run_process_mock.mock_calls[0].kwargs["args"]
+    assert first_args[-1] == str(failing_test_file)
+    assert "--exitfirst" in first_args
+    assert file_cache.get_failed_test_files() == {failing_test_file}
+
+
 def test_get_subprojects_to_test_dockerfile_modified(docker_project_root: Path) -> None:
     """Test get_subprojects_to_test when dockerfile is modified."""
     git_info_yaml_path = get_git_info_yaml(project_root=docker_project_root)
@@ -1549,266 +3006,3 @@ def test_subproject_unit_tests_skips_when_not_in_test_list(
         ).run()
         # Should not call run_process at all since we return early
         run_process_mock.assert_not_called()
-
-
-@dataclass(frozen=True)
-class FullUnitTestInfo:
-    """Test helper dataclass with all unit test information including resource dir."""
-
-    src_file_path: Path
-    test_file_path: Path
-    coverage_config_path: Path
-    test_resource_dir_path: Path | None
-
-
-def create_full_unit_test_info(
-    src_file_path: Path, test_file_path: Path, subproject: PythonSubproject
-) -> FullUnitTestInfo:
-    """Create a FullUnitTestInfo from file paths.
-
-    Args:
-        src_file_path: Path to the source file.
-        test_file_path: Path to the test file.
-        subproject: The subproject containing these files.
-
-    Returns:
-        FullUnitTestInfo with all computed paths.
-    """
-    coverage_config_path = subproject.get_build_dir().joinpath(
-        f"coverage_config_{test_file_path.stem}.toml"
-    )
-    test_resource_dir = get_resource_dir(file_path=test_file_path)
-    test_resource_dir_path = test_resource_dir if test_resource_dir.exists() else None
-
-    return FullUnitTestInfo(
-        src_file_path=src_file_path,
-        test_file_path=test_file_path,
-        coverage_config_path=coverage_config_path,
-        test_resource_dir_path=test_resource_dir_path,
-    )
-
-
-@pytest.fixture(
-    params=["basic", "with_existing_omit", "only_run", "only_report", "minimal"]
-)
-def coverage_settings(
-    request: SubRequest, test_resource_dir: Path
-) -> tuple[str, TOMLDocument]:
-    """Fixture providing coverage settings read from resource TOML files."""
-    settings_name: str = request.param
-    settings_path = test_resource_dir / "inputs" / f"{settings_name}.toml"
-    return settings_name, parse(settings_path.read_text())
-
-
-# Factory functions for different test file setups
-def _create_test_setup_single_file(subproject: PythonSubproject) -> FullUnitTestInfo:
-    """Create a test setup with a single test file."""
-    test_dir = subproject.get_test_suite_dir(
-        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-    ).joinpath("test_module")
-    test_dir.mkdir(parents=True, exist_ok=True)
-    test_file = test_dir.joinpath("test_single_file.py")
-    test_file.write_text("# test file")
-
-    return create_full_unit_test_info(
-        src_file_path=subproject.get_src_dir().joinpath("single_file.py"),
-        test_file_path=test_file,
-        subproject=subproject,
-    )
-
-
-def _create_test_setup_multiple_files(subproject: PythonSubproject) -> FullUnitTestInfo:
-    """Create a test setup with multiple test files in the same directory."""
-    test_dir = subproject.get_test_suite_dir(
-        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-    ).joinpath("test_module")
-    test_dir.mkdir(parents=True, exist_ok=True)
-
-    test_target = test_dir.joinpath("test_multiple_files.py")
-    test_target.write_text("# target test file")
-    test_dir.joinpath("test_other1.py").write_text("# other test file 1")
-    test_dir.joinpath("test_other2.py").write_text("# other test file 2")
-
-    return create_full_unit_test_info(
-        src_file_path=subproject.get_src_dir().joinpath("multiple_files.py"),
-        test_file_path=test_target,
-        subproject=subproject,
-    )
-
-
-def _create_test_setup_with_subdirs(subproject: PythonSubproject) -> FullUnitTestInfo:
-    """Create a test setup with subdirectories containing test files."""
-    test_dir = subproject.get_test_suite_dir(
-        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-    ).joinpath("test_module")
-    test_dir.mkdir(parents=True, exist_ok=True)
-    test_file = test_dir.joinpath("test_with_subdirs.py")
-    test_file.write_text("# test file")
-
-    subdir1 = test_dir.joinpath("subdir1")
-    subdir1.mkdir()
-    subdir1.joinpath("test_sub1.py").write_text("# sub test")
-    subdir2 = test_dir.joinpath("subdir2")
-    subdir2.mkdir()
-    subdir2.joinpath("test_sub2.py").write_text("# sub test")
-
-    return create_full_unit_test_info(
-        src_file_path=subproject.get_src_dir().joinpath("with_subdirs.py"),
-        test_file_path=test_file,
-        subproject=subproject,
-    )
-
-
-def _create_test_setup_complex(subproject: PythonSubproject) -> FullUnitTestInfo:
-    """Create a complex test setup with multiple files and subdirectories."""
-    test_dir = subproject.get_test_suite_dir(
-        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-    ).joinpath("test_module")
-    test_dir.mkdir(parents=True, exist_ok=True)
-
-    test_target = test_dir.joinpath("test_complex.py")
-    test_target.write_text("# target")
-    test_dir.joinpath("test_other1.py").write_text("# other 1")
-    test_dir.joinpath("test_other2.py").write_text("# other 2")
-
-    subdir = test_dir.joinpath("subdir")
-    subdir.mkdir()
-    subdir.joinpath("__init__.py").write_text("# init")
-    subdir.joinpath("conftest.py").write_text("# conftest")
-    subdir.joinpath("test_sub.py").write_text("# sub test")
-
-    return create_full_unit_test_info(
-        src_file_path=subproject.get_src_dir().joinpath("complex.py"),
-        test_file_path=test_target,
-        subproject=subproject,
-    )
-
-
-@pytest.fixture(
-    params=[
-        _create_test_setup_single_file,
-        _create_test_setup_multiple_files,
-        _create_test_setup_with_subdirs,
-        _create_test_setup_complex,
-    ],
-    ids=["single_file", "multiple_files", "with_subdirs", "complex"],
-)
-def test_file_setup(request: SubRequest, docker_project_root: Path) -> FullUnitTestInfo:
-    """Parameterized fixture providing different test file setup configurations."""
-    subproject = get_python_subproject(
-        subproject_context=SubprojectContext.BUILD_SUPPORT,
-        project_root=docker_project_root,
-    )
-    return cast(FullUnitTestInfo, request.param(subproject))
-
-
-def _assert_coverage_config_matches_expected(
-    actual_config_path: Path, expected_config_path: Path
-) -> None:
-    """Assert actual coverage config file matches expected resource file.
-
-    Sorts omit lists before comparison to handle non-deterministic glob ordering.
-
-    Args:
-        actual_config_path: Path to the actual generated config file.
-        expected_config_path: Path to the expected resource file.
-    """
-    actual = parse(actual_config_path.read_text())
-    expected = parse(expected_config_path.read_text())
-    actual_tool = cast(TOMLDocument, actual["tool"])
-    actual_coverage = cast(TOMLDocument, actual_tool["coverage"])
-    actual_run = cast(TOMLDocument, actual_coverage["run"])
-    actual_run["omit"] = sorted(cast(list[str], actual_run["omit"]))
-    expected_tool = cast(TOMLDocument, expected["tool"])
-    expected_coverage = cast(TOMLDocument, expected_tool["coverage"])
-    expected_run = cast(TOMLDocument, expected_coverage["run"])
-    expected_run["omit"] = sorted(cast(list[str], expected_run["omit"]))
-    assert actual == expected
-
-
-class TestWriteCoverageConfigFile:
-    """Tests for write_coverage_config_file method."""
-
-    def test_write_coverage_config_file(
-        self,
-        basic_task_info: BasicTaskInfo,
-        coverage_settings: tuple[str, TOMLDocument],
-        test_file_setup: FullUnitTestInfo,
-        test_resource_dir: Path,
-    ) -> None:
-        """Test writing config file with various settings and test file setups."""
-        settings_name, settings = coverage_settings
-        settings_before = deepcopy(settings)
-
-        task = SubprojectUnitTests(
-            basic_task_info=basic_task_info,
-            subproject_context=SubprojectContext.BUILD_SUPPORT,
-        )
-
-        config_path = task.write_coverage_config_file(
-            unit_test_info=UnitTestInfo(
-                src_file_path=test_file_setup.src_file_path,
-                test_file_path=test_file_setup.test_file_path,
-                coverage_config_path=test_file_setup.coverage_config_path,
-            ),
-            coverage_settings=settings,
-        )
-
-        subproject = get_python_subproject(
-            subproject_context=SubprojectContext.BUILD_SUPPORT,
-            project_root=basic_task_info.docker_project_root,
-        )
-        assert config_path.parent == subproject.get_build_dir()
-        # Derive expected config name from test file name
-        test_file_stem = test_file_setup.test_file_path.stem
-        assert config_path.name == f"coverage_config_{test_file_stem}.toml"
-
-        # Derive name for expected output by removing "test_" prefix
-        expected_name = test_file_stem.removeprefix("test_")
-        expected_path = (
-            test_resource_dir
-            / "expected_outputs"
-            / settings_name
-            / f"{expected_name}.toml"
-        )
-        _assert_coverage_config_matches_expected(config_path, expected_path)
-
-        assert settings == settings_before
-
-    def test_write_coverage_config_preserves_other_settings(
-        self,
-        basic_task_info: BasicTaskInfo,
-        test_file_setup: FullUnitTestInfo,
-        test_resource_dir: Path,
-    ) -> None:
-        """Test that other coverage settings are preserved."""
-        settings_name = "preserves_other_settings"
-        settings_path = test_resource_dir / "inputs" / f"{settings_name}.toml"
-        settings = parse(settings_path.read_text())
-        settings_before = deepcopy(settings)
-
-        task = SubprojectUnitTests(
-            basic_task_info=basic_task_info,
-            subproject_context=SubprojectContext.BUILD_SUPPORT,
-        )
-
-        config_path = task.write_coverage_config_file(
-            unit_test_info=UnitTestInfo(
-                src_file_path=test_file_setup.src_file_path,
-                test_file_path=test_file_setup.test_file_path,
-                coverage_config_path=test_file_setup.coverage_config_path,
-            ),
-            coverage_settings=settings,
-        )
-
-        # Derive name for expected output by removing "test_" prefix
-        expected_name = test_file_setup.test_file_path.stem.removeprefix("test_")
-        expected_path = (
-            test_resource_dir
-            / "expected_outputs"
-            / settings_name
-            / f"{expected_name}.toml"
-        )
-        _assert_coverage_config_matches_expected(config_path, expected_path)
-
-        assert settings == settings_before
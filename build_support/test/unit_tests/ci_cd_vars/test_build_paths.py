@@ -4,10 +4,16 @@ from build_support.ci_cd_vars.build_paths import (
     get_build_docs_build_dir,
     get_build_docs_dir,
     get_build_docs_source_dir,
+    get_build_history_db_path,
     get_build_runtime_report_path,
+    get_build_trace_path,
     get_dist_dir,
     get_git_info_yaml,
     get_local_info_yaml,
+    get_shared_test_results_dir,
+    get_task_cache_dir,
+    get_task_duration_history_path,
+    get_task_queue_dir,
 )
 from build_support.ci_cd_vars.project_structure import get_build_dir
 
@@ -19,6 +25,36 @@ def test_get_dist_dir(mock_project_root: Path) -> None:
     assert expected_dist_dir.exists()
 
 
+def test_get_task_cache_dir(mock_project_root: Path) -> None:
+    expected_task_cache_dir = get_build_dir(project_root=mock_project_root).joinpath(
+        "task_cache"
+    )
+    assert not expected_task_cache_dir.exists()
+    assert get_task_cache_dir(project_root=mock_project_root) == expected_task_cache_dir
+    assert expected_task_cache_dir.exists()
+
+
+def test_get_task_queue_dir(mock_project_root: Path) -> None:
+    expected_task_queue_dir = get_build_dir(project_root=mock_project_root).joinpath(
+        "task_queue"
+    )
+    assert not expected_task_queue_dir.exists()
+    assert get_task_queue_dir(project_root=mock_project_root) == expected_task_queue_dir
+    assert expected_task_queue_dir.exists()
+
+
+def test_get_shared_test_results_dir(mock_project_root: Path) -> None:
+    expected_shared_test_results_dir = get_build_dir(
+        project_root=mock_project_root
+    ).joinpath("shared_test_results")
+    assert not expected_shared_test_results_dir.exists()
+    assert (
+        get_shared_test_results_dir(project_root=mock_project_root)
+        == expected_shared_test_results_dir
+    )
+    assert expected_shared_test_results_dir.exists()
+
+
 def test_get_local_info_yaml(mock_project_root: Path) -> None:
     assert get_local_info_yaml(project_root=mock_project_root) == get_build_dir(
         project_root=mock_project_root
@@ -72,3 +108,33 @@ def test_get_build_runtime_report_path(mock_project_root: Path) -> None:
         get_build_runtime_report_path(project_root=mock_project_root)
         == expected_build_runtime_report_path
     )
+
+
+def test_get_build_trace_path(mock_project_root: Path) -> None:
+    expected_build_trace_path = get_build_dir(project_root=mock_project_root).joinpath(
+        "build_trace.json"
+    )
+    assert (
+        get_build_trace_path(project_root=mock_project_root)
+        == expected_build_trace_path
+    )
+
+
+def test_get_build_history_db_path(mock_project_root: Path) -> None:
+    expected_build_history_db_path = get_build_dir(
+        project_root=mock_project_root
+    ).joinpath("build_history.sqlite")
+    assert (
+        get_build_history_db_path(project_root=mock_project_root)
+        == expected_build_history_db_path
+    )
+
+
+def test_get_task_duration_history_path(mock_project_root: Path) -> None:
+    expected_task_duration_history_path = get_build_dir(
+        project_root=mock_project_root
+    ).joinpath("task_duration_history.yaml")
+    assert (
+        get_task_duration_history_path(project_root=mock_project_root)
+        == expected_task_duration_history_path
+    )
@@ -28,6 +28,7 @@ from build_support.ci_cd_vars.subproject_structure import (
     SubprojectContext,
     get_python_subproject,
 )
+from build_support.docker_session import docker_session
 from build_support.process_runner import concatenate_args
 
 docker_targets = list(DockerTarget)
@@ -276,6 +277,55 @@ def test_get_docker_command_for_image(
     )
 
 
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_get_docker_command_for_image_with_environment(
+    mock_project_root: Path, docker_project_root: Path, docker_target: DockerTarget
+) -> None:
+    assert get_docker_command_for_image(
+        non_docker_project_root=mock_project_root,
+        docker_project_root=docker_project_root,
+        target_image=docker_target,
+        environment={"A": "1", "B": "2"},
+    ) == concatenate_args(
+        [
+            get_base_docker_command_for_image(
+                non_docker_project_root=mock_project_root,
+                docker_project_root=docker_project_root,
+                target_image=docker_target,
+            ),
+            ["-e", "A=1", "-e", "B=2"],
+            get_docker_image_name(
+                project_root=docker_project_root, target_image=docker_target
+            ),
+        ]
+    )
+
+
+@pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
+def test_get_docker_command_for_image_in_docker_session(
+    mock_project_root: Path, docker_project_root: Path, docker_target: DockerTarget
+) -> None:
+    with (
+        patch("build_support.docker_session.run_process") as mock_run_process,
+        patch("build_support.docker_session.get_output_of_process", return_value=""),
+        docker_session(project_root=mock_project_root) as session,
+    ):
+        docker_command = get_docker_command_for_image(
+            non_docker_project_root=mock_project_root,
+            docker_project_root=docker_project_root,
+            target_image=docker_target,
+            environment={"A": "1"},
+        )
+        container_name = session.container_names[
+            get_docker_image_name(
+                project_root=docker_project_root, target_image=docker_target
+            )
+        ]
+        # The container starts when the command runs, not when it's built
+        mock_run_process.assert_not_called()
+    assert docker_command == ["docker", "exec", "-e", "A=1", container_name]
+
+
 @pytest.mark.usefixtures("mock_docker_pyproject_toml_file")
 def test_get_interactive_docker_command_for_image(
     mock_project_root: Path, docker_project_root: Path, docker_target: DockerTarget
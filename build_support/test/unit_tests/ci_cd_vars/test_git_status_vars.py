@@ -13,12 +13,15 @@ from build_support.ci_cd_vars.git_status_vars import (
     get_git_diff,
     get_git_head,
     get_git_repo,
+    get_head_commit_sha,
+    get_line_diff_since_commit,
     get_local_tags,
     get_modified_files,
     get_modified_files_between_commits,
     get_modified_subprojects,
     get_most_recent_commit_on_main,
     get_ticket_id,
+    get_uncommitted_files,
     git_add_all,
     git_fetch,
     monkeypatch_git_python_execute_kwargs,
@@ -360,6 +363,51 @@ def test_get_modified_files_not_on_main(
     assert expected_files.issubset(modified_files)
 
 
+def test_get_head_commit_sha(mock_project_root: Path, mock_git_repo: Repo) -> None:
+    assert (
+        get_head_commit_sha(project_root=mock_project_root)
+        == mock_git_repo.head.commit.hexsha
+    )
+
+
+def test_get_uncommitted_files(mock_project_root: Path, mock_git_repo: Repo) -> None:
+    assert get_uncommitted_files(project_root=mock_project_root) == set()
+    committed_file = mock_project_root.joinpath("first_file.txt")
+    committed_file.write_text("modified text")
+    staged_file = mock_project_root.joinpath("staged.txt")
+    staged_file.write_text("staged text")
+    mock_git_repo.index.add([staged_file])
+    untracked_file = mock_project_root.joinpath("untracked.txt")
+    untracked_file.write_text("untracked text")
+    assert get_uncommitted_files(project_root=mock_project_root) == {
+        committed_file,
+        staged_file,
+        untracked_file,
+    }
+
+
+def test_get_line_diff_since_commit(
+    mock_project_root: Path, mock_git_repo: Repo
+) -> None:
+    tracked_file = mock_project_root.joinpath("tracked.txt")
+    tracked_file.write_text("line 1\nline 2\nline 3\n")
+    other_file = mock_project_root.joinpath("other.txt")
+    other_file.write_text("other\n")
+    mock_git_repo.index.add([tracked_file, other_file])
+    commit_sha = mock_git_repo.index.commit("add files").hexsha
+    tracked_file.write_text("line 1\nline two\nline 3\n")
+    mock_git_repo.index.add([tracked_file])
+    mock_git_repo.index.commit("change a line")
+    other_file.write_text("changed\n")
+    diff = get_line_diff_since_commit(
+        project_root=mock_project_root, commit_sha=commit_sha, paths=[tracked_file]
+    )
+    assert "@@ -2 +2 @@" in diff
+    assert "-line 2" in diff
+    assert "+line two" in diff
+    assert "other.txt" not in diff
+
+
 def test_get_modified_subprojects(mock_project_root: Path) -> None:
     """Test that get_modified_subprojects returns the correct subprojects."""
     # Create some test files in different subprojects
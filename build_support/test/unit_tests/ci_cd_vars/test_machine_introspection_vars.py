@@ -1,8 +1,98 @@
-import multiprocessing
+import os
 from copy import copy
+from pathlib import Path
+from unittest.mock import patch
 
-from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
+import pytest
+from build_support.ci_cd_vars.machine_introspection_vars import (
+    CGROUP_V1_CPU_PERIOD_PATH,
+    CGROUP_V1_CPU_QUOTA_PATH,
+    CGROUP_V2_CPU_MAX_PATH,
+    THREADS_AVAILABLE,
+    get_available_cpus,
+    get_cgroup_cpu_limit,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert Path("/sys/fs/cgroup/cpu.max") == CGROUP_V2_CPU_MAX_PATH
+    assert Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") == CGROUP_V1_CPU_QUOTA_PATH
+    assert Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us") == CGROUP_V1_CPU_PERIOD_PATH
 
 
 def test_get_threads() -> None:
-    assert copy(THREADS_AVAILABLE) == multiprocessing.cpu_count()
+    assert copy(THREADS_AVAILABLE) == get_available_cpus()
+
+
+@pytest.mark.parametrize(
+    ("cpu_max", "expected_limit"),
+    [
+        ("max 100000\n", None),
+        ("200000 100000\n", 2),
+        ("150000 100000\n", 2),
+        ("10000 100000\n", 1),
+    ],
+)
+def test_get_cgroup_cpu_limit_v2(
+    tmp_path: Path, cpu_max: str, expected_limit: int | None
+) -> None:
+    cpu_max_path = tmp_path.joinpath("cpu.max")
+    cpu_max_path.write_text(cpu_max)
+    assert (
+        get_cgroup_cpu_limit(
+            cpu_max_path=cpu_max_path,
+            cpu_quota_path=tmp_path.joinpath("missing_quota"),
+            cpu_period_path=tmp_path.joinpath("missing_period"),
+        )
+        == expected_limit
+    )
+
+
+@pytest.mark.parametrize(
+    ("cpu_quota", "expected_limit"), [("-1\n", None), ("400000\n", 4)]
+)
+def test_get_cgroup_cpu_limit_v1(
+    tmp_path: Path, cpu_quota: str, expected_limit: int | None
+) -> None:
+    cpu_quota_path = tmp_path.joinpath("cpu.cfs_quota_us")
+    cpu_period_path = tmp_path.joinpath("cpu.cfs_period_us")
+    cpu_quota_path.write_text(cpu_quota)
+    cpu_period_path.write_text("100000\n")
+    assert (
+        get_cgroup_cpu_limit(
+            cpu_max_path=tmp_path.joinpath("missing_cpu_max"),
+            cpu_quota_path=cpu_quota_path,
+            cpu_period_path=cpu_period_path,
+        )
+        == expected_limit
+    )
+
+
+def test_get_cgroup_cpu_limit_without_cgroup_files(tmp_path: Path) -> None:
+    cpu_quota_path = tmp_path.joinpath("cpu.cfs_quota_us")
+    cpu_quota_path.write_text("400000\n")
+    assert (
+        get_cgroup_cpu_limit(
+            cpu_max_path=tmp_path.joinpath("missing_cpu_max"),
+            cpu_quota_path=cpu_quota_path,
+            cpu_period_path=tmp_path.joinpath("missing_period"),
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    ("process_cpu_count", "cgroup_cpu_limit", "expected_cpus"),
+    [(8, None, 8), (8, 2, 2), (2, 8, 2), (None, None, 1)],
+)
+def test_get_available_cpus(
+    process_cpu_count: int | None, cgroup_cpu_limit: int | None, expected_cpus: int
+) -> None:
+    with (
+        patch.object(os, "process_cpu_count", return_value=process_cpu_count),
+        patch(
+            "build_support.ci_cd_vars.machine_introspection_vars.get_cgroup_cpu_limit",
+            return_value=cgroup_cpu_limit,
+        ),
+    ):
+        assert get_available_cpus() == expected_cpus
@@ -12,6 +12,7 @@ from build_support.ci_cd_vars.project_structure import (
     get_readme,
     get_resource_dir,
     get_sphinx_conf_dir,
+    get_static_check_config_files,
     get_uv_lock_file,
     maybe_build_dir,
 )
@@ -86,6 +87,14 @@ def test_get_readme(mock_project_root: Path) -> None:
     )
 
 
+def test_get_static_check_config_files(mock_project_root: Path) -> None:
+    assert get_static_check_config_files(project_root=mock_project_root) == [
+        get_pyproject_toml(project_root=mock_project_root),
+        get_uv_lock_file(project_root=mock_project_root),
+        get_dockerfile(project_root=mock_project_root),
+    ]
+
+
 def test_get_feature_test_log_file(mock_project_root: Path) -> None:
     log_name = "test_something[param1::param2]"
     expected_log_path = get_feature_test_scratch_folder(
@@ -316,25 +316,12 @@ def test_get_pytest_whole_test_suite_report_args(
         test_report_path = mock_subproject.get_pytest_report_path(
             test_suite=test_suite, test_scope=test_scope
         )
-        coverage_report_path = mock_subproject.get_pytest_coverage_report_path(
-            test_suite=test_suite
-        )
-        if test_suite == PythonSubproject.TestSuite.UNIT_TESTS:
-            expected_args = [
-                "--cov-report",
-                "term-missing",
-                f"--cov={mock_subproject.get_test_suite_dir(test_suite=test_suite)}",
-                f"--junitxml={test_report_path}",
-                f"--cov={mock_subproject.get_src_dir()}",
-                f"--cov-report=xml:{coverage_report_path}",
-            ]
-        else:
-            expected_args = [
-                "--cov-report",
-                "term-missing",
-                f"--cov={mock_subproject.get_test_suite_dir(test_suite=test_suite)}",
-                f"--junitxml={test_report_path}",
-            ]
+        expected_args = [
+            "--cov-report",
+            "term-missing",
+            f"--cov={mock_subproject.get_test_suite_dir(test_suite=test_suite)}",
+            f"--junitxml={test_report_path}",
+        ]
         assert (
             mock_subproject.get_pytest_whole_test_suite_report_args(
                 test_suite=test_suite
@@ -344,12 +331,31 @@ def test_get_pytest_whole_test_suite_report_args(
 
 
 @pytest.mark.usefixtures("mock_local_pyproject_toml_file")
-def test_get_pytest_feature_test_report_args(mock_subproject: PythonSubproject) -> None:
+def test_get_pytest_unit_test_session_args(mock_subproject: PythonSubproject) -> None:
     report_path = mock_subproject.get_pytest_report_path(
-        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS,
-        test_scope=PythonSubproject.TestScope.SINGLE_FILE,
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS,
+        test_scope=PythonSubproject.TestScope.INCOMPLETE,
     )
-    assert mock_subproject.get_pytest_feature_test_report_args() == [
+    unit_test_dir = mock_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    )
+    assert mock_subproject.get_pytest_unit_test_session_args() == [
+        f"--cov={mock_subproject.get_src_dir()}",
+        f"--cov={unit_test_dir}",
+        "--cov-context=test",
+        "--cov-report=",
+        "--cov-fail-under=0",
+        f"--junitxml={report_path}",
+    ]
+
+
+@pytest.mark.usefixtures("mock_local_pyproject_toml_file")
+def test_get_pytest_feature_test_report_args(mock_subproject: PythonSubproject) -> None:
+    test_file = mock_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+    ).joinpath("test_a.py")
+    report_path = mock_subproject.get_feature_test_report_fragment(test_file=test_file)
+    assert mock_subproject.get_pytest_feature_test_report_args(test_file=test_file) == [
         f"--junitxml={report_path}"
     ]
 
@@ -362,6 +368,54 @@ def test_get_file_cache_yaml(mock_subproject: PythonSubproject) -> None:
     assert mock_subproject.get_file_cache_yaml() == expected_file_cache_yaml
 
 
+@pytest.mark.usefixtures("mock_local_pyproject_toml_file")
+def test_get_file_cache_db(mock_subproject: PythonSubproject) -> None:
+    expected_file_cache_db = mock_subproject.get_build_dir().joinpath(
+        "file_cache.sqlite"
+    )
+    assert mock_subproject.get_file_cache_db() == expected_file_cache_db
+
+
+@pytest.mark.usefixtures("mock_local_pyproject_toml_file")
+def test_get_unit_test_coverage_data_file(mock_subproject: PythonSubproject) -> None:
+    expected_data_file = mock_subproject.get_build_dir().joinpath(
+        "unit_test_coverage.sqlite"
+    )
+    assert mock_subproject.get_unit_test_coverage_data_file() == expected_data_file
+
+
+@pytest.mark.usefixtures("mock_local_pyproject_toml_file")
+def test_get_unit_test_session_coverage_data_file(
+    mock_subproject: PythonSubproject,
+) -> None:
+    expected_data_file = mock_subproject.get_build_dir().joinpath(
+        "unit_test_session_coverage.sqlite"
+    )
+    assert (
+        mock_subproject.get_unit_test_session_coverage_data_file() == expected_data_file
+    )
+
+
+@pytest.mark.usefixtures("mock_local_pyproject_toml_file")
+def test_get_unit_test_report_fragments_dir(mock_subproject: PythonSubproject) -> None:
+    expected_dir = mock_subproject.get_build_dir().joinpath(
+        "unit_test_report_fragments"
+    )
+    assert mock_subproject.get_unit_test_report_fragments_dir() == expected_dir
+
+
+@pytest.mark.usefixtures("mock_local_pyproject_toml_file")
+def test_get_feature_test_report_fragment(mock_subproject: PythonSubproject) -> None:
+    test_file = mock_subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
+    ).joinpath("test_a.py")
+    assert mock_subproject.get_feature_test_report_fragment(
+        test_file=test_file
+    ) == mock_subproject.get_build_dir().joinpath(
+        "feature_test_report_fragments", "test_a.xml"
+    )
+
+
 def test_get_python_subproject(mock_project_root: Path) -> None:
     for context in get_sorted_subproject_contexts():
         assert get_python_subproject(
@@ -0,0 +1,360 @@
+from contextlib import closing
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from build_support.build_history import (
+    MIN_REGRESSION_DURATION,
+    PASSED_STATUS,
+    REGRESSION_THRESHOLD,
+    ROLLING_BASELINE_BUILDS,
+    TaskTrend,
+    connect_to_build_history,
+    get_git_revision,
+    get_recent_builds,
+    get_task_trends,
+    record_build,
+)
+from build_support.build_tracing import BuildTrace, TraceSpan
+from git import Actor, Repo
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert ROLLING_BASELINE_BUILDS == 10  # noqa: PLR2004
+    assert REGRESSION_THRESHOLD == 0.2  # noqa: PLR2004
+    assert timedelta(seconds=1) == MIN_REGRESSION_DURATION
+    assert PASSED_STATUS == "passed"
+
+
+def build_trace_with_tasks(
+    task_durations: dict[str, timedelta], cached_tasks: frozenset[str] = frozenset()
+) -> BuildTrace:
+    """Builds a trace where tasks run one after another, each running one command."""
+    build_trace = BuildTrace()
+    start = build_trace.start
+    for task_name, duration in task_durations.items():
+        build_trace.add_span(
+            span=TraceSpan(
+                name=f"{task_name} command",
+                category="command",
+                start=start,
+                duration=duration,
+                thread_id=1,
+                args={"exit_code": 0},
+                parent=task_name,
+            )
+        )
+        build_trace.add_span(
+            span=TraceSpan(
+                name=task_name,
+                category="task",
+                start=start,
+                duration=duration,
+                thread_id=1,
+                args={"restored_from_cache": task_name in cached_tasks},
+            )
+        )
+        start += duration
+    return build_trace
+
+
+def test_get_git_revision_of_real_project(real_project_root_dir: Path) -> None:
+    repo = Repo(real_project_root_dir)
+    expected_branch = None if repo.head.is_detached else repo.active_branch.name
+    assert get_git_revision(project_root=real_project_root_dir) == (
+        expected_branch,
+        repo.head.commit.hexsha,
+    )
+
+
+def test_get_git_revision_not_a_repo(mock_project_root: Path) -> None:
+    assert get_git_revision(project_root=mock_project_root) == (None, None)
+
+
+def test_get_git_revision_missing_path(tmp_path: Path) -> None:
+    assert get_git_revision(project_root=tmp_path.joinpath("missing")) == (None, None)
+
+
+def test_get_git_revision_no_commits(mock_project_root: Path) -> None:
+    Repo.init(mock_project_root)
+    assert get_git_revision(project_root=mock_project_root) == (None, None)
+
+
+def test_get_git_revision_branch_and_detached(mock_project_root: Path) -> None:
+    repo = Repo.init(mock_project_root, initial_branch="a_branch")
+    author = Actor(name="author", email="author@example.com")
+    commit = repo.index.commit(message="first", author=author, committer=author)
+    assert get_git_revision(project_root=mock_project_root) == (
+        "a_branch",
+        commit.hexsha,
+    )
+    repo.git.checkout(commit.hexsha)
+    assert get_git_revision(project_root=mock_project_root) == (None, commit.hexsha)
+
+
+def test_connect_to_build_history_creates_tables(mock_project_root: Path) -> None:
+    with closing(connect_to_build_history(project_root=mock_project_root)) as conn:
+        tables = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+    assert {"builds", "task_runs", "command_runs"}.issubset(tables)
+
+
+def test_record_build(mock_project_root: Path) -> None:
+    build_trace = build_trace_with_tasks(
+        task_durations={"TASK_1": timedelta(seconds=2), "TASK_2": timedelta(seconds=3)},
+        cached_tasks=frozenset({"TASK_2"}),
+    )
+    build_trace.add_span(
+        span=TraceSpan(
+            name="orphan command",
+            category="command",
+            start=build_trace.start,
+            duration=timedelta(seconds=1),
+            thread_id=2,
+            args={"exit_code": 2},
+        )
+    )
+    first_build_id = record_build(
+        project_root=mock_project_root,
+        build_trace=build_trace,
+        task_statuses={"TASK_1": "failed"},
+    )
+    second_build_id = record_build(
+        project_root=mock_project_root, build_trace=build_trace
+    )
+    assert second_build_id == first_build_id + 1
+    with closing(connect_to_build_history(project_root=mock_project_root)) as conn:
+        task_rows = conn.execute(
+            "SELECT task_name, restored_from_cache, status "
+            "FROM task_runs WHERE build_id = ? ORDER BY rowid",
+            (first_build_id,),
+        ).fetchall()
+        command_rows = conn.execute(
+            "SELECT task_name, command, duration_seconds, exit_code "
+            "FROM command_runs WHERE build_id = ? ORDER BY rowid",
+            (first_build_id,),
+        ).fetchall()
+    assert task_rows == [("TASK_1", 0, "failed"), ("TASK_2", 1, "passed")]
+    assert command_rows == [
+        ("TASK_1", "TASK_1 command", 2.0, 0),
+        ("TASK_2", "TASK_2 command", 3.0, 0),
+        (None, "orphan command", 1.0, 2),
+    ]
+    (build_record, _) = get_recent_builds(project_root=mock_project_root, limit=2)
+    assert build_record.build_id == first_build_id
+    assert build_record.started_at == build_trace.start
+    assert build_record.branch is None
+    assert build_record.commit_sha is None
+    assert build_record.duration == timedelta(seconds=5)
+    assert build_record.tasks_run == 2  # noqa: PLR2004
+    assert build_record.cache_hits == 1
+
+
+def test_connect_to_build_history_adds_status_to_old_history(
+    mock_project_root: Path,
+) -> None:
+    with closing(connect_to_build_history(project_root=mock_project_root)) as conn:
+        conn.executescript(
+            """
+            DROP TABLE task_runs;
+            CREATE TABLE task_runs (
+                build_id INTEGER NOT NULL REFERENCES builds (build_id),
+                task_name TEXT NOT NULL,
+                duration_seconds REAL NOT NULL,
+                restored_from_cache INTEGER NOT NULL
+            );
+            INSERT INTO task_runs VALUES (1, 'TASK', 1.0, 0);
+            """
+        )
+    with closing(connect_to_build_history(project_root=mock_project_root)) as conn:
+        rows = conn.execute("SELECT task_name, status FROM task_runs").fetchall()
+    assert rows == [("TASK", "passed")]
+
+
+def test_record_empty_build(mock_project_root: Path) -> None:
+    record_build(project_root=mock_project_root, build_trace=BuildTrace())
+    (build_record,) = get_recent_builds(project_root=mock_project_root, limit=1)
+    assert build_record.duration == timedelta(0)
+    assert build_record.tasks_run == 0
+    assert build_record.cache_hits == 0
+
+
+def test_get_recent_builds_limit(mock_project_root: Path) -> None:
+    build_ids = [
+        record_build(project_root=mock_project_root, build_trace=BuildTrace())
+        for _ in range(3)
+    ]
+    assert [
+        build.build_id
+        for build in get_recent_builds(project_root=mock_project_root, limit=2)
+    ] == build_ids[1:]
+
+
+def test_get_task_trends_without_builds(mock_project_root: Path) -> None:
+    assert get_task_trends(project_root=mock_project_root) == []
+
+
+def test_get_task_trends(mock_project_root: Path) -> None:
+    for seconds in [10, 12, 100]:
+        record_build(
+            project_root=mock_project_root,
+            build_trace=build_trace_with_tasks(
+                task_durations={
+                    "SLOWER": timedelta(seconds=seconds),
+                    "STEADY": timedelta(seconds=10),
+                    "CACHED": timedelta(seconds=10),
+                    "TINY": timedelta(milliseconds=100),
+                }
+            ),
+        )
+    record_build(
+        project_root=mock_project_root,
+        build_trace=build_trace_with_tasks(
+            task_durations={
+                "SLOWER": timedelta(seconds=20),
+                "STEADY": timedelta(seconds=11),
+                "CACHED": timedelta(milliseconds=1),
+                "TINY": timedelta(milliseconds=500),
+                "NEW": timedelta(seconds=5),
+            },
+            cached_tasks=frozenset({"CACHED"}),
+        ),
+    )
+    trends = get_task_trends(
+        project_root=mock_project_root, baseline_builds=2, regression_threshold=0.2
+    )
+    assert trends == [
+        TaskTrend(
+            task_name="SLOWER",
+            latest_duration=timedelta(seconds=20),
+            restored_from_cache=False,
+            # Only the two most recent runs make up the baseline
+            baseline_duration=timedelta(seconds=56),
+            regressed=False,
+        ),
+        TaskTrend(
+            task_name="STEADY",
+            latest_duration=timedelta(seconds=11),
+            restored_from_cache=False,
+            baseline_duration=timedelta(seconds=10),
+            regressed=False,
+        ),
+        TaskTrend(
+            task_name="CACHED",
+            latest_duration=timedelta(milliseconds=1),
+            restored_from_cache=True,
+            baseline_duration=timedelta(seconds=10),
+            regressed=False,
+        ),
+        TaskTrend(
+            task_name="TINY",
+            latest_duration=timedelta(milliseconds=500),
+            restored_from_cache=False,
+            baseline_duration=timedelta(milliseconds=100),
+            regressed=False,
+        ),
+        TaskTrend(
+            task_name="NEW",
+            latest_duration=timedelta(seconds=5),
+            restored_from_cache=False,
+            baseline_duration=None,
+            regressed=False,
+        ),
+    ]
+    slower_trend = get_task_trends(
+        project_root=mock_project_root, baseline_builds=1, regression_threshold=0.2
+    )[0]
+    assert slower_trend.baseline_duration == timedelta(seconds=100)
+    assert not slower_trend.regressed
+
+
+def test_get_task_trends_flags_regression(mock_project_root: Path) -> None:
+    for seconds in [10, 12, 11]:
+        record_build(
+            project_root=mock_project_root,
+            build_trace=build_trace_with_tasks(
+                task_durations={"TASK": timedelta(seconds=seconds)}
+            ),
+        )
+    record_build(
+        project_root=mock_project_root,
+        build_trace=build_trace_with_tasks(
+            task_durations={"TASK": timedelta(seconds=30)}
+        ),
+    )
+    (trend,) = get_task_trends(project_root=mock_project_root)
+    assert trend.regressed
+    assert trend.baseline_duration == timedelta(seconds=11)
+
+
+def test_get_task_trends_leaves_out_failed_runs(mock_project_root: Path) -> None:
+    for seconds, status in [(10, "passed"), (1, "failed"), (2, "failed")]:
+        record_build(
+            project_root=mock_project_root,
+            build_trace=build_trace_with_tasks(
+                task_durations={"TASK": timedelta(seconds=seconds)}
+            ),
+            task_statuses={"TASK": status},
+        )
+    record_build(
+        project_root=mock_project_root,
+        build_trace=build_trace_with_tasks(
+            task_durations={"TASK": timedelta(seconds=11)}
+        ),
+    )
+    (trend,) = get_task_trends(project_root=mock_project_root)
+    assert trend.baseline_duration == timedelta(seconds=10)
+    assert not trend.regressed
+    record_build(
+        project_root=mock_project_root,
+        build_trace=build_trace_with_tasks(
+            task_durations={"TASK": timedelta(seconds=30)}
+        ),
+        task_statuses={"TASK": "failed"},
+    )
+    (failed_trend,) = get_task_trends(project_root=mock_project_root)
+    assert failed_trend.baseline_duration == timedelta(seconds=10.5)
+    assert not failed_trend.regressed
+
+
+@pytest.mark.parametrize(
+    ("trend", "expected_percent_change"),
+    [
+        (
+            TaskTrend(
+                task_name="TASK",
+                latest_duration=timedelta(seconds=15),
+                restored_from_cache=False,
+                baseline_duration=timedelta(seconds=10),
+                regressed=True,
+            ),
+            50.0,
+        ),
+        (
+            TaskTrend(
+                task_name="TASK",
+                latest_duration=timedelta(seconds=15),
+                restored_from_cache=False,
+                baseline_duration=None,
+                regressed=False,
+            ),
+            None,
+        ),
+        (
+            TaskTrend(
+                task_name="TASK",
+                latest_duration=timedelta(seconds=15),
+                restored_from_cache=False,
+                baseline_duration=timedelta(0),
+                regressed=False,
+            ),
+            None,
+        ),
+    ],
+)
+def test_task_trend_percent_change(
+    trend: TaskTrend, expected_percent_change: float | None
+) -> None:
+    assert trend.get_percent_change() == expected_percent_change
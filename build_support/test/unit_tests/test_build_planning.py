@@ -0,0 +1,205 @@
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import yaml
+from build_support.build_planning import (
+    HISTORY_SMOOTHING_FACTOR,
+    TaskDurationHistory,
+    get_build_plan,
+)
+from build_support.ci_cd_tasks.task_node import BasicTaskInfo, TaskNode
+
+
+def build_mock_basic_task(
+    task_name: str, required_mock_tasks: list[TaskNode]
+) -> TaskNode:
+    """Builds a mock task for testing task interactions."""
+
+    return type(
+        task_name,
+        (TaskNode,),
+        {"required_tasks": Mock(return_value=required_mock_tasks), "run": Mock()},
+    )(
+        basic_task_info=BasicTaskInfo(
+            non_docker_project_root=Path("/root"),
+            docker_project_root=Path("/root"),
+            local_uid=10,
+            local_gid=2,
+            local_user_env={"ENV1": "VAL1", "ENV2": "VAL2"},
+        )
+    )
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert HISTORY_SMOOTHING_FACTOR == 0.5  # noqa: PLR2004
+
+
+def test_load_and_dump_task_duration_history() -> None:
+    history_data = {"durations": {"TASK_1": "PT3S", "TASK_2": "PT1M"}}
+    history = TaskDurationHistory.from_yaml(yaml_str=yaml.dump(history_data))
+    assert history == TaskDurationHistory(
+        durations={"TASK_1": timedelta(seconds=3), "TASK_2": timedelta(minutes=1)}
+    )
+    assert history.to_yaml() == yaml.dump(history_data)
+
+
+def test_estimated_duration_of_known_task() -> None:
+    history = TaskDurationHistory(
+        durations={"TASK_1": timedelta(seconds=3), "TASK_2": timedelta(seconds=5)}
+    )
+    assert history.get_estimated_duration(task_label="TASK_2") == timedelta(seconds=5)
+
+
+def test_estimated_duration_of_unknown_task_is_average() -> None:
+    history = TaskDurationHistory(
+        durations={"TASK_1": timedelta(seconds=3), "TASK_2": timedelta(seconds=5)}
+    )
+    assert history.get_estimated_duration(task_label="TASK_3") == timedelta(seconds=4)
+
+
+def test_estimated_duration_with_no_history_is_zero() -> None:
+    assert TaskDurationHistory().get_estimated_duration(
+        task_label="TASK_1"
+    ) == timedelta(0)
+
+
+def test_record_durations() -> None:
+    history = TaskDurationHistory(durations={"TASK_1": timedelta(seconds=10)})
+    history.record_durations(
+        durations={"TASK_1": timedelta(seconds=20), "TASK_2": timedelta(seconds=4)}
+    )
+    assert history == TaskDurationHistory(
+        durations={"TASK_1": timedelta(seconds=15), "TASK_2": timedelta(seconds=4)}
+    )
+
+
+@pytest.fixture
+def diamond_tasks() -> dict[str, TaskNode]:
+    """A build where SHORT and LONG both depend on SETUP and END depends on both."""
+    setup = build_mock_basic_task(task_name="SETUP", required_mock_tasks=[])
+    short = build_mock_basic_task(task_name="SHORT", required_mock_tasks=[setup])
+    other_short = build_mock_basic_task(
+        task_name="OTHER_SHORT", required_mock_tasks=[setup]
+    )
+    long = build_mock_basic_task(task_name="LONG", required_mock_tasks=[setup])
+    end = build_mock_basic_task(
+        task_name="END", required_mock_tasks=[short, other_short, long]
+    )
+    return {task.task_label(): task for task in [setup, short, other_short, long, end]}
+
+
+@pytest.fixture
+def diamond_requirements(
+    diamond_tasks: dict[str, TaskNode],
+) -> dict[TaskNode, set[TaskNode]]:
+    return {task: set(task.required_tasks()) for task in diamond_tasks.values()}
+
+
+@pytest.fixture
+def diamond_history() -> TaskDurationHistory:
+    return TaskDurationHistory(
+        durations={
+            "SETUP": timedelta(seconds=1),
+            "SHORT": timedelta(seconds=2),
+            "OTHER_SHORT": timedelta(seconds=2),
+            "LONG": timedelta(seconds=10),
+            "END": timedelta(seconds=1),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    ("jobs", "expected_makespan"),
+    [
+        (1, timedelta(seconds=16)),
+        # LONG starts first, both short tasks run next to it
+        (2, timedelta(seconds=12)),
+        (3, timedelta(seconds=12)),
+    ],
+)
+def test_build_plan_predicts_makespan(
+    diamond_tasks: dict[str, TaskNode],
+    diamond_requirements: dict[TaskNode, set[TaskNode]],
+    diamond_history: TaskDurationHistory,
+    jobs: int,
+    expected_makespan: timedelta,
+) -> None:
+    build_plan = get_build_plan(
+        task_execution_order=list(diamond_tasks.values()),
+        task_requirements=diamond_requirements,
+        duration_history=diamond_history,
+        jobs=jobs,
+    )
+    assert build_plan.predicted_makespan == expected_makespan
+
+
+def test_build_plan_finds_critical_path(
+    diamond_tasks: dict[str, TaskNode],
+    diamond_requirements: dict[TaskNode, set[TaskNode]],
+    diamond_history: TaskDurationHistory,
+) -> None:
+    build_plan = get_build_plan(
+        task_execution_order=list(diamond_tasks.values()),
+        task_requirements=diamond_requirements,
+        duration_history=diamond_history,
+        jobs=2,
+    )
+    assert build_plan.critical_path == [
+        diamond_tasks["SETUP"],
+        diamond_tasks["LONG"],
+        diamond_tasks["END"],
+    ]
+    assert build_plan.describe() == (
+        "Predicted makespan: 0:00:12\n"
+        "Critical path: SETUP (0:00:01) -> LONG (0:00:10) -> END (0:00:01)"
+    )
+
+
+def test_build_plan_prioritizes_long_pole(
+    diamond_tasks: dict[str, TaskNode],
+    diamond_requirements: dict[TaskNode, set[TaskNode]],
+    diamond_history: TaskDurationHistory,
+) -> None:
+    build_plan = get_build_plan(
+        task_execution_order=list(diamond_tasks.values()),
+        task_requirements=diamond_requirements,
+        duration_history=diamond_history,
+        jobs=1,
+    )
+    assert build_plan.prioritize(
+        tasks=[
+            diamond_tasks["SHORT"],
+            diamond_tasks["OTHER_SHORT"],
+            diamond_tasks["LONG"],
+        ]
+    ) == [diamond_tasks["LONG"], diamond_tasks["SHORT"], diamond_tasks["OTHER_SHORT"]]
+
+
+def test_build_plan_without_history_keeps_execution_order(
+    diamond_tasks: dict[str, TaskNode],
+    diamond_requirements: dict[TaskNode, set[TaskNode]],
+) -> None:
+    build_plan = get_build_plan(
+        task_execution_order=list(diamond_tasks.values()),
+        task_requirements=diamond_requirements,
+        duration_history=TaskDurationHistory(),
+        jobs=1,
+    )
+    assert build_plan.predicted_makespan == timedelta(0)
+    assert build_plan.prioritize(tasks=list(reversed(diamond_tasks.values()))) == list(
+        diamond_tasks.values()
+    )
+
+
+def test_build_plan_for_empty_build() -> None:
+    build_plan = get_build_plan(
+        task_execution_order=[],
+        task_requirements={},
+        duration_history=TaskDurationHistory(),
+        jobs=1,
+    )
+    assert build_plan.critical_path == []
+    assert build_plan.predicted_makespan == timedelta(0)
+    assert build_plan.describe() == "Predicted makespan: 0:00:00\nCritical path: "
@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from build_support.build_tracing import (
+    TRACE_EVENT_PHASE_COMPLETE,
+    BuildTrace,
+    TraceSpan,
+    trace_build,
+    trace_span,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert TRACE_EVENT_PHASE_COMPLETE == "X"
+
+
+def test_trace_span_outside_of_build_is_discarded() -> None:
+    with trace_build() as build_trace:
+        pass
+    with trace_span(name="span", category="task") as span_args:
+        span_args["key"] = "value"
+    assert build_trace.spans == []
+
+
+def test_trace_build_records_nested_spans() -> None:
+    with (
+        trace_build() as build_trace,
+        trace_span(name="task", category="task") as task_args,
+    ):
+        task_args["restored_from_cache"] = False
+        with trace_span(name="command", category="command") as command_args:
+            command_args["exit_code"] = 0
+    command_span, task_span = build_trace.spans
+    assert command_span.name == "command"
+    assert command_span.category == "command"
+    assert command_span.args == {"exit_code": 0}
+    assert task_span.name == "task"
+    assert task_span.category == "task"
+    assert task_span.args == {"restored_from_cache": False}
+    assert task_span.start <= command_span.start
+    assert (
+        command_span.start + command_span.duration
+        <= task_span.start + task_span.duration
+    )
+    assert task_span.thread_id == command_span.thread_id
+    assert command_span.parent == "task"
+    assert task_span.parent is None
+
+
+def test_trace_span_recorded_when_work_raises() -> None:
+    with (
+        trace_build() as build_trace,
+        pytest.raises(RuntimeError, match="failed"),
+        trace_span(name="task", category="task"),
+    ):
+        raise RuntimeError("failed")  # noqa: EM101
+    assert [span.name for span in build_trace.spans] == ["task"]
+
+
+def test_trace_build_records_spans_from_all_threads() -> None:
+    def record_span() -> None:
+        with trace_span(name="other_thread", category="task"):
+            pass
+
+    with trace_build() as build_trace:
+        with trace_span(name="main_thread", category="task"):
+            pass
+        other_thread = threading.Thread(target=record_span)
+        other_thread.start()
+        other_thread.join()
+    assert len({span.thread_id for span in build_trace.spans}) == len(build_trace.spans)
+
+
+def test_trace_span_parent_follows_copied_context() -> None:
+    def record_span() -> None:
+        with trace_span(name="command", category="command"):
+            pass
+
+    with (
+        trace_build() as build_trace,
+        trace_span(name="task", category="task"),
+        ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        executor.submit(copy_context().run, record_span).result()
+        executor.submit(record_span).result()
+    assert [span.parent for span in build_trace.spans] == ["task", None, None]
+
+
+def test_to_chrome_trace() -> None:
+    build_trace = BuildTrace()
+    trace_start = build_trace.start
+    build_trace.add_span(
+        span=TraceSpan(
+            name="second",
+            category="command",
+            start=trace_start + timedelta(milliseconds=5),
+            duration=timedelta(milliseconds=1),
+            thread_id=1234,
+            args={"exit_code": 1},
+        )
+    )
+    build_trace.add_span(
+        span=TraceSpan(
+            name="first",
+            category="task",
+            start=trace_start + timedelta(milliseconds=2),
+            duration=timedelta(milliseconds=10),
+            thread_id=1234,
+            args={},
+        )
+    )
+    build_trace.add_span(
+        span=TraceSpan(
+            name="third",
+            category="task",
+            start=trace_start + timedelta(milliseconds=3),
+            duration=timedelta(microseconds=1500),
+            thread_id=42,
+            args={},
+        )
+    )
+    assert json.loads(build_trace.to_chrome_trace()) == {
+        "traceEvents": [
+            {
+                "name": "first",
+                "cat": "task",
+                "ph": "X",
+                "ts": 2000,
+                "dur": 10000,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {},
+            },
+            {
+                "name": "third",
+                "cat": "task",
+                "ph": "X",
+                "ts": 3000,
+                "dur": 1500,
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": {},
+            },
+            {
+                "name": "second",
+                "cat": "command",
+                "ph": "X",
+                "ts": 5000,
+                "dur": 1000,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"exit_code": 1},
+            },
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def test_build_trace_starts_now() -> None:
+    before = datetime.now(tz=UTC)
+    build_trace = BuildTrace()
+    assert before <= build_trace.start <= datetime.now(tz=UTC)
+    assert build_trace.spans == []
@@ -0,0 +1,22 @@
+from argparse import ArgumentTypeError
+
+import pytest
+from build_support.cli_args import positive_int
+
+
+@pytest.mark.parametrize(("value", "expected"), [("1", 1), ("8", 8), ("64", 64)])
+def test_positive_int(value: str, expected: int) -> None:
+    assert positive_int(value=value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "error_message"),
+    [
+        ("0", "'0' is not a positive integer."),
+        ("-1", "'-1' is not a positive integer."),
+        ("two", "'two' is not an integer."),
+    ],
+)
+def test_positive_int_rejects_invalid_values(value: str, error_message: str) -> None:
+    with pytest.raises(ArgumentTypeError, match=error_message):
+        positive_int(value=value)
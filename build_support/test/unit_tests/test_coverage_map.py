@@ -0,0 +1,338 @@
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from build_support.coverage_map import (
+    DIFF_FILE_REGEX,
+    HUNK_HEADER_REGEX,
+    IMPORT_CONTEXT,
+    TEST_CONTEXT_SEPARATOR,
+    CoverageMap,
+    CoverageTestSelector,
+    build_coverage_map,
+    check_test_file_coverage,
+    get_context_test_file,
+    get_test_file_context,
+    get_test_file_contexts_regex,
+    parse_changed_lines,
+    report_coverage,
+)
+from coverage import CoverageData
+from git import GitCommandError
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert IMPORT_CONTEXT == ""
+    assert TEST_CONTEXT_SEPARATOR == "::"
+    assert DIFF_FILE_REGEX.pattern == r"^diff --git a/(.+) b/"
+    assert HUNK_HEADER_REGEX.pattern == r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@"
+
+
+@pytest.fixture
+def coverage_map() -> CoverageMap:
+    return CoverageMap(
+        commit_sha="abc123",
+        file_digests={"/root/src/a.py": "digest_a", "/root/src/b.py": "digest_b"},
+        test_lines={
+            "/root/test/test_a.py": {"/root/src/a.py": {5, 6}},
+            "/root/test/test_b.py": {"/root/src/b.py": {3}},
+        },
+        import_lines={"/root/src/a.py": {1, 2}},
+    )
+
+
+def test_coverage_map_serialize_deserialize(coverage_map: CoverageMap) -> None:
+    assert CoverageMap.model_validate_json(coverage_map.model_dump_json()) == (
+        coverage_map
+    )
+
+
+def test_get_lines_run(coverage_map: CoverageMap) -> None:
+    assert coverage_map.get_lines_run(
+        test_file="/root/test/test_a.py", file_path="/root/src/a.py"
+    ) == {1, 2, 5, 6}
+    assert coverage_map.get_lines_run(
+        test_file="/root/test/test_b.py", file_path="/root/src/a.py"
+    ) == {1, 2}
+    assert (
+        coverage_map.get_lines_run(
+            test_file="/root/test/test_a.py", file_path="/root/src/b.py"
+        )
+        == set()
+    )
+
+
+def test_get_context_test_file() -> None:
+    assert (
+        get_context_test_file(
+            context="test/test_a.py::test_something|run", project_root=Path("/root")
+        )
+        == "/root/test/test_a.py"
+    )
+
+
+def test_get_test_file_context() -> None:
+    assert (
+        get_test_file_context(
+            test_file=Path("/root/test/test_a.py"), project_root=Path("/root")
+        )
+        == "test/test_a.py::"
+    )
+
+
+def test_get_test_file_contexts_regex() -> None:
+    regex = get_test_file_contexts_regex(
+        test_file=Path("/root/test/test_a.py"), project_root=Path("/root")
+    )
+    assert re.search(regex, IMPORT_CONTEXT)
+    assert re.search(regex, "test/test_a.py::test_something|run")
+    assert re.search(regex, "test/test_a.py::TestClass::test_something|setup")
+    assert not re.search(regex, "test/test_b.py::test_something|run")
+    assert not re.search(regex, "test/test_a_py::test_something|run")
+
+
+@pytest.mark.parametrize(
+    argnames=("test_file_name", "fully_covered", "missing_lines"),
+    argvalues=[("test_a.py", True, ""), ("test_b.py", False, "4")],
+)
+def test_check_test_file_coverage(
+    tmp_path: Path, test_file_name: str, fully_covered: bool, missing_lines: str
+) -> None:
+    config_file = tmp_path.joinpath("pyproject.toml")
+    config_file.write_text("[tool.coverage.report]\nfail_under = 100\n")
+    src_file = tmp_path.joinpath("src", "a.py")
+    src_file.parent.mkdir()
+    src_file.write_text("def f(a):\n    if a:\n        return 1\n    return 2\n")
+    data_file = tmp_path.joinpath("coverage_data")
+    coverage_data = CoverageData(basename=str(data_file))
+    coverage_data.set_context(IMPORT_CONTEXT)
+    coverage_data.add_lines({str(src_file): [1]})
+    coverage_data.set_context("test/test_a.py::test_one|run")
+    coverage_data.add_lines({str(src_file): [2, 3]})
+    coverage_data.set_context("test/test_a.py::test_two|run")
+    coverage_data.add_lines({str(src_file): [2, 4]})
+    coverage_data.set_context("test/test_b.py::test_three|run")
+    coverage_data.add_lines({str(src_file): [2, 3]})
+    coverage_data.write()
+    result, report = check_test_file_coverage(
+        data_file=data_file,
+        config_file=config_file,
+        project_root=tmp_path,
+        test_file=tmp_path.joinpath("test", test_file_name),
+        covered_files=[src_file],
+    )
+    assert result == fully_covered
+    assert report.splitlines()[2].split()[-1] == (missing_lines or "100%")
+
+
+@pytest.mark.parametrize(
+    argnames=("covered_lines", "fully_covered"),
+    argvalues=[([1, 2], True), ([1], False)],
+)
+def test_report_coverage(
+    tmp_path: Path, covered_lines: list[int], fully_covered: bool
+) -> None:
+    config_file = tmp_path.joinpath("pyproject.toml")
+    config_file.write_text("[tool.coverage.report]\nfail_under = 100\n")
+    src_file = tmp_path.joinpath("a.py")
+    src_file.write_text("x = 1\ny = 2\n")
+    data_file = tmp_path.joinpath("coverage_data")
+    coverage_data = CoverageData(basename=str(data_file))
+    coverage_data.add_lines({str(src_file): covered_lines})
+    coverage_data.write()
+    xml_report = tmp_path.joinpath("coverage.xml")
+    result, report = report_coverage(
+        data_file=data_file, config_file=config_file, xml_report=xml_report
+    )
+    assert result == fully_covered
+    assert "a.py" in report
+    assert xml_report.exists()
+
+
+def test_build_coverage_map(tmp_path: Path) -> None:
+    data_file = tmp_path.joinpath("coverage_data")
+    src_a = str(tmp_path.joinpath("src", "a.py"))
+    src_b = str(tmp_path.joinpath("src", "b.py"))
+    unmapped_file = str(tmp_path.joinpath("test", "test_a.py"))
+    coverage_data = CoverageData(basename=str(data_file))
+    coverage_data.set_context(IMPORT_CONTEXT)
+    coverage_data.add_lines({src_a: [1, 2], unmapped_file: [1]})
+    coverage_data.set_context("test/test_a.py::test_one|run")
+    coverage_data.add_lines({src_a: [5], unmapped_file: [4]})
+    coverage_data.set_context("test/test_a.py::test_two|run")
+    coverage_data.add_lines({src_a: [6], src_b: [3]})
+    coverage_data.set_context("test/test_b.py::test_three|run")
+    coverage_data.add_lines({unmapped_file: [8]})
+    coverage_data.write()
+    file_digests = {src_a: "digest_a", src_b: "digest_b"}
+    assert build_coverage_map(
+        data_file=data_file,
+        project_root=tmp_path,
+        commit_sha="abc123",
+        file_digests=file_digests,
+    ) == CoverageMap(
+        commit_sha="abc123",
+        file_digests=file_digests,
+        test_lines={
+            str(tmp_path.joinpath("test", "test_a.py")): {src_a: {5, 6}, src_b: {3}},
+            str(tmp_path.joinpath("test", "test_b.py")): {},
+        },
+        import_lines={src_a: {1, 2}},
+    )
+
+
+def test_parse_changed_lines() -> None:
+    diff = (
+        "diff --git a/src/a.py b/src/a.py\n"
+        "index 1111111..2222222 100644\n"
+        "--- a/src/a.py\n"
+        "+++ b/src/a.py\n"
+        "@@ -3 +3 @@ def f():\n"
+        "-    return 1\n"
+        "+    return 2\n"
+        "@@ -10,2 +10,0 @@\n"
+        "-x = 1\n"
+        "-y = 2\n"
+        "@@ -20,0 +19,2 @@\n"
+        "+--- a/src/not_a_file.py\n"
+        "+@@ -40 +40 @@\n"
+        "diff --git a/src/new.py b/src/new.py\n"
+        "new file mode 100644\n"
+        "--- /dev/null\n"
+        "+++ b/src/new.py\n"
+        "@@ -0,0 +1 @@\n"
+        "+z = 3\n"
+    )
+    assert parse_changed_lines(diff=diff, project_root=Path("/root")) == {
+        "/root/src/a.py": {3, 10, 11, 20, 21},
+        "/root/src/new.py": {0, 1},
+    }
+
+
+def test_parse_changed_lines_no_changes() -> None:
+    assert parse_changed_lines(diff="", project_root=Path("/root")) == {}
+
+
+def _get_selector(coverage_map: CoverageMap) -> CoverageTestSelector:
+    return CoverageTestSelector(
+        coverage_map=coverage_map, project_root=Path("/root"), paths=[Path("/root/src")]
+    )
+
+
+def test_get_changed_lines_runs_git_once(coverage_map: CoverageMap) -> None:
+    selector = _get_selector(coverage_map=coverage_map)
+    with patch(
+        "build_support.coverage_map.get_line_diff_since_commit",
+        return_value="diff --git a/src/a.py b/src/a.py\n@@ -4 +4 @@\n",
+    ) as mock_get_line_diff:
+        assert selector.get_changed_lines() == {"/root/src/a.py": {4}}
+        assert selector.get_changed_lines() == {"/root/src/a.py": {4}}
+    mock_get_line_diff.assert_called_once_with(
+        project_root=Path("/root"), commit_sha="abc123", paths=[Path("/root/src")]
+    )
+
+
+def test_get_changed_lines_unknown_commit(coverage_map: CoverageMap) -> None:
+    selector = _get_selector(coverage_map=coverage_map)
+    with patch(
+        "build_support.coverage_map.get_line_diff_since_commit",
+        side_effect=GitCommandError("git diff"),
+    ):
+        assert selector.get_changed_lines() is None
+
+
+PREVIOUS_DIGESTS = {
+    "/root/src/a.py": "digest_a",
+    "/root/test/test_a.py": "digest_test_a",
+}
+
+
+@pytest.mark.parametrize(
+    argnames=("test_file", "input_digests", "changed_lines", "must_run"),
+    argvalues=[
+        # Not in the map
+        (
+            Path("/root/test/test_c.py"),
+            {**PREVIOUS_DIGESTS, "/root/src/a.py": "new"},
+            {},
+            True,
+        ),
+        # Nothing changed
+        (Path("/root/test/test_a.py"), PREVIOUS_DIGESTS, None, False),
+        # A file that isn't mapped changed
+        (
+            Path("/root/test/test_a.py"),
+            {**PREVIOUS_DIGESTS, "/root/test/test_a.py": "new"},
+            {},
+            True,
+        ),
+        # A new input
+        (
+            Path("/root/test/test_a.py"),
+            {**PREVIOUS_DIGESTS, "/root/src/b.py": "digest_b"},
+            {},
+            True,
+        ),
+        # Git can't diff against the commit
+        (
+            Path("/root/test/test_a.py"),
+            {**PREVIOUS_DIGESTS, "/root/src/a.py": "new"},
+            None,
+            True,
+        ),
+        # A line the test ran changed
+        (
+            Path("/root/test/test_a.py"),
+            {**PREVIOUS_DIGESTS, "/root/src/a.py": "new"},
+            {"/root/src/a.py": {6, 7}},
+            True,
+        ),
+        # A line run on import changed
+        (
+            Path("/root/test/test_a.py"),
+            {**PREVIOUS_DIGESTS, "/root/src/a.py": "new"},
+            {"/root/src/a.py": {2}},
+            True,
+        ),
+        # Only lines the test didn't run changed
+        (
+            Path("/root/test/test_a.py"),
+            {**PREVIOUS_DIGESTS, "/root/src/a.py": "new"},
+            {"/root/src/a.py": {3, 4, 7}},
+            False,
+        ),
+    ],
+)
+def test_test_must_run(
+    coverage_map: CoverageMap,
+    test_file: Path,
+    input_digests: dict[str, str],
+    changed_lines: dict[str, set[int]] | None,
+    must_run: bool,
+) -> None:
+    selector = _get_selector(coverage_map=coverage_map)
+    with patch.object(
+        CoverageTestSelector, "get_changed_lines", return_value=changed_lines
+    ):
+        assert (
+            selector.test_must_run(
+                test_file=test_file,
+                previous_digests=PREVIOUS_DIGESTS,
+                input_digests=input_digests,
+            )
+            == must_run
+        )
+
+
+def test_test_must_run_file_changed_before_map(coverage_map: CoverageMap) -> None:
+    selector = _get_selector(coverage_map=coverage_map)
+    with patch.object(
+        CoverageTestSelector, "get_changed_lines", return_value={}
+    ) as mock_get_changed_lines:
+        assert selector.test_must_run(
+            test_file=Path("/root/test/test_a.py"),
+            previous_digests={"/root/src/a.py": "older_digest_a"},
+            input_digests={"/root/src/a.py": "digest_a"},
+        )
+    mock_get_changed_lines.assert_not_called()
@@ -1,13 +1,40 @@
+import json
+from contextlib import closing
+from datetime import timedelta
+from functools import partial
 from pathlib import Path
-from typing import cast
-from unittest.mock import Mock
+from threading import Barrier
+from typing import Any, cast
+from unittest.mock import Mock, patch
 
 import pytest
 import yaml
 from _pytest.fixtures import SubRequest
-from build_support.ci_cd_tasks.task_node import BasicTaskInfo, TaskNode
-from build_support.ci_cd_vars.build_paths import get_build_runtime_report_path
-from build_support.dag_engine import BuildRunReport, get_task_execution_order, run_tasks
+from build_support.build_history import connect_to_build_history
+from build_support.build_planning import TaskDurationHistory
+from build_support.ci_cd_tasks.task_node import (
+    BasicTaskInfo,
+    TaskCacheSpec,
+    TaskNode,
+    TaskResources,
+)
+from build_support.ci_cd_vars.build_paths import (
+    get_build_runtime_report_path,
+    get_build_trace_path,
+    get_task_duration_history_path,
+)
+from build_support.dag_engine import (
+    BuildFailedError,
+    BuildRunReport,
+    TaskStatus,
+    get_task_execution_order,
+    load_task_duration_history,
+    run_tasks,
+)
+from build_support.process_runner import run_piped_processes, run_process
+from build_support.resource_accounting import ResourceUsage
+from build_support.resource_budget import get_task_cpu_budget
+from build_support.task_queue import RemoteTaskError, TaskQueue, TaskResult
 
 
 def build_mock_basic_task(
@@ -134,13 +161,19 @@ def test_add_task_and_all_required_tasks_to_dict(
     assert observed_results == task_execution_order
 
 
+@pytest.fixture(params=[1, 2, 4])
+def jobs(request: SubRequest) -> int:
+    return cast(int, request.param)
+
+
 def test_run_tasks(
     tasks_requested: list[TaskNode],
     task_execution_order: list[TaskNode],
     all_tasks: set[TaskNode],
     mock_project_root: Path,
+    jobs: int,
 ) -> None:
-    run_tasks(tasks=tasks_requested, project_root=mock_project_root)
+    run_tasks(tasks=tasks_requested, project_root=mock_project_root, jobs=jobs)
     for task in all_tasks:
         task_run = task.run
         if isinstance(task_run, Mock):
@@ -153,29 +186,384 @@ def test_run_tasks(
     parsed_report = BuildRunReport.from_yaml(
         get_build_runtime_report_path(project_root=mock_project_root).read_text()
     )
-    assert len(parsed_report.report) == len(task_execution_order)
+    assert [task_report.task_name for task_report in parsed_report.report] == [
+        task.task_label() for task in task_execution_order
+    ]
+
+
+def test_run_tasks_runs_independent_tasks_concurrently(mock_project_root: Path) -> None:
+    # Both tasks must be running at the same time to get past the barrier
+    barrier = Barrier(parties=2, timeout=10)
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[])
+    task3 = build_mock_basic_task(
+        task_name="TASK_3", required_mock_tasks=[task1, task2]
+    )
+    cast(Mock, task1.run).side_effect = barrier.wait
+    cast(Mock, task2.run).side_effect = barrier.wait
+    with patch("build_support.dag_engine.THREADS_AVAILABLE", 2):
+        run_tasks(tasks=[task3], project_root=mock_project_root, jobs=2)
+    cast(Mock, task3.run).assert_called_once_with()
+    parsed_report = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    )
+    assert [task_report.task_name for task_report in parsed_report.report] == [
+        "TASK_1",
+        "TASK_2",
+        "TASK_3",
+    ]
+
+
+def test_run_tasks_shares_cpus_between_running_tasks(mock_project_root: Path) -> None:
+    cpu_budgets: dict[str, int] = {}
+    tasks = []
+    for task_name, cpus in [("BIG_1", 4), ("BIG_2", 4), ("SMALL", 1)]:
+        task = type(
+            task_name,
+            (TaskNode,),
+            {
+                "required_tasks": Mock(return_value=[]),
+                "run": Mock(
+                    side_effect=lambda name=task_name: cpu_budgets.update(
+                        {name: get_task_cpu_budget()}
+                    )
+                ),
+                "resources": Mock(return_value=TaskResources(cpus=cpus)),
+            },
+        )(
+            basic_task_info=BasicTaskInfo(
+                non_docker_project_root=mock_project_root,
+                docker_project_root=mock_project_root,
+                local_uid=10,
+                local_gid=2,
+                local_user_env={},
+            )
+        )
+        tasks.append(task)
+    with patch("build_support.dag_engine.THREADS_AVAILABLE", 6):
+        run_tasks(tasks=tasks, project_root=mock_project_root, jobs=3)
+    # SMALL has to wait for one of the others to give back a CPU
+    assert cpu_budgets == {"BIG_1": 4, "BIG_2": 2, "SMALL": 1}
+
+
+def test_run_tasks_stops_scheduling_after_failure(
+    mock_project_root: Path, jobs: int
+) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[task1])
+    task3 = build_mock_basic_task(task_name="TASK_3", required_mock_tasks=[task1])
+    task_error = RuntimeError("task failed")
+    cast(Mock, task1.run).side_effect = task_error
+    with pytest.raises(BuildFailedError) as error_info:
+        run_tasks(tasks=[task2, task3], project_root=mock_project_root, jobs=jobs)
+    assert error_info.value.failed_tasks == ["TASK_1"]
+    assert error_info.value.skipped_tasks == ["TASK_2", "TASK_3"]
+    assert error_info.value.__cause__ is task_error
+    assert str(error_info.value) == (
+        "Failed tasks: TASK_1\nSkipped tasks: TASK_2, TASK_3"
+    )
+    cast(Mock, task2.run).assert_not_called()
+    cast(Mock, task3.run).assert_not_called()
+    parsed_report = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    )
+    assert [
+        (task_report.task_name, task_report.status, task_report.duration)
+        for task_report in parsed_report.report
+    ] == [
+        ("TASK_1", TaskStatus.FAILED, timedelta(0)),
+        ("TASK_2", TaskStatus.SKIPPED, timedelta(0)),
+        ("TASK_3", TaskStatus.SKIPPED, timedelta(0)),
+    ]
+    assert load_task_duration_history(project_root=mock_project_root).durations == {}
+    with closing(connect_to_build_history(project_root=mock_project_root)) as conn:
+        assert conn.execute("SELECT task_name, status FROM task_runs").fetchall() == [
+            ("TASK_1", "failed")
+        ]
+
+
+def test_run_tasks_without_keep_going_skips_independent_tasks(
+    mock_project_root: Path,
+) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[])
+    cast(Mock, task1.run).side_effect = RuntimeError("task failed")
+    with pytest.raises(BuildFailedError) as error_info:
+        run_tasks(tasks=[task1, task2], project_root=mock_project_root, jobs=1)
+    assert error_info.value.skipped_tasks == ["TASK_2"]
+    cast(Mock, task2.run).assert_not_called()
+
+
+def test_run_tasks_keep_going(
+    all_task_lookup: dict[str, TaskNode], mock_project_root: Path, jobs: int
+) -> None:
+    task_error = RuntimeError("task failed")
+    other_task_error = RuntimeError("other task failed")
+    cast(Mock, all_task_lookup["TASK_3"].run).side_effect = task_error
+    cast(Mock, all_task_lookup["TASK_6"].run).side_effect = other_task_error
+    with pytest.raises(BuildFailedError) as error_info:
+        run_tasks(
+            tasks=[all_task_lookup["TASK_9"], all_task_lookup["TASK_6"]],
+            project_root=mock_project_root,
+            jobs=jobs,
+            keep_going=True,
+        )
+    assert error_info.value.failed_tasks == ["TASK_3", "TASK_6"]
+    assert error_info.value.skipped_tasks == ["TASK_4", "TASK_9"]
+    assert error_info.value.__cause__ in (task_error, other_task_error)
+    for task_name in ["TASK_1", "TASK_2", "TASK_5", "TASK_7", "TASK_8"]:
+        cast(Mock, all_task_lookup[task_name].run).assert_called_once_with()
+    for task_name in ["TASK_4", "TASK_9"]:
+        cast(Mock, all_task_lookup[task_name].run).assert_not_called()
+    parsed_report = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    )
+    assert {
+        task_report.task_name: task_report.status
+        for task_report in parsed_report.report
+    } == {
+        "TASK_1": TaskStatus.PASSED,
+        "TASK_2": TaskStatus.PASSED,
+        "TASK_3": TaskStatus.FAILED,
+        "TASK_4": TaskStatus.SKIPPED,
+        "TASK_5": TaskStatus.PASSED,
+        "TASK_6": TaskStatus.FAILED,
+        "TASK_7": TaskStatus.PASSED,
+        "TASK_8": TaskStatus.PASSED,
+        "TASK_9": TaskStatus.SKIPPED,
+    }
+
+
+def test_build_failed_error_without_skipped_tasks() -> None:
+    assert str(BuildFailedError(failed_tasks=["TASK_1"], skipped_tasks=[])) == (
+        "Failed tasks: TASK_1\nSkipped tasks: none"
+    )
+
+
+def test_load_task_duration_history_without_previous_build(
+    mock_project_root: Path,
+) -> None:
+    assert (
+        load_task_duration_history(project_root=mock_project_root)
+        == TaskDurationHistory()
+    )
+
+
+def test_run_tasks_records_task_durations(mock_project_root: Path) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[task1])
+    run_tasks(tasks=[task2], project_root=mock_project_root)
+    duration_history = load_task_duration_history(project_root=mock_project_root)
+    assert set(duration_history.durations) == {"TASK_1", "TASK_2"}
+
+
+def test_run_tasks_starts_long_pole_first(mock_project_root: Path) -> None:
+    started_tasks: list[str] = []
+    short_task = build_mock_basic_task(task_name="SHORT", required_mock_tasks=[])
+    long_task = build_mock_basic_task(task_name="LONG", required_mock_tasks=[])
+    final_task = build_mock_basic_task(
+        task_name="FINAL", required_mock_tasks=[short_task, long_task]
+    )
+    for task in [short_task, long_task, final_task]:
+        cast(Mock, task.run).side_effect = partial(
+            started_tasks.append, task.task_label()
+        )
+    get_task_duration_history_path(project_root=mock_project_root).write_text(
+        TaskDurationHistory(
+            durations={
+                "SHORT": timedelta(seconds=1),
+                "LONG": timedelta(minutes=1),
+                "FINAL": timedelta(seconds=1),
+            }
+        ).to_yaml()
+    )
+    run_tasks(tasks=[final_task], project_root=mock_project_root, jobs=1)
+    assert started_tasks == ["LONG", "SHORT", "FINAL"]
+    parsed_report = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    )
+    assert [task_report.task_name for task_report in parsed_report.report] == [
+        "SHORT",
+        "LONG",
+        "FINAL",
+    ]
+    duration_history = load_task_duration_history(project_root=mock_project_root)
+    assert duration_history.durations["LONG"] > timedelta(seconds=30)
+
+
+def test_run_tasks_skips_task_with_unchanged_inputs(mock_project_root: Path) -> None:
+    input_file = mock_project_root.joinpath("input.txt")
+    output_file = mock_project_root.joinpath("output.txt")
+    input_file.write_text("input")
+    task = type(
+        "CACHED_TASK",
+        (TaskNode,),
+        {
+            "required_tasks": Mock(return_value=[]),
+            "run": Mock(side_effect=lambda: output_file.write_text("output")),
+            "cache_spec": Mock(
+                return_value=TaskCacheSpec(
+                    input_paths=[input_file], output_paths=[output_file]
+                )
+            ),
+        },
+    )(
+        basic_task_info=BasicTaskInfo(
+            non_docker_project_root=mock_project_root,
+            docker_project_root=mock_project_root,
+            local_uid=10,
+            local_gid=2,
+            local_user_env={},
+        )
+    )
+    run_tasks(tasks=[task], project_root=mock_project_root)
+    duration_history = load_task_duration_history(project_root=mock_project_root)
+    output_file.unlink()
+    run_tasks(tasks=[task], project_root=mock_project_root)
+    cast(Mock, task.run).assert_called_once_with()
+    assert output_file.read_text() == "output"
+    (task_report,) = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    ).report
+    assert task_report.restored_from_cache
+    # Restoring the outputs took no time, which isn't how long the task takes to run
+    assert load_task_duration_history(project_root=mock_project_root) == (
+        duration_history
+    )
+    input_file.write_text("changed input")
+    run_tasks(tasks=[task], project_root=mock_project_root)
+    assert cast(Mock, task.run).call_count == 2  # noqa: PLR2004
+
+
+def test_run_tasks_writes_build_trace(mock_project_root: Path) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[task1])
+    run_tasks(tasks=[task2], project_root=mock_project_root)
+    build_trace = json.loads(
+        get_build_trace_path(project_root=mock_project_root).read_text()
+    )
+    assert [
+        (event["name"], event["cat"], event["args"])
+        for event in build_trace["traceEvents"]
+    ] == [
+        ("TASK_1", "task", {"restored_from_cache": False}),
+        ("TASK_2", "task", {"restored_from_cache": False}),
+    ]
+
+
+def test_run_tasks_reports_resource_usage(mock_project_root: Path) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[task1])
+    cast(Mock, task1.run).side_effect = partial(run_process, args=["true"])
+    cast(Mock, task2.run).side_effect = partial(
+        run_piped_processes, processes=[["true"], ["true"]]
+    )
+    run_tasks(tasks=[task2], project_root=mock_project_root)
+    parsed_report = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    )
+    assert [
+        task_report.resource_usage.processes_spawned
+        for task_report in parsed_report.report
+    ] == [1, 2]
+    assert parsed_report.resource_usage.processes_spawned == 3  # noqa: PLR2004
+    assert parsed_report.resource_usage.max_rss_bytes > 0
+
+
+def _run_on_worker(task: TaskNode) -> TaskResult:
+    return TaskResult(
+        task_label=task.task_label(),
+        worker="worker-1",
+        succeeded=task.task_label() != "TASK_3",
+        duration=timedelta(seconds=2),
+        resource_usage=ResourceUsage(processes_spawned=4),
+        restored_from_cache=task.task_label() == "TASK_2",
+        error="Traceback: boom",
+    )
+
+
+def test_run_tasks_on_task_queue(mock_project_root: Path) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task2 = build_mock_basic_task(task_name="TASK_2", required_mock_tasks=[task1])
+    task_queue = Mock(spec=TaskQueue)
+    task_queue.run_task.side_effect = _run_on_worker
+    run_tasks(tasks=[task2], project_root=mock_project_root, task_queue=task_queue)
+    cast(Mock, task1.run).assert_not_called()
+    cast(Mock, task2.run).assert_not_called()
+    parsed_report = BuildRunReport.from_yaml(
+        get_build_runtime_report_path(project_root=mock_project_root).read_text()
+    )
+    assert [
+        (
+            task_report.duration,
+            task_report.resource_usage.processes_spawned,
+            task_report.restored_from_cache,
+        )
+        for task_report in parsed_report.report
+    ] == [(timedelta(seconds=2), 4, False), (timedelta(seconds=2), 4, True)]
+    assert set(
+        load_task_duration_history(project_root=mock_project_root).durations
+    ) == {"TASK_1"}
+    build_trace = json.loads(
+        get_build_trace_path(project_root=mock_project_root).read_text()
+    )
+    assert [(event["name"], event["args"]) for event in build_trace["traceEvents"]] == [
+        ("TASK_1", {"worker": "worker-1", "restored_from_cache": False}),
+        ("TASK_2", {"worker": "worker-1", "restored_from_cache": True}),
+    ]
+
+
+def test_run_tasks_on_task_queue_failure(mock_project_root: Path) -> None:
+    task1 = build_mock_basic_task(task_name="TASK_1", required_mock_tasks=[])
+    task3 = build_mock_basic_task(task_name="TASK_3", required_mock_tasks=[task1])
+    task_queue = Mock(spec=TaskQueue)
+    task_queue.run_task.side_effect = _run_on_worker
+    with pytest.raises(BuildFailedError) as error_info:
+        run_tasks(
+            tasks=[task3], project_root=mock_project_root, jobs=2, task_queue=task_queue
+        )
+    assert error_info.value.failed_tasks == ["TASK_3"]
+    assert isinstance(error_info.value.__cause__, RemoteTaskError)
 
 
 @pytest.fixture
-def build_runtime_report_data() -> dict[str, list[dict[str, str]]]:
+def build_runtime_report_data() -> dict[str, Any]:
+    resource_usage = {
+        "block_input_operations": 1,
+        "block_output_operations": 2,
+        "max_rss_bytes": 4096,
+        "processes_spawned": 3,
+        "system_cpu_time": "PT0.5S",
+        "user_cpu_time": "PT1.5S",
+    }
     return {
         "report": [
-            {"duration": "PT0.000036S", "task_name": "TASK_5"},
-            {"duration": "PT0.000024S", "task_name": "TASK_6"},
-        ]
+            {
+                "duration": "PT0.000036S",
+                "resource_usage": resource_usage,
+                "restored_from_cache": True,
+                "status": "passed",
+                "task_name": "TASK_5",
+            },
+            {
+                "duration": "PT0S",
+                "resource_usage": ResourceUsage().model_dump(mode="json"),
+                "restored_from_cache": False,
+                "status": "skipped",
+                "task_name": "TASK_6",
+            },
+        ],
+        "resource_usage": dict(resource_usage),
     }
 
 
 @pytest.fixture
-def build_runtime_report_yaml_str(
-    build_runtime_report_data: dict[str, list[dict[str, str]]],
-) -> str:
+def build_runtime_report_yaml_str(build_runtime_report_data: dict[str, Any]) -> str:
     return yaml.dump(build_runtime_report_data)
 
 
 def test_load_build_runtime_report(
-    build_runtime_report_yaml_str: str,
-    build_runtime_report_data: dict[str, list[dict[str, str]]],
+    build_runtime_report_yaml_str: str, build_runtime_report_data: dict[str, Any]
 ) -> None:
     build_runtime_report = BuildRunReport.from_yaml(
         yaml_str=build_runtime_report_yaml_str
@@ -186,8 +574,7 @@ def test_load_build_runtime_report(
 
 
 def test_dump_build_runtime_report(
-    build_runtime_report_yaml_str: str,
-    build_runtime_report_data: dict[str, list[dict[str, str]]],
+    build_runtime_report_yaml_str: str, build_runtime_report_data: dict[str, Any]
 ) -> None:
     build_runtime_report = BuildRunReport.model_validate(build_runtime_report_data)
     assert build_runtime_report.to_yaml() == build_runtime_report_yaml_str
@@ -0,0 +1,214 @@
+import signal
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+from types import FrameType
+from unittest.mock import Mock, call, patch
+
+import pytest
+from build_support.docker_session import (
+    KEEP_ALIVE_COMMAND,
+    MAX_BUILD_TIME,
+    SESSION_LABEL,
+    DockerSession,
+    docker_session,
+    get_session_container,
+)
+from build_support.process_runner import run_process
+
+RUN_ARGS = ["docker", "run", "--rm", "-e", "TAG_SUFFIX=-1"]
+PROJECT_ROOT = Path("/home/dev/project")
+LEFTOVERS_QUERY = [
+    "docker",
+    "ps",
+    "--quiet",
+    "--filter",
+    f"label={SESSION_LABEL}={PROJECT_ROOT}",
+]
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert timedelta(hours=6) == MAX_BUILD_TIME
+    assert KEEP_ALIVE_COMMAND == ["sleep", "21600"]
+    assert SESSION_LABEL == "build_support.docker_session"
+
+
+@pytest.fixture
+def mock_run_process() -> Iterator[Mock]:
+    with patch("build_support.docker_session.run_process") as run_process_mock:
+        yield run_process_mock
+
+
+@pytest.fixture
+def mock_get_output_of_process() -> Iterator[Mock]:
+    with patch(
+        "build_support.docker_session.get_output_of_process", return_value=""
+    ) as get_output_of_process_mock:
+        yield get_output_of_process_mock
+
+
+def _get_container_run_args(image_name: str, container_name: str) -> list[str]:
+    return [
+        *RUN_ARGS,
+        "--init",
+        "--label",
+        f"{SESSION_LABEL}={PROJECT_ROOT}",
+        "--detach",
+        "--name",
+        container_name,
+        image_name,
+        *KEEP_ALIVE_COMMAND,
+    ]
+
+
+def test_get_session_container_outside_of_session(mock_run_process: Mock) -> None:
+    assert get_session_container(image_name="image:dev", run_args=RUN_ARGS) is None
+    mock_run_process.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_get_output_of_process")
+def test_docker_session_starts_containers_when_first_used(
+    mock_run_process: Mock,
+) -> None:
+    with docker_session(project_root=PROJECT_ROOT) as session:
+        dev_container = get_session_container(image_name="image:dev", run_args=RUN_ARGS)
+        assert (
+            get_session_container(image_name="image:dev", run_args=RUN_ARGS)
+            == dev_container
+        )
+        prod_container = get_session_container(
+            image_name="image:prod", run_args=RUN_ARGS
+        )
+        assert session.container_names == {
+            "image:dev": dev_container,
+            "image:prod": prod_container,
+        }
+        # Getting the containers of the commands doesn't start them
+        mock_run_process.assert_not_called()
+        session.start_container_for_command(args=["docker", "build", "."])
+        session.start_container_for_command(
+            args=["docker", "exec", "-e", "A=1", str(dev_container), "ls"]
+        )
+        session.start_container_for_command(
+            args=["docker", "exec", str(dev_container), "pwd"]
+        )
+    assert str(dev_container).startswith("image_dev_")
+    assert str(prod_container).startswith("image_prod_")
+    # The prod container was never used, so it was never started
+    assert mock_run_process.call_args_list == [
+        call(
+            args=_get_container_run_args(
+                image_name="image:dev", container_name=str(dev_container)
+            )
+        ),
+        call(args=["docker", "kill", str(dev_container)]),
+    ]
+    assert get_session_container(image_name="image:dev", run_args=RUN_ARGS) is None
+
+
+@pytest.mark.usefixtures("mock_get_output_of_process")
+def test_docker_session_starts_containers_of_commands_run(
+    mock_run_process: Mock,
+) -> None:
+    with (
+        patch("build_support.process_runner.build_popen"),
+        patch(
+            "build_support.process_runner.wait_for_processes",
+            return_value=(b"", b"", Mock()),
+        ),
+        patch("build_support.process_runner.record_resource_usage"),
+        patch("build_support.process_runner.resolve_process_results"),
+        docker_session(project_root=PROJECT_ROOT),
+    ):
+        dev_container = get_session_container(image_name="image:dev", run_args=RUN_ARGS)
+        run_process(args=["docker", "exec", dev_container, "ls"])
+        mock_run_process.assert_called_once_with(
+            args=_get_container_run_args(
+                image_name="image:dev", container_name=str(dev_container)
+            )
+        )
+
+
+def test_docker_session_removes_leftover_containers(
+    mock_run_process: Mock, mock_get_output_of_process: Mock
+) -> None:
+    mock_get_output_of_process.return_value = "abc123\ndef456\n"
+    with docker_session(project_root=PROJECT_ROOT):
+        mock_get_output_of_process.assert_called_once_with(args=LEFTOVERS_QUERY)
+        mock_run_process.assert_called_once_with(
+            args=["docker", "kill", "abc123", "def456"]
+        )
+
+
+def _expect_container(session_container: str | None) -> str:
+    assert session_container is not None
+    return session_container
+
+
+def _start_container_and_interrupt(session: DockerSession) -> None:
+    container = _expect_container(
+        session_container=get_session_container(
+            image_name="image:dev", run_args=RUN_ARGS
+        )
+    )
+    session.start_container_for_command(args=["docker", "exec", container, "ls"])
+    raise KeyboardInterrupt(container)
+
+
+@pytest.mark.usefixtures("mock_get_output_of_process")
+def test_docker_session_removes_containers_when_build_is_interrupted(
+    mock_run_process: Mock,
+) -> None:
+    with (
+        pytest.raises(KeyboardInterrupt) as exc_info,
+        docker_session(project_root=PROJECT_ROOT) as session,
+    ):
+        _start_container_and_interrupt(session=session)
+    mock_run_process.assert_called_with(args=["docker", "kill", *exc_info.value.args])
+
+
+class TerminatedError(Exception):
+    """Raised by the SIGTERM handler in place of terminating the tests."""
+
+
+def _raise_terminated(signum: int, frame: FrameType | None) -> None:  # noqa: ARG001
+    raise TerminatedError
+
+
+@pytest.mark.usefixtures("mock_get_output_of_process")
+@pytest.mark.parametrize(
+    ("signum", "expected_error"),
+    [(signal.SIGINT, KeyboardInterrupt), (signal.SIGTERM, TerminatedError)],
+)
+def test_docker_session_removes_containers_on_signal(
+    mock_run_process: Mock, signum: int, expected_error: type[BaseException]
+) -> None:
+    previous_sigint_handler = signal.signal(signal.SIGINT, signal.default_int_handler)
+    previous_sigterm_handler = signal.signal(signal.SIGTERM, _raise_terminated)
+    try:
+        with docker_session(project_root=PROJECT_ROOT) as session:
+            container = _expect_container(
+                session_container=get_session_container(
+                    image_name="image:dev", run_args=RUN_ARGS
+                )
+            )
+            session.start_container_for_command(
+                args=["docker", "exec", container, "ls"]
+            )
+            with pytest.raises(expected_error):
+                signal.raise_signal(signum)
+            # The containers were removed before the signal ended the build
+            mock_run_process.assert_called_with(args=["docker", "kill", container])
+            assert session.started_containers == []
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+        assert signal.getsignal(signal.SIGTERM) is _raise_terminated
+    finally:
+        signal.signal(signal.SIGINT, previous_sigint_handler)
+        signal.signal(signal.SIGTERM, previous_sigterm_handler)
+
+
+@pytest.mark.usefixtures("mock_get_output_of_process")
+def test_docker_session_without_containers(mock_run_process: Mock) -> None:
+    with docker_session(project_root=PROJECT_ROOT):
+        pass
+    mock_run_process.assert_not_called()
@@ -0,0 +1,703 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from build_support.docstring_enforcement import (
+    ARGUMENTS_SECTIONS,
+    ATTRIBUTES_SECTIONS,
+    GOOGLE_ARGS_REGEX,
+    GOOGLE_RESULT_REGEX,
+    LISTED_NAME_REGEX,
+    LOOSE_ELEMENT_REGEX,
+    MODULES_SECTIONS,
+    NON_METHOD_DECORATORS,
+    PROJECT_SPECIFIC_SECTIONS,
+    RESULT_REGEX_TYPE_GROUP,
+    RESULTS_SECTIONS,
+    SUB_PACKAGES_SECTIONS,
+    UNBOUND_ARGS,
+    DocstringIssue,
+    DocumentedModule,
+    SectionContext,
+    check_listed_elements,
+    check_module_docstrings,
+    check_modules_docstrings,
+    check_result_section,
+    find_documented_modules,
+    get_docstring_cache_key,
+    get_docstring_contexts,
+    get_leading_words,
+    get_section_contexts,
+    is_docstring_section,
+    is_valid_result_type,
+    normalize_context,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert ATTRIBUTES_SECTIONS == ("Attributes",)
+    assert ARGUMENTS_SECTIONS == ("Args",)
+    assert RESULTS_SECTIONS == ("Returns", "Yields")
+    assert SUB_PACKAGES_SECTIONS == ("SubPackages",)
+    assert MODULES_SECTIONS == ("Modules",)
+    assert PROJECT_SPECIFIC_SECTIONS == (
+        "Args",
+        "Attributes",
+        "Modules",
+        "Returns",
+        "SubPackages",
+        "Yields",
+    )
+    assert RESULT_REGEX_TYPE_GROUP == 2  # noqa: PLR2004
+    assert (
+        frozenset(
+            {
+                "cached_property",
+                "computed_field",
+                "deleter",
+                "field_serializer",
+                "field_validator",
+                "getter",
+                "model_serializer",
+                "model_validator",
+                "property",
+                "setter",
+            }
+        )
+        == NON_METHOD_DECORATORS
+    )
+    assert frozenset({"self", "cls"}) == UNBOUND_ARGS
+    assert LOOSE_ELEMENT_REGEX.pattern == r"^\s*(\|\s)?([^\s:]+)\s*.*"
+    assert LISTED_NAME_REGEX.pattern == r"^\s*\|\s([^\s:]+)\s*:\n?\s*(.+)"
+    assert GOOGLE_ARGS_REGEX.pattern == r"^\s*(\w+)\s*(\(.*\))\s*:\n?\s*(.+)"
+    assert GOOGLE_RESULT_REGEX.pattern == r"^\s*(([\w\[\],\s|]+)\s*:\s*(.+)|None)"
+
+
+def _make_context(following_lines: list[str]) -> SectionContext:
+    return SectionContext(
+        section_name="Returns",
+        previous_line="",
+        line="Returns:",
+        following_lines=following_lines,
+        original_index=0,
+        is_last_section=True,
+    )
+
+
+@pytest.mark.parametrize(
+    argnames=("line", "expected_words"),
+    argvalues=[("  Hello world!!!", "Hello world"), ("!!! Hello", "")],
+)
+def test_get_leading_words(line: str, expected_words: str) -> None:
+    assert get_leading_words(line=line) == expected_words
+
+
+@pytest.mark.parametrize(
+    argnames=("previous_line", "line", "expected_section"),
+    argvalues=[
+        ("", "    Args:", True),
+        ("    Ends a paragraph.", "    Returns", True),
+        ("    The paragraph goes on", "    Returns:", False),
+        ("", "    Returns the thing.", False),
+    ],
+)
+def test_is_docstring_section(
+    previous_line: str, line: str, expected_section: bool
+) -> None:
+    context = SectionContext(
+        section_name=get_leading_words(line=line),
+        previous_line=previous_line,
+        line=line,
+        following_lines=[],
+        original_index=1,
+        is_last_section=True,
+    )
+    assert is_docstring_section(context=context) == expected_section
+
+
+def test_get_section_contexts() -> None:
+    lines = [
+        "Summary.",
+        "",
+        "Args:",
+        "    a (int): An arg whose value",
+        "    Returns",
+        "",
+        "Returns:",
+        "    int: A result.",
+    ]
+    assert list(
+        get_section_contexts(lines=lines, valid_section_names=["Args", "Returns"])
+    ) == [
+        SectionContext(
+            section_name="Args",
+            previous_line="",
+            line="Args:",
+            following_lines=lines[3:6],
+            original_index=2,
+            is_last_section=False,
+        ),
+        SectionContext(
+            section_name="Returns",
+            previous_line="",
+            line="Returns:",
+            following_lines=lines[7:],
+            original_index=6,
+            is_last_section=True,
+        ),
+    ]
+
+
+def test_normalize_context() -> None:
+    context = _make_context(
+        following_lines=["    int: A result", "        over two lines.", "", "Not it."]
+    )
+    assert normalize_context(context=context).following_lines == [
+        "int: A result\n",
+        "    over two lines.",
+    ]
+    assert normalize_context(context=_make_context(following_lines=[])) == (
+        _make_context(following_lines=[])
+    )
+
+
+def test_get_docstring_contexts() -> None:
+    docstring = "Summary.\n\nArgs:\n    a (int): An arg.\n\nReturns:\n    None\n"
+    contexts = get_docstring_contexts(docstring=docstring)
+    assert list(contexts) == ["Args", "Returns"]
+    assert contexts["Args"].following_lines == ["a (int): An arg."]
+    assert contexts["Returns"].following_lines == ["None"]
+    assert get_docstring_contexts(docstring="") == {}
+
+
+@pytest.mark.parametrize(
+    ("returns_line", "regex_should_match", "validator_should_pass"),
+    [
+        ("str | None: Ticket id or None.", True, True),
+        ("None", True, True),
+        ("str: Single type.", True, True),
+        ("list[str] | None: Optional list.", True, True),
+        ("| str: Leading pipe.", True, False),
+        ("str |: Trailing pipe.", True, False),
+        ("str || None: Double pipe.", True, False),
+        ("  tuple[str, int] | None: Optional tuple.", True, True),
+        ("int | str | None: Union of three.", True, True),
+        ("   : Whitespace-only type.", True, False),
+        ("no colon so no match", False, False),
+    ],
+    ids=[
+        "union_str_none",
+        "literal_none",
+        "single_type",
+        "generic_union",
+        "leading_pipe_rejected",
+        "trailing_pipe_rejected",
+        "double_pipe_rejected",
+        "generic_union_indented",
+        "three_way_union",
+        "whitespace_type_rejected",
+        "no_colon_rejected",
+    ],
+)
+def test_returns_regex_and_validator(
+    returns_line: str, regex_should_match: bool, validator_should_pass: bool
+) -> None:
+    match = GOOGLE_RESULT_REGEX.match(returns_line)
+    assert (match is not None) == regex_should_match
+    if match is not None:
+        assert is_valid_result_type(match=match) == validator_should_pass
+
+
+def test_check_listed_elements() -> None:
+    contexts = get_docstring_contexts(
+        docstring=(
+            "Summary.\n\n"
+            "Args:\n"
+            "    a (int): Documented.\n"
+            "    b (str):\n"
+            "        Documented over two lines.\n"
+            "    c: Missing its type.\n"
+            "    : Not an element.\n"
+            "    d (int): Not an arg.\n"
+        )
+    )
+    assert check_listed_elements(
+        contexts=contexts,
+        section_names=ARGUMENTS_SECTIONS,
+        required_elements=["a", "b", "c", "e"],
+        element_regex=GOOGLE_ARGS_REGEX,
+    ) == ["malformed Args element c", "extra Args element d", "missing Args element e"]
+
+
+def test_check_listed_elements_nothing_required() -> None:
+    assert (
+        check_listed_elements(
+            contexts={},
+            section_names=ATTRIBUTES_SECTIONS,
+            required_elements=[],
+            element_regex=LISTED_NAME_REGEX,
+        )
+        == []
+    )
+
+
+def test_check_listed_elements_missing_section() -> None:
+    assert check_listed_elements(
+        contexts={},
+        section_names=ATTRIBUTES_SECTIONS,
+        required_elements=["A"],
+        element_regex=LISTED_NAME_REGEX,
+    ) == ["missing section Attributes"]
+
+
+@pytest.mark.parametrize(
+    argnames=("docstring", "expected_issues"),
+    argvalues=[
+        ("Summary.\n\nReturns:\n    int: A result.\n", []),
+        ("Summary.\n\nYields:\n    Iterator[int]: Results.\n", []),
+        ("Summary.\n", ["missing section Returns|Yields"]),
+        (
+            "Summary.\n\nReturns:\n    int: A result.\n\nYields:\n    int: Results.\n",
+            ["clashing sections Returns|Yields"],
+        ),
+        (
+            "Summary.\n\nReturns:\n    int: A result.\n    str: Another.\n",
+            ["malformed Returns section"],
+        ),
+        ("Summary.\n\nReturns:\n    | int: A result.\n", ["malformed Returns section"]),
+        ("Summary.\n\nReturns:\n    A result.\n", ["malformed Returns section"]),
+    ],
+)
+def test_check_result_section(docstring: str, expected_issues: list[str]) -> None:
+    assert (
+        check_result_section(contexts=get_docstring_contexts(docstring=docstring))
+        == expected_issues
+    )
+
+
+DOCUMENTED_MODULE_SOURCE = '''"""A module.
+
+Attributes:
+    | A: An attribute.
+    | B: Bound by unpacking.
+    | C: Bound by unpacking.
+    | D: An annotated attribute.
+    | E: A type alias.
+    | F: Bound in a conditional block.
+    | G: Bound in the else of a conditional block.
+    | H: Bound in a try block.
+    | I: Bound in an except block.
+    | J: Bound in the else of a try block.
+    | K: Bound in the finally of a try block.
+"""
+
+import os
+from pathlib import Path as ImportedPath
+
+A = 1
+B, [C, _PRIVATE] = 2, [3, 4]
+D: int = 5
+UNBOUND: int
+type E = int
+os.environ["NOT_A_NAME"] = "6"
+if A:
+    F = 7
+else:
+    G = 8
+try:
+    import tomllib
+
+    H = 9
+except ImportError:
+    tomllib = None
+    I = 10
+else:
+    J = 11
+finally:
+    K = 12
+
+
+def function(a: int, /, b: int, *args: int, c: int, **kwargs: int) -> None:
+    """A function.
+
+    Args:
+        a (int): Positional only.
+        b (int): Positional.
+        args (int): Variadic.
+        c (int): Keyword only.
+        kwargs (int): Variadic keywords.
+
+    Returns:
+        None
+    """
+
+
+async def async_function() -> int:
+    """An async function without args.
+
+    Returns:
+        int: A result.
+    """
+
+
+def _private_function(a: int) -> None:
+    pass
+
+
+class _PrivateClass:
+    def method(self, a: int) -> None:
+        pass
+
+
+class AClass:
+    """A class, whose docstring isn't checked."""
+
+    ATTRIBUTE = 1
+
+    def __init__(self, a: int) -> None:
+        """Initializes the class.
+
+        Args:
+            a (int): An arg.
+
+        Returns:
+            None
+        """
+
+    def _private_method(self, a: int) -> None:
+        pass
+
+    @classmethod
+    def class_method(cls) -> "AClass":
+        """A class method.
+
+        Returns:
+            AClass: An instance.
+        """
+
+    @property
+    def a_property(self) -> int:
+        return 1
+
+    @a_property.setter
+    def a_property(self, value: int) -> None:
+        pass
+
+    @functools.cache
+    def cached(self) -> int:
+        """A cached method.
+
+        Returns:
+            int: A result.
+        """
+
+    class InnerClass:
+        """An inner class."""
+
+        @staticmethod
+        def static_method() -> None:
+            """A static method.
+
+            Returns:
+                None
+            """
+
+    class _PrivateInnerClass:
+        def method(self, a: int) -> None:
+            pass
+'''
+
+
+def test_check_module_docstrings_documented(tmp_path: Path) -> None:
+    module = tmp_path.joinpath("a_module.py")
+    module.write_text(DOCUMENTED_MODULE_SOURCE)
+    assert (
+        check_module_docstrings(
+            documented_module=DocumentedModule(
+                file_path=module, module_path="package.a_module"
+            )
+        )
+        == []
+    )
+
+
+UNDOCUMENTED_MODULE_SOURCE = '''"""A module missing its attributes."""
+
+A = 1
+
+
+def function(a: int) -> None:
+    """A function missing its args and result."""
+
+
+class AClass:
+    def __init__(self) -> None:
+        """Missing its result."""
+
+    async def method(self) -> None:
+        pass
+
+    class InnerClass:
+        def __eq__(self, other: object) -> bool:
+            pass
+
+
+@dataclass
+class ADataclass:
+    def __post_init__(self) -> None:
+        pass
+
+    def __init__(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        pass
+
+
+@dataclasses.dataclass(
+    frozen=True, eq=False, init=False, repr=False, slots=True, **options
+)
+class FrozenDataclass:
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+    def __eq__(self, other: object) -> bool:
+        pass
+
+    def __init__(self) -> None:
+        pass
+
+
+@decorators[0]
+@dataclass(init=some_flag)
+class NonConstantDataclass:
+    def __init__(self) -> None:
+        pass
+'''
+
+
+def test_check_module_docstrings_undocumented(tmp_path: Path) -> None:
+    module = tmp_path.joinpath("a_module.py")
+    module.write_text(UNDOCUMENTED_MODULE_SOURCE)
+    module_path = "package.a_module"
+    assert check_module_docstrings(
+        documented_module=DocumentedModule(file_path=module, module_path=module_path)
+    ) == [
+        DocstringIssue(
+            module_path=module_path,
+            element_path="function",
+            issue="missing section Args",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="function",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="AClass.__init__",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="AClass.method",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="AClass.InnerClass.__eq__",
+            issue="missing section Args",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="AClass.InnerClass.__eq__",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="ADataclass.__post_init__",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="FrozenDataclass.__eq__",
+            issue="missing section Args",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="FrozenDataclass.__eq__",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path,
+            element_path="FrozenDataclass.__init__",
+            issue="missing section Returns|Yields",
+        ),
+        DocstringIssue(
+            module_path=module_path, element_path="", issue="missing section Attributes"
+        ),
+    ]
+
+
+def test_check_module_docstrings_package(tmp_path: Path) -> None:
+    init_module = tmp_path.joinpath("__init__.py")
+    init_module.write_text(
+        '"""A package.\n\n'
+        "SubPackages:\n"
+        "    | sub_package: A sub-package.\n\n"
+        "Modules:\n"
+        "    | a_module: A module.\n"
+        "    b_module: Missing its pipe.\n"
+        '"""\n'
+    )
+    assert check_module_docstrings(
+        documented_module=DocumentedModule(
+            file_path=init_module,
+            module_path="package",
+            sub_packages=("sub_package",),
+            modules=("a_module", "b_module", "c_module"),
+        )
+    ) == [
+        DocstringIssue(
+            module_path="package",
+            element_path="",
+            issue="malformed Modules element b_module",
+        ),
+        DocstringIssue(
+            module_path="package",
+            element_path="",
+            issue="missing Modules element c_module",
+        ),
+    ]
+
+
+def test_check_module_docstrings_syntax_error(tmp_path: Path) -> None:
+    module = tmp_path.joinpath("a_module.py")
+    module.write_text("def broken(:\n")
+    with pytest.raises(SyntaxError) as error_info:
+        compile(module.read_text(), str(module), "exec")
+    error_message = error_info.value.msg
+    assert check_module_docstrings(
+        documented_module=DocumentedModule(file_path=module, module_path="a_module")
+    ) == [
+        DocstringIssue(
+            module_path="a_module",
+            element_path="",
+            issue=f"can't be parsed: {error_message}",
+        )
+    ]
+
+
+@pytest.mark.parametrize(argnames="max_workers", argvalues=[1, 2])
+def test_check_modules_docstrings(tmp_path: Path, max_workers: int) -> None:
+    documented = tmp_path.joinpath("documented.py")
+    documented.write_text('"""Documented."""\n')
+    undocumented = tmp_path.joinpath("undocumented.py")
+    undocumented.write_text("A = 1\n")
+    assert check_modules_docstrings(
+        documented_modules=[
+            DocumentedModule(file_path=documented, module_path="documented"),
+            DocumentedModule(file_path=undocumented, module_path="undocumented"),
+        ],
+        max_workers=max_workers,
+    ) == [
+        [],
+        [
+            DocstringIssue(
+                module_path="undocumented",
+                element_path="",
+                issue="missing section Attributes",
+            )
+        ],
+    ]
+
+
+def test_check_modules_docstrings_single_module_in_process(tmp_path: Path) -> None:
+    module = tmp_path.joinpath("a_module.py")
+    module.write_text('"""Documented."""\n')
+    with patch(
+        "build_support.docstring_enforcement.ProcessPoolExecutor"
+    ) as mock_executor:
+        assert check_modules_docstrings(
+            documented_modules=[
+                DocumentedModule(file_path=module, module_path="a_module")
+            ],
+            max_workers=4,
+        ) == [[]]
+    mock_executor.assert_not_called()
+
+
+def test_find_documented_modules(tmp_path: Path) -> None:
+    src_dir = tmp_path.joinpath("src")
+    package_dir = src_dir.joinpath("package")
+    sub_package_dir = package_dir.joinpath("sub_package")
+    files = [
+        package_dir.joinpath("__init__.py"),
+        package_dir.joinpath("b_module.py"),
+        package_dir.joinpath("a_module.py"),
+        package_dir.joinpath("_private_module.py"),
+        package_dir.joinpath("resource.txt"),
+        sub_package_dir.joinpath("__init__.py"),
+        sub_package_dir.joinpath("c_module.py"),
+        package_dir.joinpath("_private_package", "__init__.py"),
+        package_dir.joinpath("not_a_package", "d_module.py"),
+        src_dir.joinpath("_private_package", "__init__.py"),
+        src_dir.joinpath("not_a_package", "e_module.py"),
+    ]
+    for file in files:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.touch()
+    assert find_documented_modules(src_dir=src_dir) == [
+        DocumentedModule(
+            file_path=package_dir.joinpath("__init__.py"),
+            module_path="package",
+            sub_packages=("sub_package",),
+            modules=("a_module", "b_module"),
+        ),
+        DocumentedModule(
+            file_path=package_dir.joinpath("a_module.py"),
+            module_path="package.a_module",
+        ),
+        DocumentedModule(
+            file_path=package_dir.joinpath("b_module.py"),
+            module_path="package.b_module",
+        ),
+        DocumentedModule(
+            file_path=sub_package_dir.joinpath("__init__.py"),
+            module_path="package.sub_package",
+            modules=("c_module",),
+        ),
+        DocumentedModule(
+            file_path=sub_package_dir.joinpath("c_module.py"),
+            module_path="package.sub_package.c_module",
+        ),
+    ]
+
+
+def test_find_documented_modules_without_src_dir(tmp_path: Path) -> None:
+    assert find_documented_modules(src_dir=tmp_path.joinpath("src")) == []
+
+
+def test_get_docstring_cache_key() -> None:
+    documented_module = DocumentedModule(
+        file_path=Path("src/package/__init__.py"),
+        module_path="package",
+        modules=("a_module",),
+    )
+    cache_key = get_docstring_cache_key(
+        documented_module=documented_module, digest="digest"
+    )
+    assert cache_key == get_docstring_cache_key(
+        documented_module=documented_module, digest="digest"
+    )
+    assert cache_key != get_docstring_cache_key(
+        documented_module=documented_module, digest="other_digest"
+    )
+    assert cache_key != get_docstring_cache_key(
+        documented_module=DocumentedModule(
+            file_path=Path("src/package/__init__.py"),
+            module_path="package",
+            modules=("a_module", "b_module"),
+        ),
+        digest="digest",
+    )
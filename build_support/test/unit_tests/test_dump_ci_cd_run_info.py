@@ -26,12 +26,18 @@ def ci_cd_feature_test_mode(request: SubRequest) -> bool:
     return cast(bool, request.param)
 
 
+@pytest.fixture(params=[True, False])
+def fail_fast(request: SubRequest) -> bool:
+    return cast(bool, request.param)
+
+
 @pytest.fixture
 def cli_arg_combo(
     non_docker_project_root_arg: Path,
     docker_project_root_arg: Path,
     basic_task_info: BasicTaskInfo,
     ci_cd_feature_test_mode: bool,
+    fail_fast: bool,
 ) -> BasicTaskInfo:
     return BasicTaskInfo(
         non_docker_project_root=non_docker_project_root_arg,
@@ -39,6 +45,7 @@ def cli_arg_combo(
         local_uid=basic_task_info.local_uid,
         local_gid=basic_task_info.local_gid,
         ci_cd_feature_test_mode=ci_cd_feature_test_mode,
+        fail_fast=fail_fast,
         local_user_env=basic_task_info.local_user_env,
     )
 
@@ -62,6 +69,7 @@ def args_to_test_single_task(cli_arg_combo: BasicTaskInfo) -> list[str]:
             if cli_arg_combo.ci_cd_feature_test_mode
             else []
         )
+        + (["--fail-fast"] if cli_arg_combo.fail_fast else [])
     ]
 
 
@@ -73,6 +81,7 @@ def expected_namespace_single_task(cli_arg_combo: BasicTaskInfo) -> Namespace:
         user_id=cli_arg_combo.local_uid,
         group_id=cli_arg_combo.local_gid,
         ci_cd_feature_test_mode=cli_arg_combo.ci_cd_feature_test_mode,
+        fail_fast=cli_arg_combo.fail_fast,
     )
 
 
@@ -149,6 +158,7 @@ def test_run_main_success(cli_arg_combo: BasicTaskInfo) -> None:
         user_id=cli_arg_combo.local_uid,
         group_id=cli_arg_combo.local_gid,
         ci_cd_feature_test_mode=cli_arg_combo.ci_cd_feature_test_mode,
+        fail_fast=cli_arg_combo.fail_fast,
     )
     run_main(args)
     local_info_yaml = get_local_info_yaml(
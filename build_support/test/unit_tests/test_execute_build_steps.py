@@ -29,7 +29,7 @@ from build_support.ci_cd_tasks.validation_tasks import (
     ValidatePythonStyle,
     ValidateStaticTypeChecking,
 )
-from build_support.ci_cd_vars.build_paths import get_local_info_yaml
+from build_support.ci_cd_vars.build_paths import get_local_info_yaml, get_task_queue_dir
 from build_support.ci_cd_vars.project_structure import maybe_build_dir
 from build_support.ci_cd_vars.subproject_structure import SubprojectContext
 from build_support.execute_build_steps import (
@@ -41,6 +41,8 @@ from build_support.execute_build_steps import (
 )
 from build_support.new_project_setup.setup_new_project import MakeProjectFromTemplate
 from build_support.process_runner import concatenate_args
+from build_support.shared_test_results import SHARED_RESULT_MAX_AGE
+from build_support.task_queue import DirectoryTaskQueue
 
 
 def test_constants_not_changed_by_accident() -> None:
@@ -165,7 +167,11 @@ def expected_namespace_single_task(
     docker_project_root_arg: Path, build_task: str
 ) -> Namespace:
     return Namespace(
-        docker_project_root=docker_project_root_arg, build_tasks=[build_task]
+        docker_project_root=docker_project_root_arg,
+        build_tasks=[build_task],
+        jobs=1,
+        keep_going=False,
+        distribute=False,
     )
 
 
@@ -192,6 +198,9 @@ def expected_namespace_all_tasks(docker_project_root_arg: Path) -> Namespace:
     return Namespace(
         docker_project_root=docker_project_root_arg,
         build_tasks=list(CLI_ARG_TO_TASK.keys()),
+        jobs=1,
+        keep_going=False,
+        distribute=False,
     )
 
 
@@ -201,6 +210,63 @@ def test_parse_args_all_task(
     assert parse_args(args=args_to_test_all_tasks) == expected_namespace_all_tasks
 
 
+@pytest.mark.parametrize("jobs", [1, 2, 16])
+def test_parse_args_jobs(jobs: int) -> None:
+    assert parse_args(
+        args=[
+            "--docker-project-root",
+            "docker_project_root",
+            "--jobs",
+            str(jobs),
+            "test",
+        ]
+    ) == Namespace(
+        docker_project_root=Path("docker_project_root"),
+        build_tasks=["test"],
+        jobs=jobs,
+        keep_going=False,
+        distribute=False,
+    )
+
+
+def test_parse_args_keep_going() -> None:
+    assert parse_args(
+        args=["--docker-project-root", "docker_project_root", "--keep-going", "test"]
+    ) == Namespace(
+        docker_project_root=Path("docker_project_root"),
+        build_tasks=["test"],
+        jobs=1,
+        keep_going=True,
+        distribute=False,
+    )
+
+
+def test_parse_args_distribute() -> None:
+    assert parse_args(
+        args=["--docker-project-root", "docker_project_root", "--distribute", "test"]
+    ) == Namespace(
+        docker_project_root=Path("docker_project_root"),
+        build_tasks=["test"],
+        jobs=1,
+        keep_going=False,
+        distribute=True,
+    )
+
+
+@pytest.mark.parametrize("jobs", ["0", "-3", "many", "1.5"])
+def test_parse_args_bad_jobs(jobs: str) -> None:
+    with pytest.raises(SystemExit):
+        parse_args(
+            args=[
+                "--docker-project-root",
+                "docker_project_root",
+                "--jobs",
+                jobs,
+                "test",
+            ]
+        )
+
+
 def test_parse_args_no_task() -> None:
     with pytest.raises(SystemExit):
         parse_args(args=["--docker-project-root", "docker_project_root"])
@@ -221,18 +287,45 @@ def test_parse_args_no_docker_project_root() -> None:
 @pytest.mark.usefixtures("_setup_run_info_yaml")
 def test_run_main_success(cli_arg_combo: BasicTaskInfo) -> None:
     args = Namespace(
-        docker_project_root=cli_arg_combo.docker_project_root, build_tasks=["clean"]
+        docker_project_root=cli_arg_combo.docker_project_root,
+        build_tasks=["clean"],
+        jobs=3,
+        keep_going=True,
+        distribute=False,
     )
     with (
         patch("build_support.execute_build_steps.run_tasks") as mock_run_tasks,
+        patch(
+            "build_support.execute_build_steps.docker_session"
+        ) as mock_docker_session,
+        patch(
+            "build_support.execute_build_steps.get_shared_result_store"
+        ) as mock_get_shared_result_store,
         patch(
             "build_support.execute_build_steps.fix_permissions"
         ) as mock_fix_permissions,
     ):
+        mock_run_tasks.side_effect = lambda **_: (
+            mock_docker_session.return_value.__exit__.assert_not_called()
+        )
         run_main(args)
+        mock_get_shared_result_store.assert_called_once_with(
+            project_root=cli_arg_combo.docker_project_root
+        )
+        mock_get_shared_result_store.return_value.prune.assert_called_once_with(
+            max_age=SHARED_RESULT_MAX_AGE
+        )
+        mock_docker_session.assert_called_once_with(
+            project_root=cli_arg_combo.non_docker_project_root
+        )
+        mock_docker_session.return_value.__enter__.assert_called_once()
+        mock_docker_session.return_value.__exit__.assert_called_once()
         mock_run_tasks.assert_called_once_with(
             tasks=[Clean(basic_task_info=cli_arg_combo)],
             project_root=cli_arg_combo.docker_project_root,
+            jobs=3,
+            keep_going=True,
+            task_queue=None,
         )
         mock_fix_permissions.assert_called_once_with(
             local_user_uid=cli_arg_combo.local_uid,
@@ -264,9 +357,20 @@ def test_run_main_bad_cli_task(cli_arg_combo: BasicTaskInfo) -> None:
 def test_run_main_exception(cli_arg_combo: BasicTaskInfo) -> None:
     all_task_list = list(CLI_ARG_TO_TASK.keys())
     args = Namespace(
-        docker_project_root=cli_arg_combo.docker_project_root, build_tasks=all_task_list
+        docker_project_root=cli_arg_combo.docker_project_root,
+        build_tasks=all_task_list,
+        jobs=1,
+        keep_going=False,
+        distribute=True,
     )
+    # A task left in the queue by an interrupted build
+    stale_task_path = get_task_queue_dir(
+        project_root=cli_arg_combo.docker_project_root
+    ).joinpath("pending", "Clean.yaml")
+    stale_task_path.parent.mkdir(parents=True)
+    stale_task_path.write_text("")
     with (
+        patch("build_support.execute_build_steps.docker_session"),
         patch("build_support.execute_build_steps.run_tasks") as mock_run_tasks,
         patch("build_support.execute_build_steps.logger") as mock_logger,
         patch(
@@ -282,8 +386,18 @@ def test_run_main_exception(cli_arg_combo: BasicTaskInfo) -> None:
             for arg in args.build_tasks
         ]
         mock_run_tasks.assert_called_once_with(
-            tasks=requested_tasks, project_root=cli_arg_combo.docker_project_root
+            tasks=requested_tasks,
+            project_root=cli_arg_combo.docker_project_root,
+            jobs=1,
+            keep_going=False,
+            task_queue=mock_run_tasks.call_args.kwargs["task_queue"],
         )
+        task_queue = mock_run_tasks.call_args.kwargs["task_queue"]
+        assert isinstance(task_queue, DirectoryTaskQueue)
+        assert task_queue.pending_dir == get_task_queue_dir(
+            project_root=cli_arg_combo.docker_project_root
+        ).joinpath("pending")
+        assert not stale_task_path.exists()
         mock_logger.exception.assert_called_once_with("Build failed")
         mock_fix_permissions.assert_called_once_with(
             local_user_uid=cli_arg_combo.local_uid,
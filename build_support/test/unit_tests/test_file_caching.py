@@ -1,18 +1,46 @@
-from datetime import UTC, datetime
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from time import sleep
+from types import SimpleNamespace
 from typing import Any, cast
 from unittest.mock import patch
 
 import pytest
 import yaml
-from build_support.ci_cd_vars.project_structure import get_resource_dir
+from build_support.ci_cd_vars.project_structure import (
+    get_resource_dir,
+    get_uv_lock_file,
+)
 from build_support.ci_cd_vars.subproject_structure import (
     PythonSubproject,
     SubprojectContext,
     get_python_subproject,
 )
-from build_support.file_caching import FileCacheEngine, FileCacheInfo, TestFileInfo
+from build_support.coverage_map import CoverageMap
+from build_support.docstring_enforcement import (
+    DocstringIssue,
+    DocumentedModule,
+    check_modules_docstrings,
+)
+from build_support.file_caching import (
+    CACHE_DIR_NAMES,
+    CONFTEST_NAME,
+    FILE_CACHE_LOCK_TIMEOUT,
+    HASH_CHUNK_SIZE,
+    RACY_MTIME_WINDOW_NS,
+    TEST_FILE_PREFIX,
+    FileCacheEngine,
+    FileCacheInfo,
+    FileStatCacheEntry,
+    TestFileInfo,
+    connect_to_file_cache,
+    migrate_file_cache_yaml,
+)
+from build_support.import_graph import ImportGraph, ModuleImports, parse_module_imports
+from build_support.shared_test_results import PassedTest
 from pydantic import ValidationError
 
 
@@ -47,9 +75,31 @@ def file_cache_data_dict() -> dict[str, Any]:
     return {
         "subproject_context": "build_support",
         "test_cache_info": [
-            {"file_path": "some/file", "tests_passed": "2024-03-30T17:16:23.163489Z"},
-            {"file_path": "some/other/file", "tests_passed": None},
+            {
+                "file_path": "some/file",
+                "tests_passed": "2024-03-30T17:16:23.163489Z",
+                "input_digests": None,
+            },
+            {
+                "file_path": "some/other/file",
+                "tests_passed": "2024-03-31T17:16:23.163489Z",
+                "input_digests": {"some/src_file": "abc", "some/other/file": "def"},
+            },
+            {
+                "file_path": "some/third/file",
+                "tests_passed": None,
+                "input_digests": None,
+            },
         ],
+        "stat_cache": {
+            "some/src_file": {
+                "size": 10,
+                "mtime_ns": 5,
+                "inode": 7,
+                "hashed_at_ns": 2_000_000_000,
+                "digest": "abc",
+            }
+        },
     }
 
 
@@ -82,258 +132,989 @@ def test_dump(file_cache_yaml_str: str, file_cache_data_dict: dict[str, Any]) ->
     assert file_cache_info.to_yaml() == file_cache_yaml_str
 
 
-def test_get_file_cache_for(
-    mock_project_root: Path, subproject_context: SubprojectContext
+@pytest.fixture
+def file_cache_engine(mock_project_root: Path) -> FileCacheEngine:
+    return FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert CONFTEST_NAME == "conftest.py"
+    assert frozenset({"__pycache__", ".pytest_cache", ".ruff_cache"}) == (
+        CACHE_DIR_NAMES
+    )
+    assert HASH_CHUNK_SIZE == 1024 * 1024
+    assert RACY_MTIME_WINDOW_NS == 1_000_000_000  # noqa: PLR2004
+    assert TEST_FILE_PREFIX == "test_"
+    assert timedelta(seconds=30) == FILE_CACHE_LOCK_TIMEOUT
+
+
+def test_connect_to_file_cache(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    with closing(connect_to_file_cache(subproject=subproject)) as connection:
+        tables = {
+            name
+            for (name,) in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+    assert tables == {
+        "test_cache",
+        "stat_cache",
+        "import_cache",
+        "coverage_map",
+        "failed_tests",
+        "test_durations",
+        "check_cache",
+        "docstring_cache",
+    }
+    assert subproject.get_file_cache_db().exists()
+
+
+def test_record_test_passed_persists(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path
 ) -> None:
-    file_cache_info = FileCacheInfo.get_file_cache_for(
-        subproject_context=subproject_context, project_root=mock_project_root
+    test_files = [
+        mock_project_root.joinpath("some", "file"),
+        mock_project_root.joinpath("some", "other", "file"),
+    ]
+    for test_file in test_files:
+        file_cache_engine.record_test_passed(
+            file_path=test_file, input_digests={str(test_file): "abc"}
+        )
+        file_cache_engine.record_test_passed(
+            file_path=test_file, input_digests={str(test_file): "def"}
+        )
+    assert len(file_cache_engine.test_cache_info) == len(test_files)
+    assert not file_cache_engine.subproject.get_file_cache_yaml().exists()
+    reloaded_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    assert file_cache_info == FileCacheInfo(subproject_context=subproject_context)
-    test_file_info = TestFileInfo(
-        file_path=Path("some/file"), tests_passed=datetime.now(tz=UTC)
+    assert reloaded_engine.test_cache_info == file_cache_engine.test_cache_info
+
+
+def test_record_test_passed_concurrently(mock_project_root: Path) -> None:
+    tasks = 4
+    tests_per_task = 10
+
+    def record_tests(task: int) -> None:
+        file_cache_engine = FileCacheEngine(
+            subproject_context=SubprojectContext.BUILD_SUPPORT,
+            project_root=mock_project_root,
+        )
+        for test in range(tests_per_task):
+            test_file = mock_project_root.joinpath(f"test_{task}_{test}.py")
+            file_cache_engine.record_test_passed(
+                file_path=test_file, input_digests={str(test_file): "abc"}
+            )
+
+    with ThreadPoolExecutor(max_workers=tasks) as executor:
+        list(executor.map(record_tests, range(tasks)))
+    reloaded_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    file_cache_info.test_cache_info.append(test_file_info)
-    get_python_subproject(
-        subproject_context=subproject_context, project_root=mock_project_root
-    ).get_file_cache_yaml().write_text(file_cache_info.to_yaml())
-    new_file_cache_info = FileCacheInfo.get_file_cache_for(
-        subproject_context=subproject_context, project_root=mock_project_root
+    assert set(reloaded_engine.test_cache_info) == {
+        mock_project_root.joinpath(f"test_{task}_{test}.py")
+        for task in range(tasks)
+        for test in range(tests_per_task)
+    }
+
+
+def test_flush(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path, tmp_path: Path
+) -> None:
+    file_path = tmp_path.joinpath("a_file")
+    file_path.write_text("some contents")
+    with patch(
+        "build_support.file_caching.connect_to_file_cache"
+    ) as mock_connect_to_file_cache:
+        file_cache_engine.flush()
+    mock_connect_to_file_cache.assert_not_called()
+    file_cache_engine.get_file_digest(file_path=file_path)
+    assert list(file_cache_engine.unsaved_stat_cache) == [str(file_path)]
+    file_cache_engine.flush()
+    assert file_cache_engine.unsaved_stat_cache == {}
+    reloaded_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    assert new_file_cache_info == file_cache_info
+    assert reloaded_engine.stat_cache == file_cache_engine.stat_cache
 
 
-@pytest.fixture
-def file_cache_engine(mock_project_root: Path) -> FileCacheEngine:
-    return FileCacheEngine(
+def test_record_test_passed_saves_digests(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path
+) -> None:
+    file_path = mock_project_root.joinpath("a_file")
+    file_path.write_text("some contents")
+    input_digests = file_cache_engine.get_input_digests(input_files=[file_path])
+    file_cache_engine.record_test_passed(
+        file_path=mock_project_root.joinpath("test_file.py"),
+        input_digests=input_digests,
+    )
+    assert file_cache_engine.unsaved_stat_cache == {}
+    reloaded_engine = FileCacheEngine(
         subproject_context=SubprojectContext.BUILD_SUPPORT,
         project_root=mock_project_root,
     )
+    assert reloaded_engine.stat_cache == file_cache_engine.stat_cache
 
 
-def test_write_text(file_cache_engine: FileCacheEngine) -> None:
-    expected_location = file_cache_engine.subproject.get_file_cache_yaml()
-    test_files = [Path("some/file"), Path("some/other/file")]
-    for test_file in test_files:
-        file_cache_engine.update_test_pass_timestamp(file_path=test_file)
-        file_cache_engine.update_test_pass_timestamp(file_path=test_file)
-    assert not expected_location.exists()
-    assert len(file_cache_engine.cache_data.test_cache_info) == len(test_files)
-    file_cache_engine.write_text()
-    written_cache_info = FileCacheInfo.from_yaml(expected_location.read_text())
-    assert written_cache_info == file_cache_engine.cache_data
-
-
-def test_get_last_modified_time(tmp_path: Path) -> None:
-    file_path = tmp_path.joinpath("path", "to", "a_file")
-    assert not file_path.exists()
-    with pytest.raises(FileNotFoundError):
-        FileCacheEngine.get_last_modified_time(file_path=file_path)
-    file_path.parent.mkdir(parents=True)
+def test_migrate_file_cache_yaml(
+    mock_project_root: Path,
+    file_cache_yaml_str: str,
+    file_cache_data_dict: dict[str, Any],
+) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    migrate_file_cache_yaml(subproject=subproject)
+    assert not subproject.get_file_cache_db().exists()
+    file_cache_yaml = subproject.get_file_cache_yaml()
+    file_cache_yaml.write_text(file_cache_yaml_str)
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert not file_cache_yaml.exists()
+    file_cache_info = FileCacheInfo.model_validate(file_cache_data_dict)
+    assert file_cache_engine.test_cache_info == {
+        info.file_path: info for info in file_cache_info.test_cache_info
+    }
+    assert file_cache_engine.stat_cache == file_cache_info.stat_cache
+
+
+def test_migrate_file_cache_yaml_migrated_by_another_task(
+    mock_project_root: Path, file_cache_yaml_str: str
+) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    file_cache_yaml = subproject.get_file_cache_yaml()
+    file_cache_yaml.parent.mkdir(parents=True, exist_ok=True)
+    file_cache_yaml.write_text(file_cache_yaml_str)
+    file_cache_info = FileCacheInfo.from_yaml(file_cache_yaml_str)
+
+    def finish_migrating_in_another_task(_yaml_str: str) -> FileCacheInfo:
+        file_cache_yaml.unlink()
+        return file_cache_info
+
+    with patch.object(
+        FileCacheInfo, "from_yaml", side_effect=finish_migrating_in_another_task
+    ):
+        migrate_file_cache_yaml(subproject=subproject)
+    # Later tasks find the file already migrated
+    migrate_file_cache_yaml(subproject=subproject)
+    assert not file_cache_yaml.exists()
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.test_cache_info == {
+        info.file_path: info for info in file_cache_info.test_cache_info
+    }
+
+
+def test_migrate_file_cache_yaml_keeps_newer_entries(
+    file_cache_engine: FileCacheEngine,
+    mock_project_root: Path,
+    file_cache_yaml_str: str,
+) -> None:
+    input_digests = {"some/src_file": "xyz"}
+    # The paths from the old file cache aren't in the project, so can't be shared
+    with (
+        patch("build_support.file_caching.PassedTest"),
+        patch.object(file_cache_engine, "shared_results"),
+    ):
+        file_cache_engine.record_test_passed(
+            file_path=Path("some/other/file"), input_digests=input_digests
+        )
+    file_cache_engine.subproject.get_file_cache_yaml().write_text(file_cache_yaml_str)
+    migrate_file_cache_yaml(subproject=file_cache_engine.subproject)
+    reloaded_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert (
+        reloaded_engine.get_test_info_for_file(
+            file_path=Path("some/other/file")
+        ).input_digests
+        == input_digests
+    )
+    assert reloaded_engine.get_test_info_for_file(
+        file_path=Path("some/file")
+    ) == TestFileInfo(
+        file_path=Path("some/file"),
+        tests_passed=datetime(2024, 3, 30, 17, 16, 23, 163489, tzinfo=UTC),
+    )
+
+
+def test_hash_file(tmp_path: Path) -> None:
+    file_path = tmp_path.joinpath("a_file")
+    content = b"some contents" * HASH_CHUNK_SIZE
+    file_path.write_bytes(content)
+    assert (
+        FileCacheEngine.hash_file(file_path=file_path)
+        == hashlib.blake2b(content).hexdigest()
+    )
+
+
+@pytest.fixture
+def file_stat_cache_entry() -> FileStatCacheEntry:
+    return FileStatCacheEntry(
+        size=10,
+        mtime_ns=5,
+        inode=7,
+        hashed_at_ns=5 + RACY_MTIME_WINDOW_NS + 1,
+        digest="abc",
+    )
+
+
+@pytest.fixture
+def file_stat() -> os.stat_result:
+    return cast(os.stat_result, SimpleNamespace(st_size=10, st_mtime_ns=5, st_ino=7))
+
+
+def test_file_stat_cache_entry_matches(
+    file_stat_cache_entry: FileStatCacheEntry, file_stat: os.stat_result
+) -> None:
+    assert file_stat_cache_entry.matches(file_stat=file_stat)
+
+
+@pytest.mark.parametrize(
+    "changed_fields", [{"size": 11}, {"mtime_ns": 6}, {"inode": 8}, {"hashed_at_ns": 5}]
+)
+def test_file_stat_cache_entry_does_not_match(
+    file_stat_cache_entry: FileStatCacheEntry,
+    file_stat: os.stat_result,
+    changed_fields: dict[str, int],
+) -> None:
+    assert not file_stat_cache_entry.model_copy(update=changed_fields).matches(
+        file_stat=file_stat
+    )
+
+
+def test_get_file_digest_reuses_digest_of_unchanged_file(
+    file_cache_engine: FileCacheEngine, tmp_path: Path
+) -> None:
+    file_path = tmp_path.joinpath("a_file")
+    file_path.write_text("some contents")
+    # Make the file look like it was last modified long before it was hashed
+    os.utime(file_path, ns=(0, 0))
+    digest = file_cache_engine.get_file_digest(file_path=file_path)
+    assert digest == FileCacheEngine.hash_file(file_path=file_path)
+    assert file_cache_engine.stat_cache[str(file_path)].digest == digest
+    with patch.object(FileCacheEngine, "hash_file") as mock_hash_file:
+        assert file_cache_engine.get_file_digest(file_path=file_path) == digest
+    mock_hash_file.assert_not_called()
+
+
+def test_get_file_digest_rehashes_racily_modified_file(
+    file_cache_engine: FileCacheEngine, tmp_path: Path
+) -> None:
+    file_path = tmp_path.joinpath("a_file")
+    file_path.write_text("some contents")
+    file_cache_engine.get_file_digest(file_path=file_path)
+    with patch.object(
+        FileCacheEngine, "hash_file", return_value="new"
+    ) as mock_hash_file:
+        assert file_cache_engine.get_file_digest(file_path=file_path) == "new"
+    mock_hash_file.assert_called_once_with(file_path=file_path)
+
+
+def test_get_file_digest_rehashes_changed_file(
+    file_cache_engine: FileCacheEngine, tmp_path: Path
+) -> None:
+    file_path = tmp_path.joinpath("a_file")
+    file_path.write_text("some contents")
+    os.utime(file_path, ns=(0, 0))
+    old_digest = file_cache_engine.get_file_digest(file_path=file_path)
+    file_path.write_text("some new contents")
+    os.utime(file_path, ns=(0, 0))
+    new_digest = file_cache_engine.get_file_digest(file_path=file_path)
+    assert new_digest != old_digest
+    assert new_digest == FileCacheEngine.hash_file(file_path=file_path)
+
+
+def test_get_input_digests(file_cache_engine: FileCacheEngine, tmp_path: Path) -> None:
+    file_a = tmp_path.joinpath("a.txt")
+    file_b = tmp_path.joinpath("b.txt")
+    file_a.write_text("aaa")
+    file_b.write_text("bbb")
+    assert file_cache_engine.get_input_digests(input_files=[file_a, file_b]) == {
+        str(file_a): FileCacheEngine.hash_file(file_path=file_a),
+        str(file_b): FileCacheEngine.hash_file(file_path=file_b),
+    }
+
+
+def test_get_file_digest_uses_snapshot_stat(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    file_path = subproject.get_python_package_dir().joinpath("file_1.py")
+    file_path.parent.mkdir(parents=True, exist_ok=True)
     file_path.write_text("some contents")
-    mtime = FileCacheEngine.get_last_modified_time(file_path=file_path)
-    expected = datetime.fromtimestamp(timestamp=file_path.stat().st_mtime, tz=UTC)
-    assert mtime == expected
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    snapshot_size = file_path.stat().st_size
+    file_path.write_text("some contents changed after the snapshot")
+    file_cache_engine.get_file_digest(file_path=file_path)
+    assert file_cache_engine.stat_cache[str(file_path)].size == snapshot_size
+
+
+def test_get_files_in_dir_nonexistent(
+    file_cache_engine: FileCacheEngine, tmp_path: Path
+) -> None:
+    assert file_cache_engine.get_files_in_dir(directory=tmp_path / "missing") == []
+
+
+def test_get_files_in_dir_nested(
+    file_cache_engine: FileCacheEngine, tmp_path: Path
+) -> None:
+    resource_dir = tmp_path / "resources"
+    sub_dir = resource_dir / "sub"
+    sub_dir.mkdir(parents=True)
+    file_b = resource_dir / "b.txt"
+    file_b.write_text("bbb")
+    nested_file = sub_dir / "nested.txt"
+    nested_file.write_text("nested")
+    file_a = resource_dir / "a.txt"
+    file_a.write_text("aaa")
+    assert file_cache_engine.get_files_in_dir(directory=resource_dir) == [
+        file_a,
+        file_b,
+        nested_file,
+    ]
+
+
+def test_get_files_in_paths(file_cache_engine: FileCacheEngine, tmp_path: Path) -> None:
+    input_dir = tmp_path / "inputs"
+    cache_dir = input_dir / "__pycache__"
+    cache_dir.mkdir(parents=True)
+    cache_dir.joinpath("module.cpython-313.pyc").write_bytes(b"cached")
+    module_file = input_dir / "module.py"
+    module_file.write_text("a = 1\n")
+    readme = tmp_path / "README.md"
+    readme.write_text("# Readme\n")
+    assert file_cache_engine.get_files_in_paths(
+        input_paths=[readme, input_dir, module_file, tmp_path / "missing.md"]
+    ) == [readme, module_file]
 
 
-def test_most_recent_conftest_update(file_cache_engine: FileCacheEngine) -> None:
+def test_get_files_in_dir_from_snapshot(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    resource_dir = get_resource_dir(
+        file_path=subproject.get_python_package_dir().joinpath("file_1.py")
+    )
+    resource_dir.mkdir(parents=True)
+    resource_file = resource_dir.joinpath("data.txt")
+    resource_file.write_text("data")
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    resource_dir.joinpath("added_after_snapshot.txt").write_text("data")
+    assert file_cache_engine.get_files_in_dir(directory=resource_dir) == [resource_file]
+
+
+def test_get_conftest_files_without_conftests(
+    file_cache_engine: FileCacheEngine,
+) -> None:
     top_test_folder = file_cache_engine.subproject.get_test_dir()
+    assert file_cache_engine.get_conftest_files(test_dir=top_test_folder) == []
+    assert (
+        file_cache_engine.get_conftest_files(
+            test_dir=top_test_folder.joinpath("a", "b", "c")
+        )
+        == []
+    )
+
+
+def test_get_conftest_files(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    top_test_folder = subproject.get_test_dir()
     deep_test_folder = top_test_folder.joinpath("a", "b", "c")
     deep_test_folder.mkdir(parents=True)
-    # If not conftests report min datetime
-    no_conftest_datetime = file_cache_engine.most_recent_conftest_update(
-        test_dir=top_test_folder
+    top_conftest = top_test_folder.joinpath(CONFTEST_NAME)
+    top_conftest.touch()
+    deep_conftest = deep_test_folder.joinpath(CONFTEST_NAME)
+    deep_conftest.touch()
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    assert no_conftest_datetime == datetime.min.replace(tzinfo=UTC)
-    assert no_conftest_datetime == file_cache_engine.most_recent_conftest_update(
-        test_dir=deep_test_folder
+    assert file_cache_engine.get_conftest_files(test_dir=top_test_folder) == [
+        top_conftest
+    ]
+    assert file_cache_engine.get_conftest_files(test_dir=deep_test_folder) == [
+        top_conftest,
+        deep_conftest,
+    ]
+    assert file_cache_engine.get_conftest_files(test_dir=deep_test_folder.parent) == [
+        top_conftest
+    ]
+
+
+def _write_files(files: dict[Path, str]) -> None:
+    for file_path, contents in files.items():
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(contents)
+
+
+def test_get_unit_test_input_files(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    # Make some conftests, and since top is made second, they should have the same
-    # last modified result
-    deep_conftest = deep_test_folder.joinpath("conftest.py")
-    deep_conftest.touch()
-    top_conftest = top_test_folder.joinpath("conftest.py")
-    top_conftest.touch()
-    unmodified_conftest_datetime = file_cache_engine.most_recent_conftest_update(
-        test_dir=top_test_folder
+    package_dir = subproject.get_python_package_dir()
+    package_init = package_dir.joinpath("__init__.py")
+    src_file = package_dir.joinpath("file_1.py")
+    imported_by_src = package_dir.joinpath("file_2.py")
+    imported_by_test = package_dir.joinpath("file_3.py")
+    imported_by_conftest = package_dir.joinpath("file_4.py")
+    not_imported = package_dir.joinpath("file_5.py")
+    test_dir = subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
     )
-    assert (
-        unmodified_conftest_datetime
-        == file_cache_engine.most_recent_conftest_update(test_dir=deep_test_folder)
+    test_file = test_dir.joinpath("test_file_1.py")
+    src_resource = get_resource_dir(file_path=src_file).joinpath("data.txt")
+    imported_resource = get_resource_dir(file_path=imported_by_src).joinpath("data.txt")
+    not_imported_resource = get_resource_dir(file_path=not_imported).joinpath(
+        "data.txt"
     )
-    assert unmodified_conftest_datetime > no_conftest_datetime
-    # Wait a beat and update the top level conftest.  This will change the result of
-    # both folders' conftest update
-    sleep(0.001)
-    top_conftest.write_text("some new content")
-    modified_top_conftest_datetime = file_cache_engine.most_recent_conftest_update(
-        test_dir=top_test_folder
+    test_resource = get_resource_dir(file_path=test_file).joinpath("data.txt")
+    conftest = test_dir.joinpath(CONFTEST_NAME)
+    _write_files(
+        files={
+            package_init: "",
+            src_file: "from . import file_2\n",
+            imported_by_src: "",
+            imported_by_test: "",
+            imported_by_conftest: "",
+            not_imported: "",
+            src_resource: "",
+            imported_resource: "",
+            not_imported_resource: "",
+            test_file: "from build_support.file_3 import a_function\n",
+            test_resource: "",
+            conftest: "import build_support.file_4\n",
+        }
     )
-    assert (
-        modified_top_conftest_datetime
-        == file_cache_engine.most_recent_conftest_update(test_dir=deep_test_folder)
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.get_unit_test_input_files(
+        src_file=src_file, test_file=test_file
+    ) == [
+        package_init,
+        src_file,
+        src_resource,
+        imported_by_src,
+        imported_resource,
+        imported_by_test,
+        imported_by_conftest,
+        test_file,
+        test_resource,
+        conftest,
+    ]
+
+
+def test_get_feature_test_input_files(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    assert modified_top_conftest_datetime > unmodified_conftest_datetime
-    # Wait a beat and update the deep conftest.  This should only change the result of
-    # the deep folder's conftest update
-    sleep(0.001)
-    deep_conftest.write_text("some new content")
-    modified_deep_conftest_datetime = file_cache_engine.most_recent_conftest_update(
-        test_dir=deep_test_folder
+    package_dir = subproject.get_python_package_dir()
+    entry_point = package_dir.joinpath("file_1.py")
+    imported_by_entry_point = package_dir.joinpath("file_2.py")
+    imported_by_test = package_dir.joinpath("file_3.py")
+    not_imported = package_dir.joinpath("file_4.py")
+    test_dir = subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.FEATURE_TESTS
     )
-    assert (
-        modified_top_conftest_datetime
-        == file_cache_engine.most_recent_conftest_update(test_dir=top_test_folder)
+    test_file = test_dir.joinpath("test_some_feature.py")
+    other_test_file = test_dir.joinpath("test_other_feature.py")
+    src_resource = get_resource_dir(file_path=imported_by_entry_point).joinpath(
+        "data.txt"
     )
-    assert modified_deep_conftest_datetime > modified_top_conftest_datetime
-    # Check a folder without a conftest. Should be the same as the top level.
-    intermediate_test_folder = deep_test_folder.parent
-    assert (
-        modified_top_conftest_datetime
-        == file_cache_engine.most_recent_conftest_update(
-            test_dir=intermediate_test_folder
+    test_resource = get_resource_dir(file_path=test_file).joinpath("data.txt")
+    conftest = test_dir.joinpath(CONFTEST_NAME)
+    _write_files(
+        files={
+            entry_point: (
+                "from build_support import file_2\n\n"
+                'if __name__ == "__main__":\n'
+                "    file_2.main()\n"
+            ),
+            imported_by_entry_point: "",
+            imported_by_test: "",
+            not_imported: "",
+            src_resource: "",
+            test_file: "from build_support import file_3\n",
+            other_test_file: "",
+            test_resource: "",
+            conftest: "",
+        }
+    )
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    with patch(
+        "build_support.file_caching.ImportGraph", wraps=ImportGraph
+    ) as mock_import_graph:
+        assert file_cache_engine.get_feature_test_input_files(test_file=test_file) == [
+            entry_point,
+            imported_by_entry_point,
+            src_resource,
+            imported_by_test,
+            test_file,
+            test_resource,
+            conftest,
+        ]
+        assert file_cache_engine.get_feature_test_input_files(
+            test_file=other_test_file
+        ) == [
+            entry_point,
+            imported_by_entry_point,
+            src_resource,
+            other_test_file,
+            conftest,
+        ]
+    mock_import_graph.assert_called_once()
+
+
+def test_get_module_imports_parses_each_digest_once(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path, tmp_path: Path
+) -> None:
+    file_path = tmp_path.joinpath("a_module.py")
+    file_path.write_text("import os\n")
+    same_contents_path = tmp_path.joinpath("same_module.py")
+    same_contents_path.write_text("import os\n")
+    expected_imports = ModuleImports(import_targets=("os",), is_entry_point=False)
+    with patch(
+        "build_support.file_caching.parse_module_imports", wraps=parse_module_imports
+    ) as mock_parse_module_imports:
+        assert file_cache_engine.get_module_imports(file_path=file_path) == (
+            expected_imports
+        )
+        assert file_cache_engine.get_module_imports(file_path=same_contents_path) == (
+            expected_imports
+        )
+    mock_parse_module_imports.assert_called_once_with(source="import os\n")
+    file_cache_engine.flush()
+    assert file_cache_engine.unsaved_import_cache == {}
+    reloaded_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert reloaded_engine.import_cache == file_cache_engine.import_cache
+    with patch(
+        "build_support.file_caching.parse_module_imports"
+    ) as mock_parse_module_imports:
+        assert reloaded_engine.get_module_imports(file_path=file_path) == (
+            expected_imports
         )
+    mock_parse_module_imports.assert_not_called()
+
+
+def test_flush_saves_imports_without_new_digests(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path
+) -> None:
+    module_imports = ModuleImports(import_targets=("a", ".b"), is_entry_point=True)
+    file_cache_engine.unsaved_import_cache = {"some_digest": module_imports}
+    file_cache_engine.flush()
+    reloaded_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
     )
-    # Wait a beat and add a conftest to this level.  Should update deep result but not
-    # top level result
-    sleep(0.001)
-    intermediate_conftest = intermediate_test_folder.joinpath("conftest.py")
-    intermediate_conftest.touch()
-    modified_intermediate_conftest_datetime = (
-        file_cache_engine.most_recent_conftest_update(test_dir=intermediate_test_folder)
+    assert reloaded_engine.import_cache == {"some_digest": module_imports}
+
+
+def test_save_and_get_coverage_map(file_cache_engine: FileCacheEngine) -> None:
+    assert file_cache_engine.get_coverage_map() is None
+    first_map = CoverageMap(
+        commit_sha="abc123",
+        file_digests={"src/a.py": "digest_a"},
+        test_lines={"test/test_a.py": {"src/a.py": {1, 2}}},
+        import_lines={"src/a.py": {1}},
     )
-    assert modified_intermediate_conftest_datetime > modified_deep_conftest_datetime
-    assert (
-        modified_intermediate_conftest_datetime
-        == file_cache_engine.most_recent_conftest_update(test_dir=deep_test_folder)
+    file_cache_engine.save_coverage_map(coverage_map=first_map)
+    assert file_cache_engine.get_coverage_map() == first_map
+    second_map = CoverageMap(
+        commit_sha="def456", file_digests={}, test_lines={}, import_lines={}
     )
-    assert (
-        modified_top_conftest_datetime
-        == file_cache_engine.most_recent_conftest_update(test_dir=top_test_folder)
-    )
-
-
-def test_most_recent_src_file_update(file_cache_engine: FileCacheEngine) -> None:
-    pypi_package_folder = file_cache_engine.subproject.get_python_package_dir()
-    sub_folder = pypi_package_folder.joinpath("a")
-    sub_folder.mkdir(parents=True)
-    no_conftest_datetime = file_cache_engine.most_recent_src_file_update()
-    assert no_conftest_datetime == datetime.min.replace(tzinfo=UTC)
-    # populate_folders
-    file_1 = pypi_package_folder.joinpath("file_1.py")
-    file_2 = pypi_package_folder.joinpath("file_2.py")
-    file_3 = sub_folder.joinpath("file_3.py")
-    file_1.touch()
-    file_2.touch()
-    file_3.touch()
-    files_exist_datetime = file_cache_engine.most_recent_src_file_update()
-    assert files_exist_datetime > no_conftest_datetime
-    sleep(0.001)
-    # add a file
-    file_4 = sub_folder.joinpath("file_4.py")
-    file_4.touch()
-    file_added_datetime = file_cache_engine.most_recent_src_file_update()
-    assert file_added_datetime > files_exist_datetime
-    sleep(0.001)
-    # check after waiting a bit without changes
-    file_added_datetime_round_2 = file_cache_engine.most_recent_src_file_update()
-    assert file_added_datetime_round_2 == file_added_datetime
-    sleep(0.001)
-    # update a file
-    file_1.write_text("some new content")
-    file_added_datetime = file_cache_engine.most_recent_src_file_update()
-    assert file_added_datetime > files_exist_datetime
-
-
-def test_most_recent_src_file_update_src_resource_updated(
-    file_cache_engine: FileCacheEngine,
+    file_cache_engine.save_coverage_map(coverage_map=second_map)
+    assert file_cache_engine.get_coverage_map() == second_map
+
+
+def test_inputs_changed_and_record_test_passed(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path
 ) -> None:
-    src_file = file_cache_engine.subproject.get_python_package_dir().joinpath(
-        "file_1.py"
-    )
-    src_file.parent.mkdir(parents=True, exist_ok=True)
-    src_file.touch()
-    files_exist_datetime = file_cache_engine.most_recent_src_file_update()
-    sleep(0.001)
-    src_resource_dir = get_resource_dir(file_path=src_file)
-    src_resource_dir.mkdir(parents=True, exist_ok=True)
-    src_resource_dir.joinpath("data.txt").write_text("resource")
-    resource_added_datetime = file_cache_engine.most_recent_src_file_update()
-    assert resource_added_datetime > files_exist_datetime
-
-
-def test_update_test_pass_timestamp(file_cache_engine: FileCacheEngine) -> None:
-    test_file = file_cache_engine.subproject.get_test_suite_dir(
-        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
-    ).joinpath("test_file.py")
-    test_file.parent.mkdir(parents=True)
-    test_file.touch()
-    assert file_cache_engine.get_test_info_for_file(test_file) == TestFileInfo(
-        file_path=test_file, tests_passed=None
+    test_file = mock_project_root.joinpath("test_file.py")
+    src_file = str(mock_project_root.joinpath("src_file.py"))
+    input_digests = {src_file: "abc", str(test_file): "def"}
+    assert file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests=input_digests
     )
     datetime_to_use = datetime.now(tz=UTC)
     with patch("build_support.file_caching.datetime") as mock_datetime:
         mock_datetime.now.return_value = datetime_to_use
-        file_cache_engine.update_test_pass_timestamp(file_path=test_file)
+        file_cache_engine.record_test_passed(
+            file_path=test_file, input_digests=input_digests
+        )
     assert file_cache_engine.get_test_info_for_file(test_file) == TestFileInfo(
-        file_path=test_file, tests_passed=datetime_to_use
+        file_path=test_file, tests_passed=datetime_to_use, input_digests=input_digests
+    )
+    assert not file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests=dict(input_digests)
+    )
+    assert file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests={**input_digests, src_file: "xyz"}
+    )
+    assert file_cache_engine.inputs_changed(
+        file_path=test_file,
+        input_digests={
+            **input_digests,
+            str(mock_project_root.joinpath("new_file.py")): "ghi",
+        },
+    )
+    assert file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests={str(test_file): "def"}
     )
 
 
-def test_get_most_recent_file_update_in_dir_nonexistent(tmp_path: Path) -> None:
-    non_existent = tmp_path / "does_not_exist"
-    result = FileCacheEngine.get_most_recent_file_update_in_dir(directory=non_existent)
-    assert result == datetime.min.replace(tzinfo=UTC)
+def test_inputs_changed_uses_shared_results(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path
+) -> None:
+    test_file = mock_project_root.joinpath("test_file.py")
+    old_digests = {str(test_file): "abc"}
+    new_digests = {str(test_file): "def"}
+    file_cache_engine.record_test_passed(file_path=test_file, input_digests=old_digests)
+    assert file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests=new_digests
+    )
+    # A file cache of its own, like on another machine, sharing the same results
+    other_runner_file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.PYPI, project_root=mock_project_root
+    )
+    other_runner_file_cache.record_test_passed(
+        file_path=test_file, input_digests=new_digests
+    )
+    assert not file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests=new_digests
+    )
+    assert file_cache_engine.get_test_info_for_file(
+        file_path=test_file
+    ).input_digests == (old_digests)
+    assert not file_cache_engine.inputs_changed(
+        file_path=test_file, input_digests=old_digests
+    )
+    assert file_cache_engine.shared_results.has_passed(
+        result_key=PassedTest.from_test_run(
+            test_file=test_file,
+            input_digests=old_digests,
+            tests_passed=datetime.now(tz=UTC),
+            project_root=mock_project_root,
+        ).get_key()
+    )
 
 
-def test_get_most_recent_file_update_in_dir_empty(tmp_path: Path) -> None:
-    empty_dir = tmp_path / "empty"
-    empty_dir.mkdir()
-    result = FileCacheEngine.get_most_recent_file_update_in_dir(directory=empty_dir)
-    expected = datetime.fromtimestamp(timestamp=empty_dir.stat().st_mtime, tz=UTC)
-    assert result == expected
+def test_shared_results_depend_on_dev_environment(
+    file_cache_engine: FileCacheEngine, mock_project_root: Path
+) -> None:
+    test_file = mock_project_root.joinpath("test_file.py")
+    input_digests = {str(test_file): "abc"}
+    uv_lock_file = get_uv_lock_file(project_root=mock_project_root)
+    uv_lock_file.write_text("version = 1\n")
+    file_cache_engine.record_test_passed(
+        file_path=test_file, input_digests=input_digests
+    )
+    # Another machine with other versions of the dependencies
+    uv_lock_file.write_text("version = 1\nrevision = 2\n")
+    other_runner_file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.PYPI, project_root=mock_project_root
+    )
+    assert other_runner_file_cache.inputs_changed(
+        file_path=test_file, input_digests=input_digests
+    )
+    # The same versions as the machine that passed the test
+    uv_lock_file.write_text("version = 1\n")
+    other_runner_file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.PYPI, project_root=mock_project_root
+    )
+    assert not other_runner_file_cache.inputs_changed(
+        file_path=test_file, input_digests=input_digests
+    )
 
 
-def test_get_most_recent_file_update_in_dir_with_files(tmp_path: Path) -> None:
-    resource_dir = tmp_path / "resources"
-    resource_dir.mkdir()
-    file_a = resource_dir / "a.txt"
-    file_a.write_text("aaa")
-    sleep(0.001)
-    file_b = resource_dir / "b.txt"
-    file_b.write_text("bbb")
-    result = FileCacheEngine.get_most_recent_file_update_in_dir(directory=resource_dir)
-    expected = FileCacheEngine.get_last_modified_time(file_path=file_b)
-    assert result == expected
+def test_get_python_files(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    package_dir = subproject.get_python_package_dir()
+    src_file = package_dir.joinpath("file_1.py")
+    src_resource = get_resource_dir(file_path=src_file).joinpath("data.txt")
+    test_file = subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    ).joinpath("test_file_1.py")
+    _write_files(files={src_file: "", src_resource: "", test_file: ""})
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.get_python_files() == [src_file, test_file]
 
 
-def test_get_most_recent_file_update_in_dir_nested(tmp_path: Path) -> None:
-    resource_dir = tmp_path / "resources"
-    resource_dir.mkdir()
-    sub_dir = resource_dir / "sub"
-    sub_dir.mkdir()
-    file_a = resource_dir / "a.txt"
-    file_a.write_text("aaa")
-    sleep(0.001)
-    nested_file = sub_dir / "nested.txt"
-    nested_file.write_text("nested")
-    result = FileCacheEngine.get_most_recent_file_update_in_dir(directory=resource_dir)
-    expected = FileCacheEngine.get_last_modified_time(file_path=nested_file)
-    assert result == expected
+def test_get_type_check_input_files(mock_project_root: Path) -> None:
+    subproject = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    package_dir = subproject.get_python_package_dir()
+    package_init = package_dir.joinpath("__init__.py")
+    src_file = package_dir.joinpath("file_1.py")
+    imported_by_src = package_dir.joinpath("file_2.py")
+    imported_by_test = package_dir.joinpath("file_3.py")
+    not_imported = package_dir.joinpath("file_4.py")
+    test_dir = subproject.get_test_suite_dir(
+        test_suite=PythonSubproject.TestSuite.UNIT_TESTS
+    )
+    test_file = test_dir.joinpath("test_file_1.py")
+    other_test_file = test_dir.joinpath("test_file_2.py")
+    conftest = test_dir.joinpath(CONFTEST_NAME)
+    test_utility = subproject.get_test_utils_dir().joinpath("helpers.py")
+    _write_files(
+        files={
+            package_init: "",
+            src_file: "from . import file_2\n",
+            imported_by_src: "",
+            imported_by_test: "",
+            not_imported: "",
+            test_file: "from build_support.file_3 import a_function\n",
+            other_test_file: "",
+            conftest: "",
+            test_utility: "",
+        }
+    )
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.get_type_check_input_files(file_path=src_file) == [
+        package_init,
+        src_file,
+        imported_by_src,
+    ]
+    assert file_cache_engine.get_type_check_input_files(file_path=test_file) == sorted(
+        [package_init, imported_by_test, test_file, conftest, test_utility]
+    )
 
 
-def test_get_most_recent_file_update_in_dir_detects_deleted_file(
-    tmp_path: Path,
+def test_get_files_to_check_and_record_check_passed(
+    mock_project_root: Path, tmp_path: Path
 ) -> None:
-    resource_dir = tmp_path / "resources"
-    resource_dir.mkdir()
-    deleted_file = resource_dir / "to_delete.txt"
-    deleted_file.write_text("delete me")
-    before_delete = FileCacheEngine.get_most_recent_file_update_in_dir(
-        directory=resource_dir
-    )
-    sleep(0.001)
-    deleted_file.unlink()
-    after_delete = FileCacheEngine.get_most_recent_file_update_in_dir(
-        directory=resource_dir
-    )
-    assert after_delete > before_delete
+    checked_file = tmp_path.joinpath("checked.py")
+    input_file = tmp_path.joinpath("input.py")
+    _write_files(files={checked_file: "a = 1\n", input_file: "b = 2\n"})
+    input_files_by_file = {checked_file: [checked_file, input_file]}
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    files_to_check = file_cache_engine.get_files_to_check(
+        check_name="ruff", input_files_by_file=input_files_by_file
+    )
+    assert files_to_check == {
+        checked_file: file_cache_engine.get_input_digests(
+            input_files=[checked_file, input_file]
+        )
+    }
+    file_cache_engine.record_check_passed(
+        check_name="ruff", input_digests_by_file=files_to_check
+    )
+    assert not file_cache_engine.get_files_to_check(
+        check_name="ruff", input_files_by_file=input_files_by_file
+    )
+    assert (
+        file_cache_engine.get_files_to_check(
+            check_name="ty", input_files_by_file=input_files_by_file
+        )
+        == files_to_check
+    )
+    # A new engine reads the results recorded by the last one
+    reloaded_file_cache = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert not reloaded_file_cache.get_files_to_check(
+        check_name="ruff", input_files_by_file=input_files_by_file
+    )
+    input_file.write_text("b = 3\n")
+    assert list(
+        reloaded_file_cache.get_files_to_check(
+            check_name="ruff", input_files_by_file=input_files_by_file
+        )
+    ) == [checked_file]
+
+
+def test_get_and_record_test_durations(mock_project_root: Path) -> None:
+    test_file_1 = mock_project_root.joinpath("test_file_1.py")
+    test_file_2 = mock_project_root.joinpath("test_file_2.py")
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.get_test_durations() == {}
+    file_cache_engine.record_test_durations(
+        durations={
+            test_file_1: timedelta(seconds=1.5),
+            test_file_2: timedelta(seconds=2),
+        }
+    )
+    file_cache_engine.record_test_durations(
+        durations={test_file_2: timedelta(seconds=3)}
+    )
+    assert FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    ).get_test_durations() == {
+        test_file_1: timedelta(seconds=1.5),
+        test_file_2: timedelta(seconds=3),
+    }
+
+
+def test_get_and_record_test_failures(mock_project_root: Path) -> None:
+    test_file_1 = mock_project_root.joinpath("test_file_1.py")
+    test_file_2 = mock_project_root.joinpath("test_file_2.py")
+    test_file_3 = mock_project_root.joinpath("test_file_3.py")
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.get_failed_test_files() == set()
+    file_cache_engine.record_test_failures(
+        ran_test_files=[test_file_1, test_file_2, test_file_3],
+        failed_test_files={test_file_1, test_file_2},
+    )
+    # Test files that didn't run keep their last result
+    file_cache_engine.record_test_failures(
+        ran_test_files=[test_file_2, test_file_3], failed_test_files={test_file_3}
+    )
+    assert FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    ).get_failed_test_files() == {test_file_1, test_file_3}
+
+
+def test_get_last_modified(mock_project_root: Path) -> None:
+    older_file = mock_project_root.joinpath("older.py")
+    newer_file = mock_project_root.joinpath("newer.py")
+    older_file.write_text("a = 1\n")
+    newer_file.write_text("b = 2\n")
+    os.utime(older_file, (1_000, 1_000))
+    os.utime(newer_file, (2_000, 2_000))
+    file_cache_engine = FileCacheEngine(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    )
+    assert file_cache_engine.get_last_modified(
+        input_files=[older_file, newer_file]
+    ) == datetime.fromtimestamp(2_000, tz=UTC)
+    assert file_cache_engine.get_last_modified(input_files=[]) == datetime.min.replace(
+        tzinfo=UTC
+    )
+
+
+def test_get_docstring_issues_only_checks_changed_modules(
+    mock_project_root: Path,
+) -> None:
+    package_dir = get_python_subproject(
+        subproject_context=SubprojectContext.BUILD_SUPPORT,
+        project_root=mock_project_root,
+    ).get_python_package_dir()
+    package_init = package_dir.joinpath("__init__.py")
+    documented = package_dir.joinpath("documented.py")
+    undocumented = package_dir.joinpath("undocumented.py")
+    _write_files(
+        files={
+            package_init: (
+                '"""A package.\n\n'
+                "Modules:\n"
+                "    | documented: Documented.\n"
+                "    | undocumented: Not documented yet.\n"
+                '"""\n'
+            ),
+            documented: '"""Documented."""\n',
+            undocumented: "A = 1\n",
+        }
+    )
+    package_name = package_dir.name
+    with patch(
+        "build_support.file_caching.check_modules_docstrings",
+        wraps=check_modules_docstrings,
+    ) as mock_check_modules_docstrings:
+        assert FileCacheEngine(
+            subproject_context=SubprojectContext.BUILD_SUPPORT,
+            project_root=mock_project_root,
+        ).get_docstring_issues(max_workers=1) == [
+            DocstringIssue(
+                module_path=f"{package_name}.undocumented",
+                element_path="",
+                issue="missing section Attributes",
+            )
+        ]
+        undocumented.write_text(
+            '"""Documented now.\n\nAttributes:\n    | A: An attribute.\n"""\n\nA = 1\n'
+        )
+        for _ in range(2):
+            assert (
+                FileCacheEngine(
+                    subproject_context=SubprojectContext.BUILD_SUPPORT,
+                    project_root=mock_project_root,
+                ).get_docstring_issues(max_workers=1)
+                == []
+            )
+    assert [
+        call.kwargs["documented_modules"]
+        for call in mock_check_modules_docstrings.call_args_list
+    ] == [
+        [
+            DocumentedModule(
+                file_path=package_init,
+                module_path=package_name,
+                modules=("documented", "undocumented"),
+            ),
+            DocumentedModule(
+                file_path=documented, module_path=f"{package_name}.documented"
+            ),
+            DocumentedModule(
+                file_path=undocumented, module_path=f"{package_name}.undocumented"
+            ),
+        ],
+        [
+            DocumentedModule(
+                file_path=undocumented, module_path=f"{package_name}.undocumented"
+            )
+        ],
+        [],
+    ]
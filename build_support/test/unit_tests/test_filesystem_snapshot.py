@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+from build_support.filesystem_snapshot import FileSystemSnapshot
+
+
+@pytest.fixture
+def snapshot_root(tmp_path: Path) -> Path:
+    root = tmp_path.joinpath("root")
+    root.joinpath("a", "b").mkdir(parents=True)
+    root.joinpath("empty").mkdir()
+    root.joinpath("top.txt").write_text("top")
+    root.joinpath("a", "a.txt").write_text("a")
+    root.joinpath("a", "b", "b.txt").write_text("b")
+    return root
+
+
+def test_snapshot_of_missing_dir(tmp_path: Path) -> None:
+    snapshot = FileSystemSnapshot(root=tmp_path.joinpath("missing"))
+    assert snapshot.file_stats == {}
+    assert snapshot.get_files_in_dir(directory=tmp_path.joinpath("missing")) == []
+
+
+def test_get_files_in_dir(snapshot_root: Path) -> None:
+    snapshot = FileSystemSnapshot(root=snapshot_root)
+    a_txt = snapshot_root.joinpath("a", "a.txt")
+    b_txt = snapshot_root.joinpath("a", "b", "b.txt")
+    top_txt = snapshot_root.joinpath("top.txt")
+    assert snapshot.get_files_in_dir(directory=snapshot_root) == [a_txt, b_txt, top_txt]
+    assert snapshot.get_files_in_dir(directory=snapshot_root.joinpath("a")) == [
+        a_txt,
+        b_txt,
+    ]
+    assert snapshot.get_files_in_dir(directory=snapshot_root.joinpath("empty")) == []
+    assert snapshot.get_files_in_dir(directory=snapshot_root.joinpath("missing")) == []
+    assert snapshot.get_files_in_dir(directory=snapshot_root) == sorted(
+        path for path in snapshot_root.rglob("*") if path.is_file()
+    )
+
+
+def test_get_files_in_dir_returns_a_copy(snapshot_root: Path) -> None:
+    snapshot = FileSystemSnapshot(root=snapshot_root)
+    snapshot.get_files_in_dir(directory=snapshot_root).clear()
+    assert len(snapshot.get_files_in_dir(directory=snapshot_root)) == len(
+        snapshot.file_stats
+    )
+
+
+def test_snapshot_does_not_follow_symlinked_dirs(
+    snapshot_root: Path, tmp_path: Path
+) -> None:
+    outside_dir = tmp_path.joinpath("outside")
+    outside_dir.mkdir()
+    outside_dir.joinpath("outside.txt").write_text("outside")
+    snapshot_root.joinpath("link").symlink_to(outside_dir, target_is_directory=True)
+    snapshot = FileSystemSnapshot(root=snapshot_root)
+    assert snapshot.get_files_in_dir(directory=snapshot_root) == sorted(
+        path for path in snapshot_root.rglob("*") if path.is_file()
+    )
+
+
+def test_covers(snapshot_root: Path) -> None:
+    snapshot = FileSystemSnapshot(root=snapshot_root)
+    assert snapshot.covers(path=snapshot_root)
+    assert snapshot.covers(path=snapshot_root.joinpath("a", "missing.txt"))
+    assert not snapshot.covers(path=snapshot_root.parent)
+
+
+def test_is_file_and_get_stat(snapshot_root: Path) -> None:
+    snapshot = FileSystemSnapshot(root=snapshot_root)
+    a_txt = snapshot_root.joinpath("a", "a.txt")
+    assert snapshot.is_file(file_path=a_txt)
+    assert snapshot.get_stat(file_path=a_txt) == a_txt.stat()
+    assert not snapshot.is_file(file_path=snapshot_root.joinpath("a"))
+    missing_file = snapshot_root.joinpath("missing.txt")
+    assert not snapshot.is_file(file_path=missing_file)
+    with pytest.raises(FileNotFoundError, match=r"missing\.txt was not a file"):
+        snapshot.get_stat(file_path=missing_file)
+
+
+def test_snapshot_does_not_see_later_changes(snapshot_root: Path) -> None:
+    snapshot = FileSystemSnapshot(root=snapshot_root)
+    new_file = snapshot_root.joinpath("new.txt")
+    new_file.write_text("new")
+    assert not snapshot.is_file(file_path=new_file)
+    assert new_file not in snapshot.get_files_in_dir(directory=snapshot_root)
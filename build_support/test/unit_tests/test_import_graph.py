@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import pytest
+from build_support.import_graph import (
+    INIT_MODULE_NAME,
+    ImportGraph,
+    ModuleImports,
+    get_module_name,
+    parse_module_imports,
+    resolve_import_target,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert INIT_MODULE_NAME == "__init__"
+
+
+def test_parse_module_imports() -> None:
+    source = (
+        "import os, a.b\n"
+        "from c import d, e\n"
+        "from . import f\n"
+        "from ..g import h\n"
+        "from c import d\n"
+        "\n"
+        "def a_function() -> None:\n"
+        "    import i\n"
+    )
+    assert parse_module_imports(source=source) == ModuleImports(
+        import_targets=("os", "a.b", "c", "c.d", "c.e", ".f", "..g", "..g.h", "i"),
+        is_entry_point=False,
+    )
+
+
+@pytest.mark.parametrize(
+    argnames=("source", "is_entry_point"),
+    argvalues=[
+        ('if __name__ == "__main__":\n    pass\n', True),
+        ('if "__main__" == __name__:\n    pass\n', False),
+        ('if __name__ == "other":\n    pass\n', False),
+        ('if __file__ == "__main__":\n    pass\n', False),
+        ("if __name__:\n    pass\n", False),
+        ('def f() -> None:\n    if __name__ == "__main__":\n        pass\n', False),
+    ],
+)
+def test_parse_module_imports_entry_point(source: str, is_entry_point: bool) -> None:
+    assert parse_module_imports(source=source).is_entry_point == is_entry_point
+
+
+def test_parse_module_imports_syntax_error() -> None:
+    assert parse_module_imports(source="import (\n") == ModuleImports(
+        import_targets=(), is_entry_point=False
+    )
+
+
+@pytest.mark.parametrize(
+    argnames=("import_target", "package", "expected"),
+    argvalues=[
+        ("a.b", "c", "a.b"),
+        (".b", "a", "a.b"),
+        (".", "a.c", "a.c"),
+        ("..b", "a.c", "a.b"),
+        ("..", "a.c", "a"),
+        ("..b", "a", None),
+        (".b", "", None),
+    ],
+)
+def test_resolve_import_target(
+    import_target: str, package: str, expected: str | None
+) -> None:
+    assert (
+        resolve_import_target(import_target=import_target, package=package) == expected
+    )
+
+
+def test_get_module_name() -> None:
+    src_dir = Path("src")
+    assert get_module_name(src_dir=src_dir, file_path=Path("src/a/b.py")) == "a.b"
+    assert get_module_name(src_dir=src_dir, file_path=Path("src/a/__init__.py")) == "a"
+
+
+@pytest.fixture
+def import_graph() -> ImportGraph:
+    src_dir = Path("src")
+    return ImportGraph(
+        src_dir=src_dir,
+        module_imports_by_path={
+            Path("src/a/__init__.py"): ModuleImports(
+                import_targets=(), is_entry_point=False
+            ),
+            Path("src/a/b.py"): ModuleImports(
+                import_targets=(".c", "os"), is_entry_point=False
+            ),
+            Path("src/a/c.py"): ModuleImports(
+                import_targets=("a.b",), is_entry_point=False
+            ),
+            Path("src/a/d/__init__.py"): ModuleImports(
+                import_targets=(".e",), is_entry_point=False
+            ),
+            Path("src/a/d/e.py"): ModuleImports(
+                import_targets=(), is_entry_point=False
+            ),
+            Path("src/a/main.py"): ModuleImports(
+                import_targets=("a.d",), is_entry_point=True
+            ),
+        },
+    )
+
+
+def test_get_package(import_graph: ImportGraph) -> None:
+    assert import_graph.get_package(module_name="a") == "a"
+    assert import_graph.get_package(module_name="a.b") == "a"
+    assert import_graph.get_package(module_name="a.d") == "a.d"
+
+
+def test_resolve(import_graph: ImportGraph) -> None:
+    assert import_graph.resolve(import_targets=["a.d.e", "os"], package="") == {
+        "a",
+        "a.d",
+        "a.d.e",
+    }
+    assert import_graph.resolve(import_targets=["a.b.some_function"], package="") == {
+        "a",
+        "a.b",
+    }
+    assert import_graph.resolve(import_targets=["..b"], package="a") == set()
+
+
+def test_get_dependencies(import_graph: ImportGraph) -> None:
+    assert import_graph.get_dependencies(module_names=["a.b"]) == [
+        Path("src/a/__init__.py"),
+        Path("src/a/b.py"),
+        Path("src/a/c.py"),
+    ]
+    assert import_graph.get_dependencies(module_names=["a.main"]) == [
+        Path("src/a/__init__.py"),
+        Path("src/a/d/__init__.py"),
+        Path("src/a/d/e.py"),
+        Path("src/a/main.py"),
+    ]
+    assert import_graph.get_dependencies(module_names=[]) == []
+
+
+def test_get_entry_points(import_graph: ImportGraph) -> None:
+    assert import_graph.get_entry_points() == ["a.main"]
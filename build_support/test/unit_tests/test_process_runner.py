@@ -1,18 +1,47 @@
 import logging
+from collections.abc import Iterator
 from pathlib import Path
+from resource import struct_rusage
 from subprocess import PIPE
-from unittest.mock import Mock, call, patch
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
+from build_support.build_tracing import trace_build
 from build_support.process_runner import (
     TRACE,
+    ProcessFailedError,
+    build_popen,
     concatenate_args,
     get_output_of_process,
     get_str_args,
+    preparing_commands,
     resolve_process_results,
     run_piped_processes,
     run_process,
+    wait_for_processes,
 )
+from build_support.resource_accounting import ResourceUsage, track_resource_usage
+
+MOCK_PID = 1234
+MOCK_RUSAGE = struct_rusage((1.5, 0.5, 2048, 0, 0, 0, 0, 0, 0, 3, 4, 0, 0, 0, 0, 0))
+MOCK_RESOURCE_USAGE = ResourceUsage.from_rusage(rusage=MOCK_RUSAGE, processes_spawned=1)
+
+
+def build_mock_process(output: bytes, error: bytes) -> MagicMock:
+    """Builds a mock process whose stdout and stderr hold the given bytes."""
+    process_mock = MagicMock()
+    process_mock.pid = MOCK_PID
+    process_mock.stdout.read.return_value = output
+    process_mock.stderr.read.return_value = error
+    return process_mock
+
+
+@pytest.fixture
+def mock_wait4() -> Iterator[Mock]:
+    with patch(
+        "build_support.process_runner.os.wait4", return_value=(MOCK_PID, 0, MOCK_RUSAGE)
+    ) as wait4_mock:
+        yield wait4_mock
 
 
 def test_get_str_args() -> None:
@@ -50,7 +79,7 @@ def test_resolve_process_results_normal_process_exit_1(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     caplog.set_level(logging.ERROR, logger="build_support.process_runner")
-    with patch("build_support.process_runner.sys.exit") as mock_exit:
+    with pytest.raises(ProcessFailedError) as error_info:
         resolve_process_results(
             command_as_str="run a process", output=b"output", error=b"", return_code=1
         )
@@ -59,7 +88,8 @@ def test_resolve_process_results_normal_process_exit_1(
     error_records = [r for r in caplog.records if r.levelno == logging.ERROR]
     expected_error_count = 2
     assert len(error_records) == expected_error_count
-    mock_exit.assert_called_once_with(1)
+    assert error_info.value.return_code == 1
+    assert error_info.value.command_as_str == "run a process"
 
 
 def test_resolve_process_results_normal_process_has_error_text(
@@ -92,7 +122,7 @@ def test_resolve_process_results_normal_process_has_error_text_exit_1(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     caplog.set_level(logging.ERROR, logger="build_support.process_runner")
-    with patch("build_support.process_runner.sys.exit") as mock_exit:
+    with pytest.raises(ProcessFailedError) as error_info:
         resolve_process_results(
             command_as_str="run a process",
             output=b"output",
@@ -105,14 +135,15 @@ def test_resolve_process_results_normal_process_has_error_text_exit_1(
     error_records = [r for r in caplog.records if r.levelno == logging.ERROR]
     expected_error_count = 3
     assert len(error_records) == expected_error_count
-    mock_exit.assert_called_once_with(1)
+    assert error_info.value.return_code == 1
+    assert error_info.value.command_as_str == "run a process"
 
 
 def test_resolve_process_results_failure_stderr_only(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     caplog.set_level(logging.ERROR, logger="build_support.process_runner")
-    with patch("build_support.process_runner.sys.exit") as mock_exit:
+    with pytest.raises(ProcessFailedError) as error_info:
         resolve_process_results(
             command_as_str="run a process",
             output=b"",
@@ -124,7 +155,8 @@ def test_resolve_process_results_failure_stderr_only(
     error_records = [r for r in caplog.records if r.levelno == logging.ERROR]
     expected_error_count = 2
     assert len(error_records) == expected_error_count
-    mock_exit.assert_called_once_with(1)
+    assert error_info.value.return_code == 1
+    assert error_info.value.command_as_str == "run a process"
 
 
 def test_resolve_process_results_at_info_level_suppresses_trace_output(
@@ -140,6 +172,7 @@ def test_resolve_process_results_at_info_level_suppresses_trace_output(
     assert len(caplog.records) == 0
 
 
+@pytest.mark.usefixtures("mock_wait4")
 def test_run_process() -> None:
     with (
         patch("build_support.process_runner.Popen") as mock_popen,
@@ -147,10 +180,7 @@ def test_run_process() -> None:
             "build_support.process_runner.resolve_process_results"
         ) as mock_resolve_process_results,
     ):
-        process_mock = Mock()
-        process_mock.communicate = Mock()
-        process_mock.communicate.return_value = b"output", b"error"
-        process_mock.returncode = 0
+        process_mock = build_mock_process(output=b"output", error=b"error")
         mock_popen.return_value = process_mock
         assert run_process(args=["command", 0, 1.5, Path("/usr/dev")]) == b"output"
         mock_popen.assert_called_once_with(
@@ -167,6 +197,40 @@ def test_run_process() -> None:
         )
 
 
+@pytest.mark.usefixtures("mock_wait4")
+def test_run_process_prepares_command() -> None:
+    prepared_commands = []
+    with (
+        patch("build_support.process_runner.Popen") as mock_popen,
+        patch("build_support.process_runner.resolve_process_results"),
+    ):
+        mock_popen.return_value = build_mock_process(output=b"", error=b"")
+        with preparing_commands(prepare=prepared_commands.append):
+            run_process(args=["command", 0])
+            run_piped_processes(processes=[["first", 1], ["second", 2]])
+        run_process(args=["unprepared"])
+    assert prepared_commands == [["command", "0"], ["first", "1"], ["second", "2"]]
+
+
+def test_run_process_records_trace_span(mock_wait4: Mock) -> None:
+    with (
+        patch("build_support.process_runner.Popen") as mock_popen,
+        patch("build_support.process_runner.resolve_process_results"),
+        trace_build() as build_trace,
+    ):
+        process_mock = build_mock_process(output=b"output", error=b"error")
+        mock_wait4.return_value = (MOCK_PID, 3 << 8, MOCK_RUSAGE)
+        mock_popen.return_value = process_mock
+        run_process(args=["command", 0])
+    (span,) = build_trace.spans
+    assert span.name == "command 0"
+    assert span.category == "command"
+    assert span.args == {
+        "exit_code": 3,
+        "resource_usage": MOCK_RESOURCE_USAGE.model_dump(mode="json"),
+    }
+
+
 def test_get_output_of_process() -> None:
     with patch("build_support.process_runner.run_process") as mock_run_process:
         mock_run_process.return_value = b"output"
@@ -176,6 +240,7 @@ def test_get_output_of_process() -> None:
         )
 
 
+@pytest.mark.usefixtures("mock_wait4")
 def test_run_piped_processes(caplog: pytest.LogCaptureFixture) -> None:
     caplog.set_level(logging.DEBUG, logger="build_support.process_runner")
     with (
@@ -184,10 +249,7 @@ def test_run_piped_processes(caplog: pytest.LogCaptureFixture) -> None:
             "build_support.process_runner.resolve_process_results"
         ) as mock_resolve_process_results,
     ):
-        process_mock = Mock()
-        process_mock.communicate = Mock()
-        process_mock.communicate.return_value = b"output", b"error"
-        process_mock.returncode = 0
+        process_mock = build_mock_process(output=b"output", error=b"error")
         mock_popen.return_value = process_mock
         run_piped_processes(
             processes=[["command", 0, 1.5, Path("/usr/dev")], ["second_command", 1337]]
@@ -218,6 +280,28 @@ def test_run_piped_processes(caplog: pytest.LogCaptureFixture) -> None:
         assert command_as_str in caplog.text
 
 
+@pytest.mark.usefixtures("mock_wait4")
+def test_run_piped_processes_records_trace_span() -> None:
+    with (
+        patch("build_support.process_runner.Popen") as mock_popen,
+        patch("build_support.process_runner.resolve_process_results"),
+        trace_build() as build_trace,
+    ):
+        process_mock = build_mock_process(output=b"output", error=b"error")
+        mock_popen.return_value = process_mock
+        run_piped_processes(processes=[["command", 0], ["second_command", 1337]])
+    (span,) = build_trace.spans
+    assert span.name == "command 0 | second_command 1337"
+    assert span.category == "command"
+    assert span.args == {
+        "exit_code": 0,
+        "resource_usage": MOCK_RESOURCE_USAGE.combine(
+            other=MOCK_RESOURCE_USAGE
+        ).model_dump(mode="json"),
+    }
+
+
+@pytest.mark.usefixtures("mock_wait4")
 def test_run_piped_processes_at_info_level_hides_command(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
@@ -229,10 +313,7 @@ def test_run_piped_processes_at_info_level_hides_command(
             "build_support.process_runner.resolve_process_results"
         ) as mock_resolve_process_results,
     ):
-        process_mock = Mock()
-        process_mock.communicate = Mock()
-        process_mock.communicate.return_value = b"output", b"error"
-        process_mock.returncode = 0
+        process_mock = build_mock_process(output=b"output", error=b"error")
         mock_popen.return_value = process_mock
         run_piped_processes(
             processes=[["command", 0, 1.5, Path("/usr/dev")], ["second_command", 1337]]
@@ -247,6 +328,7 @@ def test_run_piped_processes_at_info_level_hides_command(
         assert command_as_str not in caplog.text
 
 
+@pytest.mark.usefixtures("mock_wait4")
 def test_run_piped_processes_one_process(caplog: pytest.LogCaptureFixture) -> None:
     caplog.set_level(logging.DEBUG, logger="build_support.process_runner")
     with (
@@ -255,10 +337,7 @@ def test_run_piped_processes_one_process(caplog: pytest.LogCaptureFixture) -> No
             "build_support.process_runner.resolve_process_results"
         ) as mock_resolve_process_results,
     ):
-        process_mock = Mock()
-        process_mock.communicate = Mock()
-        process_mock.communicate.return_value = b"output", b"error"
-        process_mock.returncode = 0
+        process_mock = build_mock_process(output=b"output", error=b"error")
         mock_popen.return_value = process_mock
         run_piped_processes(processes=[["command", 0, 1.5, Path("/usr/dev")]])
         command_as_str = "command 0 1.5 /usr/dev"
@@ -277,6 +356,7 @@ def test_run_piped_processes_one_process(caplog: pytest.LogCaptureFixture) -> No
         assert command_as_str in caplog.text
 
 
+@pytest.mark.usefixtures("mock_wait4")
 def test_run_piped_processes_one_process_at_info_level_hides_command(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
@@ -288,10 +368,7 @@ def test_run_piped_processes_one_process_at_info_level_hides_command(
             "build_support.process_runner.resolve_process_results"
         ) as mock_resolve_process_results,
     ):
-        process_mock = Mock()
-        process_mock.communicate = Mock()
-        process_mock.communicate.return_value = b"output", b"error"
-        process_mock.returncode = 0
+        process_mock = build_mock_process(output=b"output", error=b"error")
         mock_popen.return_value = process_mock
         run_piped_processes(processes=[["command", 0, 1.5, Path("/usr/dev")]])
         command_as_str = "command 0 1.5 /usr/dev"
@@ -302,3 +379,39 @@ def test_run_piped_processes_one_process_at_info_level_hides_command(
             return_code=0,
         )
         assert command_as_str not in caplog.text
+
+
+@pytest.mark.usefixtures("mock_wait4")
+def test_run_process_records_resource_usage() -> None:
+    with (
+        patch("build_support.process_runner.Popen") as mock_popen,
+        patch("build_support.process_runner.resolve_process_results"),
+        track_resource_usage() as usage_tracker,
+    ):
+        mock_popen.return_value = build_mock_process(output=b"", error=b"")
+        run_process(args=["command"])
+        run_piped_processes(processes=[["command"], ["second_command"]])
+    assert usage_tracker.usage.processes_spawned == 3  # noqa: PLR2004
+    assert usage_tracker.usage.user_cpu_time == 3 * MOCK_RESOURCE_USAGE.user_cpu_time
+
+
+def test_wait_for_processes_reaps_real_process() -> None:
+    process = build_popen(args=["sh", "-c", "echo out; echo err >&2; exit 3"])
+    output, error, usage = wait_for_processes(processes=[process])
+    assert output == b"out\n"
+    assert error == b"err\n"
+    assert process.returncode == 3  # noqa: PLR2004
+    assert usage.processes_spawned == 1
+    assert usage.max_rss_bytes > 0
+
+
+def test_wait_for_processes_without_pipes() -> None:
+    process = MagicMock(pid=MOCK_PID, stdout=None, stderr=None)
+    with patch(
+        "build_support.process_runner.os.wait4", return_value=(MOCK_PID, 0, MOCK_RUSAGE)
+    ):
+        assert wait_for_processes(processes=[process]) == (
+            b"",
+            b"",
+            MOCK_RESOURCE_USAGE,
+        )
@@ -0,0 +1,171 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from build_support.pytest_sizing import (
+    IN_PROCESS,
+    MIN_WORK_PER_WORKER,
+    RECENTLY_MODIFIED_WINDOW,
+    estimate_test_file_durations,
+    get_failed_test_files,
+    get_pytest_distribution_args,
+    get_pytest_worker_count,
+    get_test_file_durations,
+    order_test_files,
+    was_modified_recently,
+)
+from junitparser import Error, Failure, JUnitXml, Skipped, TestCase, TestSuite
+
+TEST_A = Path("/root/test/test_a.py")
+TEST_B = Path("/root/test/test_b.py")
+TEST_C = Path("/root/test/test_c.py")
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert timedelta(seconds=2) == MIN_WORK_PER_WORKER
+    assert IN_PROCESS == 0
+    assert timedelta(hours=1) == RECENTLY_MODIFIED_WINDOW
+
+
+def test_get_test_file_durations(tmp_path: Path) -> None:
+    test_a = tmp_path.joinpath("test", "test_a.py")
+    test_c = tmp_path.joinpath("test", "test_c.py")
+    suite = TestSuite(name="pytest")
+    suite.add_testcase(TestCase(name="test_1", classname="test.test_a", time=1.25))
+    suite.add_testcase(TestCase(name="test_2", classname="test.test_a.TestA", time=2))
+    suite.add_testcase(TestCase(name="test_3", classname="test.test_b", time=0.5))
+    xml = JUnitXml()
+    xml.add_testsuite(suite)
+    report = tmp_path.joinpath("report.xml")
+    xml.write(str(report))
+    assert get_test_file_durations(
+        junit_report=report, test_files=[test_a, test_c], project_root=tmp_path
+    ) == {test_a: timedelta(seconds=3.25)}
+
+
+def test_get_failed_test_files(tmp_path: Path) -> None:
+    test_a = tmp_path.joinpath("test", "test_a.py")
+    test_b = tmp_path.joinpath("test", "test_b.py")
+    test_c = tmp_path.joinpath("test", "test_c.py")
+    test_d = tmp_path.joinpath("test", "test_d.py")
+    failed_case = TestCase(name="test_1", classname="test.test_a")
+    failed_case.result = [Failure("assert False")]
+    errored_case = TestCase(name="test_2", classname="test.test_b.TestB")
+    errored_case.result = [Error("fixture broke")]
+    skipped_case = TestCase(name="test_3", classname="test.test_c")
+    skipped_case.result = [Skipped("not here")]
+    suite = TestSuite(name="pytest")
+    suite.add_testcase(failed_case)
+    suite.add_testcase(errored_case)
+    suite.add_testcase(skipped_case)
+    suite.add_testcase(TestCase(name="test_4", classname="test.test_d"))
+    xml = JUnitXml()
+    xml.add_testsuite(suite)
+    report = tmp_path.joinpath("report.xml")
+    xml.write(str(report))
+    assert get_failed_test_files(
+        junit_report=report,
+        test_files=[test_a, test_b, test_c, test_d],
+        project_root=tmp_path,
+    ) == {test_a, test_b}
+
+
+def test_get_failed_test_files_without_report(tmp_path: Path) -> None:
+    assert get_failed_test_files(
+        junit_report=tmp_path.joinpath("report.xml"),
+        test_files=[TEST_A, TEST_B],
+        project_root=tmp_path,
+    ) == {TEST_A, TEST_B}
+
+
+@pytest.mark.parametrize(
+    argnames=("age", "expected_recent"),
+    argvalues=[
+        (timedelta(), True),
+        (RECENTLY_MODIFIED_WINDOW / 2, True),
+        (RECENTLY_MODIFIED_WINDOW * 2, False),
+    ],
+)
+def test_was_modified_recently(age: timedelta, expected_recent: bool) -> None:
+    assert (
+        was_modified_recently(last_modified=datetime.now(tz=UTC) - age)
+        == expected_recent
+    )
+
+
+def test_was_modified_recently_never_modified() -> None:
+    assert not was_modified_recently(last_modified=datetime.min.replace(tzinfo=UTC))
+
+
+def test_estimate_test_file_durations() -> None:
+    assert estimate_test_file_durations(
+        test_files=[TEST_A, TEST_C],
+        durations={TEST_A: timedelta(seconds=1), TEST_B: timedelta(seconds=3)},
+    ) == {TEST_A: timedelta(seconds=1), TEST_C: timedelta(seconds=2)}
+
+
+def test_estimate_test_file_durations_without_history() -> None:
+    assert estimate_test_file_durations(test_files=[TEST_A], durations={}) is None
+
+
+@pytest.mark.parametrize(
+    argnames=("durations", "cpu_budget", "expected_worker_count"),
+    argvalues=[
+        ({}, 6, 6),
+        ({TEST_A: timedelta(seconds=1)}, 6, IN_PROCESS),
+        ({TEST_A: timedelta(milliseconds=500)}, 6, IN_PROCESS),
+        ({TEST_A: timedelta(seconds=3), TEST_B: timedelta(seconds=3)}, 6, 4),
+        ({TEST_A: timedelta(seconds=30), TEST_B: timedelta(seconds=30)}, 6, 6),
+        ({TEST_A: timedelta(seconds=30), TEST_B: timedelta(seconds=30)}, 1, IN_PROCESS),
+    ],
+)
+def test_get_pytest_worker_count(
+    durations: dict[Path, timedelta], cpu_budget: int, expected_worker_count: int
+) -> None:
+    assert (
+        get_pytest_worker_count(
+            test_files=[TEST_A, TEST_B, TEST_C],
+            durations=durations,
+            cpu_budget=cpu_budget,
+        )
+        == expected_worker_count
+    )
+
+
+def test_get_pytest_distribution_args_in_process() -> None:
+    assert get_pytest_distribution_args(
+        test_files=[TEST_A], durations={TEST_A: timedelta(seconds=1)}, cpu_budget=6
+    ) == ["-n", IN_PROCESS]
+
+
+def test_get_pytest_distribution_args_with_workers() -> None:
+    assert get_pytest_distribution_args(
+        test_files=[TEST_A], durations={TEST_A: timedelta(seconds=5)}, cpu_budget=6
+    ) == ["-n", 2, "--dist", "worksteal"]
+
+
+def test_order_test_files_longest_first() -> None:
+    assert order_test_files(
+        test_files=[TEST_A, TEST_B, TEST_C],
+        durations={TEST_A: timedelta(seconds=1), TEST_C: timedelta(seconds=3)},
+        failed_test_files=set(),
+        recently_modified_test_files=set(),
+    ) == [TEST_C, TEST_B, TEST_A]
+
+
+def test_order_test_files_without_history() -> None:
+    assert order_test_files(
+        test_files=[TEST_C, TEST_A, TEST_B],
+        durations={},
+        failed_test_files=set(),
+        recently_modified_test_files=set(),
+    ) == [TEST_A, TEST_B, TEST_C]
+
+
+def test_order_test_files_failed_then_recently_modified_first() -> None:
+    assert order_test_files(
+        test_files=[TEST_A, TEST_B, TEST_C],
+        durations={TEST_A: timedelta(seconds=1), TEST_C: timedelta(seconds=3)},
+        failed_test_files={TEST_A},
+        recently_modified_test_files={TEST_A, TEST_B},
+    ) == [TEST_A, TEST_B, TEST_C]
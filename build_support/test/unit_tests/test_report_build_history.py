@@ -0,0 +1,203 @@
+from argparse import Namespace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from build_support.build_history import (
+    REGRESSION_THRESHOLD,
+    ROLLING_BASELINE_BUILDS,
+    BuildRecord,
+    TaskTrend,
+    record_build,
+)
+from build_support.build_tracing import BuildTrace, TraceSpan
+from build_support.report_build_history import (
+    format_build_history_report,
+    parse_args,
+    run_main,
+)
+
+
+def test_parse_args_defaults(mock_project_root: Path) -> None:
+    assert parse_args(
+        args=["--docker-project-root", str(mock_project_root)]
+    ) == Namespace(
+        docker_project_root=mock_project_root,
+        builds=ROLLING_BASELINE_BUILDS,
+        baseline_builds=ROLLING_BASELINE_BUILDS,
+        regression_threshold=REGRESSION_THRESHOLD,
+        fail_on_regression=False,
+    )
+
+
+def test_parse_args(mock_project_root: Path) -> None:
+    assert parse_args(
+        args=[
+            "--docker-project-root",
+            str(mock_project_root),
+            "--builds",
+            "3",
+            "--baseline-builds",
+            "5",
+            "--regression-threshold",
+            "0.5",
+            "--fail-on-regression",
+        ]
+    ) == Namespace(
+        docker_project_root=mock_project_root,
+        builds=3,
+        baseline_builds=5,
+        regression_threshold=0.5,
+        fail_on_regression=True,
+    )
+
+
+def test_parse_args_no_project_root() -> None:
+    with pytest.raises(SystemExit):
+        parse_args(args=[])
+
+
+def test_format_report_without_builds() -> None:
+    assert (
+        format_build_history_report(builds=[], trends=[], regression_threshold=0.2)
+        == "No builds have been recorded yet."
+    )
+
+
+def test_format_report() -> None:
+    started_at = datetime(year=2026, month=1, day=2, hour=3, minute=4, tzinfo=UTC)
+    builds = [
+        BuildRecord(
+            build_id=1,
+            started_at=started_at,
+            branch="main",
+            commit_sha="0123456789abcdef",
+            duration=timedelta(seconds=90),
+            tasks_run=4,
+            cache_hits=0,
+        ),
+        BuildRecord(
+            build_id=2,
+            started_at=started_at,
+            branch=None,
+            commit_sha="0123456789abcdef",
+            duration=timedelta(seconds=60),
+            tasks_run=4,
+            cache_hits=1,
+        ),
+        BuildRecord(
+            build_id=3,
+            started_at=started_at,
+            branch=None,
+            commit_sha=None,
+            duration=timedelta(seconds=30),
+            tasks_run=4,
+            cache_hits=2,
+        ),
+    ]
+    trends = [
+        TaskTrend(
+            task_name="SLOWER",
+            latest_duration=timedelta(seconds=30),
+            restored_from_cache=False,
+            baseline_duration=timedelta(seconds=10),
+            regressed=True,
+        ),
+        TaskTrend(
+            task_name="FASTER",
+            latest_duration=timedelta(seconds=5),
+            restored_from_cache=False,
+            baseline_duration=timedelta(seconds=10),
+            regressed=False,
+        ),
+        TaskTrend(
+            task_name="CACHED",
+            latest_duration=timedelta(milliseconds=1),
+            restored_from_cache=True,
+            baseline_duration=timedelta(seconds=10),
+            regressed=False,
+        ),
+        TaskTrend(
+            task_name="NEW",
+            latest_duration=timedelta(seconds=1),
+            restored_from_cache=False,
+            baseline_duration=None,
+            regressed=False,
+        ),
+    ]
+    assert format_build_history_report(
+        builds=builds, trends=trends, regression_threshold=0.2
+    ) == (
+        "Recent builds:\n"
+        "  #1 2026-01-02 03:04:00 main@01234567 90.0s tasks: 4 cache hits: 0\n"
+        "  #2 2026-01-02 03:04:00 01234567 60.0s tasks: 4 cache hits: 1\n"
+        "  #3 2026-01-02 03:04:00 unknown revision 30.0s tasks: 4 cache hits: 2\n"
+        "Tasks in the latest build:\n"
+        "  SLOWER 30.0s baseline: 10.0s (+200.0%) REGRESSED\n"
+        "  FASTER 5.0s baseline: 10.0s (-50.0%)\n"
+        "  CACHED 0.0s (restored from cache)\n"
+        "  NEW 1.0s (no baseline)\n"
+        "1 task(s) regressed by more than 20% against their baseline."
+    )
+
+
+def _record_task_run(project_root: Path, duration: timedelta) -> None:
+    build_trace = BuildTrace()
+    build_trace.add_span(
+        span=TraceSpan(
+            name="TASK",
+            category="task",
+            start=build_trace.start,
+            duration=duration,
+            thread_id=1,
+            args={"restored_from_cache": False},
+        )
+    )
+    record_build(project_root=project_root, build_trace=build_trace)
+
+
+@pytest.fixture
+def regressed_project_root(mock_project_root: Path) -> Path:
+    _record_task_run(project_root=mock_project_root, duration=timedelta(seconds=10))
+    _record_task_run(project_root=mock_project_root, duration=timedelta(seconds=30))
+    return mock_project_root
+
+
+def test_run_main(
+    regressed_project_root: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run_main(
+        args=parse_args(args=["--docker-project-root", str(regressed_project_root)])
+    )
+    output = capsys.readouterr().out
+    assert "  TASK 30.0s baseline: 10.0s (+200.0%) REGRESSED" in output
+
+
+def test_run_main_fail_on_regression(regressed_project_root: Path) -> None:
+    with pytest.raises(SystemExit) as exit_info:
+        run_main(
+            args=parse_args(
+                args=[
+                    "--docker-project-root",
+                    str(regressed_project_root),
+                    "--fail-on-regression",
+                ]
+            )
+        )
+    assert exit_info.value.code == 1
+
+
+def test_run_main_fail_on_regression_without_regression(
+    mock_project_root: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    _record_task_run(project_root=mock_project_root, duration=timedelta(seconds=10))
+    run_main(
+        args=parse_args(
+            args=[
+                "--docker-project-root",
+                str(mock_project_root),
+                "--fail-on-regression",
+            ]
+        )
+    )
+    assert "0 task(s) regressed" in capsys.readouterr().out
@@ -0,0 +1,175 @@
+from pathlib import Path
+
+import pytest
+from build_support.coverage_map import IMPORT_CONTEXT
+from build_support.report_fragments import (
+    COVERAGE_FRAGMENT_SUFFIX,
+    JUNIT_FRAGMENT_SUFFIX,
+    ReportFragmentStore,
+    get_junit_classname,
+    get_test_file_cases,
+)
+from build_support.shared_test_results import (
+    get_shareable_test_inputs,
+    get_shared_result_key,
+)
+from coverage import CoverageData
+from junitparser import JUnitXml, TestCase, TestSuite
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert COVERAGE_FRAGMENT_SUFFIX == ".coverage.sqlite"
+    assert JUNIT_FRAGMENT_SUFFIX == ".junit.xml"
+
+
+def test_get_junit_classname() -> None:
+    assert (
+        get_junit_classname(
+            test_file=Path("/root/test/unit_tests/test_a.py"),
+            project_root=Path("/root"),
+        )
+        == "test.unit_tests.test_a"
+    )
+
+
+def test_get_test_file_cases() -> None:
+    module_case = TestCase(name="test_1", classname="test.unit_tests.test_a")
+    class_case = TestCase(name="test_2", classname="test.unit_tests.test_a.TestA")
+    other_case = TestCase(name="test_3", classname="test.unit_tests.test_ab")
+    unnamed_case = TestCase(name="test_4")
+    assert get_test_file_cases(
+        test_cases=[module_case, other_case, unnamed_case, class_case],
+        test_file=Path("/root/test/unit_tests/test_a.py"),
+        project_root=Path("/root"),
+    ) == [module_case, class_case]
+
+
+@pytest.fixture
+def fragment_store(tmp_path: Path) -> ReportFragmentStore:
+    return ReportFragmentStore(
+        fragment_dir=tmp_path.joinpath("build", "fragments"), project_root=tmp_path
+    )
+
+
+def test_fragment_store_creates_dir(tmp_path: Path) -> None:
+    fragment_dir = tmp_path.joinpath("build", "fragments")
+    ReportFragmentStore(fragment_dir=fragment_dir, project_root=tmp_path)
+    assert fragment_dir.is_dir()
+
+
+def test_get_fragment_key(tmp_path: Path, fragment_store: ReportFragmentStore) -> None:
+    test_file = tmp_path.joinpath("test", "test_a.py")
+    input_digests = {str(tmp_path.joinpath("src", "a.py")): "abc"}
+    assert fragment_store.get_fragment_key(
+        test_file=test_file, input_digests=input_digests
+    ) == get_shared_result_key(
+        *get_shareable_test_inputs(
+            test_file=test_file, input_digests=input_digests, project_root=tmp_path
+        )
+    )
+
+
+def _write_test_run(
+    project_root: Path, branch: bool
+) -> tuple[Path, Path, dict[str, Path]]:
+    """Write the coverage data and junit report of a run of two test files."""
+    src_file = project_root.joinpath("src", "a.py")
+    unrun_file = project_root.joinpath("src", "b.py")
+    data_file = project_root.joinpath("session_coverage")
+    coverage_data = CoverageData(basename=str(data_file))
+    lines_by_context = {
+        IMPORT_CONTEXT: [1],
+        "test/test_a.py::test_one|run": [2, 3],
+        "test/test_a.py::TestA::test_two|run": [4],
+        "test/test_b.py::test_three|run": [5],
+    }
+    for context, lines in lines_by_context.items():
+        coverage_data.set_context(context)
+        if branch:
+            coverage_data.add_arcs({str(src_file): [(-1, line) for line in lines]})
+        else:
+            coverage_data.add_lines({str(src_file): lines})
+    coverage_data.touch_files([str(unrun_file)])
+    coverage_data.write()
+    junit_report = project_root.joinpath("session_junit.xml")
+    test_suite = TestSuite(name="pytest")
+    test_suite.add_testcases(
+        [
+            TestCase(name="test_one", classname="test.test_a"),
+            TestCase(name="test_two", classname="test.test_a.TestA"),
+            TestCase(name="test_three", classname="test.test_b"),
+            TestCase(name="test_four", classname="test.test_ab"),
+        ]
+    )
+    junit_xml = JUnitXml()
+    junit_xml.add_testsuite(test_suite)
+    junit_xml.write(str(junit_report))
+    return (data_file, junit_report, {"src": src_file, "unrun": unrun_file})
+
+
+@pytest.mark.parametrize("branch", [True, False])
+def test_save_and_assemble_fragments(
+    tmp_path: Path, fragment_store: ReportFragmentStore, branch: bool
+) -> None:
+    data_file, junit_report, files = _write_test_run(
+        project_root=tmp_path, branch=branch
+    )
+    test_a = tmp_path.joinpath("test", "test_a.py")
+    test_b = tmp_path.joinpath("test", "test_b.py")
+    test_inputs = {
+        test_a: {str(files["src"]): "digest_a"},
+        test_b: {str(files["src"]): "digest_b"},
+    }
+    assert not fragment_store.has_fragments(
+        test_file=test_a, input_digests=test_inputs[test_a]
+    )
+    fragment_store.save_fragments(
+        data_file=data_file, junit_report=junit_report, test_inputs=test_inputs
+    )
+    # Saving again replaces the fragments
+    fragment_store.save_fragments(
+        data_file=data_file, junit_report=junit_report, test_inputs=test_inputs
+    )
+    assert fragment_store.has_fragments(
+        test_file=test_a, input_digests=test_inputs[test_a]
+    )
+    assert not fragment_store.has_fragments(
+        test_file=test_a, input_digests=test_inputs[test_b]
+    )
+    old_fragment = fragment_store.fragment_dir.joinpath(
+        f"old{COVERAGE_FRAGMENT_SUFFIX}"
+    )
+    old_fragment.touch()
+    config_file = tmp_path.joinpath("pyproject.toml")
+    config_file.write_text(f"[tool.coverage.run]\nbranch = {str(branch).lower()}\n")
+    complete_data_file = tmp_path.joinpath("complete_coverage")
+    complete_data_file.write_text("stale data")
+    complete_report = tmp_path.joinpath("complete_junit.xml")
+    fragment_store.assemble_reports(
+        test_inputs=test_inputs,
+        data_file=complete_data_file,
+        config_file=config_file,
+        junit_report=complete_report,
+    )
+    assert not old_fragment.exists()
+    assert len(list(fragment_store.fragment_dir.iterdir())) == 2 * len(test_inputs)
+    complete_data = CoverageData(basename=str(complete_data_file))
+    complete_data.read()
+    assert complete_data.measured_files() == {str(files["src"]), str(files["unrun"])}
+    assert complete_data.measured_contexts() == {
+        IMPORT_CONTEXT,
+        "test/test_a.py::",
+        "test/test_b.py::",
+    }
+    assert complete_data.contexts_by_lineno(str(files["src"])) == {
+        1: [IMPORT_CONTEXT],
+        2: ["test/test_a.py::"],
+        3: ["test/test_a.py::"],
+        4: ["test/test_a.py::"],
+        5: ["test/test_b.py::"],
+    }
+    complete_xml = JUnitXml.fromfile(str(complete_report))
+    assert {
+        test_suite.name: sorted(test_case.name for test_case in test_suite)
+        for test_suite in complete_xml
+    } == {"test/test_a.py": ["test_one", "test_two"], "test/test_b.py": ["test_three"]}
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from resource import struct_rusage
+
+from build_support.resource_accounting import (
+    RUSAGE_MAX_RSS_UNIT_BYTES,
+    ResourceUsage,
+    ResourceUsageTracker,
+    record_resource_usage,
+    track_resource_usage,
+)
+
+
+def build_rusage(
+    user_seconds: float,
+    system_seconds: float,
+    max_rss_kb: int,
+    blocks_in: int,
+    blocks_out: int,
+) -> struct_rusage:
+    """Builds a rusage with the fields resource accounting reads."""
+    return struct_rusage(
+        (
+            user_seconds,
+            system_seconds,
+            max_rss_kb,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            blocks_in,
+            blocks_out,
+            0,
+            0,
+            0,
+            0,
+            0,
+        )
+    )
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert RUSAGE_MAX_RSS_UNIT_BYTES == 1024  # noqa: PLR2004
+
+
+def test_from_rusage() -> None:
+    assert ResourceUsage.from_rusage(
+        rusage=build_rusage(
+            user_seconds=1.5,
+            system_seconds=0.25,
+            max_rss_kb=100,
+            blocks_in=3,
+            blocks_out=4,
+        ),
+        processes_spawned=1,
+    ) == ResourceUsage(
+        user_cpu_time=timedelta(seconds=1.5),
+        system_cpu_time=timedelta(seconds=0.25),
+        max_rss_bytes=102400,
+        block_input_operations=3,
+        block_output_operations=4,
+        processes_spawned=1,
+    )
+
+
+def test_from_rusage_delta() -> None:
+    assert ResourceUsage.from_rusage_delta(
+        before=build_rusage(
+            user_seconds=1.0,
+            system_seconds=1.0,
+            max_rss_kb=100,
+            blocks_in=3,
+            blocks_out=4,
+        ),
+        after=build_rusage(
+            user_seconds=3.5,
+            system_seconds=1.5,
+            max_rss_kb=200,
+            blocks_in=10,
+            blocks_out=4,
+        ),
+        processes_spawned=5,
+    ) == ResourceUsage(
+        user_cpu_time=timedelta(seconds=2.5),
+        system_cpu_time=timedelta(seconds=0.5),
+        max_rss_bytes=204800,
+        block_input_operations=7,
+        block_output_operations=0,
+        processes_spawned=5,
+    )
+
+
+def test_combine_and_get_cpu_time() -> None:
+    usage = ResourceUsage(
+        user_cpu_time=timedelta(seconds=1),
+        system_cpu_time=timedelta(seconds=2),
+        max_rss_bytes=300,
+        block_input_operations=1,
+        block_output_operations=2,
+        processes_spawned=1,
+    )
+    other_usage = ResourceUsage(
+        user_cpu_time=timedelta(seconds=3),
+        system_cpu_time=timedelta(seconds=4),
+        max_rss_bytes=100,
+        block_input_operations=5,
+        block_output_operations=6,
+        processes_spawned=2,
+    )
+    combined_usage = usage.combine(other=other_usage)
+    assert combined_usage == ResourceUsage(
+        user_cpu_time=timedelta(seconds=4),
+        system_cpu_time=timedelta(seconds=6),
+        max_rss_bytes=300,
+        block_input_operations=6,
+        block_output_operations=8,
+        processes_spawned=3,
+    )
+    assert combined_usage.get_cpu_time() == timedelta(seconds=10)
+
+
+def test_tracker_adds_up_usage() -> None:
+    tracker = ResourceUsageTracker()
+    usage = ResourceUsage(user_cpu_time=timedelta(seconds=1), processes_spawned=1)
+    tracker.add(usage=usage)
+    tracker.add(usage=usage)
+    assert tracker.usage == ResourceUsage(
+        user_cpu_time=timedelta(seconds=2), processes_spawned=2
+    )
+
+
+def test_record_resource_usage_is_per_thread() -> None:
+    usage = ResourceUsage(processes_spawned=1)
+    with track_resource_usage() as tracker:
+        record_resource_usage(usage=usage)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(record_resource_usage, usage).result()
+    assert tracker.usage == usage
+
+
+def test_record_resource_usage_outside_of_tracking() -> None:
+    record_resource_usage(usage=ResourceUsage(processes_spawned=1))
+    with track_resource_usage() as tracker:
+        pass
+    assert tracker.usage == ResourceUsage()
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from build_support.ci_cd_tasks.task_node import TaskResources
+from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
+from build_support.resource_budget import (
+    FULL_MEMORY_WEIGHT,
+    ResourcePool,
+    get_task_cpu_budget,
+    task_cpu_budget,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert FULL_MEMORY_WEIGHT == 1.0
+
+
+def test_acquire_gives_each_task_the_cpus_it_can_use() -> None:
+    resource_pool = ResourcePool(cpus=8)
+    assert resource_pool.acquire(resources=TaskResources(cpus=6)) == 6  # noqa: PLR2004
+    assert resource_pool.acquire(resources=TaskResources(cpus=6)) == 2  # noqa: PLR2004
+    assert resource_pool.acquire(resources=TaskResources()) is None
+    assert resource_pool.cpus_free == 0
+    assert resource_pool.tasks_running == 2  # noqa: PLR2004
+
+
+def test_release_returns_resources_to_the_pool() -> None:
+    resource_pool = ResourcePool(cpus=4)
+    resources = TaskResources(cpus=4, memory_weight=0.5)
+    cpu_budget = resource_pool.acquire(resources=resources)
+    assert cpu_budget == 4  # noqa: PLR2004
+    resource_pool.release(resources=resources, cpu_budget=cpu_budget)
+    assert resource_pool.cpus_free == 4  # noqa: PLR2004
+    assert resource_pool.memory_weight_free == FULL_MEMORY_WEIGHT
+    assert resource_pool.tasks_running == 0
+
+
+def test_acquire_waits_for_memory() -> None:
+    resource_pool = ResourcePool(cpus=8)
+    assert resource_pool.acquire(resources=TaskResources(memory_weight=0.75)) == 1
+    assert resource_pool.acquire(resources=TaskResources(memory_weight=0.5)) is None
+    assert resource_pool.acquire(resources=TaskResources(memory_weight=0.25)) == 1
+
+
+def test_acquire_starts_task_that_does_not_fit_when_nothing_is_running() -> None:
+    resource_pool = ResourcePool(cpus=2)
+    assert (
+        resource_pool.acquire(resources=TaskResources(cpus=4, memory_weight=2.0)) == 2  # noqa: PLR2004
+    )
+
+
+def test_get_task_cpu_budget_outside_of_a_task() -> None:
+    assert get_task_cpu_budget() == THREADS_AVAILABLE
+
+
+def test_task_cpu_budget_is_per_thread() -> None:
+    with task_cpu_budget(cpus=3):
+        assert get_task_cpu_budget() == 3  # noqa: PLR2004
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(get_task_cpu_budget).result() == THREADS_AVAILABLE
+            assert (
+                executor.submit(copy_context().run, get_task_cpu_budget).result() == 3  # noqa: PLR2004
+            )
+    assert get_task_cpu_budget() == THREADS_AVAILABLE
@@ -0,0 +1,186 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import cast
+from unittest.mock import patch
+
+import pytest
+from build_support.ci_cd_vars.build_paths import get_shared_test_results_dir
+from build_support.shared_test_results import (
+    SHARED_RESULT_MAX_AGE,
+    SHARED_TEST_RESULTS_PATH_ENV_VAR,
+    DirectorySharedResultStore,
+    PassedTest,
+    get_shareable_test_inputs,
+    get_shared_result_key,
+    get_shared_result_store,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert SHARED_TEST_RESULTS_PATH_ENV_VAR == "SHARED_TEST_RESULTS_PATH"
+    assert timedelta(days=30) == SHARED_RESULT_MAX_AGE
+
+
+def test_get_shared_result_key() -> None:
+    key = get_shared_result_key(
+        test_file="test/test_a.py", input_digests={"src/a.py": "abc", "src/b.py": "d"}
+    )
+    assert key == get_shared_result_key(
+        test_file="test/test_a.py", input_digests={"src/b.py": "d", "src/a.py": "abc"}
+    )
+    assert key != get_shared_result_key(
+        test_file="test/test_b.py", input_digests={"src/a.py": "abc", "src/b.py": "d"}
+    )
+    assert key != get_shared_result_key(
+        test_file="test/test_a.py", input_digests={"src/a.py": "abc", "src/b.py": "e"}
+    )
+
+
+def test_get_shareable_test_inputs() -> None:
+    assert get_shareable_test_inputs(
+        test_file=Path("/root/test/test_a.py"),
+        input_digests={"/root/src/a.py": "abc", "/root/test/test_a.py": "def"},
+        project_root=Path("/root"),
+    ) == ("test/test_a.py", {"src/a.py": "abc", "test/test_a.py": "def"})
+
+
+@pytest.fixture
+def passed_test() -> PassedTest:
+    return PassedTest(
+        test_file="test/test_a.py",
+        input_digests={"src/a.py": "abc", "test/test_a.py": "def"},
+        tests_passed=datetime(2024, 3, 30, 17, 16, 23, tzinfo=UTC),
+    )
+
+
+def test_passed_test_from_test_run(passed_test: PassedTest) -> None:
+    assert (
+        PassedTest.from_test_run(
+            test_file=Path("/root/test/test_a.py"),
+            input_digests={"/root/src/a.py": "abc", "/root/test/test_a.py": "def"},
+            tests_passed=passed_test.tests_passed,
+            project_root=Path("/root"),
+        )
+        == passed_test
+    )
+
+
+def test_passed_test_get_key_ignores_time(passed_test: PassedTest) -> None:
+    assert passed_test.get_key() == get_shared_result_key(
+        test_file=passed_test.test_file, input_digests=passed_test.input_digests
+    )
+    assert (
+        passed_test.model_copy(update={"tests_passed": datetime.now(tz=UTC)}).get_key()
+        == passed_test.get_key()
+    )
+
+
+def test_passed_test_serialize_deserialize(passed_test: PassedTest) -> None:
+    assert PassedTest.from_yaml(passed_test.to_yaml()) == passed_test
+
+
+def test_directory_store_creates_dir(tmp_path: Path) -> None:
+    store_dir = tmp_path.joinpath("shared", "results")
+    DirectorySharedResultStore(store_dir=store_dir)
+    assert store_dir.is_dir()
+
+
+def test_directory_store_add_and_has_passed(
+    tmp_path: Path, passed_test: PassedTest
+) -> None:
+    store_dir = tmp_path.joinpath("shared_test_results")
+    store = DirectorySharedResultStore(store_dir=store_dir)
+    assert not store.has_passed(result_key=passed_test.get_key())
+    store.add(passed_test=passed_test)
+    store.add(passed_test=passed_test)
+    assert store.has_passed(result_key=passed_test.get_key())
+    assert DirectorySharedResultStore(store_dir=store_dir).has_passed(
+        result_key=passed_test.get_key()
+    )
+    assert [path.name for path in store_dir.iterdir()] == [
+        f"{passed_test.get_key()}.yaml"
+    ]
+    assert (
+        PassedTest.from_yaml(
+            store_dir.joinpath(f"{passed_test.get_key()}.yaml").read_text()
+        )
+        == passed_test
+    )
+
+
+def test_directory_store_add_concurrently(
+    tmp_path: Path, passed_test: PassedTest
+) -> None:
+    writers = 4
+    store_dir = tmp_path.joinpath("shared_test_results")
+    stores = [DirectorySharedResultStore(store_dir=store_dir) for _ in range(writers)]
+    with ThreadPoolExecutor(max_workers=writers) as executor:
+        list(executor.map(lambda store: store.add(passed_test=passed_test), stores))
+    assert [path.name for path in store_dir.iterdir()] == [
+        f"{passed_test.get_key()}.yaml"
+    ]
+
+
+def _set_age(path: Path, age: timedelta) -> None:
+    timestamp = time.time() - age.total_seconds()
+    os.utime(path, (timestamp, timestamp))
+
+
+def test_directory_store_prune(tmp_path: Path, passed_test: PassedTest) -> None:
+    store_dir = tmp_path.joinpath("shared_test_results")
+    store = DirectorySharedResultStore(store_dir=store_dir)
+    store.add(passed_test=passed_test)
+    result_path = store_dir.joinpath(f"{passed_test.get_key()}.yaml")
+    interrupted_write_path = store_dir.joinpath(f".{result_path.name}.abc.tmp")
+    interrupted_write_path.write_text("")
+    for path in (result_path, interrupted_write_path):
+        _set_age(path=path, age=timedelta(days=31))
+    # Using a result keeps it in the store
+    assert store.has_passed(result_key=passed_test.get_key())
+    store.prune(max_age=timedelta(days=30))
+    assert [path.name for path in store_dir.iterdir()] == [result_path.name]
+    _set_age(path=result_path, age=timedelta(days=31))
+    store.prune(max_age=timedelta(days=30))
+    assert list(store_dir.iterdir()) == []
+
+
+def test_directory_store_prune_removed_by_another_machine(
+    tmp_path: Path, passed_test: PassedTest
+) -> None:
+    store = DirectorySharedResultStore(store_dir=tmp_path)
+    store.add(passed_test=passed_test)
+    _set_age(
+        path=tmp_path.joinpath(f"{passed_test.get_key()}.yaml"), age=timedelta(days=31)
+    )
+    with patch.object(Path, "unlink", side_effect=FileNotFoundError) as mock_unlink:
+        store.prune(max_age=timedelta(days=30))
+    mock_unlink.assert_called_once_with()
+
+
+def test_get_shared_result_store_in_build_dir(
+    mock_project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv(SHARED_TEST_RESULTS_PATH_ENV_VAR, raising=False)
+    store = cast(
+        DirectorySharedResultStore,
+        get_shared_result_store(project_root=mock_project_root),
+    )
+    assert store.store_dir == get_shared_test_results_dir(
+        project_root=mock_project_root
+    )
+
+
+def test_get_shared_result_store_from_env(
+    mock_project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store_dir = tmp_path.joinpath("mounted_results")
+    monkeypatch.setenv(SHARED_TEST_RESULTS_PATH_ENV_VAR, str(store_dir))
+    store = cast(
+        DirectorySharedResultStore,
+        get_shared_result_store(project_root=mock_project_root),
+    )
+    assert store.store_dir == store_dir
+    assert store_dir.is_dir()
@@ -0,0 +1,341 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import override
+from unittest.mock import patch
+
+import build_support.task_caching
+import pytest
+import yaml
+from build_support.ci_cd_tasks.task_node import BasicTaskInfo, TaskCacheSpec, TaskNode
+from build_support.task_caching import (
+    HASH_CHUNK_SIZE,
+    MISSING_PATH_DIGEST,
+    UNSET_ENV_VAR_VALUE,
+    TaskCacheEntry,
+    _get_build_code_digests,
+    get_file_digest,
+    get_task_fingerprint,
+    restore_task_outputs,
+    store_task_outputs,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert HASH_CHUNK_SIZE == 1024 * 1024
+    assert MISSING_PATH_DIGEST == "MISSING"
+    assert UNSET_ENV_VAR_VALUE == "UNSET"
+
+
+class CachedTask(TaskNode):
+    """A task with a cache spec that writes its inputs to its outputs."""
+
+    @override
+    def required_tasks(self) -> list[TaskNode]:
+        return []
+
+    @override
+    def cache_spec(self) -> TaskCacheSpec:
+        return TaskCacheSpec(
+            input_paths=[
+                self.docker_project_root.joinpath("input_dir"),
+                self.docker_project_root.joinpath("input_file.txt"),
+            ],
+            output_paths=[
+                self.docker_project_root.joinpath("build", "output_dir"),
+                self.docker_project_root.joinpath("build", "output_file.txt"),
+            ],
+            env_var_names=["CACHED_TASK_ENV_VAR"],
+            task_info_fields=["ci_cd_feature_test_mode"],
+        )
+
+    @override
+    def run(self) -> None:
+        output_dir = self.docker_project_root.joinpath("build", "output_dir")
+        output_dir.joinpath("nested").mkdir(parents=True, exist_ok=True)
+        output_dir.joinpath("nested", "output.txt").write_text("nested output")
+        self.docker_project_root.joinpath("build", "output_file.txt").write_text(
+            "file output"
+        )
+
+
+class UncachedTask(TaskNode):
+    """A task without a cache spec."""
+
+    @override
+    def required_tasks(self) -> list[TaskNode]:
+        return []
+
+    @override
+    def run(self) -> None:
+        """Does nothing."""
+
+
+def _get_basic_task_info(
+    project_root: Path, ci_cd_feature_test_mode: bool = False
+) -> BasicTaskInfo:
+    return BasicTaskInfo(
+        non_docker_project_root=project_root,
+        docker_project_root=project_root,
+        local_uid=10,
+        local_gid=2,
+        local_user_env={},
+        ci_cd_feature_test_mode=ci_cd_feature_test_mode,
+    )
+
+
+@pytest.fixture
+def cached_task(mock_project_root: Path) -> CachedTask:
+    mock_project_root.joinpath("input_dir", "sub").mkdir(parents=True)
+    mock_project_root.joinpath("input_dir", "sub", "a.txt").write_text("a")
+    mock_project_root.joinpath("input_file.txt").write_text("input")
+    return CachedTask(basic_task_info=_get_basic_task_info(mock_project_root))
+
+
+@pytest.fixture
+def uncached_task(mock_project_root: Path) -> UncachedTask:
+    return UncachedTask(basic_task_info=_get_basic_task_info(mock_project_root))
+
+
+def test_load_and_dump_task_cache_entry() -> None:
+    entry_data = {"fingerprint": "abc", "outputs": {"build/out.txt": "def"}}
+    entry = TaskCacheEntry.from_yaml(yaml_str=yaml.dump(entry_data))
+    assert entry == TaskCacheEntry(fingerprint="abc", outputs={"build/out.txt": "def"})
+    assert entry.to_yaml() == yaml.dump(entry_data)
+
+
+def test_get_file_digest(tmp_path: Path) -> None:
+    file_path = tmp_path.joinpath("file.txt")
+    file_path.write_text("some content")
+    assert (
+        get_file_digest(file_path=file_path)
+        == hashlib.sha256(b"some content").hexdigest()
+    )
+
+
+def test_uncached_task_has_no_fingerprint(
+    uncached_task: UncachedTask, mock_project_root: Path
+) -> None:
+    assert get_task_fingerprint(task=uncached_task, project_root=mock_project_root) is (
+        None
+    )
+
+
+def test_fingerprint_is_stable(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    assert get_task_fingerprint(
+        task=cached_task, project_root=mock_project_root
+    ) == get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+
+
+def test_get_build_code_digests() -> None:
+    package_dir = Path(build_support.task_caching.__file__).parent
+    code_digests = dict(_get_build_code_digests())
+    assert code_digests["task_caching.py"] == get_file_digest(
+        file_path=package_dir.joinpath("task_caching.py")
+    )
+    assert code_digests["ci_cd_tasks/build_tasks.py"] == get_file_digest(
+        file_path=package_dir.joinpath("ci_cd_tasks", "build_tasks.py")
+    )
+    assert not any("__pycache__" in code_file for code_file in code_digests)
+
+
+def test_fingerprint_changes_with_build_code(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    fingerprint = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    with patch(
+        "build_support.task_caching._get_build_code_digests",
+        return_value=(*_get_build_code_digests(), ("new_module.py", "abc")),
+    ):
+        assert fingerprint != get_task_fingerprint(
+            task=cached_task, project_root=mock_project_root
+        )
+
+
+def test_fingerprint_changes_with_input_file_content(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    original = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    mock_project_root.joinpath("input_file.txt").write_text("changed")
+    assert (
+        get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+        != original
+    )
+
+
+def test_fingerprint_changes_with_new_file_in_input_dir(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    original = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    mock_project_root.joinpath("input_dir", "b.txt").write_text("b")
+    assert (
+        get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+        != original
+    )
+
+
+def test_fingerprint_ignores_tool_caches_in_input_dir(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    original = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    pycache_dir = mock_project_root.joinpath("input_dir", "__pycache__")
+    pycache_dir.mkdir()
+    pycache_dir.joinpath("a.cpython-313.pyc").write_bytes(b"bytecode")
+    ruff_cache_dir = mock_project_root.joinpath("input_dir", ".ruff_cache")
+    ruff_cache_dir.mkdir()
+    ruff_cache_dir.joinpath("CACHEDIR.TAG").write_text("tag")
+    assert (
+        get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+        == original
+    )
+
+
+def test_fingerprint_changes_when_input_removed(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    mock_project_root.joinpath("input_file.txt").write_text("")
+    original = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    mock_project_root.joinpath("input_file.txt").unlink()
+    assert (
+        get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+        != original
+    )
+
+
+def test_fingerprint_changes_with_env_var(
+    cached_task: CachedTask, mock_project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("CACHED_TASK_ENV_VAR", raising=False)
+    original = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    monkeypatch.setenv("CACHED_TASK_ENV_VAR", "value")
+    assert (
+        get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+        != original
+    )
+
+
+def test_fingerprint_changes_with_task_info_field(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    feature_test_mode_task = CachedTask(
+        basic_task_info=_get_basic_task_info(
+            project_root=mock_project_root, ci_cd_feature_test_mode=True
+        )
+    )
+    assert get_task_fingerprint(
+        task=cached_task, project_root=mock_project_root
+    ) != get_task_fingerprint(
+        task=feature_test_mode_task, project_root=mock_project_root
+    )
+
+
+def test_store_and_restore_task_outputs(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    fingerprint = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    assert fingerprint is not None
+    assert not restore_task_outputs(
+        task=cached_task, fingerprint=fingerprint, project_root=mock_project_root
+    )
+    cached_task.run()
+    output_dir = mock_project_root.joinpath("build", "output_dir")
+    output_file = mock_project_root.joinpath("build", "output_file.txt")
+    produced_time = 1_700_000_000
+    os.utime(output_file, (produced_time, produced_time))
+    store_task_outputs(
+        task=cached_task, fingerprint=fingerprint, project_root=mock_project_root
+    )
+    output_dir.joinpath("nested", "output.txt").write_text("modified")
+    output_dir.joinpath("stale.txt").write_text("stale")
+    output_file.write_text("modified")
+    assert restore_task_outputs(
+        task=cached_task, fingerprint=fingerprint, project_root=mock_project_root
+    )
+    assert output_dir.joinpath("nested", "output.txt").read_text() == "nested output"
+    assert not output_dir.joinpath("stale.txt").exists()
+    assert output_file.read_text() == "file output"
+    assert output_file.stat().st_mtime == produced_time
+
+
+def test_restore_task_outputs_when_outputs_missing(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    fingerprint = get_task_fingerprint(task=cached_task, project_root=mock_project_root)
+    assert fingerprint is not None
+    cached_task.run()
+    store_task_outputs(
+        task=cached_task, fingerprint=fingerprint, project_root=mock_project_root
+    )
+    output_dir = mock_project_root.joinpath("build", "output_dir")
+    output_file = mock_project_root.joinpath("build", "output_file.txt")
+    output_dir.joinpath("nested", "output.txt").unlink()
+    output_dir.joinpath("nested").rmdir()
+    output_dir.rmdir()
+    output_file.unlink()
+    assert restore_task_outputs(
+        task=cached_task, fingerprint=fingerprint, project_root=mock_project_root
+    )
+    assert output_dir.joinpath("nested", "output.txt").read_text() == "nested output"
+    assert output_file.read_text() == "file output"
+
+
+def test_restore_task_outputs_with_different_fingerprint(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    cached_task.run()
+    store_task_outputs(
+        task=cached_task, fingerprint="old", project_root=mock_project_root
+    )
+    assert not restore_task_outputs(
+        task=cached_task, fingerprint="new", project_root=mock_project_root
+    )
+
+
+def test_restore_task_outputs_with_missing_object(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    cached_task.run()
+    store_task_outputs(
+        task=cached_task, fingerprint="same", project_root=mock_project_root
+    )
+    objects_dir = mock_project_root.joinpath("build", "task_cache", "objects")
+    objects_dir.joinpath(
+        get_file_digest(
+            file_path=mock_project_root.joinpath("build", "output_file.txt")
+        )
+    ).unlink()
+    assert not restore_task_outputs(
+        task=cached_task, fingerprint="same", project_root=mock_project_root
+    )
+
+
+def test_store_task_outputs_reuses_existing_objects(
+    cached_task: CachedTask, mock_project_root: Path
+) -> None:
+    cached_task.run()
+    store_task_outputs(
+        task=cached_task, fingerprint="first", project_root=mock_project_root
+    )
+    objects_dir = mock_project_root.joinpath("build", "task_cache", "objects")
+    objects_before = sorted(objects_dir.iterdir())
+    store_task_outputs(
+        task=cached_task, fingerprint="second", project_root=mock_project_root
+    )
+    assert sorted(objects_dir.iterdir()) == objects_before
+    assert restore_task_outputs(
+        task=cached_task, fingerprint="second", project_root=mock_project_root
+    )
+
+
+def test_uncached_task_is_never_stored_or_restored(
+    uncached_task: UncachedTask, mock_project_root: Path
+) -> None:
+    store_task_outputs(
+        task=uncached_task, fingerprint="any", project_root=mock_project_root
+    )
+    assert not mock_project_root.joinpath("build", "task_cache", "entries").exists()
+    assert not restore_task_outputs(
+        task=uncached_task, fingerprint="any", project_root=mock_project_root
+    )
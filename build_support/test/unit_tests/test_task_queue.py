@@ -0,0 +1,402 @@
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from build_support.ci_cd_tasks.env_setup_tasks import Clean
+from build_support.ci_cd_tasks.task_node import BasicTaskInfo, PerSubprojectTask
+from build_support.ci_cd_tasks.validation_tasks import SubprojectUnitTests
+from build_support.ci_cd_vars.subproject_structure import SubprojectContext
+from build_support.resource_accounting import ResourceUsage
+from build_support.task_queue import (
+    QUEUE_CLAIM_LEASE,
+    QUEUE_POLL_INTERVAL,
+    QUEUE_TASK_DEADLINE,
+    DirectoryTaskQueue,
+    RemoteTaskError,
+    TaskResult,
+    TaskSpec,
+)
+
+
+def test_constants_not_changed_by_accident() -> None:
+    assert timedelta(seconds=0.1) == QUEUE_POLL_INTERVAL
+    assert timedelta(seconds=30) == QUEUE_CLAIM_LEASE
+    assert timedelta(hours=2) == QUEUE_TASK_DEADLINE
+
+
+def test_task_spec_round_trip_basic_task(basic_task_info: BasicTaskInfo) -> None:
+    task = Clean(basic_task_info=basic_task_info)
+    task_spec = TaskSpec.from_yaml(TaskSpec.from_task(task=task).to_yaml())
+    assert task_spec == TaskSpec(
+        task_label="Clean",
+        task_module="build_support.ci_cd_tasks.env_setup_tasks",
+        task_class="Clean",
+        basic_task_info=basic_task_info,
+    )
+    rebuilt_task = task_spec.build_task()
+    assert isinstance(rebuilt_task, Clean)
+    assert rebuilt_task.get_basic_task_info() == basic_task_info
+
+
+def test_task_spec_round_trip_per_subproject_task(
+    basic_task_info: BasicTaskInfo,
+) -> None:
+    task = SubprojectUnitTests(
+        basic_task_info=basic_task_info, subproject_context=SubprojectContext.PYPI
+    )
+    task_spec = TaskSpec.from_yaml(TaskSpec.from_task(task=task).to_yaml())
+    assert task_spec.subproject_context == SubprojectContext.PYPI
+    rebuilt_task = task_spec.build_task()
+    assert isinstance(rebuilt_task, SubprojectUnitTests)
+    assert rebuilt_task.task_label() == task.task_label()
+    assert rebuilt_task.get_basic_task_info() == basic_task_info
+
+
+def test_task_spec_build_task_not_a_task(basic_task_info: BasicTaskInfo) -> None:
+    task_spec = TaskSpec(
+        task_label="Path",
+        task_module="pathlib",
+        task_class="Path",
+        basic_task_info=basic_task_info,
+    )
+    with pytest.raises(TypeError, match=r"pathlib\.Path is not a TaskNode\."):
+        task_spec.build_task()
+
+
+@pytest.mark.parametrize(
+    ("task_class", "subproject_context"),
+    [(Clean, SubprojectContext.PYPI), (SubprojectUnitTests, None)],
+)
+def test_task_spec_build_task_incoherent(
+    basic_task_info: BasicTaskInfo,
+    task_class: type[Clean | PerSubprojectTask],
+    subproject_context: SubprojectContext | None,
+) -> None:
+    task_spec = TaskSpec(
+        task_label=task_class.__name__,
+        task_module=task_class.__module__,
+        task_class=task_class.__name__,
+        basic_task_info=basic_task_info,
+        subproject_context=subproject_context,
+    )
+    with pytest.raises(ValueError, match=r"Incoherent task spec\."):
+        task_spec.build_task()
+
+
+@pytest.fixture
+def task_result() -> TaskResult:
+    return TaskResult(
+        task_label="Clean",
+        worker="host-123",
+        succeeded=False,
+        duration=timedelta(seconds=2),
+        resource_usage=ResourceUsage(processes_spawned=3),
+        error="Traceback: boom",
+    )
+
+
+def test_task_result_round_trip(task_result: TaskResult) -> None:
+    assert TaskResult.from_yaml(task_result.to_yaml()) == task_result
+
+
+def test_remote_task_error(task_result: TaskResult) -> None:
+    error = RemoteTaskError(task_result=task_result)
+    assert str(error) == "Clean failed on worker host-123:\nTraceback: boom"
+    assert error.task_result == task_result
+
+
+@pytest.fixture
+def task_queue(tmp_path: Path) -> DirectoryTaskQueue:
+    return DirectoryTaskQueue(queue_dir=tmp_path.joinpath("task_queue"))
+
+
+@pytest.fixture
+def clean_task_spec(basic_task_info: BasicTaskInfo) -> TaskSpec:
+    return TaskSpec.from_task(task=Clean(basic_task_info=basic_task_info))
+
+
+def test_directory_task_queue_creates_dirs(
+    tmp_path: Path, task_queue: DirectoryTaskQueue
+) -> None:
+    queue_dir = tmp_path.joinpath("task_queue")
+    assert task_queue.pending_dir == queue_dir.joinpath("pending")
+    assert task_queue.claimed_dir == queue_dir.joinpath("claimed")
+    assert task_queue.log_dir == queue_dir.joinpath("logs")
+    assert task_queue.result_dir == queue_dir.joinpath("results")
+    for queue_subdir in (
+        task_queue.pending_dir,
+        task_queue.claimed_dir,
+        task_queue.log_dir,
+        task_queue.result_dir,
+    ):
+        assert queue_subdir.is_dir()
+
+
+def test_claim_empty_queue(task_queue: DirectoryTaskQueue) -> None:
+    assert task_queue.claim(worker="host-123") is None
+
+
+def test_submit_and_claim(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    os.utime(task_queue.pending_dir.joinpath("Clean.yaml"), ns=(0, 0))
+    assert task_queue.claim(worker="host-123") == clean_task_spec
+    claimed_path = task_queue.claimed_dir.joinpath("Clean", "host-123.yaml")
+    # The lease starts when the task is claimed, not when it was submitted
+    assert claimed_path.stat().st_mtime_ns > 0
+    assert task_queue.claim(worker="host-456") is None
+
+
+def test_claim_oldest_task_first(
+    task_queue: DirectoryTaskQueue,
+    basic_task_info: BasicTaskInfo,
+    clean_task_spec: TaskSpec,
+) -> None:
+    unit_tests_spec = TaskSpec.from_task(
+        task=SubprojectUnitTests(
+            basic_task_info=basic_task_info, subproject_context=SubprojectContext.PYPI
+        )
+    )
+    task_queue.submit(task_spec=unit_tests_spec)
+    task_queue.submit(task_spec=clean_task_spec)
+    os.utime(task_queue.pending_dir.joinpath("Clean.yaml"), ns=(0, 0))
+    assert task_queue.claim(worker="host-123") == clean_task_spec
+    assert task_queue.claim(worker="host-123") == unit_tests_spec
+
+
+def test_claim_skips_task_claimed_by_another_worker(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    with patch.object(Path, "rename", side_effect=FileNotFoundError):
+        assert task_queue.claim(worker="host-123") is None
+
+
+def test_claim_skips_task_claimed_while_sorting(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    with patch.object(Path, "stat", side_effect=FileNotFoundError):
+        assert task_queue.claim(worker="host-123") is None
+    assert task_queue.claim(worker="host-123") == clean_task_spec
+
+
+def test_renew_claim(task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    claimed_path = task_queue.claimed_dir.joinpath("Clean", "host-123.yaml")
+    os.utime(claimed_path, ns=(0, 0))
+    task_queue.renew_claim(task_label="Clean", worker="host-123")
+    assert claimed_path.stat().st_mtime_ns > 0
+
+
+def test_renew_lost_claim(task_queue: DirectoryTaskQueue) -> None:
+    task_queue.renew_claim(task_label="Clean", worker="host-123")
+    assert not task_queue.claimed_dir.joinpath("Clean", "host-123.yaml").exists()
+
+
+def test_requeue_expired_claim(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> None:
+    assert not task_queue.requeue_expired_claim(
+        task_label="Clean", claim_lease=QUEUE_CLAIM_LEASE
+    )
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    assert not task_queue.requeue_expired_claim(
+        task_label="Clean", claim_lease=QUEUE_CLAIM_LEASE
+    )
+    claimed_path = task_queue.claimed_dir.joinpath("Clean", "host-123.yaml")
+    os.utime(claimed_path, ns=(0, 0))
+    assert task_queue.requeue_expired_claim(
+        task_label="Clean", claim_lease=QUEUE_CLAIM_LEASE
+    )
+    assert not claimed_path.exists()
+    assert task_queue.claim(worker="host-456") == clean_task_spec
+
+
+def test_requeue_expired_claim_finished_meanwhile(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    with patch.object(Path, "stat", side_effect=FileNotFoundError):
+        assert not task_queue.requeue_expired_claim(
+            task_label="Clean", claim_lease=QUEUE_CLAIM_LEASE
+        )
+
+
+@pytest.mark.parametrize("claimed", [True, False])
+def test_withdraw(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec, claimed: bool
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    if claimed:
+        task_queue.claim(worker="host-123")
+    task_queue.withdraw(task_label="Clean")
+    assert list(task_queue.pending_dir.iterdir()) == []
+    assert list(task_queue.claimed_dir.glob("*/*")) == []
+
+
+def test_clear(
+    task_queue: DirectoryTaskQueue,
+    basic_task_info: BasicTaskInfo,
+    clean_task_spec: TaskSpec,
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    task_queue.submit(
+        task_spec=TaskSpec.from_task(
+            task=SubprojectUnitTests(
+                basic_task_info=basic_task_info,
+                subproject_context=SubprojectContext.PYPI,
+            )
+        )
+    )
+    task_queue.clear()
+    assert task_queue.claim(worker="host-123") is None
+    assert list(task_queue.claimed_dir.glob("*/*")) == []
+
+
+def test_read_log_before_any_message(task_queue: DirectoryTaskQueue) -> None:
+    assert task_queue.read_log(task_label="Clean", messages_read=0) == []
+
+
+def test_append_and_read_log(task_queue: DirectoryTaskQueue) -> None:
+    task_queue.append_log(task_label="Clean", level=logging.INFO, message="first")
+    task_queue.append_log(
+        task_label="Clean", level=logging.ERROR, message="multi\nline"
+    )
+    assert task_queue.read_log(task_label="Clean", messages_read=0) == [
+        (logging.INFO, "first"),
+        (logging.ERROR, "multi\nline"),
+    ]
+    assert task_queue.read_log(task_label="Clean", messages_read=1) == [
+        (logging.ERROR, "multi\nline")
+    ]
+
+
+def test_read_log_leaves_partial_message(task_queue: DirectoryTaskQueue) -> None:
+    task_queue.append_log(task_label="Clean", level=logging.INFO, message="done")
+    with task_queue.log_dir.joinpath("Clean.log").open("a") as log_file:
+        log_file.write('[20, "still being writ')
+    assert task_queue.read_log(task_label="Clean", messages_read=0) == [
+        (logging.INFO, "done")
+    ]
+
+
+def test_finish_and_get_result(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec, task_result: TaskResult
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    assert task_queue.get_result(task_label="Clean") is None
+    task_queue.finish(task_result=task_result)
+    assert task_queue.get_result(task_label="Clean") == task_result
+    assert not task_queue.claimed_dir.joinpath("Clean", "host-123.yaml").exists()
+
+
+def test_finish_without_claim(
+    task_queue: DirectoryTaskQueue,
+    clean_task_spec: TaskSpec,
+    task_result: TaskResult,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    task_queue.withdraw(task_label="Clean")
+    task_queue.finish(task_result=task_result)
+    assert task_queue.get_result(task_label="Clean") is None
+    assert caplog.messages == [
+        "Dropped the outcome of Clean, host-123 no longer holds its claim."
+    ]
+
+
+def test_submit_discards_previous_run(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec, task_result: TaskResult
+) -> None:
+    task_queue.append_log(task_label="Clean", level=logging.INFO, message="old")
+    task_queue.submit(task_spec=clean_task_spec)
+    task_queue.claim(worker="host-123")
+    task_queue.finish(task_result=task_result)
+    task_queue.submit(task_spec=clean_task_spec)
+    assert task_queue.read_log(task_label="Clean", messages_read=0) == []
+    assert task_queue.get_result(task_label="Clean") is None
+
+
+def test_run_task_logs_output_and_returns_result(
+    task_queue: DirectoryTaskQueue,
+    basic_task_info: BasicTaskInfo,
+    task_result: TaskResult,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    def finish_on_second_check(task_label: str) -> TaskResult | None:
+        if task_queue.claim(worker="host-123") is not None:
+            task_queue.append_log(
+                task_label=task_label, level=logging.WARNING, message="from worker"
+            )
+            return None
+        return task_result
+
+    caplog.set_level(logging.INFO)
+    with patch.object(task_queue, "get_result", side_effect=finish_on_second_check):
+        assert (
+            task_queue.run_task(
+                task=Clean(basic_task_info=basic_task_info), poll_interval=timedelta(0)
+            )
+            == task_result
+        )
+    assert [(record.levelno, record.message) for record in caplog.records] == [
+        (logging.WARNING, "from worker")
+    ]
+
+
+def test_run_task_requeues_task_of_unresponsive_worker(
+    task_queue: DirectoryTaskQueue,
+    basic_task_info: BasicTaskInfo,
+    task_result: TaskResult,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    claimed_path = task_queue.claimed_dir.joinpath("Clean", "host-123.yaml")
+    workers = iter(["host-123", "host-456"])
+
+    def stop_responding_then_finish(task_label: str) -> TaskResult | None:  # noqa: ARG001
+        worker = next(workers)
+        assert task_queue.claim(worker=worker) is not None
+        if worker == "host-123":
+            # The first worker stops renewing its claim right after claiming the task
+            os.utime(claimed_path, ns=(0, 0))
+            return None
+        return task_result
+
+    with patch.object(
+        task_queue, "get_result", side_effect=stop_responding_then_finish
+    ):
+        assert (
+            task_queue.run_task(
+                task=Clean(basic_task_info=basic_task_info), poll_interval=timedelta(0)
+            )
+            == task_result
+        )
+    assert not claimed_path.exists()
+    assert caplog.messages == ["Requeued Clean, its worker stopped responding."]
+
+
+def test_run_task_fails_after_deadline(
+    task_queue: DirectoryTaskQueue, basic_task_info: BasicTaskInfo
+) -> None:
+    task_result = task_queue.run_task(
+        task=Clean(basic_task_info=basic_task_info),
+        poll_interval=timedelta(0),
+        deadline=timedelta(0),
+    )
+    assert task_result.task_label == "Clean"
+    assert task_result.worker == "none"
+    assert not task_result.succeeded
+    assert task_result.error == "Not finished within 0:00:00."
+    # No worker picks up the task once it failed
+    assert task_queue.claim(worker="host-123") is None
@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+import time
+from argparse import Namespace
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from build_support.ci_cd_tasks.env_setup_tasks import Clean
+from build_support.ci_cd_tasks.task_node import BasicTaskInfo
+from build_support.ci_cd_vars.build_paths import get_task_queue_dir
+from build_support.ci_cd_vars.machine_introspection_vars import THREADS_AVAILABLE
+from build_support.resource_accounting import ResourceUsage
+from build_support.task_queue import DirectoryTaskQueue, TaskResult, TaskSpec
+from build_support.task_worker import (
+    TaskLogHandler,
+    get_worker_name,
+    parse_args,
+    renewing_claim,
+    run_claimed_task,
+    run_main,
+    serve_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def task_queue(tmp_path: Path) -> DirectoryTaskQueue:
+    return DirectoryTaskQueue(queue_dir=tmp_path.joinpath("task_queue"))
+
+
+@pytest.fixture
+def clean_task_spec(basic_task_info: BasicTaskInfo) -> TaskSpec:
+    return TaskSpec.from_task(task=Clean(basic_task_info=basic_task_info))
+
+
+@pytest.fixture
+def claimed_task_spec(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> TaskSpec:
+    task_queue.submit(task_spec=clean_task_spec)
+    task_spec = task_queue.claim(worker="worker-1")
+    assert task_spec is not None
+    return task_spec
+
+
+def test_task_log_handler(task_queue: DirectoryTaskQueue) -> None:
+    log_handler = TaskLogHandler(task_queue=task_queue, task_label="Clean")
+    log_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    log_handler.handle(
+        logging.LogRecord(
+            name="test",
+            level=logging.ERROR,
+            pathname=__file__,
+            lineno=1,
+            msg="failed %s",
+            args=("badly",),
+            exc_info=None,
+        )
+    )
+    assert task_queue.read_log(task_label="Clean", messages_read=0) == [
+        (logging.ERROR, "ERROR failed badly")
+    ]
+
+
+def test_get_worker_name() -> None:
+    assert get_worker_name() == f"{os.uname().nodename}-{os.getpid()}"
+
+
+def test_renewing_claim(
+    task_queue: DirectoryTaskQueue, claimed_task_spec: TaskSpec
+) -> None:
+    claimed_path = task_queue.claimed_dir.joinpath("Clean", "worker-1.yaml")
+    os.utime(claimed_path, ns=(0, 0))
+    renewed = threading.Event()
+    with patch.object(
+        task_queue, "renew_claim", side_effect=lambda **_: renewed.set()
+    ) as mock_renew_claim:
+        with renewing_claim(
+            task_queue=task_queue,
+            task_label=claimed_task_spec.task_label,
+            worker="worker-1",
+            renew_interval=timedelta(seconds=0.01),
+        ):
+            assert renewed.wait(timeout=10)
+        renew_count = mock_renew_claim.call_count
+        time.sleep(0.05)
+        # Renewals stop once the task is done
+        assert mock_renew_claim.call_count == renew_count
+    mock_renew_claim.assert_called_with(task_label="Clean", worker="worker-1")
+
+
+def test_run_claimed_task_success(
+    task_queue: DirectoryTaskQueue, claimed_task_spec: TaskSpec
+) -> None:
+    resource_usage = ResourceUsage(processes_spawned=2)
+
+    def log_and_finish(**_: object) -> tuple[timedelta, ResourceUsage, bool]:
+        logger.warning("running on a worker")
+        return timedelta(seconds=3), resource_usage, True
+
+    root_handlers = list(logging.getLogger().handlers)
+    with patch(
+        "build_support.task_worker.run_task", side_effect=log_and_finish
+    ) as mock_run_task:
+        run_claimed_task(
+            task_queue=task_queue, task_spec=claimed_task_spec, worker="worker-1"
+        )
+    assert isinstance(mock_run_task.call_args.kwargs["task"], Clean)
+    assert (
+        mock_run_task.call_args.kwargs["project_root"]
+        == claimed_task_spec.basic_task_info.docker_project_root
+    )
+    assert mock_run_task.call_args.kwargs["cpu_budget"] == THREADS_AVAILABLE
+    assert task_queue.get_result(task_label="Clean") == TaskResult(
+        task_label="Clean",
+        worker="worker-1",
+        succeeded=True,
+        duration=timedelta(seconds=3),
+        resource_usage=resource_usage,
+        restored_from_cache=True,
+    )
+    assert task_queue.read_log(task_label="Clean", messages_read=0) == [
+        (logging.WARNING, "running on a worker")
+    ]
+    assert logging.getLogger().handlers == root_handlers
+
+
+def test_run_claimed_task_failure(
+    task_queue: DirectoryTaskQueue, claimed_task_spec: TaskSpec
+) -> None:
+    root_handlers = list(logging.getLogger().handlers)
+    with patch(
+        "build_support.task_worker.run_task", side_effect=RuntimeError("task broke")
+    ):
+        run_claimed_task(
+            task_queue=task_queue, task_spec=claimed_task_spec, worker="worker-1"
+        )
+    task_result = task_queue.get_result(task_label="Clean")
+    assert task_result is not None
+    assert not task_result.succeeded
+    assert task_result.worker == "worker-1"
+    assert "RuntimeError: task broke" in task_result.error
+    assert task_result.resource_usage == ResourceUsage()
+    assert logging.getLogger().handlers == root_handlers
+
+
+def test_serve_tasks_until_idle(
+    task_queue: DirectoryTaskQueue, clean_task_spec: TaskSpec
+) -> None:
+    task_queue.submit(task_spec=clean_task_spec)
+    with patch("build_support.task_worker.run_claimed_task") as mock_run_claimed_task:
+        serve_tasks(
+            task_queue=task_queue,
+            worker="worker-1",
+            max_idle_time=timedelta(seconds=0.05),
+            poll_interval=timedelta(seconds=0.01),
+        )
+    mock_run_claimed_task.assert_called_once_with(
+        task_queue=task_queue, task_spec=clean_task_spec, worker="worker-1"
+    )
+
+
+def test_serve_tasks_without_idle_limit(task_queue: DirectoryTaskQueue) -> None:
+    with (
+        patch.object(task_queue, "claim", side_effect=[None, KeyboardInterrupt]),
+        patch("build_support.task_worker.time.sleep") as mock_sleep,
+        pytest.raises(KeyboardInterrupt),
+    ):
+        serve_tasks(task_queue=task_queue, worker="worker-1")
+    mock_sleep.assert_called_once()
+
+
+def test_parse_args() -> None:
+    assert parse_args(args=["--docker-project-root", "root"]) == Namespace(
+        docker_project_root=Path("root"), max_idle_seconds=None
+    )
+    assert parse_args(
+        args=["--docker-project-root", "root", "--max-idle-seconds", "2.5"]
+    ) == Namespace(docker_project_root=Path("root"), max_idle_seconds=2.5)
+
+
+@pytest.mark.parametrize(
+    ("max_idle_seconds", "max_idle_time"), [(None, None), (2.5, timedelta(seconds=2.5))]
+)
+def test_run_main(
+    mock_project_root: Path,
+    max_idle_seconds: float | None,
+    max_idle_time: timedelta | None,
+) -> None:
+    with patch("build_support.task_worker.serve_tasks") as mock_serve_tasks:
+        run_main(
+            args=Namespace(
+                docker_project_root=mock_project_root, max_idle_seconds=max_idle_seconds
+            )
+        )
+    task_queue = mock_serve_tasks.call_args.kwargs["task_queue"]
+    assert isinstance(task_queue, DirectoryTaskQueue)
+    assert task_queue.pending_dir == get_task_queue_dir(
+        project_root=mock_project_root
+    ).joinpath("pending")
+    assert mock_serve_tasks.call_args.kwargs["worker"] == get_worker_name()
+    assert mock_serve_tasks.call_args.kwargs["max_idle_time"] == max_idle_time